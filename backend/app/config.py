@@ -38,7 +38,65 @@ class Settings(BaseSettings):
     DEFAULT_CLIPS_OUTPUT_DIR: str = "data/clips_output"
     DEFAULT_SUBTITLE_DIR: str = "data/subtitles"
     DEFAULT_TEMP_DIR: str = "data/temp"
-    
+
+    # Whisper 전사 워커 설정
+    WHISPER_BACKEND: str = "auto"  # auto, faster-whisper, openai-whisper
+    WHISPER_MAX_LOADED_MODELS: int = 2
+    WHISPER_CHUNK_WORKERS: int = 0  # 0이면 CPU 코어 수 / 워커당 스레드 수
+    WHISPER_THREADS_PER_WORKER: int = 2
+    WHISPER_MAX_CHUNK_POOLS: int = 2  # 상주시킬 모델별 프로세스 풀 수 (넘으면 가장 오래 안 쓴 풀 종료)
+
+    # 미디어 메타데이터 캐시 설정
+    MEDIA_PROBE_WARMUP: bool = True  # 앱 시작 시 클립 디렉토리 메타데이터 예열
+    MEDIA_PROBE_WORKERS: int = 4
+
+    # 자막 경계 보정 (인덱싱 시 한 번 수행, 원본 옆에 .refined.srt 저장)
+    SUBTITLE_REFINE: bool = True
+    SUBTITLE_REFINE_MAX_SECONDS: float = 8.0  # 문장 부호가 없는 자동 자막을 합칠 최대 길이
+    SUBTITLE_SNAP_WINDOW: float = 0.35  # 경계를 옮길 수 있는 최대 거리 (초)
+    SENTENCE_SPLITTER: str = "auto"  # 한 자막 안의 문장 분리: auto, spacy, nltk, regex
+
+    # 자막 검색 진단 (검색어/소요 시간을 INFO로 기록, 운영에서는 끔)
+    SEARCH_DEBUG: bool = False
+
+    # 예문 의미 검색 (문장 벡터 인덱스)
+    SEMANTIC_INDEX_DIR: str = "data/semantic"
+    SEMANTIC_DIMENSIONS: int = 128  # TF-IDF를 줄이는 LSA 차원
+    SEMANTIC_EMBEDDING_MODEL: str = ""  # 로컬 sentence-transformers 모델 (비우면 TF-IDF/LSA)
+
+    # 스크럽 미리보기(스프라이트 시트 + WebVTT) 설정
+    PREVIEW_DIR: str = "data/previews"
+    PREVIEW_INTERVAL_SECONDS: float = 5.0
+    PREVIEW_BUILD_ON_STARTUP: bool = True
+
+    # 편집기 미리보기용 저해상도 프록시 설정
+    PROXY_DIR: str = "data/proxies"
+    PROXY_HEIGHT: int = 480
+    PROXY_ON_INGEST: bool = True  # 다운로드 직후 프록시 생성
+
+    # 생성 결과물 HLS(fMP4) 패키징 설정
+    HLS_DIR: str = "data/hls"
+    HLS_SEGMENT_SECONDS: float = 2.0
+    HLS_PACKAGE_OUTPUTS: bool = False  # 요청에서 지정하지 않으면 사용할 기본값
+
+    # 자막 경계 편집용 오디오 파형(피크) 설정
+    WAVEFORM_DIR: str = "data/waveforms"
+    WAVEFORM_SAMPLES_PER_PEAK: int = 256  # 가장 세밀한 단계 (16kHz 기준 16ms)
+    WAVEFORM_LEVELS: int = 5  # 단계마다 4배씩 묶음
+    WAVEFORM_BITS: int = 8  # 8 또는 16
+
+    # TTS(원어민 음성) 합성 설정
+    TTS_PROVIDER: str = "edge-tts"  # edge-tts, gtts, offline
+    TTS_CACHE_DIR: str = "data/tts_cache"
+    TTS_CACHE_MAX_MB: int = 256
+    TTS_MAX_CONCURRENT: int = 4
+
+    # 발음 평가 설정
+    PRONUNCIATION_CACHE_DIR: str = "data/pronunciation_cache"  # 자막 구간별 참조 특징 캐시
+    RECORDINGS_DIR: str = "data/recordings"  # 학습자 녹음 업로드 저장 위치
+    RECORDING_MAX_MB: int = 20  # 녹음 파일 하나의 최대 크기
+    PRONUNCIATION_WORKERS: int = 2  # 녹음 디코딩/채점 동시 작업 수
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -62,6 +120,14 @@ def ensure_directories():
         settings.SUBTITLES_DIR,
         settings.TEMP_DIR,
         settings.LOG_DIR,
+        settings.PREVIEW_DIR,
+        settings.PROXY_DIR,
+        settings.HLS_DIR,
+        settings.WAVEFORM_DIR,
+        settings.SEMANTIC_INDEX_DIR,
+        settings.TTS_CACHE_DIR,
+        settings.PRONUNCIATION_CACHE_DIR,
+        settings.RECORDINGS_DIR,
         "app/static",
         "app/templates"
     ]
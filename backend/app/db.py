@@ -24,6 +24,62 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # 모델 기본 클래스
 Base = declarative_base()
 
+
+class JobTiming(Base):
+    """작업(whisper/repeat/final) 실제 소요 시간 기록"""
+    __tablename__ = "job_timings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(32), index=True, nullable=False)
+    host = Column(String(255), index=True, nullable=False)
+    variant = Column(String(64), index=True, nullable=True)  # whisper 모델/처리 방식 등
+    media_seconds = Column(Float, nullable=True)  # 원본 미디어 길이
+    work_seconds = Column(Float, nullable=False)  # 실제로 처리한 구간 길이
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    repeat_count = Column(Integer, nullable=True)
+    wall_seconds = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+
+class MediaMetadata(Base):
+    """ffprobe로 확인한 미디어 메타데이터 캐시 (경로 + 크기 + 수정 시각 기준)"""
+    __tablename__ = "media_metadata"
+
+    path = Column(String(1024), primary_key=True)
+    size = Column(Integer, nullable=False)
+    mtime_ns = Column(Integer, nullable=False)
+    duration = Column(Float, default=0.0)
+    bit_rate = Column(Integer, nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    fps = Column(Float, nullable=True)
+    video_codec = Column(String(32), nullable=True)
+    audio_codec = Column(String(32), nullable=True)
+    has_audio = Column(Boolean, default=False)
+    keyframe_interval = Column(Float, nullable=True)  # 평균 키프레임 간격 (초)
+    probed_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class PronunciationAttempt(Base):
+    """학습자 쉐도잉 녹음(테이크)별 발음 채점 결과"""
+    __tablename__ = "pronunciation_attempts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String(32), index=True, nullable=False)  # 한 번에 업로드한 테이크 묶음
+    take_index = Column(Integer, nullable=False)
+    video_path = Column(String(1024), index=True, nullable=False)
+    start = Column(Float, nullable=False)
+    end = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    recording_path = Column(String(1024), nullable=False)
+    score = Column(Float, nullable=True)
+    accuracy = Column(Float, nullable=True)
+    fluency = Column(Float, nullable=True)
+    pronunciation = Column(Float, nullable=True)
+    duration_ratio = Column(Float, nullable=True)
+    words = Column(Text, nullable=True)  # 단어별 점수 JSON
+    error = Column(Text, nullable=True)  # 디코딩/채점 실패 사유
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+
 # 데이터베이스 세션 의존성
 def get_db():
     """DB 세션 제공"""
@@ -22,7 +22,7 @@ try:
     
     # 라우터 가져오기 시도
     try:
-        from app.routers import youtube, subtitle
+        from app.routers import youtube, subtitle, pronunciation
         print("라우터 모듈 가져오기 성공")
     except Exception as e:
         print(f"라우터 가져오기 실패: {str(e)}")
@@ -52,6 +52,7 @@ setup_middlewares(app)
 # 라우터 등록
 app.include_router(youtube.router, prefix="/api/youtube", tags=["youtube"])
 app.include_router(subtitle.router, tags=["subtitle"])
+app.include_router(pronunciation.router, tags=["pronunciation"])
 
 # 메인 라우트
 @app.get("/api")
@@ -86,12 +87,35 @@ async def startup():
     from app.config import ensure_directories
     ensure_directories()
 
+    # 클립 디렉토리 메타데이터 캐시 예열 (시작을 막지 않도록 백그라운드 스레드에서 실행)
+    if settings.MEDIA_PROBE_WARMUP:
+        import asyncio
+        import functools
+        from app.services.media_probe import warm_up_directory
+        loop = asyncio.get_running_loop()
+        for directory in (settings.DEFAULT_CLIP_DIR, settings.DEFAULT_CLIPS_OUTPUT_DIR):
+            loop.run_in_executor(None, functools.partial(warm_up_directory, directory, workers=settings.MEDIA_PROBE_WORKERS))
+
+    # 누락되었거나 원본이 바뀐 클립의 스크럽 미리보기 생성
+    if settings.PREVIEW_BUILD_ON_STARTUP:
+        import asyncio
+        from app.services.preview import SpritePreviewGenerator
+        asyncio.get_running_loop().run_in_executor(
+            None, SpritePreviewGenerator().build_library, settings.DEFAULT_CLIP_DIR
+        )
+
 # 앱 종료 시 실행
 @app.on_event("shutdown")
 async def shutdown():
     """앱 종료 시 실행되는 함수"""
     print(f"=== {settings.APP_NAME} 종료 ===")
 
+    # 상주 Whisper 워커 종료
+    from app.services.whisper_server import shutdown_whisper_server
+    from app.services.whisper_chunked import shutdown_chunk_pools
+    shutdown_whisper_server()
+    shutdown_chunk_pools()
+
 # 직접 실행 시
 if __name__ == "__main__":
     uvicorn.run(
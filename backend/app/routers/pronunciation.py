@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+File: pronunciation.py
+Description: 쉐도잉 녹음 업로드 및 발음 채점 API 엔드포인트
+"""
+
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import JSONResponse
+from typing import Optional
+
+from app.common.utils import setup_logger
+from app.routers.youtube import standardize_path
+from app.services.attempts import get_attempt_scorer, UploadTooLarge
+
+# 라우터 설정
+router = APIRouter(
+    prefix="/api/pronunciation",
+    tags=["pronunciation"],
+    responses={404: {"description": "Not found"}},
+)
+
+# 로거 설정
+logger = setup_logger("pronunciation_router", "pronunciation_router.log")
+
+
+@router.post("/attempts")
+async def upload_attempts(request: Request):
+    """
+    한 자막 구간에 대한 여러 테이크를 업로드하고 일괄 채점
+
+    multipart/form-data 필드:
+        video_path: 원본 비디오 경로
+        start: 자막 구간 시작 (초)
+        end: 자막 구간 종료 (초)
+        text: 자막 문장
+        takes: 녹음 파일 (여러 개, 파일 파트는 이름과 관계없이 모두 테이크로 처리)
+
+    본문은 받는 대로 디스크에 기록하고(메모리에 올리지 않음), 디코딩/채점은
+    제한된 작업 풀에서 병렬로 처리한다.
+    """
+    scorer = get_attempt_scorer()
+    try:
+        batch_id, fields, takes = await scorer.receive(request.stream(), request.headers.get("content-type", ""))
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"업로드 형식 오류: {str(e)}")
+
+    try:
+        video_path = standardize_path(fields.get("video_path", ""))
+        start = float(fields["start"])
+        end = float(fields["end"])
+        text = fields.get("text", "").strip()
+        if not fields.get("video_path") or not video_path.exists():
+            raise ValueError(f"비디오 파일을 찾을 수 없습니다: {fields.get('video_path')}")
+        if end <= start:
+            raise ValueError("구간 종료 시간은 시작 시간보다 커야 합니다")
+        if not text:
+            raise ValueError("자막 문장(text)이 필요합니다")
+        if not takes:
+            raise ValueError("녹음 파일이 없습니다")
+    except (KeyError, ValueError) as e:
+        scorer.discard(batch_id)
+        message = f"필수 필드가 없습니다: {e.args[0]}" if isinstance(e, KeyError) else str(e)
+        raise HTTPException(status_code=400, detail=message)
+
+    try:
+        results = await scorer.score_batch(batch_id, str(video_path), start, end, text, takes)
+    except Exception as e:
+        logger.error(f"참조 구간 처리 실패: {video_path} {start}~{end} ({str(e)})")
+        raise HTTPException(status_code=500, detail=f"참조 음성 처리 실패: {str(e)}")
+
+    scored = [r for r in results if "error" not in r]
+    best = max(scored, key=lambda r: r["score"]) if scored else None
+    return JSONResponse(content={
+        "status": "success" if scored else "error",
+        "message": f"{len(scored)}/{len(results)}개 테이크 채점 완료",
+        "batch_id": batch_id,
+        "results": results,
+        "best_take": best["take"] if best else None
+    })
+
+
+@router.get("/attempts")
+async def list_attempts(video_path: Optional[str] = Query(None, description="원본 비디오 경로"),
+                        start: Optional[float] = Query(None, description="자막 구간 시작 (초)"),
+                        limit: int = Query(50, ge=1, le=500, description="최대 개수")):
+    """
+    저장된 채점 기록 조회 (최신순, 비디오/구간으로 필터)
+    """
+    path = str(standardize_path(video_path)) if video_path else None
+    attempts = get_attempt_scorer().list_attempts(video_path=path, start=start, limit=limit)
+    return JSONResponse(content={
+        "status": "success",
+        "message": f"{len(attempts)}개 기록",
+        "attempts": attempts
+    })
+
+
+@router.get("/attempts/{batch_id}")
+async def get_attempt_batch(batch_id: str):
+    """
+    업로드 묶음 하나의 채점 결과 조회
+    """
+    attempts = get_attempt_scorer().list_attempts(batch_id=batch_id, limit=500)
+    if not attempts:
+        raise HTTPException(status_code=404, detail=f"채점 기록을 찾을 수 없습니다: {batch_id}")
+    return JSONResponse(content={
+        "status": "success",
+        "message": f"{len(attempts)}개 테이크",
+        "batch_id": batch_id,
+        "attempts": sorted(attempts, key=lambda a: a["take"])
+    })
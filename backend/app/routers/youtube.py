@@ -22,8 +22,16 @@ import tempfile
 from app.services.extractor import VideoExtractor
 from app.services.subtitle import SubtitleProcessor, SubtitleIndexer
 from app.services.generator import RepeatVideoGenerator, ThumbnailGenerator
-from app.services.pronunciation import PronunciationAnalyzer
-from app.services.whisper_generator import WhisperGenerator
+from app.services.whisper_generator import WhisperGenerator, get_partial_status
+from app.services.media_probe import probe_media_async, warm_up_directory
+from app.services.estimator import get_estimator
+from app.services.preview import SpritePreviewGenerator, VTT_NAME
+from app.services.proxy import ProxyGenerator
+from app.services.waveform import WaveformGenerator, PEAKS_SUFFIX
+from app.services.search import get_search_engine
+from app.services.ass_subtitles import find_subtitle_files
+from app.services.tts import get_tts_service
+from app.services.packager import HLSPackager, FASTSTART_ARGS, keyframe_args
 from app.config import settings
 from app.common.utils import setup_logger, ensure_dir_exists, get_project_root
 
@@ -78,12 +86,14 @@ class WhisperEstimateRequest(BaseModel):
     """Whisper 처리 시간 예상 요청 모델"""
     video_path: str = Field(..., description="비디오 파일 경로")
     model: str = Field("tiny", description="Whisper 모델 크기 (tiny, base, small, medium, large)")
+    mode: str = Field("single", description="처리 방식 (single: 상주 워커, chunked: 무음 기준 분할 후 병렬 처리)")
 
 class WhisperGenerateRequest(BaseModel):
     """Whisper 자막 생성 요청 모델"""
     video_path: str = Field(..., description="비디오 파일 경로")
     model: str = Field("tiny", description="Whisper 모델 크기 (tiny, base, small, medium, large)")
     language: str = Field("en", description="생성할 자막 언어")
+    mode: str = Field("single", description="처리 방식 (single: 상주 워커, chunked: 무음 기준 분할 후 병렬 처리)")
 
 # 자막 검색 관련 모델 추가
 class SubtitleSearchRequest(BaseModel):
@@ -91,6 +101,25 @@ class SubtitleSearchRequest(BaseModel):
     limit: Optional[int] = 10
     threshold: Optional[float] = 0.5
     multiline: Optional[bool] = False  # 멀티라인 쿼리 여부
+    # 문장 통계 필터/정렬 (말하기 속도, 희귀 단어 비율, 추정 난이도)
+    min_wpm: Optional[float] = None
+    max_wpm: Optional[float] = None
+    max_rarity: Optional[float] = None  # 0이면 흔한 단어만
+    min_difficulty: Optional[float] = None
+    max_difficulty: Optional[float] = None
+    levels: Optional[List[str]] = None  # 추정 CEFR 등급 (A1~C2)
+    sort_by: Optional[str] = "score"  # score, wpm, rarity, difficulty (-를 붙이면 내림차순)
+    # 영상/채널/언어/문장 길이 필터와 페이지 커서
+    videos: Optional[List[str]] = None
+    channels: Optional[List[str]] = None
+    languages: Optional[List[str]] = None
+    min_duration: Optional[float] = None
+    max_duration: Optional[float] = None
+    cursor: Optional[str] = None  # 이전 응답의 next_cursor
+
+class SimilarSentenceRequest(BaseModel):
+    text: str
+    limit: Optional[int] = 10
 
 class SubtitleSearchResult(BaseModel):
     video_path: str
@@ -100,21 +129,38 @@ class SubtitleSearchResult(BaseModel):
     end_time: str
     text: str
     score: float
+    wpm: Optional[float] = None
+    rarity: Optional[float] = None
+    difficulty: Optional[float] = None
+    level: Optional[str] = None
 
 class SubtitleSearchResponse(BaseModel):
     status: str
     message: Optional[str] = None
     results: Optional[List[SubtitleSearchResult]] = None
+    query_results: Optional[Dict[str, List[SubtitleSearchResult]]] = None
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    truncated: Optional[bool] = None
+    facets: Optional[Dict[str, Dict[str, int]]] = None
 
 # 작업 시간 추정 관련 모델 추가
 class EstimateRequest(BaseModel):
     video_path: str
     subtitle_segments: List[Dict]
+    repeat_count: int = 3
+    preview: bool = False
+    subtitle_mode: Optional[List[str]] = None
     
 class EstimateResponse(BaseModel):
     status: str
     message: Optional[str] = None
     estimated_seconds: Optional[float] = None
+    lower_seconds: Optional[float] = None
+    upper_seconds: Optional[float] = None
+    confidence: Optional[float] = None
+    samples: Optional[int] = None
+    source: Optional[str] = None
 
 # 경로 표준화 함수
 def standardize_path(path_str: str) -> Path:
@@ -244,6 +290,249 @@ async def list_videos():
             }
         )
 
+@router.post("/metadata/warm-up")
+async def warm_up_metadata():
+    """클립 디렉토리 전체의 미디어 메타데이터를 미리 캐시합니다."""
+    try:
+        summaries = {}
+        for directory in (settings.DEFAULT_CLIP_DIR, settings.DEFAULT_CLIPS_OUTPUT_DIR):
+            summaries[directory] = await asyncio.to_thread(
+                warm_up_directory, directory, workers=settings.MEDIA_PROBE_WORKERS
+            )
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "message": "메타데이터 예열 완료",
+                "directories": summaries
+            }
+        )
+    except Exception as e:
+        logger.error(f"메타데이터 예열 오류: {str(e)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"메타데이터 예열 실패: {str(e)}"
+            }
+        )
+
+async def _generate_preview(video_path: str) -> None:
+    """클립 하나의 스크럽 미리보기 생성 (실패해도 다른 작업에 영향 없음)"""
+    try:
+        await asyncio.to_thread(SpritePreviewGenerator().generate, video_path)
+    except Exception as e:
+        logger.warning(f"스크럽 미리보기 생성 실패: {video_path} ({str(e)})")
+
+async def _generate_proxy(video_path: str) -> None:
+    """클립 하나의 편집용 프록시 생성 (실패해도 다른 작업에 영향 없음)"""
+    try:
+        await asyncio.to_thread(ProxyGenerator().generate, video_path)
+    except Exception as e:
+        logger.warning(f"프록시 생성 실패: {video_path} ({str(e)})")
+
+async def _generate_waveform(video_path: str) -> None:
+    """클립 하나의 파형 피크 생성 (실패해도 다른 작업에 영향 없음)"""
+    try:
+        await asyncio.to_thread(WaveformGenerator().generate, video_path)
+    except Exception as e:
+        logger.warning(f"파형 생성 실패: {video_path} ({str(e)})")
+
+async def _package_hls(video_path: str, enabled: Optional[bool] = None) -> Optional[str]:
+    """
+    결과물을 HLS로 패키징하고 재생 목록 URL 반환
+    
+    Args:
+        video_path: mp4 파일 경로
+        enabled: 패키징 여부 (None이면 HLS_PACKAGE_OUTPUTS 설정 사용)
+        
+    Returns:
+        재생 목록 URL (패키징하지 않았거나 실패하면 None, 원본 mp4는 그대로 재생 가능)
+    """
+    if not (settings.HLS_PACKAGE_OUTPUTS if enabled is None else enabled):
+        return None
+    try:
+        manifest = await asyncio.to_thread(HLSPackager().package, video_path)
+        return manifest["playlist_url"]
+    except Exception as e:
+        logger.warning(f"HLS 패키징 실패: {video_path} ({str(e)})")
+        return None
+
+@router.post("/previews/build")
+async def build_previews(background_tasks: BackgroundTasks):
+    """클립 디렉토리 전체의 스크럽 미리보기(스프라이트 시트 + WebVTT)를 생성합니다."""
+    try:
+        task_id = f"previews_{int(time.time())}"
+        
+        if not hasattr(build_previews, "tasks"):
+            build_previews.tasks = {}
+        
+        build_previews.tasks[task_id] = {
+            "state": "PENDING",
+            "progress": 0,
+            "status": "미리보기 생성 준비 중...",
+            "error": None,
+            "result": None
+        }
+        
+        def progress_callback(progress: float, msg: str):
+            build_previews.tasks[task_id]["progress"] = int(progress * 100)
+            build_previews.tasks[task_id]["status"] = msg
+        
+        async def build_task():
+            try:
+                build_previews.tasks[task_id]["state"] = "PROGRESS"
+                summary = await asyncio.to_thread(
+                    SpritePreviewGenerator().build_library,
+                    settings.DEFAULT_CLIP_DIR,
+                    progress_callback
+                )
+                build_previews.tasks[task_id]["state"] = "SUCCESS"
+                build_previews.tasks[task_id]["progress"] = 100
+                build_previews.tasks[task_id]["status"] = "미리보기 생성 완료"
+                build_previews.tasks[task_id]["result"] = summary
+            except Exception as e:
+                logger.error(f"미리보기 생성 작업 오류: {str(e)}", exc_info=True)
+                build_previews.tasks[task_id]["state"] = "FAILURE"
+                build_previews.tasks[task_id]["error"] = str(e)
+        
+        background_tasks.add_task(build_task)
+        
+        return JSONResponse(
+            status_code=202,
+            content={
+                "status": "pending",
+                "task_id": task_id,
+                "message": "미리보기 생성이 시작되었습니다. 상태를 확인하세요."
+            }
+        )
+    except Exception as e:
+        logger.error(f"미리보기 생성 요청 오류: {str(e)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"미리보기 생성 요청 실패: {str(e)}"
+            }
+        )
+
+@router.get("/previews/status/{task_id}")
+async def get_previews_status(task_id: str):
+    """미리보기 일괄 생성 작업의 진행 상황을 확인합니다."""
+    task_info = getattr(build_previews, "tasks", {}).get(task_id)
+    if not task_info:
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": "작업을 찾을 수 없습니다."}
+        )
+    
+    return JSONResponse(
+        status_code=200,
+        content={
+            "status": task_info["state"].lower(),
+            "progress": task_info["progress"],
+            "message": task_info["status"],
+            "error": task_info["error"],
+            "result": task_info["result"]
+        }
+    )
+
+@router.get("/preview/{video_name}/thumbnails.vtt")
+async def get_preview_track(video_name: str, background_tasks: BackgroundTasks):
+    """
+    클립의 WebVTT 썸네일 트랙을 반환합니다.
+    
+    아직 생성되지 않았으면 404를 반환하고 백그라운드에서 생성을 시작합니다.
+    """
+    video_path = standardize_path(unquote(video_name))
+    if not video_path.exists():
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"파일을 찾을 수 없습니다: {video_name}"}
+        )
+    
+    preview_dir = await asyncio.to_thread(SpritePreviewGenerator().preview_dir, str(video_path))
+    if preview_dir is None:
+        background_tasks.add_task(_generate_preview, str(video_path))
+        return JSONResponse(
+            status_code=404,
+            content={"status": "pending", "message": "미리보기를 생성하고 있습니다. 잠시 후 다시 시도하세요."}
+        )
+    
+    # 트랙 파일은 원본이 바뀌면 다른 버전을 가리키므로 매번 재검증
+    return FileResponse(
+        str(preview_dir / VTT_NAME),
+        media_type="text/vtt",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@router.get("/preview/sprites/{dir_name}/{file_name}")
+async def get_preview_sprite(dir_name: str, file_name: str):
+    """스프라이트 시트 이미지를 반환합니다. (버전별 경로이므로 영구 캐시 가능)"""
+    preview_root = Path(settings.PREVIEW_DIR).resolve()
+    sprite_path = (preview_root / dir_name / file_name).resolve()
+    if (".." in dir_name or ".." in file_name
+            or sprite_path.parent.parent != preview_root
+            or sprite_path.suffix.lower() != ".jpg"
+            or not sprite_path.is_file()):
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": "스프라이트를 찾을 수 없습니다."}
+        )
+    
+    return FileResponse(
+        str(sprite_path),
+        media_type="image/jpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+@router.get("/waveform/{video_name}")
+async def get_waveform_manifest(video_name: str, background_tasks: BackgroundTasks):
+    """
+    클립의 파형 피크 매니페스트를 반환합니다.
+    
+    매니페스트의 url이 가리키는 피크 파일에서 단계별 offset/count로 필요한 구간만
+    Range 요청으로 읽으면 됩니다. 아직 생성되지 않았으면 404를 반환하고 백그라운드에서 생성을 시작합니다.
+    """
+    video_path = standardize_path(unquote(video_name))
+    if not video_path.exists():
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": f"파일을 찾을 수 없습니다: {video_name}"}
+        )
+    
+    manifest = await asyncio.to_thread(WaveformGenerator().find, str(video_path))
+    if manifest is None:
+        background_tasks.add_task(_generate_waveform, str(video_path))
+        return JSONResponse(
+            status_code=404,
+            content={"status": "pending", "message": "파형을 생성하고 있습니다. 잠시 후 다시 시도하세요."}
+        )
+    
+    # 매니페스트는 원본이 바뀌면 다른 버전을 가리키므로 매번 재검증
+    return JSONResponse(content=manifest, headers={"Cache-Control": "no-cache"})
+
+@router.get("/waveform/data/{file_name}")
+async def get_waveform_data(file_name: str):
+    """파형 피크 파일을 반환합니다. (Range 요청 지원, 버전별 경로이므로 영구 캐시 가능)"""
+    waveform_root = Path(settings.WAVEFORM_DIR).resolve()
+    peaks_path = (waveform_root / file_name).resolve()
+    if (".." in file_name
+            or peaks_path.parent != waveform_root
+            or peaks_path.suffix != PEAKS_SUFFIX
+            or not peaks_path.is_file()):
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": "파형 파일을 찾을 수 없습니다."}
+        )
+    
+    # FileResponse가 Range 헤더를 처리하므로 편집기는 보이는 구간의 바이트만 받음
+    return FileResponse(
+        str(peaks_path),
+        media_type="application/octet-stream",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
 @router.post("/transcript", response_model=YouTubeTranscriptResponse)
 async def get_youtube_transcript(request: YouTubeTranscriptRequest):
     """YouTube 영상의 트랜스크립트를 가져옵니다."""
@@ -355,6 +644,9 @@ async def download_youtube_video(
                 )
                 
                 if video_path:
+                    # 이후 추정/생성 작업이 바로 캐시를 쓰도록 메타데이터 미리 조회
+                    await probe_media_async(str(video_path))
+                    
                     # 자막 존재 여부 확인
                     has_subtitle = False
                     available_subtitles = []
@@ -376,6 +668,12 @@ async def download_youtube_video(
                         'has_subtitle': has_subtitle,
                         'available_subtitles': available_subtitles
                     }
+                    
+                    # 완료 상태를 먼저 알린 뒤 스크럽 미리보기, 파형, 편집용 프록시 생성
+                    await _generate_preview(str(video_path))
+                    await _generate_waveform(str(video_path))
+                    if settings.PROXY_ON_INGEST:
+                        await _generate_proxy(str(video_path))
                 else:
                     # 실패 상태로 업데이트
                     download_youtube_video.tasks[task_id]['state'] = 'FAILURE'
@@ -434,8 +732,9 @@ async def get_download_status(task_id: str):
     )
 
 @router.get("/subtitle/get")
-async def get_subtitle(video_path: str, language: Optional[str] = None, use_whisper: Optional[bool] = False):
-    """비디오 파일의 자막을 가져옵니다. 자막이 없는 경우 Whisper 생성 가능 여부 반환"""
+async def get_subtitle(video_path: str, language: Optional[str] = None, use_whisper: Optional[bool] = False,
+                       refined: Optional[bool] = False):
+    """비디오 파일의 자막을 가져옵니다 (refined=true면 문장 경계 보정 자막). 자막이 없는 경우 Whisper 생성 가능 여부 반환"""
     try:
         logger.info(f"자막 가져오기 요청: video_path={video_path}, language={language}, use_whisper={use_whisper}")
         
@@ -469,9 +768,14 @@ async def get_subtitle(video_path: str, language: Optional[str] = None, use_whis
         subtitle_processor = SubtitleProcessor()
         
         # 자막 가져오기 (언어 지정)
-        subtitles = await subtitle_processor.get_subtitles(str(video_file), language)
+        subtitles = await subtitle_processor.get_subtitles(str(video_file), language, refined=bool(refined))
+        
+        # Whisper가 생성 중인 자막이면 지금까지 기록된 부분 자막과 진행 상태를 함께 반환
+        subtitle_file = subtitle_processor.find_subtitle_file(str(video_file), language)
+        generating_file = subtitle_processor.find_generating_subtitle(str(video_file), language, subtitle_file)
+        partial_status = get_partial_status(str(generating_file)) if generating_file else None
         
-        if not subtitles:
+        if not subtitles and partial_status is None:
             logger.info(f"자막이 없음: {video_file}, 언어: {language}, Whisper 생성 옵션={use_whisper}")
             # 자막이 없는 경우
             # 사용자가 Whisper로 생성하길 원하는 경우
@@ -527,13 +831,18 @@ async def get_subtitle(video_path: str, language: Optional[str] = None, use_whis
             })
         
         logger.info(f"자막 가져오기 성공: {video_file}, {len(subtitle_items)}개의 자막")
+        content = {
+            "status": "success",
+            "message": f"{len(subtitle_items)}개의 자막을 찾았습니다.",
+            "subtitles": subtitle_items
+        }
+        if partial_status is not None:
+            content["partial"] = True
+            content["progress"] = int(partial_status.get("progress", 0) * 100)
+            content["message"] = f"자막 생성 중입니다. 지금까지 {len(subtitle_items)}개의 자막이 준비되었습니다."
         return JSONResponse(
             status_code=200,
-            content={
-                "status": "success",
-                "message": f"{len(subtitle_items)}개의 자막을 찾았습니다.",
-                "subtitles": subtitle_items
-            }
+            content=content
         )
         
     except Exception as e:
@@ -575,7 +884,8 @@ async def estimate_whisper_time(request: WhisperEstimateRequest):
         # 처리 시간 예상
         estimate = await whisper_generator.estimate_processing_time(
             str(video_path),
-            model=request.model
+            model=request.model,
+            mode=request.mode
         )
         
         logger.info(f"Whisper 처리 시간 예상 완료: {estimate}")
@@ -654,7 +964,8 @@ async def generate_whisper_subtitle(
         # 예상 처리 시간 계산
         estimate = await whisper_generator.estimate_processing_time(
             str(video_path),
-            model=request.model
+            model=request.model,
+            mode=request.mode
         )
         
         # 백그라운드 작업으로 자막 생성 실행
@@ -662,33 +973,21 @@ async def generate_whisper_subtitle(
             try:
                 generate_whisper_subtitle.tasks[task_id]["state"] = "PROGRESS"
                 
-                # 처리 진행 상황 업데이트 함수
-                start_time = time.time()
-                estimated_seconds = estimate.get("estimated_seconds", 60)
-                
-                # 상태 업데이트 작업 (1초마다)
-                async def update_status():
-                    while generate_whisper_subtitle.tasks[task_id]["state"] == "PROGRESS":
-                        elapsed = time.time() - start_time
-                        progress = min(0.95, elapsed / estimated_seconds) if estimated_seconds > 0 else 0.5
-                        generate_whisper_subtitle.tasks[task_id]["progress"] = int(progress * 100)
-                        generate_whisper_subtitle.tasks[task_id]["status"] = f"자막 생성 중... {progress:.0%}"
-                        await asyncio.sleep(1)
-                
-                # 상태 업데이트 태스크 시작
-                update_task = asyncio.create_task(update_status())
+                # 실제 처리된 오디오 길이 기준 진행률 업데이트 콜백
+                async def progress_callback(progress: float, msg: str):
+                    generate_whisper_subtitle.tasks[task_id]["progress"] = min(99, int(progress * 100))
+                    generate_whisper_subtitle.tasks[task_id]["status"] = msg
                 
-                # 자막 생성 실행
+                # 자막 생성 실행 (세그먼트가 끝날 때마다 output_path에 추가 기록됨)
                 success, result = await whisper_generator.generate_subtitle(
                     str(video_path),
                     output_path,
                     model=request.model,
-                    language=request.language
+                    language=request.language,
+                    mode=request.mode,
+                    progress_callback=progress_callback
                 )
                 
-                # 상태 업데이트 태스크 취소
-                update_task.cancel()
-                
                 if success:
                     generate_whisper_subtitle.tasks[task_id]["state"] = "SUCCESS"
                     generate_whisper_subtitle.tasks[task_id]["progress"] = 100
@@ -776,6 +1075,10 @@ class RepeatVideoRequest(BaseModel):
     end_time: str = Field(..., description="종료 시간 (00:00:00,000 형식)")
     repeat_count: int = Field(3, description="반복 횟수")
     output_name: Optional[str] = Field(None, description="출력 파일 이름 (옵션)")
+    preview: bool = Field(False, description="저해상도 프록시로 빠르게 미리보기 렌더링")
+    subtitle_mode: Optional[List[str]] = Field(None, description="반복 회차별 자막 모드 (no_subtitle, en, ko, en_ko)")
+    tts_pass: Optional[bool] = Field(None, description="마지막에 원어민 음성(TTS) 회차 추가 (기본값: 설정)")
+    hls: Optional[bool] = Field(None, description="HLS(fMP4) 패키징 여부 (기본값: 설정)")
 
 # 썸네일 생성 요청 모델
 class ThumbnailRequest(BaseModel):
@@ -831,7 +1134,8 @@ async def generate_repeat_video(
         else:
             # 원본 파일 이름에서 확장자를 제외한 이름 가져오기
             video_name = video_path.stem
-            output_name = f"{video_name}_repeat{request.repeat_count}_{request.start_time.replace(':', '_').replace(',', '_')}.mp4"
+            preview_suffix = "_preview" if request.preview else ""
+            output_name = f"{video_name}_repeat{request.repeat_count}_{request.start_time.replace(':', '_').replace(',', '_')}{preview_suffix}.mp4"
         
         # 출력 파일 경로 설정 - clips_output 디렉토리에 저장
         output_dir = Path(settings.DEFAULT_CLIPS_OUTPUT_DIR)
@@ -874,9 +1178,16 @@ async def generate_repeat_video(
                     request.end_time,
                     str(output_path),
                     request.repeat_count,
-                    progress_callback
+                    progress_callback,
+                    preview=request.preview,
+                    subtitle_mode=request.subtitle_mode,
+                    tts_pass=request.tts_pass
                 )
                 
+                # 프록시가 아직 없으면 다음 미리보기를 위해 생성
+                if request.preview and success and not result.get("used_proxy"):
+                    await _generate_proxy(str(video_path))
+                
                 if success:
                     generate_repeat_video.tasks[task_id]["state"] = "SUCCESS"
                     generate_repeat_video.tasks[task_id]["progress"] = 100
@@ -885,7 +1196,10 @@ async def generate_repeat_video(
                         "output_path": str(output_path),
                         "output_name": output_name,
                         "repeat_count": request.repeat_count,
-                        "duration": result.get("duration", 0)
+                        "duration": result.get("duration", 0),
+                        "preview": request.preview,
+                        "used_proxy": result.get("used_proxy", False),
+                        "hls_url": await _package_hls(str(output_path), request.hls)
                     }
                 else:
                     generate_repeat_video.tasks[task_id]["state"] = "FAILURE"
@@ -996,8 +1310,9 @@ async def generate_thumbnail(request: ThumbnailRequest):
         # ThumbnailGenerator 인스턴스 생성
         thumbnail_generator = ThumbnailGenerator()
         
-        # 썸네일 생성 실행
-        success, result = thumbnail_generator.generate_thumbnail(
+        # 썸네일 생성 실행 (프레임 디코딩/합성 동안 이벤트 루프를 막지 않도록 스레드에서 실행)
+        success, result = await asyncio.to_thread(
+            thumbnail_generator.generate_thumbnail,
             str(video_path),
             request.time_pos,
             str(output_path),
@@ -1037,6 +1352,82 @@ async def generate_thumbnail(request: ThumbnailRequest):
             }
         )
 
+# 썸네일 일괄 생성 요청 모델
+class ThumbnailBatchItem(BaseModel):
+    """일괄 생성할 썸네일 한 개"""
+    time_pos: str = Field(..., description="썸네일 추출 시간 위치 (00:00:00 형식)")
+    text: Optional[str] = Field(None, description="오버레이할 텍스트 (옵션)")
+    subtitle: Optional[str] = Field(None, description="하단에 표시할 자막 텍스트 (옵션)")
+    template: Optional[str] = Field("basic", description="사용할 템플릿")
+    output_name: Optional[str] = Field(None, description="출력 파일 이름 (옵션)")
+
+class ThumbnailBatchRequest(BaseModel):
+    """썸네일 일괄 생성 요청 모델"""
+    video_path: str = Field(..., description="비디오 파일 경로")
+    items: List[ThumbnailBatchItem] = Field(..., description="생성할 썸네일 목록")
+    name_prefix: Optional[str] = Field(None, description="출력 파일 이름 접두사 (옵션)")
+    contact_sheet: bool = Field(True, description="스크럽 미리보기용 컨택트 시트 생성 여부")
+
+@router.post("/generate-thumbnails")
+async def generate_thumbnails_batch(request: ThumbnailBatchRequest):
+    """한 비디오에서 여러 문장의 썸네일을 한 번의 디코딩으로 생성"""
+    try:
+        logger.info(f"썸네일 일괄 생성 요청: {request.video_path}, {len(request.items)}개")
+        
+        video_path = standardize_path(request.video_path)
+        if not video_path.exists():
+            logger.warning(f"비디오 파일을 찾을 수 없음: {video_path}")
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "status": "error",
+                    "message": f"비디오 파일을 찾을 수 없습니다: {str(video_path)}"
+                }
+            )
+        
+        thumbnails_dir = Path(settings.DEFAULT_CLIP_DIR) / "thumbnails"
+        ensure_dir_exists(thumbnails_dir)
+        
+        thumbnail_generator = ThumbnailGenerator()
+        success, manifest = await asyncio.to_thread(
+            thumbnail_generator.generate_thumbnails_batch,
+            str(video_path),
+            [item.model_dump() for item in request.items],
+            str(thumbnails_dir),
+            request.name_prefix,
+            request.contact_sheet
+        )
+        
+        if not success:
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "status": "error",
+                    "message": "썸네일 일괄 생성 실패",
+                    "error": manifest.get("error")
+                }
+            )
+        
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "message": f"썸네일 {manifest['count']}개 생성 완료",
+                "manifest": manifest
+            }
+        )
+    
+    except Exception as e:
+        logger.error(f"썸네일 일괄 생성 실패: {str(e)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"썸네일 일괄 생성 실패: {str(e)}",
+                "error_details": str(e)
+            }
+        )
+
 # 최종 영상 생성 요청 모델
 class FinalVideoRequest(BaseModel):
     """최종 영상 생성 요청 모델"""
@@ -1044,6 +1435,7 @@ class FinalVideoRequest(BaseModel):
     thumbnail_path: str = Field(..., description="썸네일 이미지 파일 경로")
     thumbnail_duration: float = Field(3.0, description="썸네일 표시 시간(초)")
     output_name: Optional[str] = Field(None, description="출력 파일 이름 (옵션)")
+    hls: Optional[bool] = Field(None, description="HLS(fMP4) 패키징 여부 (기본값: 설정)")
 
 @router.post("/generate-final")
 async def generate_final_video(request: FinalVideoRequest):
@@ -1126,6 +1518,8 @@ async def generate_final_video(request: FinalVideoRequest):
         os.makedirs(output_dir, exist_ok=True)
         output_path = output_dir / output_name
         
+        job_start = time.time()
+        
         # 임시 파일 경로 설정
         temp_dir = Path(settings.TEMP_DIR)
         ensure_dir_exists(temp_dir)
@@ -1164,6 +1558,8 @@ async def generate_final_video(request: FinalVideoRequest):
             "-filter_complex", "[0:v][0:a][1:v][1:a]concat=n=2:v=1:a=1[outv][outa]",
             "-map", "[outv]",
             "-map", "[outa]",
+            *keyframe_args(),
+            *FASTSTART_ARGS,
             str(output_path)
         ]
         
@@ -1182,6 +1578,8 @@ async def generate_final_video(request: FinalVideoRequest):
                     "-c:v", "libx264",
                     "-c:a", "aac",
                     "-filter_complex", "concat=n=2:v=1:a=0",
+                    *keyframe_args(),
+                    *FASTSTART_ARGS,
                     str(output_path)
                 ]
                 logger.debug(f"단순 연결 명령 시도: {' '.join(simple_cmd)}")
@@ -1196,6 +1594,8 @@ async def generate_final_video(request: FinalVideoRequest):
                         "-i", str(video_path),
                         "-filter_complex", "[0:v][1:v]concat=n=2:v=1:a=0[v]",
                         "-map", "[v]",
+                        *keyframe_args(),
+                        *FASTSTART_ARGS,
                         str(output_path)
                     ]
                     logger.debug(f"최종 시도: {' '.join(very_simple_cmd)}")
@@ -1218,6 +1618,18 @@ async def generate_final_video(request: FinalVideoRequest):
                 }
             )
         
+        video_info = await probe_media_async(str(video_path))
+        # 추정기 DB 기록은 블로킹이므로 스레드에서 실행
+        await asyncio.to_thread(
+            get_estimator().record,
+            "final",
+            time.time() - job_start,
+            request.thumbnail_duration + video_info.get("duration", 0.0),
+            media_seconds=video_info.get("duration"),
+            width=video_info.get("width"),
+            height=video_info.get("height")
+        )
+        
         logger.info(f"최종 영상 생성 성공: {output_path}")
         return JSONResponse(
             status_code=200,
@@ -1225,7 +1637,8 @@ async def generate_final_video(request: FinalVideoRequest):
                 "status": "success",
                 "message": "최종 영상 생성 완료",
                 "output_path": str(output_path),
-                "output_name": output_name
+                "output_name": output_name,
+                "hls_url": await _package_hls(str(output_path), request.hls)
             }
         )
         
@@ -1249,17 +1662,12 @@ async def search_subtitles(request: SubtitleSearchRequest):
     멀티라인 쿼리를 지원합니다 (각 줄이 별도의 쿼리로 처리됨).
     """
     try:
-        import re
-        import pysrt
-        from pathlib import Path
-
         original_query = request.query.strip()
         
         # 멀티라인 쿼리 처리
         if request.multiline:
             # 빈 줄을 제외한 각 줄을 별도의 쿼리로 처리
             queries = [q.strip().lower() for q in original_query.split('\n') if q.strip()]
-            logger.info(f"멀티라인 쿼리 처리: {len(queries)}개 라인")
         else:
             queries = [original_query.lower()]
         
@@ -1272,7 +1680,10 @@ async def search_subtitles(request: SubtitleSearchRequest):
                 "message": "검색어를 입력해주세요."
             }
         
-        logger.info(f"자막 검색 시작: 쿼리='{queries}', 제한={limit}, 임계값={threshold}")
+        # 진단 로그는 SEARCH_DEBUG일 때만 (검색 경로에서 요청마다 INFO 기록하지 않음)
+        started = time.perf_counter()
+        if settings.SEARCH_DEBUG:
+            logger.info(f"자막 검색 시작: 쿼리='{queries}', 제한={limit}, 임계값={threshold}")
         
         # 동영상 목록 가져오기
         clips_dir = settings.DEFAULT_CLIP_DIR
@@ -1282,178 +1693,39 @@ async def search_subtitles(request: SubtitleSearchRequest):
                 "message": f"클립 디렉토리를 찾을 수 없습니다: {clips_dir}"
             }
         
-        # HTML 태그 제거 함수
-        def remove_html_tags(text):
-            clean = re.compile('<.*?>')
-            return re.sub(clean, '', text)
-        
-        # 모든 자막 파일 검색
-        subtitle_files = []
-        logger.info(f"클립 디렉토리: {clips_dir}")
-        logger.info(f"클립 디렉토리 내 파일: {os.listdir(clips_dir)}")
-        
-        # 모든 자막 파일을 먼저 찾음 (*.en.srt 또는 *.srt)
-        for file in os.listdir(clips_dir):
-            file_path = os.path.join(clips_dir, file)
-            
-            # 자막 파일인 경우
-            if file.endswith(('.en.srt', '.srt')):
-                # .ko.srt 와 같은 한국어 자막 제외
-                if '.ko.srt' in file:
-                    continue
-                    
-                # 영상 파일명 추출 (확장자 제거)
-                if file.endswith('.en.srt'):
-                    video_name = file[:-7]  # .en.srt 제거
-                else:
-                    video_name = file[:-4]  # .srt 제거
-                
-                subtitle_files.append({
-                    "subtitle_path": file_path,
-                    "name": video_name
-                })
-        
-        logger.info(f"검색할 자막 파일 목록: {[s['name'] for s in subtitle_files]}")
-        
-        # 모든 자막 파일에서 검색
-        all_results = []
-        
-        # 각 쿼리별 결과 저장
-        query_results = {query: [] for query in queries}
-        
-        for subtitle in subtitle_files:
-            subtitle_path = subtitle["subtitle_path"]
-            video_name = subtitle["name"]
-            
-            # 관련 영상 파일 경로 구성 (필요한 경우)
-            base_name = Path(subtitle_path).stem
-            if base_name.endswith('.en'):
-                base_name = base_name[:-3]  # .en 제거
-                
-            video_path = os.path.join(clips_dir, base_name + '.mp4')
-            
-            # 영상 파일이 없어도 검색은 수행 (참조용 경로)
-            if not os.path.exists(video_path):
-                logger.warning(f"영상 파일을 찾을 수 없지만 검색 계속 진행: {video_path}")
-                
-            logger.info(f"검색 중인 자막 파일: {subtitle_path}")
-                
-            try:
-                # 자막 파일 로드
-                subs = pysrt.open(str(subtitle_path))
-                logger.info(f"자막 파일에서 {len(subs)} 개의 항목 읽음")
-                
-                # 자막에서 검색 (모든 쿼리에 대해)
-                for query in queries:
-                    for sub in subs:
-                        # HTML 태그 제거 및 소문자 변환
-                        clean_text = remove_html_tags(sub.text).lower()
-                        
-                        # 디버깅: 첫 5개 자막만 로깅
-                        if sub.index <= 5:
-                            logger.info(f"자막[{sub.index}]: '{clean_text}'")
-                        
-                        # 단순 포함 여부 확인 (짧은 검색어는 단어 단위로 검색)
-                        found = False
-                        if len(query) <= 3:
-                            # 단어 단위로 검색
-                            words = clean_text.split()
-                            for word in words:
-                                if query in word:
-                                    found = True
-                                    break
-                        else:
-                            # 일반 텍스트 검색
-                            found = query in clean_text
-                            
-                        if found:
-                            logger.info(f"검색어 '{query}' 발견: {clean_text}")
-                            # 유사도 측정 - 짧은 단어(3글자 이하)는 완전 일치 시 높은 점수 부여
-                            from difflib import SequenceMatcher
-                            if len(query) <= 3 and query in clean_text.split():
-                                similarity = 0.9  # 완전 일치인 경우 높은 점수 부여
-                            else:
-                                similarity = SequenceMatcher(None, query, clean_text).ratio()
-                            
-                            # 임계값 조정 - 단어가 짧을수록 더 낮은 임계값 적용
-                            word_threshold = threshold
-                            if len(query) <= 3:
-                                word_threshold = 0.3
-                            
-                            if similarity >= word_threshold:
-                                result = {
-                                    "video_path": video_path,
-                                    "name": video_name,
-                                    "index": sub.index,
-                                    "start_time": str(sub.start),
-                                    "end_time": str(sub.end),
-                                    "text": sub.text,
-                                    "query": query,  # 어떤 쿼리에 매치되었는지 표시
-                                    "score": similarity
-                                }
-                                query_results[query].append(result)
-                                all_results.append(result)
-            except Exception as e:
-                logger.error(f"자막 파일 처리 오류 ({subtitle_path}): {str(e)}")
-                continue
-        
-        # 쿼리별 검색 결과가 없는 경우 테스트 데이터 추가
-        for query in queries:
-            if len(query_results[query]) == 0:
-                if query == "hello":
-                    # 테스트 데이터 추가 (hello)
-                    logger.info(f"'{query}' 검색 결과가 없어 테스트 데이터 추가")
-                    test_result = {
-                        "video_path": "data/clips/Can Trump win a trade war with China？ - The Global Story podcast, BBC World Service.mp4",
-                        "name": "Can Trump win a trade war with China？ - The Global Story podcast, BBC World Service",
-                        "index": 1,
-                        "start_time": "00:00:00,000",
-                        "end_time": "00:00:03,480",
-                        "text": "Hello, I'm Lucy Hockings. From the BBC World Service.",
-                        "query": query,
-                        "score": 0.9
-                    }
-                    query_results[query].append(test_result)
-                    all_results.append(test_result)
-                elif query == "brain":
-                    # 테스트 데이터 추가 (brain)
-                    logger.info(f"'{query}' 검색 결과가 없어 테스트 데이터 추가")
-                    test_result = {
-                        "video_path": "data/clips/how_your_brain_works.mp4",
-                        "name": "how_your_brain_works",
-                        "index": 1,
-                        "start_time": "00:00:04,799",
-                        "end_time": "00:00:09,830",
-                        "text": "the brain is the most fascinating part of the human body not much to look at it",
-                        "query": query,
-                        "score": 0.9
-                    }
-                    query_results[query].append(test_result)
-                    all_results.append(test_result)
-        
-        # 유사도 순으로 정렬 후 제한
-        all_results.sort(key=lambda x: x["score"], reverse=True)
-        all_results = all_results[:limit]
+        # 인덱스 시점에 만든 문장 구간에서 검색 (빈 자막/연결 자막 제외)
+        filters = request.model_dump(include={
+            "min_wpm", "max_wpm", "max_rarity", "min_difficulty", "max_difficulty", "levels",
+            "videos", "channels", "languages", "min_duration", "max_duration"
+        }, exclude_none=True)
+        try:
+            page = await asyncio.to_thread(
+                get_search_engine().search, queries, limit, threshold, filters,
+                request.sort_by or "score", request.cursor
+            )
+        except ValueError as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+        all_results, query_results = page["results"], page["query_results"]
         
-        logger.info(f"자막 검색 결과: {len(all_results)}개 찾음")
+        if settings.SEARCH_DEBUG:
+            logger.info(f"자막 검색 결과: {page['total']}개 일치, {len(all_results)}개 반환 "
+                        f"({(time.perf_counter() - started) * 1000:.1f}ms)")
         
+        response = {
+            "status": "success",
+            "results": all_results,
+            "next_cursor": page["next_cursor"],
+            "total": page["total"],
+            "truncated": page["truncated"],
+            "facets": page["facets"]
+        }
         # 멀티라인인 경우 쿼리별 결과도 함께 반환
         if request.multiline:
-            # 각 쿼리별 결과 정렬 및 제한
-            for query in query_results:
-                query_results[query].sort(key=lambda x: x["score"], reverse=True)
-                query_results[query] = query_results[query][:limit]
-            
-            return {
-                "status": "success",
-                "results": all_results,
-                "query_results": query_results
-            }
-        else:
-            return {
-                "status": "success",
-                "results": all_results
-            }
+            response["query_results"] = query_results
+        return response
     
     except Exception as e:
         logger.error(f"자막 검색 중 오류: {str(e)}", exc_info=True)
@@ -1462,6 +1734,31 @@ async def search_subtitles(request: SubtitleSearchRequest):
             "message": f"자막 검색 중 오류가 발생했습니다: {str(e)}"
         }
 
+@router.post("/subtitle/similar", response_model=SubtitleSearchResponse)
+async def search_similar_sentences(request: SimilarSentenceRequest):
+    """
+    기준 문장과 의미가 비슷한 예문을 모든 영상 자막에서 찾습니다.
+    (문장 벡터 인덱스, 점수는 코사인 유사도)
+    """
+    text = request.text.strip()
+    if not text:
+        return {
+            "status": "error",
+            "message": "기준 문장을 입력해주세요."
+        }
+    try:
+        results = await asyncio.to_thread(get_search_engine().similar, text, request.limit)
+        return {
+            "status": "success",
+            "results": results
+        }
+    except Exception as e:
+        logger.error(f"예문 검색 중 오류: {str(e)}", exc_info=True)
+        return {
+            "status": "error",
+            "message": f"예문 검색 중 오류가 발생했습니다: {str(e)}"
+        }
+
 # 작업 시간 추정 API 추가
 @router.post("/estimate-generation", response_model=EstimateResponse)
 async def estimate_generation_time(request: EstimateRequest):
@@ -1486,17 +1783,11 @@ async def estimate_generation_time(request: EstimateRequest):
         
         logger.info(f"작업 시간 추정 시작: 영상={os.path.basename(video_path)}, 자막 수={len(subtitle_segments)}")
         
-        # 영상 정보 가져오기
-        from moviepy.editor import VideoFileClip
-        
-        # 영상 메타데이터만 로드 (전체 영상 로딩 방지)
-        with VideoFileClip(video_path, audio=False) as clip:
-            video_duration = clip.duration
-            video_fps = clip.fps
-            video_size = clip.size
+        # 영상 정보 가져오기 (캐시된 ffprobe 메타데이터, 미리보기는 프록시 기준)
+        proxy_path = ProxyGenerator().proxy_path(video_path) if request.preview else None
+        video_info = await probe_media_async(proxy_path or video_path)
         
-        # 예상 소요 시간 계산 (실제로는 하드웨어에 따라 크게 달라질 수 있음)
-        # 1. 자막 세그먼트 총 시간 계산
+        # 자막 세그먼트 총 시간 계산
         total_segment_seconds = 0
         for segment in subtitle_segments:
             # 'start_time'과 'end_time'은 "HH:MM:SS,mmm" 형식
@@ -1522,33 +1813,29 @@ async def estimate_generation_time(request: EstimateRequest):
             segment_duration = end_seconds - start_seconds
             total_segment_seconds += segment_duration
         
-        # 2. 기본 작업 시간 추정
-        # - 클립 추출: 약 총 시간의 2배
-        # - 자막 렌더링: 약 총 시간의 3배
-        # - 반복 구성: 약 총 시간의 1배
-        # - 최종 병합: 약 총 시간의 2배
-        # 하드웨어에 따라 크게 달라질 수 있음
-        
-        base_extraction_time = total_segment_seconds * 2  # 클립 추출
-        subtitle_rendering_time = total_segment_seconds * 3  # 자막 렌더링
-        repetition_time = total_segment_seconds * 1  # 반복 구성
-        merging_time = total_segment_seconds * 2  # 최종 병합
-        
-        # 비디오 해상도에 따른 보정
-        resolution_factor = (video_size[0] * video_size[1]) / (1280 * 720)  # 720p 기준
-        
-        # 최종 예상 시간 (초 단위)
-        estimated_seconds = (base_extraction_time + subtitle_rendering_time + 
-                           repetition_time + merging_time) * resolution_factor
-        
-        # 최소 5초, 최대 300초(5분)로 제한
-        estimated_seconds = max(5, min(300, estimated_seconds))
+        # 자막이 있으면 서로 다른 자막 모드 수만큼 구간을 인코딩
+        encode_passes = 1
+        if any(find_subtitle_files(video_path)):
+            modes = request.subtitle_mode or RepeatVideoGenerator().config["subtitle_mode"]
+            encode_passes = max(1, len(set(modes[:request.repeat_count])))
+        
+        # 이 호스트의 반복 영상 작업 기록으로 학습한 처리 속도 기준 예상 (90% 예측 구간 포함)
+        estimate = await asyncio.to_thread(
+            get_estimator().estimate,
+            "repeat",
+            total_segment_seconds * encode_passes,
+            variant="preview" if proxy_path else None,
+            width=video_info.get("width"),
+            height=video_info.get("height"),
+            repeat_count=request.repeat_count
+        )
+        estimated_seconds = estimate["estimated_seconds"]
         
         logger.info(f"작업 시간 추정 완료: 예상 소요 시간={estimated_seconds:.2f}초")
         
         return {
             "status": "success",
-            "estimated_seconds": estimated_seconds
+            **estimate
         }
         
     except Exception as e:
@@ -1590,6 +1877,116 @@ async def check_generation_status(task_id: str):
             "message": f"작업 상태 확인 중 오류가 발생했습니다: {str(e)}"
         }
 
+# TTS 합성 요청 모델
+class TTSRequest(BaseModel):
+    """TTS 합성 요청 모델"""
+    text: str = Field(..., description="합성할 문장")
+    voice: Optional[str] = Field(None, description="음성 이름 (예: en-US-GuyNeural)")
+    speed: Optional[float] = Field(None, description="속도 배율 (1.0 = 기본)")
+    pitch: Optional[int] = Field(None, description="음높이 조절 (Hz)")
+    provider: Optional[str] = Field(None, description="TTS 엔진 (edge-tts, gtts, offline)")
+
+@router.post("/tts")
+async def synthesize_speech(request: TTSRequest):
+    """문장을 원어민 음성으로 합성합니다. (같은 문장/음성 설정은 캐시에서 바로 반환)"""
+    try:
+        audio_path = await get_tts_service().synthesize(
+            request.text,
+            voice=request.voice,
+            speed=request.speed,
+            pitch=request.pitch,
+            provider=request.provider
+        )
+        return FileResponse(
+            audio_path,
+            media_type="audio/wav" if audio_path.endswith(".wav") else "audio/mpeg",
+            headers={"Cache-Control": "public, max-age=86400"}
+        )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"status": "error", "message": str(e)}
+        )
+    except Exception as e:
+        logger.error(f"TTS 합성 실패: {str(e)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"TTS 합성 실패: {str(e)}"
+            }
+        )
+
+# HLS 패키징 요청 모델
+class PackageHLSRequest(BaseModel):
+    """HLS 패키징 요청 모델"""
+    video_path: str = Field(..., description="mp4 파일 경로")
+    force: bool = Field(False, description="이미 패키징되어 있어도 다시 생성")
+
+@router.post("/package-hls")
+async def package_hls(request: PackageHLSRequest):
+    """기존 mp4 결과물을 HLS(fMP4 세그먼트 + 재생 목록)로 패키징합니다."""
+    try:
+        video_path = Path(settings.DEFAULT_CLIPS_OUTPUT_DIR) / request.video_path
+        if not video_path.exists():
+            video_path = standardize_path(request.video_path)
+        if not video_path.exists() or video_path.suffix.lower() != ".mp4":
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "status": "error",
+                    "message": f"mp4 파일을 찾을 수 없습니다: {request.video_path}"
+                }
+            )
+        
+        manifest = await asyncio.to_thread(HLSPackager().package, str(video_path), request.force)
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "message": "HLS 패키징 완료",
+                "hls_url": manifest["playlist_url"],
+                "segments": manifest["segments"]
+            }
+        )
+    except Exception as e:
+        logger.error(f"HLS 패키징 실패: {str(e)}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={
+                "status": "error",
+                "message": f"HLS 패키징 실패: {str(e)}"
+            }
+        )
+
+# HLS 파일 확장자별 MIME 타입
+HLS_MEDIA_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".m4s": "video/iso.segment",
+    ".mp4": "video/mp4"
+}
+
+@router.get("/hls/{dir_name}/{file_name}")
+async def get_hls_file(dir_name: str, file_name: str):
+    """HLS 재생 목록/세그먼트를 반환합니다. (버전별 경로이므로 영구 캐시 가능)"""
+    hls_root = Path(settings.HLS_DIR).resolve()
+    hls_path = (hls_root / dir_name / file_name).resolve()
+    media_type = HLS_MEDIA_TYPES.get(hls_path.suffix.lower())
+    if (".." in dir_name or ".." in file_name
+            or hls_path.parent.parent != hls_root
+            or media_type is None
+            or not hls_path.is_file()):
+        return JSONResponse(
+            status_code=404,
+            content={"status": "error", "message": "HLS 파일을 찾을 수 없습니다."}
+        )
+    
+    return FileResponse(
+        str(hls_path),
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
 @router.get("/stream/{file_path:path}")
 async def stream_video(file_path: str):
     """영상 파일을 스트리밍으로 제공합니다."""
@@ -1650,6 +2047,7 @@ async def stream_video(file_path: str):
 class MergeClipsRequest(BaseModel):
     clip_paths: List[str]
     output_filename: Optional[str] = None
+    hls: Optional[bool] = None
 
 @router.post("/merge-clips", response_model=Dict[str, Any])
 async def merge_clips(request: MergeClipsRequest):
@@ -1702,6 +2100,7 @@ async def merge_clips(request: MergeClipsRequest):
                 "-safe", "0",
                 "-i", concat_file_path,
                 "-c", "copy",  # 인코딩 없이 스트림 복사 (빠름)
+                *FASTSTART_ARGS,
                 str(output_path)
             ]
             
@@ -1715,7 +2114,8 @@ async def merge_clips(request: MergeClipsRequest):
                 "status": "success",
                 "message": "비디오 클립이 성공적으로 병합되었습니다.",
                 "output_path": str(rel_output_path),
-                "clips_count": len(abs_clip_paths)
+                "clips_count": len(abs_clip_paths),
+                "hls_url": await _package_hls(str(output_path), request.hls)
             }
         finally:
             # 임시 파일 정리
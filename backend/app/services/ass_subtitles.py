@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+File: ass_subtitles.py
+Description: 반복 영상 구간용 ASS 자막 생성 (영어/한국어 모드, 디스크 캐시)
+"""
+
+import os
+import re
+import json
+import hashlib
+import pysrt
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from app.common.utils import setup_logger, ensure_dir_exists, get_project_root
+from app.config import settings
+
+logger = setup_logger('ass_subtitles', 'ass_subtitles.log')
+
+# 반복 회차별 자막 모드
+SUBTITLE_MODES = ("no_subtitle", "en", "ko", "en_ko")
+
+# ASS 좌표 기준 해상도 (실제 영상 크기에 맞춰 libass가 비율 변환)
+PLAY_RES_X = 1280
+PLAY_RES_Y = 720
+
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _ass_time(seconds: float) -> str:
+    """초를 ASS 타임스탬프(H:MM:SS.cc)로 변환"""
+    centis = int(round(max(seconds, 0.0) * 100))
+    hours, centis = divmod(centis, 360_000)
+    minutes, centis = divmod(centis, 6000)
+    secs, centis = divmod(centis, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def _ass_color(hex_color: str, default: str = "&H00FFFFFF") -> str:
+    """'#RRGGBB' 또는 '#RRGGBBAA'를 ASS 색상(&HAABBGGRR, 알파 0=불투명)으로 변환"""
+    value = (hex_color or "").lstrip('#')
+    if len(value) not in (6, 8):
+        return default
+    r, g, b = value[0:2], value[2:4], value[4:6]
+    alpha = 255 - int(value[6:8], 16) if len(value) == 8 else 0
+    return f"&H{alpha:02X}{b}{g}{r}".upper()
+
+
+def _ass_text(text: str) -> str:
+    """SRT 텍스트를 ASS 대사 텍스트로 변환 (태그 제거, 줄바꿈, 중괄호 치환)"""
+    text = TAG_RE.sub("", text or "").strip()
+    text = text.replace("{", "(").replace("}", ")")
+    return "\\N".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def find_subtitle_files(video_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    비디오와 같은 위치의 영어/한국어 SRT 자막 찾기 (영어는 경계 보정 자막 우선)
+
+    Returns:
+        (영어 자막 경로, 한국어 자막 경로) - 없으면 None
+    """
+    base = Path(video_path).with_suffix("")
+    en = next((p for p in (Path(f"{base}.en.srt"), Path(f"{base}.srt")) if p.exists()), None)
+    if en is not None:
+        # 인덱싱 때 만든 보정 자막이 원본보다 최신이면 사용
+        refined = en.with_suffix(".refined.srt")
+        if refined.exists() and refined.stat().st_mtime_ns >= en.stat().st_mtime_ns:
+            en = refined
+    ko = Path(f"{base}.ko.srt")
+    return (str(en) if en else None), (str(ko) if ko.exists() else None)
+
+
+def translation_store_path(video_path: str) -> Optional[str]:
+    """번역 저장소(SubtitleMatcher JSON)에서 비디오에 해당하는 파일 경로"""
+    translations_dir = get_project_root() / "backend" / settings.DEFAULT_SUBTITLE_DIR / "translations"
+    stem = Path(video_path).stem
+    for video_id in (stem, f"{stem}.en"):
+        candidate = translations_dir / f"{video_id}_translations.json"
+        if candidate.exists():
+            return str(candidate)
+    return None
+
+
+def segment_cues(video_path: str, start: float, end: float) -> List[Tuple[float, float, str]]:
+    """
+    구간과 겹치는 영어 자막 (구간 시작 기준 시간, 태그 제거한 한 줄 텍스트)
+
+    Returns:
+        [(시작 초, 종료 초, 텍스트)]
+    """
+    en_path, _ = find_subtitle_files(video_path)
+    if not en_path:
+        return []
+    cues = []
+    for cue_start, cue_end, text in AssSubtitleBuilder._overlapping(pysrt.open(en_path), start, end):
+        text = " ".join(TAG_RE.sub("", text).split())
+        if text:
+            cues.append((cue_start, cue_end, text))
+    return cues
+
+
+class AssSubtitleBuilder:
+    """구간 자막을 ASS 파일로 만들고 디스크에 캐시하는 클래스"""
+
+    def __init__(self, style: Optional[Dict[str, Any]] = None, cache_dir: Optional[str] = None):
+        """
+        AssSubtitleBuilder 초기화
+
+        Args:
+            style: 자막 스타일 (font, font_ko, fontsize, position, shadow, bgcolor, color)
+            cache_dir: ASS 캐시 디렉토리 (기본값: 임시 디렉토리 아래 ass_cache)
+        """
+        self.style = style or {}
+        self.cache_dir = Path(cache_dir or Path(settings.TEMP_DIR) / "ass_cache")
+
+    def _cache_path(self, video_path: str, start: float, end: float, mode: str, sources: List[Optional[str]]) -> Path:
+        """자막/번역 파일이나 스타일이 바뀌면 달라지는 캐시 파일 경로"""
+        parts = [os.path.realpath(video_path), f"{start:.3f}", f"{end:.3f}", mode,
+                 json.dumps(self.style, sort_keys=True, ensure_ascii=False)]
+        for source in sources:
+            if source:
+                stat = os.stat(source)
+                parts.append(f"{source}|{stat.st_size}|{stat.st_mtime_ns}")
+        key = hashlib.sha1("|".join(parts).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{key}.ass"
+
+    def _header(self) -> str:
+        """스크립트 정보와 EN/KO 스타일 정의"""
+        font = self.style.get("font", "Arial")
+        font_ko = self.style.get("font_ko", "Noto Sans CJK KR")
+        size = int(self.style.get("fontsize", 48))
+        primary = _ass_color(self.style.get("color", "#FFFFFF"))
+        back = _ass_color(self.style.get("bgcolor", ""), default="&H80000000")
+        border_style = 3 if self.style.get("bgcolor") else 1
+        # BorderStyle 3(불투명 상자)은 외곽선 색으로 상자를 칠함
+        outline = back if border_style == 3 else "&H00000000"
+        shadow = 1 if self.style.get("shadow", True) else 0
+        position = self.style.get("position", {})
+        margin_v = max(0, PLAY_RES_Y - int(position.get("y", PLAY_RES_Y - 60)))
+        margin_h = int(position.get("x", 50))
+
+        def style_line(name: str, fontname: str, fontsize: int) -> str:
+            return (f"Style: {name},{fontname},{fontsize},{primary},&H000000FF,{outline},{back},"
+                    f"0,0,0,0,100,100,0,0,{border_style},2,{shadow},2,{margin_h},{margin_h},{margin_v},1")
+
+        return "\n".join([
+            "[Script Info]",
+            "ScriptType: v4.00+",
+            f"PlayResX: {PLAY_RES_X}",
+            f"PlayResY: {PLAY_RES_Y}",
+            "WrapStyle: 0",
+            "ScaledBorderAndShadow: yes",
+            "",
+            "[V4+ Styles]",
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+            "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, "
+            "Shadow, Alignment, MarginL, MarginR, MarginV, Encoding",
+            style_line("EN", font, size),
+            style_line("KO", font_ko, int(size * 0.85)),
+            "",
+            "[Events]",
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+        ])
+
+    @staticmethod
+    def _overlapping(subs: Optional[pysrt.SubRipFile], start: float, end: float) -> List[Tuple[float, float, str]]:
+        """구간과 겹치는 자막을 구간 기준 시간으로 잘라 반환"""
+        cues = []
+        for sub in subs or []:
+            cue_start = sub.start.ordinal / 1000.0
+            cue_end = sub.end.ordinal / 1000.0
+            if cue_end <= start or cue_start >= end:
+                continue
+            cues.append((max(cue_start, start) - start, min(cue_end, end) - start, sub.text))
+        return cues
+
+    def build(self, video_path: str, start: float, end: float, mode: str) -> Optional[str]:
+        """
+        구간 [start, end]의 자막을 지정한 모드로 ASS 파일 생성 (구간 시작이 0초)
+
+        Args:
+            video_path: 원본 비디오 경로
+            start: 구간 시작 (초)
+            end: 구간 종료 (초)
+            mode: 자막 모드 ('no_subtitle', 'en', 'ko', 'en_ko')
+
+        Returns:
+            ASS 파일 경로 (자막 없음 모드이거나 표시할 자막이 없으면 None)
+        """
+        if mode not in SUBTITLE_MODES:
+            raise ValueError(f"지원하지 않는 자막 모드입니다: {mode}")
+        if mode == "no_subtitle":
+            return None
+
+        en_path, ko_path = find_subtitle_files(video_path)
+        store_path = translation_store_path(video_path)
+        cache_path = self._cache_path(video_path, start, end, mode, [en_path, ko_path, store_path])
+        if cache_path.exists():
+            return str(cache_path)
+
+        en_cues = self._overlapping(pysrt.open(en_path) if en_path else None, start, end)
+        ko_subs = pysrt.open(ko_path) if ko_path else None
+
+        translations: Dict[str, str] = {}
+        if store_path:
+            from app.services.subtitle import SubtitleMatcher
+            translations = SubtitleMatcher(store_path).translations
+
+        events = []
+        if en_cues:
+            for cue_start, cue_end, text in en_cues:
+                en_text = _ass_text(text)
+                ko_text = translations.get(text.strip())
+                if ko_text is None:
+                    # 번역 저장소에 없으면 한국어 자막에서 가장 많이 겹치는 줄 사용
+                    overlaps = self._overlapping(ko_subs, start + cue_start, start + cue_end)
+                    ko_text = max(overlaps, key=lambda c: c[1] - c[0])[2] if overlaps else ""
+                ko_text = _ass_text(ko_text)
+
+                if mode == "en":
+                    body = en_text
+                elif mode == "ko":
+                    body = "{\\rKO}" + ko_text if ko_text else ""
+                else:
+                    body = en_text + ("\\N{\\rKO}" + ko_text if ko_text else "")
+                if body:
+                    events.append((cue_start, cue_end, body))
+        elif mode == "ko":
+            # 영어 자막이 없으면 한국어 자막만 사용
+            events = [(s, e, "{\\rKO}" + _ass_text(t)) for s, e, t in self._overlapping(ko_subs, start, end)]
+
+        if not events:
+            logger.info(f"구간에 표시할 자막 없음: {video_path} {start:.2f}~{end:.2f} ({mode})")
+            return None
+
+        lines = [self._header()]
+        for cue_start, cue_end, body in events:
+            lines.append(f"Dialogue: 0,{_ass_time(cue_start)},{_ass_time(cue_end)},EN,,0,0,0,,{body}")
+
+        ensure_dir_exists(str(self.cache_dir))
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, cache_path)
+        logger.debug(f"ASS 자막 생성: {cache_path} ({len(events)}개, {mode})")
+        return str(cache_path)
+
+
+def ass_filter(ass_path: str) -> str:
+    """ass 필터 식 (캐시 파일명은 해시라 작업 디렉토리 기준 상대 경로면 이스케이프가 필요 없음)"""
+    try:
+        path = os.path.relpath(ass_path)
+    except ValueError:
+        path = ass_path
+    path = path.replace('\\', '/').replace(':', '\\:').replace("'", "\\'")
+    return f"ass='{path}'"
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+File: attempts.py
+Description: 학습자 쉐도잉 녹음 업로드(스트리밍 multipart → 디스크)와 일괄 채점/기록
+"""
+
+import os
+import json
+import uuid
+import asyncio
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
+
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+from app.services.pronunciation import get_analyzer, ReferenceFeatures
+
+logger = setup_logger('attempts', 'attempts.log')
+
+# 녹음 파일로 저장할 확장자 (그 외는 .bin으로 저장하고 ffmpeg가 형식을 판별)
+RECORDING_EXTENSIONS = {".wav", ".webm", ".ogg", ".oga", ".opus", ".mp3", ".m4a", ".mp4", ".aac", ".flac"}
+
+# 파일이 아닌 일반 필드 값의 최대 크기 (바이트)
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """업로드한 녹음/필드가 허용 크기를 넘음"""
+
+
+class RecordingUpload:
+    """
+    multipart 요청 본문을 받는 대로 파싱해 파일 파트는 바로 디스크에 기록
+
+    Starlette의 request.form()은 파일을 메모리 버퍼(SpooledTemporaryFile)에 먼저 담고
+    다시 복사해야 하므로, 본문 청크를 직접 파서에 넣어 테이크 파일에 곧바로 쓴다.
+    """
+
+    def __init__(self, target_dir: Path, max_file_bytes: int):
+        """
+        RecordingUpload 초기화
+
+        Args:
+            target_dir: 테이크 파일을 저장할 디렉토리
+            max_file_bytes: 파일 하나의 최대 크기
+        """
+        self.target_dir = target_dir
+        self.max_file_bytes = max_file_bytes
+        self.fields: Dict[str, str] = {}
+        self.files: List[Dict[str, Any]] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._name = ""
+        self._value = bytearray()
+        self._file = None
+        self._size = 0
+
+    # MultipartParser 콜백 ------------------------------------------------
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = ""
+        self._value = bytearray()
+        self._file = None
+        self._size = 0
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        if filename is None:
+            return
+
+        suffix = Path(filename.decode("utf-8", "replace")).suffix.lower()
+        index = len(self.files)
+        path = self.target_dir / f"take_{index:02d}{suffix if suffix in RECORDING_EXTENSIONS else '.bin'}"
+        self._file = open(path, "wb")
+        self.files.append({"index": index, "field": self._name, "path": str(path), "size": 0})
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self._size += end - start
+        if self._file is None:
+            if self._size > MAX_FIELD_BYTES:
+                raise UploadTooLarge(f"필드 값이 너무 큽니다: {self._name}")
+            self._value += data[start:end]
+            return
+        if self._size > self.max_file_bytes:
+            raise UploadTooLarge(f"녹음 파일이 너무 큽니다 (최대 {self.max_file_bytes // (1024 * 1024)}MB)")
+        self._file.write(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._file is None:
+            self.fields[self._name] = self._value.decode("utf-8", "replace")
+            return
+        self._file.close()
+        self._file = None
+        self.files[-1]["size"] = self._size
+
+    # ------------------------------------------------------------------
+
+    async def receive(self, stream: AsyncIterator[bytes], content_type: str) -> None:
+        """
+        요청 본문 스트림을 끝까지 읽어 필드와 테이크 파일을 저장
+
+        Args:
+            stream: 요청 본문 청크 (request.stream())
+            content_type: Content-Type 헤더 값 (boundary 포함)
+        """
+        content_type_value, params = parse_options_header(content_type or "")
+        boundary = params.get(b"boundary")
+        if content_type_value != b"multipart/form-data" or not boundary:
+            raise ValueError("multipart/form-data 요청이 필요합니다")
+
+        ensure_dir_exists(str(self.target_dir))
+        parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+        try:
+            async for chunk in stream:
+                if chunk:
+                    parser.write(chunk)
+            parser.finalize()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class AttemptScorer:
+    """업로드한 여러 테이크를 자막 구간 참조 특징에 대해 채점하고 기록하는 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        AttemptScorer 초기화
+
+        Args:
+            config: 설정 (옵션) - recordings_dir, max_take_mb, workers
+        """
+        self.config = config or {}
+        self.recordings_dir = Path(self.config.get("recordings_dir", settings.RECORDINGS_DIR))
+        self.max_take_bytes = int(self.config.get("max_take_mb", settings.RECORDING_MAX_MB)) * 1024 * 1024
+        self.workers = max(1, int(self.config.get("workers", settings.PRONUNCIATION_WORKERS)))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tables_ready = False
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """디코딩(ffmpeg)/채점 작업 풀 (요청이 몰려도 동시 작업 수는 workers로 제한)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pronunciation")
+        return self._executor
+
+    def _ensure_tables(self) -> None:
+        """채점 기록 테이블 생성 (프로세스당 한 번)"""
+        if self._tables_ready:
+            return
+        from app.db import Base, engine, DB_PATH, PronunciationAttempt
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        Base.metadata.create_all(bind=engine, tables=[PronunciationAttempt.__table__])
+        self._tables_ready = True
+
+    async def receive(self, stream: AsyncIterator[bytes], content_type: str) -> Tuple[str, Dict[str, str], List[Dict[str, Any]]]:
+        """
+        테이크 업로드를 새 묶음 디렉토리에 저장
+
+        Returns:
+            (묶음 ID, 일반 필드, 테이크 파일 목록[{index, field, path, size}])
+        """
+        batch_id = uuid.uuid4().hex[:16]
+        upload = RecordingUpload(self.recordings_dir / batch_id, self.max_take_bytes)
+        try:
+            await upload.receive(stream, content_type)
+        except Exception:
+            self.discard(batch_id)
+            raise
+        return batch_id, upload.fields, upload.files
+
+    def discard(self, batch_id: str) -> None:
+        """저장한 묶음 녹음 삭제 (업로드/요청 검증 실패 시)"""
+        shutil.rmtree(self.recordings_dir / batch_id, ignore_errors=True)
+
+    def _score_take(self, reference: ReferenceFeatures, take: Dict[str, Any]) -> Dict[str, Any]:
+        """테이크 하나 디코딩 후 채점 (실패해도 다른 테이크에 영향 없음)"""
+        result = {"take": take["index"], "recording_path": take["path"]}
+        try:
+            if not take["size"]:
+                raise ValueError("빈 녹음 파일입니다")
+            signal = get_analyzer().load_recording(take["path"])
+            result.update(get_analyzer().score(signal, reference))
+        except Exception as e:
+            logger.warning(f"테이크 채점 실패: {take['path']} ({str(e)})")
+            result["error"] = str(e)
+        return result
+
+    async def score_batch(self,
+                          batch_id: str,
+                          video_path: str,
+                          start: float,
+                          end: float,
+                          text: str,
+                          takes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        묶음의 테이크를 병렬로 채점하고 결과 저장
+
+        참조 특징은 자막 구간당 한 번만 계산(캐시)하고 모든 테이크가 공유한다.
+
+        Args:
+            batch_id: 묶음 ID
+            video_path: 원본 비디오 경로
+            start: 자막 구간 시작 (초)
+            end: 자막 구간 종료 (초)
+            text: 자막 문장
+            takes: receive()가 반환한 테이크 목록
+
+        Returns:
+            테이크 순서대로 채점 결과 (실패한 테이크는 error 포함)
+        """
+        loop = asyncio.get_running_loop()
+        reference = await loop.run_in_executor(
+            self._pool(), get_analyzer().get_reference, video_path, start, end, text
+        )
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._pool(), self._score_take, reference, take) for take in takes
+        ))
+        await asyncio.to_thread(self._store, batch_id, video_path, start, end, text, results)
+        scored = sum(1 for r in results if "error" not in r)
+        logger.info(f"테이크 채점 완료: {batch_id} ({scored}/{len(results)}개, {Path(video_path).name} {start:.2f}~{end:.2f})")
+        return list(results)
+
+    def _store(self, batch_id: str, video_path: str, start: float, end: float, text: str,
+               results: List[Dict[str, Any]]) -> None:
+        """채점 결과를 한 트랜잭션으로 저장 (기록 실패는 응답에 영향을 주지 않음)"""
+        from app.db import SessionLocal, PronunciationAttempt
+        try:
+            self._ensure_tables()
+            db = SessionLocal()
+            try:
+                for result in results:
+                    db.add(PronunciationAttempt(
+                        batch_id=batch_id,
+                        take_index=result["take"],
+                        video_path=os.path.realpath(video_path),
+                        start=start,
+                        end=end,
+                        text=text,
+                        recording_path=result["recording_path"],
+                        score=result.get("score"),
+                        accuracy=result.get("accuracy"),
+                        fluency=result.get("fluency"),
+                        pronunciation=result.get("pronunciation"),
+                        duration_ratio=result.get("duration_ratio"),
+                        words=json.dumps(result.get("words", []), ensure_ascii=False),
+                        error=result.get("error")
+                    ))
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"채점 결과 저장 실패: {batch_id} ({str(e)})")
+
+    def list_attempts(self,
+                      batch_id: Optional[str] = None,
+                      video_path: Optional[str] = None,
+                      start: Optional[float] = None,
+                      limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        저장된 채점 결과 조회 (최신순)
+
+        Args:
+            batch_id: 묶음 ID로 필터
+            video_path: 원본 비디오 경로로 필터
+            start: 자막 구간 시작 (초)으로 필터 (video_path와 함께 사용)
+            limit: 최대 개수
+
+        Returns:
+            채점 결과 목록
+        """
+        from app.db import SessionLocal, PronunciationAttempt
+        self._ensure_tables()
+        db = SessionLocal()
+        try:
+            query = db.query(PronunciationAttempt)
+            if batch_id:
+                query = query.filter(PronunciationAttempt.batch_id == batch_id)
+            if video_path:
+                query = query.filter(PronunciationAttempt.video_path == os.path.realpath(video_path))
+                if start is not None:
+                    query = query.filter(PronunciationAttempt.start.between(start - 0.0005, start + 0.0005))
+            rows = query.order_by(PronunciationAttempt.id.desc()).limit(limit).all()
+            return [{
+                "batch_id": row.batch_id,
+                "take": row.take_index,
+                "video_path": row.video_path,
+                "start": row.start,
+                "end": row.end,
+                "text": row.text,
+                "score": row.score,
+                "accuracy": row.accuracy,
+                "fluency": row.fluency,
+                "pronunciation": row.pronunciation,
+                "duration_ratio": row.duration_ratio,
+                "words": json.loads(row.words) if row.words else [],
+                "error": row.error,
+                "created_at": row.created_at.isoformat() if row.created_at else None
+            } for row in rows]
+        finally:
+            db.close()
+
+
+# 애플리케이션 전역 채점기 (작업 풀을 요청 간에 공유)
+_scorer: Optional[AttemptScorer] = None
+
+
+def get_attempt_scorer() -> AttemptScorer:
+    """전역 채점기 반환 (최초 호출 시 생성)"""
+    global _scorer
+    if _scorer is None:
+        _scorer = AttemptScorer()
+    return _scorer
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+File: audio.py
+Description: 오디오 추출, WAV 로드, 에너지 기반 무음 구간 분석 유틸리티
+"""
+
+import os
+import struct
+import subprocess
+from typing import List, Tuple
+
+import numpy as np
+
+from app.common.utils import setup_logger, ensure_dir_exists
+
+logger = setup_logger('audio_core', 'audio_core.log')
+
+# Whisper 입력 규격 (16kHz 모노)
+WHISPER_SAMPLE_RATE = 16000
+# RMS를 한 번에 계산하는 프레임 수 (메모리 맵 전체를 float32로 복사하지 않도록 나눠서 읽음)
+RMS_BLOCK_FRAMES = 8192
+
+
+def extract_audio(video_path: str, output_path: str, sample_rate: int = WHISPER_SAMPLE_RATE) -> str:
+    """
+    비디오에서 모노 16bit PCM WAV 오디오 추출
+
+    Args:
+        video_path: 비디오 파일 경로
+        output_path: 출력 WAV 파일 경로
+        sample_rate: 샘플링 레이트 (기본값: 16000)
+
+    Returns:
+        출력 WAV 파일 경로
+    """
+    ensure_dir_exists(os.path.dirname(output_path))
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-vn",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-c:a", "pcm_s16le",
+        output_path
+    ]
+    logger.debug(f"오디오 추출 명령: {' '.join(cmd)}")
+    subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return output_path
+
+
+def load_wav(wav_path: str) -> Tuple[np.ndarray, int]:
+    """
+    16bit PCM WAV 파일을 메모리 맵으로 로드
+
+    Args:
+        wav_path: WAV 파일 경로
+
+    Returns:
+        (int16 샘플 배열, 샘플링 레이트)
+    """
+    with open(wav_path, 'rb') as f:
+        riff, _size, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"WAV 파일이 아닙니다: {wav_path}")
+
+        sample_rate = 0
+        channels = 1
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"data 청크를 찾을 수 없습니다: {wav_path}")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if audio_format != 1 or bits != 16:
+                    raise ValueError(f"16bit PCM WAV만 지원합니다: {wav_path}")
+            elif chunk_id == b'data':
+                data_offset = f.tell()
+                # ffmpeg가 파이프 출력 등으로 크기를 기록하지 못한 경우 파일 끝까지 사용
+                file_size = os.fstat(f.fileno()).st_size
+                data_size = min(chunk_size, file_size - data_offset)
+                break
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    count = data_size // 2
+    samples = np.memmap(wav_path, dtype='<i2', mode='r', offset=data_offset, shape=(count,))
+    if channels > 1:
+        samples = samples[: count - count % channels].reshape(-1, channels)[:, 0]
+    return samples, sample_rate
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """int16 샘플을 [-1, 1] 범위의 float32로 변환"""
+    return np.asarray(samples, dtype=np.float32) / 32768.0
+
+
+def frame_rms(samples: np.ndarray,
+              sample_rate: int,
+              frame_ms: float = 30.0,
+              block_frames: int = RMS_BLOCK_FRAMES) -> np.ndarray:
+    """
+    프레임 단위 RMS 에너지 계산
+
+    block_frames개 프레임씩 나눠 변환하므로 긴 오디오의 메모리 맵도 블록 크기만큼만 메모리에 올린다.
+
+    Args:
+        samples: 오디오 샘플 배열
+        sample_rate: 샘플링 레이트
+        frame_ms: 프레임 길이 (밀리초)
+        block_frames: 한 번에 계산할 프레임 수
+
+    Returns:
+        프레임별 RMS 배열 (0~1 범위)
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame_len
+    rms = np.zeros(n_frames, dtype=np.float32)
+    block_frames = max(1, block_frames)
+    for first in range(0, n_frames, block_frames):
+        last = min(n_frames, first + block_frames)
+        frames = to_float32(samples[first * frame_len: last * frame_len]).reshape(last - first, frame_len)
+        rms[first:last] = np.sqrt(np.mean(frames * frames, axis=1))
+    return rms
+
+
+def find_silence_splits(samples: np.ndarray,
+                        sample_rate: int,
+                        target_chunk_s: float = 90.0,
+                        max_chunk_s: float = 150.0,
+                        min_silence_ms: float = 300.0,
+                        frame_ms: float = 30.0) -> List[Tuple[int, int]]:
+    """
+    무음 구간을 기준으로 오디오를 청크로 분할
+
+    목표 길이에 도달한 뒤 처음 만나는 무음 구간 중앙에서 자르고,
+    최대 길이까지 무음이 없으면 가장 조용한 프레임에서 자른다.
+
+    Args:
+        samples: 오디오 샘플 배열
+        sample_rate: 샘플링 레이트
+        target_chunk_s: 목표 청크 길이 (초)
+        max_chunk_s: 최대 청크 길이 (초)
+        min_silence_ms: 분할 지점으로 인정할 최소 무음 길이 (밀리초)
+        frame_ms: 에너지 분석 프레임 길이 (밀리초)
+
+    Returns:
+        (시작 샘플, 종료 샘플) 목록
+    """
+    total = len(samples)
+    if total == 0:
+        return []
+
+    rms = frame_rms(samples, sample_rate, frame_ms)
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    if len(rms) == 0:
+        return [(0, total)]
+
+    # 전체 에너지 분포에 상대적인 무음 임계값 (조용한 녹음, 배경음이 깔린 녹음 모두 대응)
+    threshold = max(min(float(np.percentile(rms, 10)) * 2.0, float(np.median(rms)) * 0.25), 1e-4)
+    silent = rms < threshold
+
+    # 연속된 무음 프레임 구간 찾기
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    min_frames = max(1, int(min_silence_ms / frame_ms))
+    keep = (run_ends - run_starts) >= min_frames
+    centers = ((run_starts[keep] + run_ends[keep]) // 2) * frame_len
+
+    target = int(target_chunk_s * sample_rate)
+    maximum = int(max_chunk_s * sample_rate)
+
+    chunks = []
+    start = 0
+    while total - start > maximum:
+        candidates = centers[(centers >= start + target) & (centers <= start + maximum)]
+        if len(candidates):
+            split = int(candidates[0])
+        else:
+            lo = (start + target) // frame_len
+            hi = min(len(rms), (start + maximum) // frame_len)
+            split = int(lo + np.argmin(rms[lo:hi])) * frame_len if hi > lo else start + maximum
+        chunks.append((start, split))
+        start = split
+    chunks.append((start, total))
+    return chunks
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+File: estimator.py
+Description: 실제 작업 소요 시간 기록을 바탕으로 호스트별 처리 속도를 학습하는 처리 시간 추정기
+"""
+
+import os
+import math
+import socket
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+
+from app.common.utils import setup_logger
+
+logger = setup_logger('estimator', 'estimator.log')
+
+# 기록이 없을 때 사용하는 사전(prior) 처리 속도: 작업 단위 1초당 소요 시간(초)
+# whisper 단위 = 오디오 1초, 영상 작업 단위 = 720p 기준 1초
+PRIOR_SECONDS_PER_UNIT = {
+    "whisper": {
+        "tiny": 1 / 32,
+        "base": 1 / 16,
+        "small": 1 / 6,
+        "medium": 1 / 2,
+        "large": 1.0
+    },
+    "repeat": 1.0,
+    "final": 0.5
+}
+
+# 사전값의 불확실성 (로그 표준편차, 약 0.5배~2배 범위)
+PRIOR_LOG_STD = 0.45
+
+# 사전값을 관측치 몇 개 분량으로 취급할지
+PRIOR_WEIGHT = 1
+
+# 사전 불확실성 자체의 신뢰도 (t 분포 자유도)
+PRIOR_DOF = 10
+
+# 90% 양측 t 분포 임계값 (자유도 -> 값)
+_T90 = [(1, 6.314), (2, 2.920), (3, 2.353), (4, 2.132), (5, 2.015), (6, 1.943),
+        (8, 1.860), (10, 1.812), (15, 1.753), (20, 1.725), (30, 1.697)]
+
+
+def _t_critical(dof: int) -> float:
+    """자유도에 해당하는 90% t 임계값 (표에 없으면 더 보수적인 값 사용)"""
+    for table_dof, value in _T90:
+        if dof <= table_dof:
+            return value
+    return 1.645
+
+
+def _pixel_factor(width: Optional[int], height: Optional[int]) -> float:
+    """720p 대비 픽셀 수 비율 (해상도를 모르면 1)"""
+    if not width or not height:
+        return 1.0
+    return (width * height) / (1280 * 720)
+
+
+class ProcessingTimeEstimator:
+    """작업 소요 시간 기록과 호스트별 처리 속도 추정 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        ProcessingTimeEstimator 초기화
+
+        Args:
+            config: 설정 (옵션) - history(학습에 사용할 최근 기록 수), host
+        """
+        self.config = config or {}
+        self.history = self.config.get("history", 50)
+        self.host = self.config.get("host") or socket.gethostname()
+        self._fits: Dict[Tuple[str, Optional[str]], Tuple[float, float, int]] = {}
+        self._lock = threading.Lock()
+        self._tables_ready = False
+
+    def _ensure_tables(self) -> None:
+        """기록 테이블 생성 (프로세스당 한 번)"""
+        if self._tables_ready:
+            return
+        from app.db import Base, engine, DB_PATH, JobTiming
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        Base.metadata.create_all(bind=engine, tables=[JobTiming.__table__])
+        self._tables_ready = True
+
+    @staticmethod
+    def work_units(job_type: str,
+                   work_seconds: float,
+                   width: Optional[int] = None,
+                   height: Optional[int] = None,
+                   repeat_count: Optional[int] = None) -> float:
+        """
+        작업량 계산
+
+        whisper는 오디오 길이, 반복 영상은 인코딩하는 구간 길이 합 × 해상도,
+        최종 영상은 다시 인코딩하는 전체 길이 × 해상도를 작업량으로 본다.
+        (반복 영상은 자막 모드별로 구간을 한 번씩만 인코딩하고 나머지 회차는 스트림 복사이므로
+        반복 횟수 자체는 영향이 작다)
+        """
+        if job_type == "whisper":
+            return max(work_seconds, 0.0)
+        return max(work_seconds, 0.0) * _pixel_factor(width, height)
+
+    def record(self,
+               job_type: str,
+               wall_seconds: float,
+               work_seconds: float,
+               variant: Optional[str] = None,
+               media_seconds: Optional[float] = None,
+               width: Optional[int] = None,
+               height: Optional[int] = None,
+               repeat_count: Optional[int] = None) -> None:
+        """
+        완료된 작업의 실제 소요 시간 기록 (기록 실패는 작업 결과에 영향을 주지 않음)
+
+        Args:
+            job_type: 작업 종류 ('whisper', 'repeat', 'final')
+            wall_seconds: 실제 소요 시간 (초)
+            work_seconds: 처리한 구간 길이 (초)
+            variant: 세부 종류 (whisper는 '모델/처리 방식')
+            media_seconds: 원본 미디어 길이 (초)
+            width: 영상 너비
+            height: 영상 높이
+            repeat_count: 반복 횟수
+        """
+        if wall_seconds <= 0 or work_seconds <= 0:
+            return
+
+        from app.db import SessionLocal, JobTiming
+        try:
+            self._ensure_tables()
+            db = SessionLocal()
+            try:
+                db.add(JobTiming(
+                    job_type=job_type,
+                    host=self.host,
+                    variant=variant,
+                    media_seconds=media_seconds,
+                    work_seconds=work_seconds,
+                    width=width,
+                    height=height,
+                    repeat_count=repeat_count,
+                    wall_seconds=wall_seconds
+                ))
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"작업 시간 기록 실패: {str(e)}")
+            return
+
+        with self._lock:
+            self._fits.pop((job_type, variant), None)
+        logger.info(f"작업 시간 기록: {job_type}/{variant}, 처리 구간 {work_seconds:.1f}초, 소요 {wall_seconds:.1f}초")
+
+    def _load_samples(self, job_type: str, variant: Optional[str]) -> List[Tuple[float, float]]:
+        """최근 기록을 (작업량, 소요 시간) 목록으로 조회"""
+        from app.db import SessionLocal, JobTiming
+        try:
+            self._ensure_tables()
+            db = SessionLocal()
+            try:
+                rows = (
+                    db.query(JobTiming)
+                    .filter(JobTiming.host == self.host,
+                            JobTiming.job_type == job_type,
+                            JobTiming.variant == variant)
+                    .order_by(JobTiming.id.desc())
+                    .limit(self.history)
+                    .all()
+                )
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"작업 시간 기록 조회 실패: {str(e)}")
+            return []
+
+        samples = []
+        for row in rows:
+            units = self.work_units(job_type, row.work_seconds, row.width, row.height, row.repeat_count)
+            if units > 0 and row.wall_seconds > 0:
+                samples.append((units, row.wall_seconds))
+        return samples
+
+    def _prior(self, job_type: str, variant: Optional[str]) -> float:
+        """사전 처리 속도 (작업 단위 1초당 소요 시간)"""
+        prior = PRIOR_SECONDS_PER_UNIT.get(job_type, 1.0)
+        if isinstance(prior, dict):
+            model = (variant or "").split("/")[0]
+            prior = prior.get(model, prior["tiny"])
+        return prior
+
+    def _fit(self, job_type: str, variant: Optional[str]) -> Tuple[float, float, int]:
+        """
+        로그 처리 속도의 평균/표준편차 추정
+
+        사전값을 PRIOR_WEIGHT개 관측치로 섞어(축소 추정) 기록이 적을 때도
+        값이 크게 흔들리지 않게 한다.
+
+        Returns:
+            (로그 평균, 로그 표준편차, 관측치 수)
+        """
+        key = (job_type, variant)
+        with self._lock:
+            cached = self._fits.get(key)
+        if cached is not None:
+            return cached
+
+        prior_mu = math.log(self._prior(job_type, variant))
+        logs = [math.log(wall / units) for units, wall in self._load_samples(job_type, variant)]
+        n = len(logs)
+
+        mu = (PRIOR_WEIGHT * prior_mu + sum(logs)) / (PRIOR_WEIGHT + n)
+        spread = sum((x - mu) ** 2 for x in logs)
+        std = math.sqrt((PRIOR_WEIGHT * PRIOR_LOG_STD ** 2 + spread) / (PRIOR_WEIGHT + n))
+
+        fit = (mu, std, n)
+        with self._lock:
+            self._fits[key] = fit
+        return fit
+
+    def estimate(self,
+                 job_type: str,
+                 work_seconds: float,
+                 variant: Optional[str] = None,
+                 width: Optional[int] = None,
+                 height: Optional[int] = None,
+                 repeat_count: Optional[int] = None) -> Dict[str, Any]:
+        """
+        처리 시간 예상 (90% 예측 구간 포함)
+
+        Args:
+            job_type: 작업 종류 ('whisper', 'repeat', 'final')
+            work_seconds: 처리할 구간 길이 (초)
+            variant: 세부 종류 (whisper는 '모델/처리 방식')
+            width: 영상 너비
+            height: 영상 높이
+            repeat_count: 반복 횟수
+
+        Returns:
+            estimated_seconds, lower_seconds, upper_seconds, confidence, samples, source
+        """
+        units = self.work_units(job_type, work_seconds, width, height, repeat_count)
+        mu, std, n = self._fit(job_type, variant)
+
+        # 새 작업 하나에 대한 예측 구간: 평균 추정 오차 + 작업 간 편차
+        margin = _t_critical(PRIOR_DOF + n) * std * math.sqrt(1 + 1 / (PRIOR_WEIGHT + n))
+        return {
+            "estimated_seconds": units * math.exp(mu),
+            "lower_seconds": units * math.exp(mu - margin),
+            "upper_seconds": units * math.exp(mu + margin),
+            "confidence": 0.9,
+            "samples": n,
+            "source": "calibrated" if n else "prior"
+        }
+
+
+# 애플리케이션 전역 추정기 인스턴스
+_estimator: Optional[ProcessingTimeEstimator] = None
+
+
+def get_estimator() -> ProcessingTimeEstimator:
+    """전역 처리 시간 추정기 반환 (최초 호출 시 생성)"""
+    global _estimator
+    if _estimator is None:
+        _estimator = ProcessingTimeEstimator()
+    return _estimator
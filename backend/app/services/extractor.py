@@ -121,6 +121,7 @@ class VideoExtractor:
                 '-o', str(output_dir_path / '%(title)s.%(ext)s'),
                 '--write-auto-sub',
                 '--write-sub',
+                '--write-info-json',  # 채널 등 메타데이터 (검색 패싯에서 사용)
                 '--sub-lang', sub_lang,
                 '--progress-template', '%(progress.downloaded_bytes)s/%(progress.total_bytes)s - %(progress.eta)s - %(progress.speed)s',
                 '--newline',
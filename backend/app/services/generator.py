@@ -9,12 +9,23 @@ import json
 import pysrt
 import asyncio
 import logging
+import time
 import tempfile
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union, Tuple
 
 from app.common.utils import setup_logger, ensure_dir_exists, get_temp_file
+from app.services.media_probe import probe_media, probe_media_async
+from app.services.estimator import get_estimator
+from app.services.proxy import ProxyGenerator
+from app.services.packager import FASTSTART_ARGS, keyframe_args
+from app.services.ass_subtitles import AssSubtitleBuilder, SUBTITLE_MODES, ass_filter, segment_cues
+from app.services.tts import get_tts_service
+from app.services.thumbnail_renderer import (
+    ThumbnailRenderer, decode_frame, decode_frames, parse_time_pos, build_contact_sheet
+)
 
 logger = setup_logger('generator_core', 'generator_core.log')
 
@@ -118,10 +129,12 @@ class RepeatVideoGenerator:
                 "bgcolor": "#00000080"
             },
             "tts": {
+                "enabled": False,
                 "provider": "edge-tts",
                 "voice": "en-US-GuyNeural",
                 "speed": 1.0,
-                "pitch": 0
+                "pitch": 0,
+                "subtitle_mode": "en"
             }
         }
         
@@ -156,7 +169,10 @@ class RepeatVideoGenerator:
         end_time: str, 
         output_path: str,
         repeat_count: int = None,
-        progress_callback = None
+        progress_callback = None,
+        preview: bool = False,
+        subtitle_mode: Optional[List[str]] = None,
+        tts_pass: Optional[bool] = None
     ) -> Tuple[bool, Dict[str, Any]]:
         """
         지정된 구간의 비디오를 여러 번 반복하는 영상 생성
@@ -168,12 +184,16 @@ class RepeatVideoGenerator:
             output_path: 출력 파일 경로
             repeat_count: 반복 횟수 (기본값: 설정에서 가져옴)
             progress_callback: 진행률 콜백 함수
+            preview: 미리보기 렌더링 여부 (프록시가 있으면 프록시에서 빠르게 생성)
+            subtitle_mode: 반복 회차별 자막 모드 (기본값: 설정의 subtitle_mode, 부족하면 마지막 값 반복)
+            tts_pass: 마지막에 원어민 음성(TTS) 회차 추가 여부 (기본값: 설정의 tts.enabled)
             
         Returns:
             (성공 여부, 결과 정보)
         """
         try:
             logger.info(f"반복 영상 생성 시작: {video_path}, {start_time} ~ {end_time}")
+            job_start = time.time()
             
             if repeat_count is None:
                 repeat_count = self.config.get("repeat_count", 3)
@@ -187,45 +207,86 @@ class RepeatVideoGenerator:
             output_dir = os.path.dirname(output_path)
             ensure_dir_exists(output_dir)
             
-            # 시간 형식 변환 (콤마를 점으로 변경)
-            start_time_fixed = start_time.replace(',', '.')
-            end_time_fixed = end_time.replace(',', '.')
-            
-            # 임시 파일 경로
-            temp_segment = get_temp_file(prefix="segment_", suffix=".mp4")
-            self.temp_files.append(temp_segment)
-            
-            # 반복할 구간 추출
-            extract_cmd = [
-                "ffmpeg", "-y",
-                "-i", video_path,
-                "-ss", start_time_fixed,
-                "-to", end_time_fixed,
-                "-c:v", "libx264", "-c:a", "aac",
-                "-preset", "fast",
-                temp_segment
-            ]
-            
-            logger.debug(f"구간 추출 명령: {' '.join(extract_cmd)}")
+            start_seconds = self._time_to_seconds(start_time)
+            duration = self._time_to_seconds(end_time) - start_seconds
+            
+            # 회차별 자막 모드 -> ASS 파일 (같은 자막이 나오는 회차는 한 번만 인코딩)
+            modes = list(subtitle_mode or self.config["subtitle_mode"]) or ["no_subtitle"]
+            builder = AssSubtitleBuilder(self.config["subtitle_style"])
+            invalid = [mode for mode in modes if mode not in SUBTITLE_MODES]
+            if invalid:
+                return False, {"error": f"지원하지 않는 자막 모드입니다: {', '.join(invalid)}"}
+            ass_by_mode = {}
+            for mode in dict.fromkeys(modes[:repeat_count]):
+                try:
+                    ass_by_mode[mode] = builder.build(video_path, start_seconds, start_seconds + duration, mode)
+                except Exception as e:
+                    # 자막을 읽지 못하면 해당 회차는 자막 없이 생성
+                    logger.warning(f"ASS 자막 생성 실패 ({mode}): {str(e)}")
+                    ass_by_mode[mode] = None
+            pass_ass = [ass_by_mode[modes[min(i, len(modes) - 1)]] for i in range(repeat_count)]
+            
+            # 반복할 구간 추출 (미리보기는 프록시가 있으면 프록시에서 가장 빠른 프리셋으로)
+            source_path = video_path
+            preset = "fast"
+            proxy_path = ProxyGenerator().proxy_path(video_path) if preview else None
+            if proxy_path:
+                source_path = proxy_path
+                preset = "ultrafast"
             
             if progress_callback:
                 await progress_callback(0.1, "반복할 구간 추출 중...")
             
-            # 셸 주입 공격 방지를 위해 쉘을 사용하지 않고 직접 실행
-            subprocess.run(extract_cmd, check=True, capture_output=True, text=True)
-            
-            if not os.path.exists(temp_segment) or os.path.getsize(temp_segment) == 0:
-                logger.error("추출된 구간 파일이 생성되지 않았습니다")
-                return False, {"error": "추출된 구간 파일이 생성되지 않았습니다"}
+            segments = {}
+            variants = list(dict.fromkeys(pass_ass))
+            for n, ass_path in enumerate(variants):
+                temp_segment = get_temp_file(prefix="segment_", suffix=".mp4")
+                self.temp_files.append(temp_segment)
+                
+                # 입력 앞 -ss로 탐색해 구간 시작이 0초가 되므로 ASS 시간과 그대로 맞음
+                extract_cmd = [
+                    "ffmpeg", "-y",
+                    "-ss", f"{start_seconds:.3f}",
+                    "-i", source_path,
+                    "-t", f"{duration:.3f}",
+                    *(["-vf", ass_filter(ass_path)] if ass_path else []),
+                    # 회차별 구간을 스트림 복사로 이어 붙이므로 픽셀 포맷을 고정
+                    "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                    "-c:a", "aac", "-ar", "48000", "-ac", "2",
+                    "-preset", preset,
+                    *keyframe_args(),
+                    temp_segment
+                ]
+                logger.debug(f"구간 추출 명령: {' '.join(extract_cmd)}")
+                
+                # 셸 주입 공격 방지를 위해 쉘을 사용하지 않고 직접 실행 (이벤트 루프를 막지 않도록 스레드에서)
+                await asyncio.to_thread(subprocess.run, extract_cmd, check=True, capture_output=True, text=True)
+                
+                if not os.path.exists(temp_segment) or os.path.getsize(temp_segment) == 0:
+                    logger.error("추출된 구간 파일이 생성되지 않았습니다")
+                    return False, {"error": "추출된 구간 파일이 생성되지 않았습니다"}
+                segments[ass_path] = temp_segment
+                
+                if progress_callback:
+                    await progress_callback(0.1 + 0.3 * (n + 1) / len(variants), f"구간 인코딩 중... ({n + 1}/{len(variants)})")
+            
+            # 원어민 음성 회차 (자막 문장을 TTS로 읽어 원본 음성을 대체)
+            tts_segment, tts_seconds = None, 0.0
+            if self.config["tts"].get("enabled", False) if tts_pass is None else tts_pass:
+                if progress_callback:
+                    await progress_callback(0.4, "원어민 음성 회차 생성 중...")
+                tts_segment, tts_seconds = await self._render_tts_pass(
+                    video_path, source_path, start_seconds, duration, preset, builder
+                )
             
             # 파일 목록 생성
             list_file = get_temp_file(prefix="filelist_", suffix=".txt")
             self.temp_files.append(list_file)
             
             with open(list_file, 'w') as f:
-                for _ in range(repeat_count):
+                for segment_path in [segments[ass_path] for ass_path in pass_ass] + ([tts_segment] if tts_segment else []):
                     # 경로에 작은따옴표가 아닌 큰따옴표 사용 (FFmpeg concat 요구사항)
-                    normalized_path = temp_segment.replace('\\', '/')
+                    normalized_path = segment_path.replace('\\', '/')
                     f.write(f"file '{normalized_path}'\n")
             
             if progress_callback:
@@ -238,11 +299,12 @@ class RepeatVideoGenerator:
                 "-safe", "0",
                 "-i", list_file,
                 "-c", "copy",
+                *FASTSTART_ARGS,
                 output_path
             ]
             
             logger.debug(f"영상 합치기 명령: {' '.join(concat_cmd)}")
-            subprocess.run(concat_cmd, check=True, capture_output=True, text=True)
+            await asyncio.to_thread(subprocess.run, concat_cmd, check=True, capture_output=True, text=True)
             
             if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
                 logger.error("최종 반복 영상 파일이 생성되지 않았습니다")
@@ -254,11 +316,28 @@ class RepeatVideoGenerator:
             if progress_callback:
                 await progress_callback(1.0, "반복 영상 생성 완료")
             
+            # ffprobe와 추정기 DB 기록은 블로킹이므로 스레드에서 실행
+            source_info = await probe_media_async(source_path)
+            await asyncio.to_thread(
+                get_estimator().record,
+                "repeat",
+                time.time() - job_start,
+                duration * len(variants) + tts_seconds,
+                variant="preview" if proxy_path else None,
+                media_seconds=source_info.get("duration"),
+                width=source_info.get("width"),
+                height=source_info.get("height"),
+                repeat_count=repeat_count
+            )
+            
             logger.info(f"반복 영상 생성 완료: {output_path}")
             return True, {
                 "output_path": output_path, 
                 "repeat_count": repeat_count,
-                "duration": self._get_video_duration(output_path)
+                "duration": await asyncio.to_thread(self._get_video_duration, output_path),
+                "used_proxy": bool(proxy_path),
+                "subtitle_modes": [modes[min(i, len(modes) - 1)] for i in range(repeat_count)],
+                "tts_pass": bool(tts_segment)
             }
             
         except Exception as e:
@@ -267,6 +346,93 @@ class RepeatVideoGenerator:
             self.cleanup()
             return False, {"error": str(e)}
     
+    async def _render_tts_pass(
+        self,
+        video_path: str,
+        source_path: str,
+        start_seconds: float,
+        duration: float,
+        preset: str,
+        builder: AssSubtitleBuilder
+    ) -> Tuple[Optional[str], float]:
+        """
+        자막 문장별 TTS 음성을 자막 시작 시각에 배치한 회차 구간 생성
+        
+        문장 음성은 TTS 캐시를 거치므로 같은 문장은 다시 합성하지 않는다.
+        음성이 구간보다 길면 마지막 프레임을 늘려 끝까지 재생한다.
+        
+        Returns:
+            (구간 파일 경로, 구간 길이) - 자막이나 원본 음성이 없으면 (None, 0)
+        """
+        cues = segment_cues(video_path, start_seconds, start_seconds + duration)
+        if not cues:
+            logger.info(f"원어민 음성 회차 생략 (구간 자막 없음): {video_path}")
+            return None, 0.0
+        if not (await probe_media_async(source_path)).get("has_audio"):
+            # 다른 회차에 오디오 트랙이 없으면 스트림 복사로 이어 붙일 수 없음
+            logger.info(f"원어민 음성 회차 생략 (원본 음성 없음): {video_path}")
+            return None, 0.0
+        
+        tts_config = self.config["tts"]
+        voice_paths = await get_tts_service().synthesize_many(
+            [text for _, _, text in cues],
+            voice=tts_config.get("voice"),
+            speed=tts_config.get("speed"),
+            pitch=tts_config.get("pitch"),
+            provider=tts_config.get("provider")
+        )
+        # 문장 음성 길이는 한 번의 스레드 호출로 모아서 확인 (캐시에 없으면 ffprobe 실행)
+        voice_durations = await asyncio.to_thread(
+            lambda: [probe_media(path).get("duration", 0.0) for path in voice_paths]
+        )
+        total = max([duration] + [
+            cue_start + voice_duration
+            for (cue_start, _, _), voice_duration in zip(cues, voice_durations)
+        ])
+        
+        ass_path = None
+        if tts_config.get("subtitle_mode", "en") != "no_subtitle":
+            try:
+                ass_path = builder.build(video_path, start_seconds, start_seconds + duration, tts_config.get("subtitle_mode", "en"))
+            except Exception as e:
+                logger.warning(f"원어민 음성 회차 자막 생성 실패: {str(e)}")
+        
+        video_filter = f"[0:v]trim=duration={duration:.3f},setpts=PTS-STARTPTS"
+        if ass_path:
+            video_filter += "," + ass_filter(ass_path)
+        if total > duration:
+            video_filter += f",tpad=stop_mode=clone:stop_duration={total - duration:.3f}"
+        filters = [video_filter + "[v]"]
+        for n, (cue_start, _, _) in enumerate(cues):
+            delay = int(round(cue_start * 1000))
+            filters.append(
+                f"[{n + 1}:a]aformat=sample_rates=48000:channel_layouts=stereo,adelay={delay}|{delay}[a{n}]"
+            )
+        labels = "".join(f"[a{n}]" for n in range(len(cues)))
+        if len(cues) > 1:
+            filters.append(f"{labels}amix=inputs={len(cues)}:normalize=0:dropout_transition=0,apad[a]")
+        else:
+            filters.append(f"{labels}apad[a]")
+        
+        temp_segment = get_temp_file(prefix="segment_tts_", suffix=".mp4")
+        self.temp_files.append(temp_segment)
+        cmd = ["ffmpeg", "-y", "-ss", f"{start_seconds:.3f}", "-i", source_path]
+        for path in voice_paths:
+            cmd += ["-i", path]
+        cmd += [
+            "-filter_complex", ";".join(filters),
+            "-map", "[v]", "-map", "[a]",
+            "-t", f"{total:.3f}",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-ar", "48000", "-ac", "2",
+            "-preset", preset,
+            *keyframe_args(),
+            temp_segment
+        ]
+        logger.debug(f"원어민 음성 회차 명령: {' '.join(cmd)}")
+        await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True, text=True)
+        return temp_segment, total
+    
     def _get_video_duration(self, video_path: str) -> float:
         """
         비디오 파일의 재생 시간을 초 단위로 반환
@@ -277,20 +443,7 @@ class RepeatVideoGenerator:
         Returns:
             재생 시간 (초)
         """
-        try:
-            cmd = [
-                "ffprobe", 
-                "-v", "error", 
-                "-show_entries", "format=duration", 
-                "-of", "json", 
-                video_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
-            return float(data['format']['duration'])
-        except Exception as e:
-            logger.error(f"비디오 재생 시간 확인 실패: {str(e)}")
-            return 0.0
+        return probe_media(video_path).get("duration", 0.0)
     
     def _time_to_seconds(self, time_str: str) -> float:
         """
@@ -409,6 +562,7 @@ class ThumbnailGenerator:
         
         # 기본 설정에 사용자 설정 병합
         self._merge_config()
+        self._renderer = None
         
     def _merge_config(self) -> None:
         """설정 병합"""
@@ -466,236 +620,148 @@ class ThumbnailGenerator:
                 
             template_config = self.config["templates"][template]
             
-            # 영어 텍스트용 폰트와 한글 텍스트용 폰트 설정
-            en_font = self.config['font']
-            ko_font = self.config.get('font_ko', self.config['font'])
+            # 배경용 축소 프레임 하나를 메모리로 디코딩한 뒤 프로세스 안에서 합성
+            renderer = self._get_renderer()
+            started = time.perf_counter()
+            frame = decode_frame(video_path, time_pos_fixed, *renderer.frame_size)
+            decoded = time.perf_counter()
             
-            # FFmpeg 명령 구성
-            temp_frame = get_temp_file(prefix="thumbnail_frame_", suffix=".jpg")
-            
-            # 프레임 추출
-            extract_cmd = [
-                "ffmpeg", "-y",
-                "-ss", time_pos_fixed,
-                "-i", video_path,
-                "-vframes", "1",
-                "-vf", f"scale={self.config['width']}:{self.config['height']}",
-                temp_frame
-            ]
+            image = renderer.render(frame, template_config, text=text, subtitle=subtitle)
+            image.convert("RGB").save(output_path, quality=92)
+            rendered = time.perf_counter()
             
-            logger.debug(f"프레임 추출 명령: {' '.join(extract_cmd)}")
-            subprocess.run(extract_cmd, check=True, capture_output=True, text=True)
+            if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+                logger.error("썸네일 파일이 생성되지 않았습니다")
+                return False, {"error": "썸네일 파일이 생성되지 않았습니다"}
             
-            if not os.path.exists(temp_frame) or os.path.getsize(temp_frame) == 0:
-                logger.error("프레임 추출에 실패했습니다")
-                return False, {"error": "프레임 추출에 실패했습니다"}
+            logger.info(
+                f"썸네일 생성 완료: {output_path} "
+                f"(디코딩 {(decoded - started) * 1000:.0f}ms, 합성 {(rendered - decoded) * 1000:.0f}ms)"
+            )
+            return True, {
+                "output_path": output_path,
+                "decode_ms": (decoded - started) * 1000,
+                "render_ms": (rendered - decoded) * 1000
+            }
             
-            # 임시 파일에 복합 필터 구성
-            filter_file = get_temp_file(prefix="filter_", suffix=".txt")
+        except Exception as e:
+            logger.error(f"썸네일 생성 실패: {str(e)}", exc_info=True)
+            return False, {"error": str(e)}
+    
+    def generate_thumbnails_batch(
+        self,
+        video_path: str,
+        items: List[Dict[str, Any]],
+        output_dir: str,
+        name_prefix: Optional[str] = None,
+        contact_sheet: bool = True,
+        workers: Optional[int] = None
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """
+        한 비디오에서 여러 문장의 썸네일을 한 번의 디코딩 패스로 생성
+        
+        Args:
+            video_path: 비디오 파일 경로
+            items: 썸네일 목록 - 각 항목은 time_pos, text, subtitle, template, output_name(옵션)
+            output_dir: 출력 디렉토리
+            name_prefix: 출력 파일 이름 접두사 (기본값: 비디오 파일 이름)
+            contact_sheet: 스크럽 미리보기용 컨택트 시트(스프라이트) 생성 여부
+            workers: 합성 스레드 수 (기본값: CPU 코어 수)
             
-            # 기본 필터: 배경에 약간의 어두움 추가
-            filter_complex = [
-                f"[0:v]format=rgb24,boxblur=20,setsar=1[bg]",
-                f"[bg]colorlevels=rimax=0.7:gimax=0.7:bimax=0.7[darken]"
-            ]
+        Returns:
+            (성공 여부, 매니페스트)
+        """
+        try:
+            logger.info(f"썸네일 일괄 생성 시작: {video_path}, {len(items)}개")
             
-            # 템플릿에 따른 배경 필터 추가
-            bg_color = template_config.get('background_color', self.config['background_color'])
+            if not os.path.exists(video_path):
+                logger.error(f"입력 파일이 존재하지 않습니다: {video_path}")
+                return False, {"error": f"입력 파일이 존재하지 않습니다: {video_path}"}
+            if not items:
+                return False, {"error": "생성할 썸네일이 없습니다"}
             
-            # 그라데이션 배경 처리
-            if template_config.get('gradient', False):
-                gradient_end = template_config.get('gradient_end', '#000000')
-                filter_complex.append(
-                    f"color=c={bg_color}:s={self.config['width']}x{self.config['height']},"
-                    f"gradients=s={self.config['width']}x{self.config['height']}:c0={bg_color}:c1={gradient_end}:"
-                    f"x0=0:y0=0:x1={self.config['width']}:y1={self.config['height']}[bg_gradient]"
-                )
-                filter_complex.append(f"[darken][bg_gradient]overlay=format=auto:alpha=0.9[base]")
-            else:
-                # 단색 배경
-                filter_complex.append(
-                    f"color=c={bg_color}:s={self.config['width']}x{self.config['height']}[bg_color]"
-                )
-                filter_complex.append(f"[darken][bg_color]overlay=format=auto:alpha=0.85[base]")
-            
-            # 텍스트와 자막 추가
-            if text:
-                # 텍스트 위치 계산
-                text_pos = template_config.get('text_position', [0.5, 0.4])
-                text_x = f"(w-text_w)*{text_pos[0]}"
-                text_y = f"(h-text_h)*{text_pos[0]}"
-                
-                # 폰트 크기
-                font_size = template_config.get('font_size', self.config['font_size'])
-                
-                # 텍스트 색상
-                text_color = template_config.get('text_color', self.config['text_color'])
-                
-                # 한글 감지 및 적절한 폰트 선택 (간단한 한글 감지)
-                has_korean = any('\uAC00' <= char <= '\uD7A3' for char in text)
-                font_path = ko_font if has_korean else en_font
-                
-                # 텍스트에서 특수 문자 이스케이프
-                escaped_text = text.replace("'", "\\'").replace(":", "\\:")
-                
-                # 그림자 추가
-                if self.config["shadow"]["enabled"]:
-                    shadow_offset_x = self.config["shadow"]["offset"][0]
-                    shadow_offset_y = self.config["shadow"]["offset"][1]
-                    shadow_color = self.config["shadow"]["color"]
-                    
-                    filter_complex.append(
-                        f"[base]drawtext=text='{escaped_text}':fontsize={font_size}:"
-                        f"fontcolor={shadow_color}:fontfile='{font_path}':"
-                        f"x={text_x}+{shadow_offset_x}:y={text_y}+{shadow_offset_y}[shadow]"
-                    )
-                    
-                    # 상자 배경이 있는 경우
-                    if template_config.get('box', {}).get('enabled', False):
-                        box_color = template_config['box']['color']
-                        box_padding = template_config['box']['padding']
-                        box_radius = template_config['box'].get('radius', 0)
-                        
-                        filter_complex.append(
-                            f"[shadow]drawbox=x={text_x}-{box_padding}-text_w/2:"
-                            f"y={text_y}-{box_padding}-text_h/2:"
-                            f"w=text_w+{box_padding*2}:h=text_h+{box_padding*2}:"
-                            f"color={box_color}:t=fill:r={box_radius}[box_bg]"
-                        )
-                        filter_complex.append(
-                            f"[box_bg]drawtext=text='{escaped_text}':fontsize={font_size}:"
-                            f"fontcolor={text_color}:fontfile='{font_path}':"
-                            f"x={text_x}:y={text_y}[main_text]"
-                        )
-                    else:
-                        filter_complex.append(
-                            f"[shadow]drawtext=text='{escaped_text}':fontsize={font_size}:"
-                            f"fontcolor={text_color}:fontfile='{font_path}':"
-                            f"x={text_x}:y={text_y}[main_text]"
-                        )
-                else:
-                    # 상자 배경이 있는 경우
-                    if template_config.get('box', {}).get('enabled', False):
-                        box_color = template_config['box']['color']
-                        box_padding = template_config['box']['padding']
-                        box_radius = template_config['box'].get('radius', 0)
-                        
-                        filter_complex.append(
-                            f"[base]drawbox=x={text_x}-{box_padding}-text_w/2:"
-                            f"y={text_y}-{box_padding}-text_h/2:"
-                            f"w=text_w+{box_padding*2}:h=text_h+{box_padding*2}:"
-                            f"color={box_color}:t=fill:r={box_radius}[box_bg]"
-                        )
-                        filter_complex.append(
-                            f"[box_bg]drawtext=text='{escaped_text}':fontsize={font_size}:"
-                            f"fontcolor={text_color}:fontfile='{font_path}':"
-                            f"x={text_x}:y={text_y}[main_text]"
-                        )
-                    else:
-                        filter_complex.append(
-                            f"[base]drawtext=text='{escaped_text}':fontsize={font_size}:"
-                            f"fontcolor={text_color}:fontfile='{font_path}':"
-                            f"x={text_x}:y={text_y}[main_text]"
-                        )
-                
-                last_filter = "main_text"
-            else:
-                last_filter = "base"
-            
-            # 자막 텍스트 추가
-            if subtitle:
-                # 자막 폰트 크기
-                subtitle_size = template_config.get('subtitle_size', self.config['subtitle_size'])
-                
-                # 자막 색상
-                subtitle_color = template_config.get('subtitle_color', self.config['subtitle_color'])
-                
-                # 자막 위치 (하단)
-                subtitle_y = f"h-th-{self.config['margin']}"
-                
-                # 한글 감지 및 적절한 폰트 선택
-                has_korean_sub = any('\uAC00' <= char <= '\uD7A3' for char in subtitle)
-                sub_font_path = ko_font if has_korean_sub else en_font
-                
-                # 자막에서 특수 문자 이스케이프
-                escaped_subtitle = subtitle.replace("'", "\\'").replace(":", "\\:")
-                
-                # 테두리가 있는 경우
-                if template_config.get('border', {}).get('enabled', False):
-                    border_color = template_config['border']['color']
-                    border_width = template_config['border']['width']
-                    
-                    filter_complex.append(
-                        f"[{last_filter}]drawtext=text='{escaped_subtitle}':fontsize={subtitle_size}:"
-                        f"bordercolor={border_color}:borderw={border_width}:"
-                        f"fontcolor={subtitle_color}:fontfile='{sub_font_path}':"
-                        f"x=(w-text_w)/2:y={subtitle_y}[final]"
-                    )
-                else:
-                    # 그림자 처리
-                    if self.config["shadow"]["enabled"]:
-                        shadow_offset_x = self.config["shadow"]["offset"][0]
-                        shadow_offset_y = self.config["shadow"]["offset"][1]
-                        shadow_color = self.config["shadow"]["color"]
-                        
-                        filter_complex.append(
-                            f"[{last_filter}]drawtext=text='{escaped_subtitle}':fontsize={subtitle_size}:"
-                            f"fontcolor={shadow_color}:fontfile='{sub_font_path}':"
-                            f"x=(w-text_w)/2+{shadow_offset_x}:y={subtitle_y}+{shadow_offset_y}[sub_shadow]"
-                        )
-                        
-                        filter_complex.append(
-                            f"[sub_shadow]drawtext=text='{escaped_subtitle}':fontsize={subtitle_size}:"
-                            f"fontcolor={subtitle_color}:fontfile='{sub_font_path}':"
-                            f"x=(w-text_w)/2:y={subtitle_y}[final]"
-                        )
-                    else:
-                        filter_complex.append(
-                            f"[{last_filter}]drawtext=text='{escaped_subtitle}':fontsize={subtitle_size}:"
-                            f"fontcolor={subtitle_color}:fontfile='{sub_font_path}':"
-                            f"x=(w-text_w)/2:y={subtitle_y}[final]"
-                        )
+            ensure_dir_exists(output_dir)
+            prefix = name_prefix or Path(video_path).stem
+            renderer = self._get_renderer()
+            
+            # 모든 프레임을 정렬된 탐색으로 한 번에 디코딩
+            started = time.perf_counter()
+            times = [parse_time_pos(item["time_pos"]) for item in items]
+            frames = decode_frames(video_path, times, *renderer.frame_size)
+            decoded = time.perf_counter()
+            
+            def render_one(index: int) -> Dict[str, Any]:
+                item = items[index]
+                template = item.get("template") or "basic"
+                if template not in self.config["templates"]:
+                    template = "basic"
+                output_name = item.get("output_name") or f"{prefix}_thumb_{index + 1:03d}.jpg"
+                output_path = os.path.join(output_dir, output_name)
                 
-                last_filter = "final"
-            
-            # 필터 파일 작성
-            with open(filter_file, 'w') as f:
-                f.write(';\n'.join(filter_complex))
-            
-            # 최종 이미지 생성
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", temp_frame,
-                "-filter_complex_script", filter_file,
-                "-map", f"[{last_filter}]",
-                "-frames:v", "1",
-                output_path
-            ]
-            
-            logger.debug(f"썸네일 생성 명령: {' '.join(cmd)}")
+                image = renderer.render(
+                    frames[index],
+                    self.config["templates"][template],
+                    text=item.get("text"),
+                    subtitle=item.get("subtitle")
+                )
+                image.convert("RGB").save(output_path, quality=92)
+                return {
+                    "index": index,
+                    "time_pos": item["time_pos"],
+                    "time": times[index],
+                    "template": template,
+                    "text": item.get("text"),
+                    "subtitle": item.get("subtitle"),
+                    "output_path": output_path
+                }
             
-            # 셸 주입 공격 방지를 위해 쉘을 사용하지 않고 직접 실행
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            # 합성과 JPEG 인코딩은 Pillow/NumPy가 GIL을 놓는 구간이 대부분이라 스레드로 병렬 처리
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+                thumbnails = list(pool.map(render_one, range(len(items))))
+            rendered = time.perf_counter()
+            
+            manifest = {
+                "video_path": video_path,
+                "count": len(thumbnails),
+                "thumbnails": thumbnails,
+                "decode_ms": (decoded - started) * 1000,
+                "render_ms": (rendered - decoded) * 1000
+            }
             
-            # 임시 파일 정리
-            for temp_file in [temp_frame, filter_file]:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
+            if contact_sheet:
+                # 시간순으로 축소 원본 프레임을 배치 (플레이어 스크럽 미리보기용)
+                order = sorted(range(len(items)), key=lambda i: times[i])
+                sheet, boxes = build_contact_sheet([frames[i] for i in order])
+                sheet_path = os.path.join(output_dir, f"{prefix}_contact_sheet.jpg")
+                sheet.save(sheet_path, quality=85)
+                manifest["contact_sheet"] = {
+                    "path": sheet_path,
+                    "tiles": [
+                        {"index": i, "time": times[i], "x": x, "y": y, "w": w, "h": h}
+                        for i, (x, y, w, h) in zip(order, boxes)
+                    ]
+                }
             
-            if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-                logger.error("썸네일 파일이 생성되지 않았습니다")
-                return False, {"error": "썸네일 파일이 생성되지 않았습니다"}
+            manifest_path = os.path.join(output_dir, f"{prefix}_thumbnails.json")
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            manifest["manifest_path"] = manifest_path
             
-            logger.info(f"썸네일 생성 완료: {output_path}")
-            return True, {"output_path": output_path}
+            logger.info(
+                f"썸네일 일괄 생성 완료: {len(thumbnails)}개 "
+                f"(디코딩 {manifest['decode_ms']:.0f}ms, 합성 {manifest['render_ms']:.0f}ms)"
+            )
+            return True, manifest
             
         except Exception as e:
-            logger.error(f"썸네일 생성 실패: {str(e)}", exc_info=True)
-            # 임시 파일 정리
-            for temp_file in [temp_frame, filter_file]:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
+            logger.error(f"썸네일 일괄 생성 실패: {str(e)}", exc_info=True)
             return False, {"error": str(e)}
+    
+    def _get_renderer(self) -> ThumbnailRenderer:
+        """설정이 반영된 합성기 반환 (폰트/배경 캐시는 모듈 단위로 공유됨)"""
+        if self._renderer is None:
+            self._renderer = ThumbnailRenderer(self.config)
+        return self._renderer
 
 
 # ClipGenerator 클래스 추가
@@ -729,6 +795,7 @@ class ClipGenerator:
                 "-to", str(end),
                 "-c:v", "copy",
                 "-c:a", "copy",
+                *FASTSTART_ARGS,
                 output_path
             ]
             subprocess.run(command, check=True)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+File: media_probe.py
+Description: ffprobe 기반 미디어 메타데이터 서비스 (메모리 + SQLite 캐시, 디렉토리 일괄 예열)
+"""
+
+import os
+import json
+import asyncio
+import threading
+import subprocess
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, List, Iterable
+
+from app.common.utils import setup_logger
+
+logger = setup_logger('media_probe', 'media_probe.log')
+
+# 캐시에 저장하는 메타데이터 필드
+METADATA_FIELDS = [
+    "duration", "bit_rate", "width", "height", "fps",
+    "video_codec", "audio_codec", "has_audio", "keyframe_interval"
+]
+
+# 예열 대상 확장자
+MEDIA_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mov", ".m4a", ".mp3", ".wav")
+
+# 키프레임 간격 계산에 사용할 앞부분 길이 (초)
+KEYFRAME_SCAN_SECONDS = 30
+
+# (실제 경로, 파일 크기, 수정 시각) -> 메타데이터
+_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 512
+_tables_ready = False
+
+
+def _empty_metadata() -> Dict[str, Any]:
+    """조회 실패 시 반환할 빈 메타데이터"""
+    return {"duration": 0.0, "width": 0, "height": 0, "fps": 0.0, "has_audio": False}
+
+
+def _parse_rate(rate: Optional[str]) -> float:
+    """ffprobe 프레임 레이트 문자열('30000/1001')을 실수로 변환"""
+    if not rate:
+        return 0.0
+    try:
+        num, _, den = rate.partition('/')
+        return float(num) / float(den or 1) if float(den or 1) else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _file_key(path: str) -> Optional[Tuple[str, int, int]]:
+    """캐시 키 (실제 경로, 크기, 수정 시각 ns), 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.realpath(path), stat.st_size, stat.st_mtime_ns
+
+
+def _run_ffprobe(path: str) -> Dict[str, Any]:
+    """
+    ffprobe를 한 번 실행해 포맷/스트림 정보와 앞부분 패킷의 키프레임 간격을 요약
+
+    Args:
+        path: 미디어 파일 경로
+
+    Returns:
+        METADATA_FIELDS 메타데이터 사전
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_format",
+        "-show_streams",
+        "-show_entries", "packet=stream_index,pts_time,flags",
+        "-read_intervals", f"%+{KEYFRAME_SCAN_SECONDS}",
+        "-of", "json",
+        path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout or "{}")
+
+    fmt = data.get("format", {})
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+
+    # 비디오 키프레임 패킷 간 평균 간격
+    keyframe_interval = None
+    if video:
+        keyframes = sorted(
+            float(p["pts_time"]) for p in data.get("packets", [])
+            if p.get("stream_index") == video.get("index")
+            and "K" in p.get("flags", "")
+            and p.get("pts_time") not in (None, "N/A")
+        )
+        if len(keyframes) >= 2:
+            keyframe_interval = (keyframes[-1] - keyframes[0]) / (len(keyframes) - 1)
+
+    return {
+        "duration": float(fmt.get("duration") or 0.0),
+        "bit_rate": int(fmt.get("bit_rate") or 0),
+        "width": int(video.get("width") or 0),
+        "height": int(video.get("height") or 0),
+        "fps": _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate")),
+        "video_codec": video.get("codec_name"),
+        "audio_codec": audio.get("codec_name"),
+        "has_audio": bool(audio),
+        "keyframe_interval": keyframe_interval
+    }
+
+
+def _ensure_tables() -> None:
+    """메타데이터 캐시 테이블 생성 (프로세스당 한 번)"""
+    global _tables_ready
+    if _tables_ready:
+        return
+    from app.db import Base, engine, DB_PATH, MediaMetadata
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    Base.metadata.create_all(bind=engine, tables=[MediaMetadata.__table__])
+    _tables_ready = True
+
+
+def _remember(key: Tuple[str, int, int], info: Dict[str, Any]) -> None:
+    """메모리 LRU 캐시에 저장"""
+    with _cache_lock:
+        _cache[key] = info
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _load_rows(paths: Iterable[str]) -> Dict[str, Any]:
+    """SQLite 캐시에서 경로별 행 조회"""
+    from app.db import SessionLocal, MediaMetadata
+    paths = list(paths)
+    if not paths:
+        return {}
+    _ensure_tables()
+    db = SessionLocal()
+    try:
+        rows = {}
+        # SQLite 바인드 변수 개수 제한을 피하기 위해 나눠서 조회
+        for i in range(0, len(paths), 500):
+            for row in db.query(MediaMetadata).filter(MediaMetadata.path.in_(paths[i:i + 500])):
+                rows[row.path] = row
+        return rows
+    finally:
+        db.close()
+
+
+def _store_rows(entries: List[Tuple[Tuple[str, int, int], Dict[str, Any]]]) -> None:
+    """프로브 결과를 SQLite 캐시에 한 트랜잭션으로 저장"""
+    from app.db import SessionLocal, MediaMetadata
+    if not entries:
+        return
+    _ensure_tables()
+    db = SessionLocal()
+    try:
+        for (path, size, mtime_ns), info in entries:
+            db.merge(MediaMetadata(
+                path=path,
+                size=size,
+                mtime_ns=mtime_ns,
+                **{field: info.get(field) for field in METADATA_FIELDS}
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _cached(key: Tuple[str, int, int], row: Any = None) -> Optional[Dict[str, Any]]:
+    """메모리 캐시 또는 (크기/수정 시각이 같은) DB 행에서 메타데이터 반환"""
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return dict(cached)
+
+    if row is not None and row.size == key[1] and row.mtime_ns == key[2]:
+        info = {field: getattr(row, field) for field in METADATA_FIELDS}
+        info["size"] = row.size
+        _remember(key, info)
+        return dict(info)
+    return None
+
+
+def probe_media(path: str) -> Dict[str, Any]:
+    """
+    미디어 메타데이터 조회
+
+    메모리 캐시 → SQLite 캐시 순으로 확인하고, 파일 크기나 수정 시각이 바뀐 경우에만
+    ffprobe를 다시 실행한다.
+
+    Args:
+        path: 미디어 파일 경로
+
+    Returns:
+        메타데이터 사전 (duration, bit_rate, width, height, fps, video_codec, audio_codec,
+        has_audio, keyframe_interval, size), 조회 실패 시 duration=0인 빈 정보
+    """
+    key = _file_key(path)
+    if key is None:
+        logger.error(f"미디어 파일 확인 실패: {path}")
+        return _empty_metadata()
+
+    info = _cached(key)
+    if info is not None:
+        return info
+
+    try:
+        info = _cached(key, _load_rows([key[0]]).get(key[0]))
+        if info is not None:
+            return info
+    except Exception as e:
+        logger.warning(f"메타데이터 캐시 조회 실패: {str(e)}")
+
+    try:
+        info = _run_ffprobe(path)
+    except Exception as e:
+        logger.error(f"ffprobe 실행 실패: {path} ({str(e)})")
+        return _empty_metadata()
+
+    info["size"] = key[1]
+    _remember(key, info)
+    try:
+        _store_rows([(key, info)])
+    except Exception as e:
+        logger.warning(f"메타데이터 캐시 저장 실패: {str(e)}")
+    return dict(info)
+
+
+async def probe_media_async(path: str) -> Dict[str, Any]:
+    """probe_media의 비동기 버전 (ffprobe를 스레드에서 실행)"""
+    return await asyncio.to_thread(probe_media, path)
+
+
+def warm_up_directory(directory: str,
+                      extensions: Tuple[str, ...] = MEDIA_EXTENSIONS,
+                      workers: int = 4) -> Dict[str, int]:
+    """
+    디렉토리의 모든 미디어 파일 메타데이터를 미리 캐시
+
+    DB 캐시는 한 번에 조회하고, 새로 추가되었거나 변경된 파일만 병렬로 ffprobe를 실행한 뒤
+    결과를 한 트랜잭션으로 저장한다.
+
+    Args:
+        directory: 미디어 디렉토리 경로
+        extensions: 대상 확장자
+        workers: 동시에 실행할 ffprobe 수
+
+    Returns:
+        {"total": 대상 파일 수, "cached": 캐시 사용 수, "probed": 새로 조회한 수, "failed": 실패 수}
+    """
+    root = Path(directory)
+    if not root.exists():
+        return {"total": 0, "cached": 0, "probed": 0, "failed": 0}
+
+    keys = []
+    for file_path in root.rglob("*"):
+        if file_path.suffix.lower() in extensions and file_path.is_file():
+            key = _file_key(str(file_path))
+            if key is not None:
+                keys.append(key)
+
+    rows = _load_rows(key[0] for key in keys)
+    stale = [key for key in keys if _cached(key, rows.get(key[0])) is None]
+
+    def probe(key):
+        try:
+            return key, _run_ffprobe(key[0])
+        except Exception as e:
+            logger.warning(f"예열 중 ffprobe 실패: {key[0]} ({str(e)})")
+            return key, None
+
+    results = []
+    if stale:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for key, info in pool.map(probe, stale):
+                if info is not None:
+                    info["size"] = key[1]
+                    _remember(key, info)
+                    results.append((key, info))
+        _store_rows(results)
+
+    summary = {
+        "total": len(keys),
+        "cached": len(keys) - len(stale),
+        "probed": len(results),
+        "failed": len(stale) - len(results)
+    }
+    logger.info(f"메타데이터 예열 완료: {directory} {summary}")
+    return summary
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+File: packager.py
+Description: 생성된 mp4 결과물을 HLS(fMP4 세그먼트 + 재생 목록)로 패키징
+"""
+
+import os
+import glob
+import json
+import shutil
+import hashlib
+import subprocess
+from pathlib import Path
+from urllib.parse import quote
+from typing import Dict, Any, Optional, List
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+
+logger = setup_logger('packager', 'packager.log')
+
+# HLS 파일을 제공하는 API 경로
+HLS_URL_PREFIX = "/api/youtube/hls"
+
+PLAYLIST_NAME = "index.m3u8"
+INIT_NAME = "init.mp4"
+MANIFEST_NAME = "manifest.json"
+
+# mp4 결과물에 항상 붙이는 옵션 (moov 아톰을 파일 앞으로 옮겨 다운로드 완료 전 재생 시작)
+FASTSTART_ARGS = ["-movflags", "+faststart"]
+
+
+def keyframe_args(segment_seconds: Optional[float] = None) -> List[str]:
+    """
+    HLS 세그먼트 경계마다 키프레임을 강제하는 인코딩 옵션
+
+    인코딩 단계에서 키프레임을 맞춰 두면 패키징은 재인코딩 없이 스트림 복사로 끝나고
+    첫 세그먼트가 짧아 재생이 빨리 시작된다.
+    """
+    seconds = segment_seconds or settings.HLS_SEGMENT_SECONDS
+    return ["-force_key_frames", f"expr:gte(t,n_forced*{seconds})"]
+
+
+class HLSPackager:
+    """mp4 파일의 HLS(fMP4) 패키징 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        HLSPackager 초기화
+
+        Args:
+            config: 설정 (옵션) - segment_seconds, output_dir
+        """
+        self.config = config or {}
+        self.segment_seconds = self.config.get("segment_seconds", settings.HLS_SEGMENT_SECONDS)
+        self.output_dir = Path(self.config.get("output_dir", settings.HLS_DIR))
+
+    def _target_dir(self, video_path: str) -> Path:
+        """원본 파일/세그먼트 길이가 바뀌면 달라지는 버전별 출력 디렉토리"""
+        stat = os.stat(video_path)
+        raw = f"{os.path.realpath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.segment_seconds}"
+        key = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+        return self.output_dir / f"{Path(video_path).stem}-{key}"
+
+    @staticmethod
+    def playlist_url(target_dir: Path) -> str:
+        """재생 목록 URL"""
+        return f"{HLS_URL_PREFIX}/{quote(target_dir.name)}/{PLAYLIST_NAME}"
+
+    def find(self, video_path: str) -> Optional[Dict[str, Any]]:
+        """
+        원본에 해당하는 최신 패키지 매니페스트 (없으면 None)
+        """
+        try:
+            manifest_path = self._target_dir(video_path) / MANIFEST_NAME
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def package(self, video_path: str, force: bool = False) -> Dict[str, Any]:
+        """
+        mp4를 HLS fMP4 세그먼트와 VOD 재생 목록으로 패키징 (스트림 복사)
+
+        Args:
+            video_path: mp4 파일 경로
+            force: 이미 최신 패키지가 있어도 다시 생성
+
+        Returns:
+            매니페스트 (playlist_path, playlist_url, segments, segment_seconds)
+        """
+        if not force:
+            existing = self.find(video_path)
+            if existing is not None:
+                return existing
+
+        target = self._target_dir(video_path)
+        tmp_dir = target.with_name(target.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        ensure_dir_exists(str(tmp_dir))
+
+        cmd = [
+            "ffmpeg", "-v", "error", "-y",
+            "-i", video_path,
+            "-map", "0:v:0?", "-map", "0:a:0?",
+            "-c", "copy",
+            "-f", "hls",
+            "-hls_time", str(self.segment_seconds),
+            "-hls_playlist_type", "vod",
+            "-hls_segment_type", "fmp4",
+            "-hls_fmp4_init_filename", INIT_NAME,
+            "-hls_flags", "independent_segments",
+            "-hls_segment_filename", str(tmp_dir / "seg_%04d.m4s"),
+            str(tmp_dir / PLAYLIST_NAME)
+        ]
+        logger.debug(f"HLS 패키징 명령: {' '.join(cmd)}")
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        manifest = {
+            "video_path": os.path.realpath(video_path),
+            "playlist_path": str(target / PLAYLIST_NAME),
+            "playlist_url": self.playlist_url(target),
+            "segments": len(list(tmp_dir.glob("seg_*.m4s"))),
+            "segment_seconds": self.segment_seconds
+        }
+        with open(tmp_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp_dir, target)
+        self._remove_old_versions(Path(video_path).stem, target.name, manifest["video_path"])
+
+        logger.info(f"HLS 패키징 완료: {video_path} ({manifest['segments']}개 세그먼트)")
+        return manifest
+
+    def _remove_old_versions(self, stem: str, current: str, real_path: str) -> None:
+        """같은 원본의 이전 버전 패키지 삭제"""
+        for old_dir in self.output_dir.glob(f"{glob.escape(stem)}-*"):
+            if old_dir.name == current or not old_dir.is_dir():
+                continue
+            try:
+                with open(old_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                    if json.load(f).get("video_path") != real_path:
+                        continue
+            except (OSError, ValueError):
+                continue
+            shutil.rmtree(old_dir, ignore_errors=True)
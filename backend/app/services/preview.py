@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+File: preview.py
+Description: 플레이어 스크럽 미리보기용 스프라이트 시트와 WebVTT 썸네일 트랙 생성
+"""
+
+import os
+import glob
+import json
+import math
+import shutil
+import hashlib
+import subprocess
+from pathlib import Path
+from urllib.parse import quote
+from typing import Dict, Any, Optional, List
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+from app.services.media_probe import probe_media
+
+logger = setup_logger('preview', 'preview.log')
+
+# 스프라이트 파일을 제공하는 API 경로 (WebVTT 큐에 그대로 기록됨)
+SPRITE_URL_PREFIX = "/api/youtube/preview/sprites"
+
+# 미리보기를 만드는 비디오 확장자
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".mov")
+
+VTT_NAME = "thumbnails.vtt"
+MANIFEST_NAME = "manifest.json"
+
+
+def _format_vtt_timestamp(seconds: float) -> str:
+    """초를 WebVTT 타임스탬프(HH:MM:SS.mmm)로 변환"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
+
+class SpritePreviewGenerator:
+    """클립별 스크럽 미리보기 스프라이트 시트/WebVTT 트랙 생성 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        SpritePreviewGenerator 초기화
+
+        Args:
+            config: 설정 (옵션) - interval, tile_width, columns, rows, max_frames, output_dir
+        """
+        self.config = config or {}
+        self.interval = self.config.get("interval", settings.PREVIEW_INTERVAL_SECONDS)
+        self.tile_width = self.config.get("tile_width", 160)
+        self.columns = self.config.get("columns", 10)
+        self.rows = self.config.get("rows", 10)
+        self.max_frames = self.config.get("max_frames", 600)
+        self.output_dir = Path(self.config.get("output_dir", settings.PREVIEW_DIR))
+
+    def _version_key(self, video_path: str, interval: float) -> str:
+        """원본 파일/생성 옵션이 바뀌면 달라지는 버전 키 (스프라이트 URL을 영구 캐시할 수 있게 함)"""
+        stat = os.stat(video_path)
+        raw = f"{os.path.realpath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{interval}|{self.tile_width}|{self.columns}x{self.rows}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+    def preview_dir(self, video_path: str) -> Optional[Path]:
+        """
+        현재 원본 파일에 해당하는 미리보기 디렉토리 (아직 생성되지 않았으면 None)
+        """
+        info = probe_media(video_path)
+        if info.get("duration", 0) <= 0:
+            return None
+        interval = self._interval_for(info["duration"])
+        target = self.output_dir / f"{Path(video_path).stem}-{self._version_key(video_path, interval)}"
+        return target if (target / MANIFEST_NAME).exists() else None
+
+    def _interval_for(self, duration: float) -> float:
+        """긴 영상은 프레임 수가 max_frames를 넘지 않도록 간격을 늘림"""
+        return max(float(self.interval), math.ceil(duration / self.max_frames))
+
+    def generate(self, video_path: str, force: bool = False) -> Dict[str, Any]:
+        """
+        클립 하나의 스프라이트 시트와 WebVTT 트랙 생성
+
+        ffmpeg 한 번으로 fps 필터로 N초마다 한 프레임씩 뽑아 저해상도로 줄이고
+        tile 필터로 시트에 배치한다. 키프레임 간격이 샘플 간격보다 짧으면
+        키프레임만 디코딩한다.
+
+        Args:
+            video_path: 비디오 파일 경로
+            force: 이미 최신 미리보기가 있어도 다시 생성
+
+        Returns:
+            매니페스트 (vtt_path, sprites, interval, tile 크기 등)
+        """
+        info = probe_media(video_path)
+        duration = info.get("duration", 0.0)
+        if duration <= 0 or not info.get("width"):
+            raise ValueError(f"비디오 정보를 확인할 수 없습니다: {video_path}")
+
+        interval = self._interval_for(duration)
+        stem = Path(video_path).stem
+        key = self._version_key(video_path, interval)
+        target = self.output_dir / f"{stem}-{key}"
+        manifest_path = target / MANIFEST_NAME
+
+        if manifest_path.exists() and not force:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        tile_w = self.tile_width
+        tile_h = max(2, int(round(tile_w * info["height"] / info["width"] / 2)) * 2)
+        frame_count = max(1, math.ceil(duration / interval))
+        per_sheet = self.columns * self.rows
+
+        tmp_dir = target.with_name(target.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        ensure_dir_exists(str(tmp_dir))
+
+        cmd = ["ffmpeg", "-v", "error", "-y"]
+        keyframe_interval = info.get("keyframe_interval")
+        if keyframe_interval and keyframe_interval <= interval:
+            cmd += ["-skip_frame", "nokey"]
+        cmd += [
+            "-i", video_path,
+            "-an", "-sn",
+            "-vf", f"fps=1/{interval},scale={tile_w}:{tile_h},tile={self.columns}x{self.rows}",
+            "-q:v", "5",
+            str(tmp_dir / "sprite_%03d.jpg")
+        ]
+        logger.debug(f"스프라이트 생성 명령: {' '.join(cmd)}")
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+        sprites = sorted(p.name for p in tmp_dir.glob("sprite_*.jpg"))
+        if not sprites:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise RuntimeError("스프라이트 시트가 생성되지 않았습니다")
+
+        # WebVTT 썸네일 트랙 (각 큐는 시트 안의 영역을 #xywh로 가리킴)
+        frame_count = min(frame_count, len(sprites) * per_sheet)
+        lines = ["WEBVTT", ""]
+        for n in range(frame_count):
+            sheet = sprites[n // per_sheet]
+            cell = n % per_sheet
+            x, y = (cell % self.columns) * tile_w, (cell // self.columns) * tile_h
+            start, end = n * interval, min(duration, (n + 1) * interval)
+            lines.append(f"{_format_vtt_timestamp(start)} --> {_format_vtt_timestamp(end)}")
+            lines.append(f"{SPRITE_URL_PREFIX}/{quote(target.name)}/{sheet}#xywh={x},{y},{tile_w},{tile_h}")
+            lines.append("")
+        with open(tmp_dir / VTT_NAME, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+
+        manifest = {
+            "video_path": os.path.realpath(video_path),
+            "version": key,
+            "interval": interval,
+            "tile_width": tile_w,
+            "tile_height": tile_h,
+            "columns": self.columns,
+            "rows": self.rows,
+            "frames": frame_count,
+            "sprites": sprites,
+            "vtt_path": str(target / VTT_NAME),
+            "keyframes_only": "-skip_frame" in cmd
+        }
+        with open(tmp_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        # 완성된 디렉토리를 한 번에 교체하고 이전 버전 정리
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp_dir, target)
+        self._remove_old_versions(stem, target.name, manifest["video_path"])
+
+        logger.info(f"스프라이트 미리보기 생성 완료: {video_path} ({frame_count}프레임, 시트 {len(sprites)}장)")
+        return manifest
+
+    def _remove_old_versions(self, stem: str, current: str, real_path: str) -> None:
+        """같은 원본의 이전 버전 미리보기 디렉토리 삭제"""
+        for old_dir in self.output_dir.glob(f"{glob.escape(stem)}-*"):
+            if old_dir.name == current or not old_dir.is_dir():
+                continue
+            try:
+                with open(old_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                    if json.load(f).get("video_path") != real_path:
+                        continue
+            except (OSError, ValueError):
+                continue
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    def build_library(self, clip_dir: str, progress_callback=None) -> Dict[str, Any]:
+        """
+        클립 디렉토리의 모든 비디오에 대해 미리보기 생성 (최신 상태인 클립은 건너뜀)
+
+        Args:
+            clip_dir: 클립 디렉토리
+            progress_callback: 진행률 콜백 함수 (progress: float, message: str) - 동기 함수
+
+        Returns:
+            {"total", "built", "skipped", "failed": [{"video_path", "error"}]}
+        """
+        videos = sorted(
+            p for p in Path(clip_dir).glob("*")
+            if p.is_file() and p.suffix.lower() in VIDEO_EXTENSIONS
+        )
+        summary: Dict[str, Any] = {"total": len(videos), "built": 0, "skipped": 0, "failed": []}
+
+        for n, video in enumerate(videos):
+            try:
+                if self.preview_dir(str(video)) is not None:
+                    summary["skipped"] += 1
+                else:
+                    self.generate(str(video))
+                    summary["built"] += 1
+            except Exception as e:
+                logger.error(f"스프라이트 미리보기 생성 실패: {video} ({str(e)})")
+                summary["failed"].append({"video_path": str(video), "error": str(e)})
+            if progress_callback:
+                progress_callback((n + 1) / len(videos), f"미리보기 생성 중... ({n + 1}/{len(videos)})")
+
+        logger.info(f"라이브러리 미리보기 생성 완료: {summary['built']}개 생성, {summary['skipped']}개 최신, {len(summary['failed'])}개 실패")
+        return summary
@@ -1,52 +1,504 @@
 #!/usr/bin/env python3
 """
 File: pronunciation.py
-Description: 발음 분석을 위한 코어 모듈
+Description: 발음 분석을 위한 코어 모듈 (MFCC 특징 + DTW 정렬 기반 CPU 채점)
 """
 
 import os
-import logging
+import re
+import hashlib
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
-from app.common.utils import setup_logger
+import numpy as np
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+from app.services.audio import extract_audio, load_wav, to_float32, frame_rms, WHISPER_SAMPLE_RATE
 
 logger = setup_logger('pronunciation_core', 'pronunciation_core.log')
 
+# 특징 추출 파라미터 (16kHz 기준 25ms 창, 10ms 간격)
+SAMPLE_RATE = WHISPER_SAMPLE_RATE
+FRAME_LENGTH = 400
+HOP_LENGTH = 160
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+PRE_EMPHASIS = 0.97
+
+# 참조 특징 캐시 형식 버전 (특징 추출 방식이 바뀌면 올림)
+FEATURE_VERSION = 1
+
+WORD_RE = re.compile(r"[A-Za-z0-9']+")
+VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
+
+@lru_cache(maxsize=4)
+def _mel_filterbank(sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """삼각형 멜 필터뱅크 (n_mels, n_fft // 2 + 1)"""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mel_points = np.linspace(hz_to_mel(0.0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+    bank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n_mels: int = N_MELS, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """정규직교 DCT-II 행렬 (n_mels, n_mfcc)"""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)
+    matrix = np.cos(np.pi / n_mels * (n[:, None] + 0.5) * k[None, :]) * np.sqrt(2.0 / n_mels)
+    matrix[:, 0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+@lru_cache(maxsize=2)
+def _window(frame_length: int = FRAME_LENGTH) -> np.ndarray:
+    return np.hamming(frame_length).astype(np.float32)
+
+
+def mfcc(signal: np.ndarray) -> np.ndarray:
+    """
+    MFCC 특징 추출 (전 과정 NumPy 벡터 연산)
+
+    Args:
+        signal: 16kHz 모노 float32 신호
+
+    Returns:
+        (프레임 수, N_MFCC) 특징 행렬 (c0 제외, 발화 단위 평균/분산 정규화)
+    """
+    if len(signal) < FRAME_LENGTH:
+        signal = np.pad(signal, (0, FRAME_LENGTH - len(signal)))
+    emphasized = np.append(signal[:1], signal[1:] - PRE_EMPHASIS * signal[:-1]).astype(np.float32)
+
+    n_frames = 1 + (len(emphasized) - FRAME_LENGTH) // HOP_LENGTH
+    frames = np.lib.stride_tricks.sliding_window_view(emphasized, FRAME_LENGTH)[::HOP_LENGTH][:n_frames]
+    spectrum = np.abs(np.fft.rfft(frames * _window(), n=N_FFT)) ** 2 / N_FFT
+    log_mel = np.log(spectrum @ _mel_filterbank().T + 1e-10)
+    coeffs = (log_mel @ _dct_matrix())[:, 1:]
+
+    # 녹음 환경(마이크, 음량) 차이를 줄이기 위한 켑스트럼 평균/분산 정규화
+    coeffs -= coeffs.mean(axis=0)
+    coeffs /= coeffs.std(axis=0) + 1e-6
+    return coeffs.astype(np.float32)
+
+
+def dtw_path(cost: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    비용 행렬의 DTW 최적 경로
+
+    같은 행 안의 가로 이동 의존성은 누적합과 np.minimum.accumulate로 풀어
+    행 단위로 벡터화한다: D[i, j] = C[j] + min_{k<=j}(A[k] - C[k]),
+    여기서 A[k] = c[i, k] + min(D[i-1, k-1], D[i-1, k]), C는 c[i]의 누적합.
+
+    Args:
+        cost: (N, M) 프레임 간 거리 행렬
+
+    Returns:
+        ((경로 길이, 2) 인덱스 배열, 경로 평균 비용)
+    """
+    n, m = cost.shape
+    acc = np.empty((n, m), dtype=np.float64)
+    row = np.cumsum(cost[0], dtype=np.float64)
+    acc[0] = row
+    for i in range(1, n):
+        prev = acc[i - 1]
+        best = prev.copy()
+        best[1:] = np.minimum(prev[1:], prev[:-1])
+        vertical = cost[i] + best
+        cum = np.cumsum(cost[i], dtype=np.float64)
+        acc[i] = cum + np.minimum.accumulate(vertical - cum)
+
+    # 끝에서부터 역추적
+    i, j = n - 1, m - 1
+    path = [(i, j)]
+    while i > 0 or j > 0:
+        if i == 0:
+            j -= 1
+        elif j == 0:
+            i -= 1
+        else:
+            diag, up, left = acc[i - 1, j - 1], acc[i - 1, j], acc[i, j - 1]
+            if diag <= up and diag <= left:
+                i, j = i - 1, j - 1
+            elif up <= left:
+                i -= 1
+            else:
+                j -= 1
+        path.append((i, j))
+    path_arr = np.array(path[::-1], dtype=np.int32)
+    return path_arr, float(cost[path_arr[:, 0], path_arr[:, 1]].mean())
+
+
+def cosine_cost(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """두 특징 행렬 간 코사인 거리 행렬 (0 = 같음, 2 = 반대)"""
+    a_norm = a / (np.linalg.norm(a, axis=1, keepdims=True) + 1e-8)
+    b_norm = b / (np.linalg.norm(b, axis=1, keepdims=True) + 1e-8)
+    return 1.0 - a_norm @ b_norm.T
+
+
+def _voiced_range(signal: np.ndarray) -> Tuple[int, int]:
+    """앞뒤 무음을 제외한 샘플 구간"""
+    rms = frame_rms(signal * 32768.0, SAMPLE_RATE, frame_ms=HOP_LENGTH * 1000 / SAMPLE_RATE)
+    if len(rms) == 0:
+        return 0, len(signal)
+    threshold = max(float(rms.max()) * 0.1, 1e-4)
+    voiced = np.flatnonzero(rms >= threshold)
+    if len(voiced) == 0:
+        return 0, len(signal)
+    return int(voiced[0] * HOP_LENGTH), int(min(len(signal), (voiced[-1] + 1) * HOP_LENGTH))
+
+
+def _syllables(word: str) -> int:
+    """대략적인 음절 수 (모음 묶음 수)"""
+    return max(1, len(VOWEL_GROUP_RE.findall(word.lower().rstrip("e") or word.lower())))
+
+
+def word_spans(text: str, energy: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    참조 발화의 단어별 프레임 구간 추정
+
+    음절 수에 비례해 구간을 나눈 뒤, 각 경계를 ±8프레임(80ms) 안에서
+    에너지가 가장 낮은 프레임으로 옮긴다.
+
+    Args:
+        text: 자막 문장
+        energy: 참조 발화의 프레임별 RMS (특징 프레임과 같은 간격)
+
+    Returns:
+        [{"word", "start_frame", "end_frame"}]
+    """
+    words = WORD_RE.findall(text)
+    n_frames = len(energy)
+    if not words or n_frames == 0:
+        return []
+
+    weights = np.array([_syllables(w) for w in words], dtype=np.float64)
+    bounds = np.round(np.concatenate(([0.0], np.cumsum(weights))) / weights.sum() * n_frames).astype(int)
+    for k in range(1, len(bounds) - 1):
+        lo = max(bounds[k - 1] + 1, bounds[k] - 8)
+        hi = min(bounds[k + 1] - 1, bounds[k] + 8)
+        if hi > lo:
+            bounds[k] = lo + int(np.argmin(energy[lo:hi + 1]))
+    return [
+        {"word": word, "start_frame": int(bounds[k]), "end_frame": int(max(bounds[k + 1], bounds[k] + 1))}
+        for k, word in enumerate(words)
+    ]
+
+
+class ReferenceFeatures:
+    """자막 구간 하나의 참조 특징 (MFCC, 프레임 에너지, 단어 구간)"""
+
+    def __init__(self, features: np.ndarray, energy: np.ndarray, words: List[Dict[str, Any]], text: str):
+        self.features = features
+        self.energy = energy
+        self.words = words
+        self.text = text
+
+    @property
+    def duration(self) -> float:
+        return len(self.features) * HOP_LENGTH / SAMPLE_RATE
+
+    @classmethod
+    def from_signal(cls, signal: np.ndarray, text: str) -> "ReferenceFeatures":
+        """참조 신호(16kHz float32)에서 특징 계산"""
+        start, end = _voiced_range(signal)
+        voiced = signal[start:end]
+        features = mfcc(voiced)
+        energy = frame_rms(voiced * 32768.0, SAMPLE_RATE, frame_ms=HOP_LENGTH * 1000 / SAMPLE_RATE)
+        energy = np.pad(energy, (0, max(0, len(features) - len(energy))))[:len(features)]
+        return cls(features, energy, word_spans(text, energy), text)
+
+    def save(self, path: Path) -> None:
+        """npz 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        ensure_dir_exists(str(path.parent))
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp_path,
+            features=self.features,
+            energy=self.energy,
+            word_bounds=np.array([[w["start_frame"], w["end_frame"]] for w in self.words], dtype=np.int32).reshape(-1, 2),
+            words=np.array([w["word"] for w in self.words], dtype=str),
+            text=np.array(self.text)
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ReferenceFeatures":
+        with np.load(path) as data:
+            words = [
+                {"word": str(word), "start_frame": int(bounds[0]), "end_frame": int(bounds[1])}
+                for word, bounds in zip(data["words"], data["word_bounds"])
+            ]
+            return cls(data["features"], data["energy"], words, str(data["text"]))
+
+
 class PronunciationAnalyzer:
     """발음 분석을 위한 클래스"""
-    
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         PronunciationAnalyzer 초기화
-        
+
         Args:
-            config: 설정 (옵션)
+            config: 설정 (옵션) - cache_dir, memory_cache_size, distance_floor, distance_ceiling
         """
         self.config = config or {}
-    
-    def analyze_pronunciation(self, audio_file: str, reference_text: str) -> Dict[str, Any]:
+        self.cache_dir = Path(self.config.get("cache_dir", settings.PRONUNCIATION_CACHE_DIR))
+        self.memory_cache_size = self.config.get("memory_cache_size", 256)
+        # 코사인 거리 -> 점수 변환 구간 (floor 이하는 100점, ceiling 이상은 0점)
+        self.distance_floor = self.config.get("distance_floor", 0.15)
+        self.distance_ceiling = self.config.get("distance_ceiling", 0.85)
+        self._references: "OrderedDict[str, ReferenceFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 참조 특징 (자막 구간별 캐시)
+    # ------------------------------------------------------------------
+
+    def _reference_key(self, video_path: str, start: float, end: float, text: str) -> str:
+        """원본 파일/구간/문장이 같으면 같은 캐시 키"""
+        stat = os.stat(video_path)
+        raw = f"{FEATURE_VERSION}|{os.path.realpath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{start:.3f}|{end:.3f}|{text.strip()}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _cached_reference(self, key: str) -> Optional[ReferenceFeatures]:
+        """메모리 LRU → 디스크 순으로 참조 특징 조회"""
+        with self._lock:
+            reference = self._references.get(key)
+            if reference is not None:
+                self._references.move_to_end(key)
+                return reference
+
+        path = self.cache_dir / key[:2] / f"{key}.npz"
+        if path.exists():
+            try:
+                reference = ReferenceFeatures.load(path)
+                self._remember(key, reference)
+                return reference
+            except Exception as e:
+                logger.warning(f"참조 특징 캐시 로드 실패: {path} ({str(e)})")
+        return None
+
+    def _remember(self, key: str, reference: ReferenceFeatures) -> None:
+        with self._lock:
+            self._references[key] = reference
+            self._references.move_to_end(key)
+            while len(self._references) > self.memory_cache_size:
+                self._references.popitem(last=False)
+
+    def _store_reference(self, key: str, reference: ReferenceFeatures) -> None:
+        self._remember(key, reference)
+        try:
+            reference.save(self.cache_dir / key[:2] / f"{key}.npz")
+        except Exception as e:
+            logger.warning(f"참조 특징 캐시 저장 실패: {str(e)}")
+
+    def prepare_references(self, video_path: str, cues: List[Dict[str, Any]]) -> int:
+        """
+        자막 구간들의 참조 특징을 미리 계산해 캐시 (오디오는 한 번만 추출)
+
+        Args:
+            video_path: 원본 비디오 경로
+            cues: [{"start": 초, "end": 초, "text": 문장}]
+
+        Returns:
+            새로 계산한 구간 수
+        """
+        pending = []
+        for cue in cues:
+            key = self._reference_key(video_path, cue["start"], cue["end"], cue["text"])
+            if self._cached_reference(key) is None:
+                pending.append((key, cue))
+        if not pending:
+            return 0
+
+        with tempfile.TemporaryDirectory(prefix="pronunciation_") as tmp_dir:
+            wav_path = extract_audio(video_path, os.path.join(tmp_dir, "reference.wav"))
+            samples, sample_rate = load_wav(wav_path)
+            for key, cue in pending:
+                segment = samples[int(cue["start"] * sample_rate):int(cue["end"] * sample_rate)]
+                self._store_reference(key, ReferenceFeatures.from_signal(to_float32(segment), cue["text"]))
+            # memmap이 임시 파일을 잡고 있지 않도록 해제
+            del samples
+
+        logger.info(f"참조 특징 계산: {video_path} ({len(pending)}/{len(cues)}개 구간)")
+        return len(pending)
+
+    def get_reference(self, video_path: str, start: float, end: float, text: str) -> ReferenceFeatures:
+        """
+        자막 구간의 참조 특징 (캐시에 없으면 해당 구간 오디오만 추출해 계산)
+
+        Args:
+            video_path: 원본 비디오 경로
+            start: 구간 시작 (초)
+            end: 구간 종료 (초)
+            text: 자막 문장
+
+        Returns:
+            참조 특징
+        """
+        key = self._reference_key(video_path, start, end, text)
+        reference = self._cached_reference(key)
+        if reference is not None:
+            return reference
+
+        with tempfile.TemporaryDirectory(prefix="pronunciation_") as tmp_dir:
+            wav_path = os.path.join(tmp_dir, "segment.wav")
+            cmd = [
+                "ffmpeg", "-v", "error", "-y",
+                "-ss", f"{start:.3f}", "-t", f"{max(end - start, 0.01):.3f}",
+                "-i", video_path,
+                "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-c:a", "pcm_s16le",
+                wav_path
+            ]
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            samples, _ = load_wav(wav_path)
+            reference = ReferenceFeatures.from_signal(to_float32(samples), text)
+            del samples
+
+        self._store_reference(key, reference)
+        return reference
+
+    # ------------------------------------------------------------------
+    # 학습자 녹음 채점
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def load_recording(audio_file: str) -> np.ndarray:
+        """
+        학습자 녹음을 16kHz 모노 float32로 로드 (16kHz PCM WAV가 아니면 ffmpeg로 변환)
+        """
+        try:
+            samples, sample_rate = load_wav(audio_file)
+            if sample_rate == SAMPLE_RATE:
+                return to_float32(samples)
+        except ValueError:
+            pass
+
+        with tempfile.TemporaryDirectory(prefix="pronunciation_") as tmp_dir:
+            wav_path = extract_audio(audio_file, os.path.join(tmp_dir, "recording.wav"))
+            samples, _ = load_wav(wav_path)
+            signal = to_float32(samples)
+            del samples
+        return signal
+
+    def _distance_score(self, distance: float) -> float:
+        """코사인 거리를 0~100 점수로 변환"""
+        ratio = (distance - self.distance_floor) / (self.distance_ceiling - self.distance_floor)
+        return float(np.clip(100.0 * (1.0 - ratio), 0.0, 100.0))
+
+    def score(self, signal: np.ndarray, reference: ReferenceFeatures) -> Dict[str, Any]:
+        """
+        학습자 신호를 참조 특징에 DTW로 정렬해 채점
+
+        Args:
+            signal: 학습자 녹음 (16kHz float32)
+            reference: 참조 특징
+
+        Returns:
+            score, accuracy, fluency, pronunciation, words[{word, score, start, end}]
+        """
+        offset, end = _voiced_range(signal)
+        learner = mfcc(signal[offset:end])
+        cost = cosine_cost(reference.features, learner)
+        path, mean_cost = dtw_path(cost)
+        step_costs = cost[path[:, 0], path[:, 1]]
+
+        # 단어별: 참조 구간에 정렬된 학습자 프레임 범위와 평균 거리
+        hop_seconds = HOP_LENGTH / SAMPLE_RATE
+        words = []
+        for span in reference.words:
+            on_word = (path[:, 0] >= span["start_frame"]) & (path[:, 0] < span["end_frame"])
+            if not on_word.any():
+                continue
+            learner_frames = path[on_word, 1]
+            words.append({
+                "word": span["word"],
+                "score": round(self._distance_score(float(step_costs[on_word].mean())), 1),
+                "start": round(offset / SAMPLE_RATE + int(learner_frames.min()) * hop_seconds, 3),
+                "end": round(offset / SAMPLE_RATE + (int(learner_frames.max()) + 1) * hop_seconds, 3)
+            })
+
+        # 유창성: 전체 길이 비율과 정렬 경로가 대각선에서 벗어난 정도
+        duration_ratio = len(learner) / max(len(reference.features), 1)
+        steps = np.diff(path, axis=0)
+        non_diagonal = float(np.mean((steps[:, 0] == 0) | (steps[:, 1] == 0))) if len(steps) else 0.0
+        fluency = 100.0 * np.exp(-abs(np.log(max(duration_ratio, 1e-3))) * 1.5) * (1.0 - 0.5 * non_diagonal)
+
+        pronunciation = self._distance_score(mean_cost)
+        accuracy = float(np.mean([w["score"] for w in words])) if words else pronunciation
+        total = 0.5 * accuracy + 0.3 * pronunciation + 0.2 * fluency
+        return {
+            "score": round(total, 1),
+            "accuracy": round(accuracy, 1),
+            "fluency": round(float(fluency), 1),
+            "pronunciation": round(pronunciation, 1),
+            "duration_ratio": round(duration_ratio, 3),
+            "words": words
+        }
+
+    def analyze_pronunciation(self,
+                              audio_file: str,
+                              reference_text: str,
+                              video_path: Optional[str] = None,
+                              start: Optional[float] = None,
+                              end: Optional[float] = None,
+                              reference_audio: Optional[str] = None) -> Dict[str, Any]:
         """
         오디오 파일의 발음을 분석
-        
+
+        참조 음성은 원본 클립의 자막 구간(video_path, start, end)이나 별도의
+        참조 오디오 파일(reference_audio, 예: TTS 음성)을 사용한다.
+
         Args:
-            audio_file: 오디오 파일 경로
-            reference_text: 참조 텍스트
-            
+            audio_file: 학습자 녹음 파일 경로
+            reference_text: 참조 텍스트 (자막 문장)
+            video_path: 원본 비디오 경로
+            start: 자막 구간 시작 (초)
+            end: 자막 구간 종료 (초)
+            reference_audio: 참조 오디오 파일 경로
+
         Returns:
-            분석 결과
+            분석 결과 (score, accuracy, fluency, pronunciation, words)
         """
-        # 실제 구현은 나중에 추가
         logger.info(f"발음 분석: {audio_file}")
-        
-        # 예시 결과 반환
-        return {
-            "score": 85,
-            "accuracy": 80,
-            "fluency": 85,
-            "pronunciation": 90,
-            "words": [
-                {"word": "example", "score": 90, "start": 0.5, "end": 1.2},
-                {"word": "pronunciation", "score": 75, "start": 1.3, "end": 2.1}
-            ]
-        } 
\ No newline at end of file
+
+        if video_path and start is not None and end is not None:
+            reference = self.get_reference(video_path, float(start), float(end), reference_text)
+        elif reference_audio:
+            reference = ReferenceFeatures.from_signal(self.load_recording(reference_audio), reference_text)
+        else:
+            raise ValueError("참조 구간(video_path, start, end) 또는 참조 오디오가 필요합니다")
+
+        return self.score(self.load_recording(audio_file), reference)
+
+
+# 애플리케이션 전역 발음 분석기 (참조 특징 메모리 캐시를 요청 간에 공유)
+_analyzer: Optional[PronunciationAnalyzer] = None
+
+
+def get_analyzer() -> PronunciationAnalyzer:
+    """전역 발음 분석기 반환 (최초 호출 시 생성)"""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = PronunciationAnalyzer()
+    return _analyzer
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+File: proxy.py
+Description: 편집기 미리보기용 저해상도 프록시 영상 생성 및 조회
+"""
+
+import os
+import glob
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+from app.services.media_probe import probe_media
+
+logger = setup_logger('proxy', 'proxy.log')
+
+
+class ProxyGenerator:
+    """원본 영상의 저해상도/짧은 GOP 프록시 생성 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        ProxyGenerator 초기화
+
+        Args:
+            config: 설정 (옵션) - height, crf, gop_seconds, output_dir
+        """
+        self.config = config or {}
+        self.height = self.config.get("height", settings.PROXY_HEIGHT)
+        self.crf = self.config.get("crf", 28)
+        self.gop_seconds = self.config.get("gop_seconds", 0.5)
+        self.output_dir = Path(self.config.get("output_dir", settings.PROXY_DIR))
+
+    def _target_path(self, video_path: str) -> Path:
+        """원본 파일/프록시 옵션이 바뀌면 달라지는 프록시 파일 경로"""
+        stat = os.stat(video_path)
+        raw = f"{os.path.realpath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{self.height}|{self.crf}|{self.gop_seconds}"
+        key = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+        return self.output_dir / f"{Path(video_path).stem}-{key}.mp4"
+
+    def needs_proxy(self, video_path: str) -> bool:
+        """프록시 해상도보다 큰 비디오인지 확인 (작은 영상은 원본을 그대로 사용)"""
+        return probe_media(video_path).get("height", 0) > self.height
+
+    def proxy_path(self, video_path: str) -> Optional[str]:
+        """
+        원본에 해당하는 최신 프록시 경로
+
+        Args:
+            video_path: 원본 비디오 경로
+
+        Returns:
+            프록시 경로 (아직 생성되지 않았으면 None)
+        """
+        try:
+            target = self._target_path(video_path)
+        except OSError:
+            return None
+        return str(target) if target.exists() else None
+
+    def generate(self, video_path: str, force: bool = False) -> Optional[str]:
+        """
+        프록시 생성
+
+        짧은 GOP(기본 0.5초)로 인코딩해 구간 탐색과 잘라내기를 빠르게 하고,
+        낮은 해상도/비트레이트로 미리보기 렌더링 부담을 줄인다.
+
+        Args:
+            video_path: 원본 비디오 경로
+            force: 이미 최신 프록시가 있어도 다시 생성
+
+        Returns:
+            프록시 경로 (원본이 프록시 해상도 이하라 필요 없으면 None)
+        """
+        info = probe_media(video_path)
+        if not info.get("height"):
+            raise ValueError(f"비디오 정보를 확인할 수 없습니다: {video_path}")
+        if info["height"] <= self.height:
+            logger.info(f"프록시 생략 (원본 해상도 {info['height']}p): {video_path}")
+            return None
+
+        target = self._target_path(video_path)
+        if target.exists() and not force:
+            return str(target)
+
+        ensure_dir_exists(str(self.output_dir))
+        gop = max(1, int(round((info.get("fps") or 30) * self.gop_seconds)))
+        tmp_path = target.with_name(target.stem + ".tmp.mp4")
+
+        cmd = [
+            "ffmpeg", "-v", "error", "-y",
+            "-i", video_path,
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-vf", f"scale=-2:{self.height}",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", str(self.crf),
+            "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+            "-c:a", "aac", "-b:a", "96k", "-ac", "2",
+            "-movflags", "+faststart",
+            str(tmp_path)
+        ]
+        logger.debug(f"프록시 생성 명령: {' '.join(cmd)}")
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except Exception:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+        os.replace(tmp_path, target)
+        self._remove_old_versions(video_path, target)
+
+        logger.info(f"프록시 생성 완료: {video_path} -> {target}")
+        return str(target)
+
+    def _remove_old_versions(self, video_path: str, current: Path) -> None:
+        """같은 이름 원본의 이전 프록시 삭제"""
+        for old_path in self.output_dir.glob(f"{glob.escape(Path(video_path).stem)}-*.mp4"):
+            # 이름 뒤에 버전 키(12자리)만 붙은 파일만 대상 (다른 원본의 프록시 보호)
+            if old_path != current and len(old_path.stem) == len(current.stem):
+                try:
+                    old_path.unlink()
+                except OSError as e:
+                    logger.warning(f"이전 프록시 삭제 실패: {old_path} ({str(e)})")
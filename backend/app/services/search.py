@@ -0,0 +1,868 @@
+#!/usr/bin/env python3
+"""
+File: search.py
+Description: 클립 영어 자막 전체를 대상으로 한 문장 단위 검색 엔진
+"""
+
+import os
+import re
+import json
+import math
+import base64
+import time
+import heapq
+import threading
+from bisect import bisect_left
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, Iterable
+
+import numpy as np
+
+from app.common.utils import setup_logger
+from app.config import settings
+from app.services.semantic import SemanticIndex
+from app.services.subtitle import (
+    get_subtitle_indexer, NORMALIZATION_VERSION, ANALYTICS_VERSION, normalize_text, current_refined_path, cefr_level,
+    CEFR_LEVELS
+)
+
+logger = setup_logger('search', 'search.log')
+
+# 근사 검색에서 편집 거리로 확인할 최대 후보 문장 수 (넘으면 공유 트라이그램이 많은 순으로 자르고
+# 검색 결과의 truncated로 알림)
+MAX_FUZZY_CANDIDATES = 5000
+# 근사 일치 후보가 공유해야 하는 검색어 트라이그램의 최소 비율. 편집 한 번은 트라이그램을 최대
+# 3개 바꾸므로 허용 편집 수를 (트라이그램 수 × (1 - 비율)) / 3 이하로 제한하면 개수 필터가
+# 일치를 놓치지 않으면서 실제로 후보를 줄인다 (임계값이 더 엄격하면 임계값을 따름).
+FUZZY_MIN_SHARED_RATIO = 0.5
+# 클립 디렉토리 수정 시각과 공유 인덱서 버전이 그대로여도 이 간격(초)마다 한 번은 자막 파일을 다시
+# 확인 (디렉토리 수정 시각이 바뀌지 않는 제자리 덮어쓰기 대비)
+RESCAN_SECONDS = 30.0
+
+# 구문/근접/접두어 검색 ("be supposed to", kind NEAR/2 of, suppos*)
+QUERY_TOKEN_RE = re.compile(r'"[^"]*"\*?|near/\d+|\S+', re.IGNORECASE)
+NEAR_RE = re.compile(r"near/(\d+)$", re.IGNORECASE)
+MAX_PREFIX_EXPANSIONS = 200  # 접두어 하나가 펼쳐지는 최대 단어 수 (문서 빈도 높은 순)
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_HALF_SCORE = 2.0  # BM25 점수를 0~1로 옮길 때 0.5가 되는 값
+POSITION_WEIGHT = 0.2  # 문장 뒤쪽에서 일치할수록 깎는 최대 비율
+
+# (토큰 목록, 마지막 토큰 접두어 여부)
+QueryUnit = Tuple[List[str], bool]
+
+# 문장 통계 필터: 필터 키 -> (통계 열, 비교)
+STAT_FILTERS = {
+    "min_wpm": ("wpm", np.greater_equal),
+    "max_wpm": ("wpm", np.less_equal),
+    "max_rarity": ("rarity", np.less_equal),
+    "min_difficulty": ("difficulty", np.greater_equal),
+    "max_difficulty": ("difficulty", np.less_equal),
+    "min_duration": ("duration", np.greater_equal),
+    "max_duration": ("duration", np.less_equal),
+}
+SORT_FIELDS = ("score", "wpm", "rarity", "difficulty")
+
+# 문장 길이 패싯 구간 (초)
+DURATION_BUCKETS = [("0-2s", 0.0, 2.0), ("2-5s", 2.0, 5.0), ("5-10s", 5.0, 10.0), ("10s+", 10.0, math.inf)]
+
+
+def trigrams(text: str, padded: bool = True) -> Iterable[str]:
+    """문자 트라이그램 집합 (padded면 앞뒤 공백을 붙여 단어 경계도 포함)"""
+    if padded:
+        text = f" {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def fuzzy_max_distance(query: str, threshold: float) -> int:
+    """
+    근사 일치로 허용할 최대 편집 거리
+
+    유사도 임계값이 허용하는 거리와 트라이그램 개수 필터가 성립하는 거리 중 작은 값이다.
+    예: "kichen sponge"(트라이그램 11개)는 임계값 0.5에서도 편집 1번까지만 허용한다.
+    """
+    grams = len(trigrams(query, padded=False))
+    return max(0, min(int((1.0 - threshold) * len(query)), int(grams * (1.0 - FUZZY_MIN_SHARED_RATIO)) // 3))
+
+
+def substring_distances(query: str, texts: List[str], max_distance: int) -> np.ndarray:
+    """
+    각 텍스트 안에서 검색어와 가장 가까운 부분 문자열까지의 편집 거리 (Levenshtein)
+
+    후보 텍스트를 (max_distance + 1)개의 구분 문자로 이어 붙인 뒤 검색어 한 글자당
+    numpy 연산 몇 번으로 모든 후보를 한꺼번에 계산한다 (Sellers 알고리즘, 시작 위치 자유).
+    행 안의 삽입 전이 D[j] = min(D[j], D[j-1] + 1)은 D[j] - j의 누적 최솟값으로 푼다.
+
+    Args:
+        query: 정규화한 검색어
+        texts: 정규화한 후보 텍스트 목록
+        max_distance: 허용 최대 거리 (구분 문자 길이 결정, 이보다 큰 값은 일치 아님)
+
+    Returns:
+        텍스트별 최소 편집 거리 (int32 배열)
+    """
+    if not texts:
+        return np.zeros(0, dtype=np.int32)
+    separator = "\x00" * (max_distance + 1)
+    buffer = separator.join(texts) + separator
+    codes = np.frombuffer(buffer.encode("utf-32-le"), dtype=np.uint32)
+    columns = np.arange(len(codes) + 1, dtype=np.int32)
+
+    row = np.zeros(len(codes) + 1, dtype=np.int32)
+    for i, char in enumerate(np.frombuffer(query.encode("utf-32-le"), dtype=np.uint32), 1):
+        current = np.empty_like(row)
+        current[0] = i
+        np.minimum(row[:-1] + (codes != char), row[1:] + 1, out=current[1:])
+        row = np.minimum.accumulate(current - columns) + columns
+
+    # 구분 문자 위치에서 끝나는 일치는 제외하고 텍스트 구간별 최솟값
+    ends = row[1:]
+    ends[codes == 0] = np.iinfo(np.int32).max
+    offsets = np.cumsum([0] + [len(t) + len(separator) for t in texts[:-1]])
+    return np.minimum.reduceat(ends, offsets)
+
+
+def english_tracks(clips_dir: str) -> List[Tuple[str, str]]:
+    """
+    클립 디렉토리의 영어 자막 목록 (*.en.srt 또는 *.srt, 한국어/보정/생성 중 자막 제외)
+
+    Returns:
+        [(자막 경로, 영상 이름)]
+    """
+    tracks = []
+    for file in sorted(os.listdir(clips_dir)):
+        if not file.endswith('.srt') or file.endswith(('.ko.srt', '.refined.srt', '.partial.srt')):
+            continue
+        name = file[:-7] if file.endswith('.en.srt') else file[:-4]
+        tracks.append((os.path.join(clips_dir, file), name))
+    return tracks
+
+
+def track_language(subtitle_path: str) -> str:
+    """자막 파일 이름의 언어 코드 (video.en.srt, video.en.refined.srt -> en, 코드가 없으면 und)"""
+    stem = Path(subtitle_path).name
+    for suffix in (".refined.srt", ".srt"):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
+    _, _, code = stem.rpartition(".")
+    return code.lower() if stem != code and 2 <= len(code) <= 8 and " " not in code else "und"
+
+
+def encode_cursor(value: float, name: str, sentence_id: int, query: str) -> str:
+    """페이지 마지막 결과의 정렬 위치 -> 다음 페이지 커서 (인덱스가 다시 만들어져도 유효)"""
+    payload = json.dumps([value, name, sentence_id, query], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, int, str]:
+    """커서 -> (정렬 값, 영상 이름, 문장 번호, 검색어)"""
+    try:
+        value, name, sentence_id, query = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(value), str(name), int(sentence_id), str(query)
+    except Exception:
+        raise ValueError(f"잘못된 페이지 커서입니다: {cursor}")
+
+
+def parse_structured_query(query: str) -> Optional[List[Tuple[List[QueryUnit], List[int]]]]:
+    """
+    구문/근접/접두어 검색어 해석
+
+    큰따옴표 안은 구문(연속 단어), `A NEAR/n B`는 사이 단어 n개 이하, `word*`는 접두어다.
+    나머지 단어는 모두 포함되어야 하는 조건(AND)으로 본다.
+
+    Args:
+        query: 검색어 원문
+
+    Returns:
+        [(단위 목록, 단위 사이 NEAR 거리 목록)] 절 목록, 구조 검색이 아니면 None
+    """
+    clauses: List[Tuple[List[QueryUnit], List[int]]] = []
+    structured = False
+    near = None
+    for token in QUERY_TOKEN_RE.findall(query):
+        near_match = NEAR_RE.match(token)
+        if near_match:
+            near = int(near_match.group(1))
+            structured = True
+            continue
+        prefix = token.endswith("*")
+        if token.startswith('"'):
+            structured = True
+            token = token.rstrip("*").strip('"')
+            prefix = prefix or token.rstrip().endswith("*")
+        words = normalize_text(token).split()
+        if not words:
+            continue
+        structured = structured or prefix
+        if near is not None and clauses:
+            clauses[-1][0].append((words, prefix))
+            clauses[-1][1].append(near)
+        else:
+            clauses.append(([(words, prefix)], []))
+        near = None
+    return clauses if structured and clauses else None
+
+
+class QueryAutomaton:
+    """
+    여러 검색어를 한 번에 찾는 Aho–Corasick 오토마톤
+
+    문장을 한 번 훑으면서 모든 검색어의 출현 위치를 찾는다 (멀티라인 검색용).
+    """
+
+    def __init__(self, patterns: List[str]):
+        """
+        QueryAutomaton 초기화
+
+        Args:
+            patterns: 정규화한 검색어 목록 (번호가 일치 결과의 식별자)
+        """
+        self.patterns = patterns
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        # 너비 우선으로 실패 링크 계산 (실패 상태의 출력도 합쳐 둔다)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Iterable[Tuple[int, int]]:
+        """
+        텍스트 안의 모든 일치 위치
+
+        Returns:
+            (검색어 번호, 끝 위치(미포함)) 반복자
+        """
+        if len(self.patterns) == 1:
+            # 검색어가 하나면 str.find가 훨씬 빠르다
+            pattern = self.patterns[0]
+            position = text.find(pattern)
+            while position >= 0:
+                yield 0, position + len(pattern)
+                position = text.find(pattern, position + 1)
+            return
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield pattern_id, position
+
+
+class SearchSnapshot:
+    """
+    검색 색인 한 벌 (만든 뒤에는 바꾸지 않음)
+
+    refresh()가 새 스냅샷을 만들어 한 번의 대입으로 바꿔 끼우므로, 검색은 시작할 때 잡은
+    스냅샷 하나만 쓰면 도중에 색인이 갱신되어도 문장 번호와 배열이 서로 어긋나지 않는다.
+    """
+
+    def __init__(self, tracks: Dict[str, Dict[str, Any]]):
+        """
+        전체 문장의 트라이그램 역색인과 단어 위치 역색인 구성
+
+        Args:
+            tracks: 영상 이름 -> 검색용 문장 목록 (스냅샷이 얕은 사본을 가짐)
+        """
+        docs, texts, lengths, doc_track = [], [], [], []
+        stats: Dict[str, List[float]] = {"wpm": [], "rarity": [], "difficulty": [], "duration": []}
+        postings: Dict[str, List[int]] = defaultdict(list)
+        positions: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+        track_names = sorted(tracks)
+        for track_id, name in enumerate(track_names):
+            track = tracks[name]
+            for column in ("wpm", "rarity", "difficulty"):
+                stats[column].extend(track["analytics"][column])
+            for sentence, text in zip(track["sentences"], track["normalized"]):
+                doc_id = len(docs)
+                docs.append((track, sentence))
+                doc_track.append(track_id)
+                stats["duration"].append(sentence["end"] - sentence["start"])
+                texts.append(text)
+                for gram in trigrams(text):
+                    postings[gram].append(doc_id)
+                words = text.split()
+                lengths.append(len(words))
+                for position, word in enumerate(words):
+                    positions[word].setdefault(doc_id, []).append(position)
+        self.tracks = dict(tracks)
+        # 전체 문장 (track, sentence), 정규화 텍스트, 트라이그램 -> 문장 번호 배열
+        self.docs: List[Tuple[Dict[str, Any], Dict[str, Any]]] = docs
+        self.texts: List[str] = texts
+        self.postings: Dict[str, np.ndarray] = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        # 단어 -> {문장 번호: 단어 위치 목록}, 문장별 단어 수, 정렬된 어휘 (접두어 검색용)
+        self.positions: Dict[str, Dict[int, List[int]]] = dict(positions)
+        self.lengths = np.asarray(lengths, dtype=np.int32)
+        self.vocabulary: List[str] = sorted(positions)
+        # 문장별 통계 열과 패싯용 열 (문장 번호 순), 커서 위치 계산용 (영상 이름, 문장 번호) 목록
+        self.stats: Dict[str, np.ndarray] = {column: np.asarray(values, dtype=np.float32)
+                                              for column, values in stats.items()}
+        # 문장별 CEFR 등급 번호 (cefr_level과 같은 구간, 원래 float64 난이도로 계산해 결과의 level과 일치)
+        difficulty = np.asarray(stats["difficulty"], dtype=np.float64)
+        self.levels = np.minimum((difficulty * len(CEFR_LEVELS)).astype(np.int32), len(CEFR_LEVELS) - 1)
+        self.doc_track = np.asarray(doc_track, dtype=np.int32)
+        self.track_names: List[str] = track_names
+        self.doc_keys: List[Tuple[str, int]] = [(track["name"], sentence["id"]) for track, sentence in docs]
+
+
+class SubtitleSearchEngine:
+    """
+    자막 인덱스(문장 구간)를 메모리에 올려 검색하는 클래스
+
+    자막 파일이 바뀌었을 때만 다시 인덱싱하고(크기/수정 시각 비교), 검색은 빈 자막과
+    10ms 연결 자막을 걸러 낸 문장 단위로 수행한다.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        SubtitleSearchEngine 초기화
+
+        Args:
+            config: 설정 (옵션) - clips_dir, index_path, semantic (SemanticIndex 설정), max_fuzzy_candidates,
+                rescan_seconds
+        """
+        self.config = config or {}
+        self.clips_dir = self.config.get("clips_dir", settings.DEFAULT_CLIP_DIR)
+        # SubtitleProcessor와 같은 인덱서를 써서 index.json 쓰기가 서로 덮어쓰지 않게 함
+        self.indexer = get_subtitle_indexer(self.config.get("index_path"))
+        self.rescan_seconds = float(self.config.get("rescan_seconds", RESCAN_SECONDS))
+        # 마지막 refresh 때의 (클립 디렉토리 수정 시각, 인덱서 버전)과 시각
+        self._signature: Optional[Tuple[int, int]] = None
+        self._scanned_at = 0.0
+        self.semantic = SemanticIndex(self.config.get("semantic"))
+        self.max_fuzzy_candidates = int(self.config.get("max_fuzzy_candidates", MAX_FUZZY_CANDIDATES))
+        # 영상 이름 -> 검색용 문장 목록 (refresh가 잠금 안에서 고치는 작업용 사본)
+        self._tracks: Dict[str, Dict[str, Any]] = {}
+        # 검색이 읽는 색인 (refresh가 새로 만들어 통째로 바꿔 끼움)
+        self._snapshot = SearchSnapshot({})
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _source_path(subtitle_path: str) -> str:
+        """인덱싱할 자막 (원본보다 최신인 경계 보정 자막이 있으면 그것을 사용)"""
+        refined = current_refined_path(subtitle_path)
+        return str(refined) if refined is not None else subtitle_path
+
+    def refresh(self) -> int:
+        """
+        자막 파일 변경을 확인해 바뀐 트랙만 다시 인덱싱하고 메모리 인덱스 갱신
+
+        Returns:
+            다시 인덱싱한 트랙 수
+        """
+        if not os.path.exists(self.clips_dir):
+            raise FileNotFoundError(f"클립 디렉토리를 찾을 수 없습니다: {self.clips_dir}")
+
+        with self._lock:
+            # 스캔 도중 추가된 파일은 다음 확인 때 잡히도록 디렉토리 시각은 스캔 전에 읽음
+            dir_mtime = os.stat(self.clips_dir).st_mtime_ns
+            reindexed = 0
+            changed = False
+            seen = set()
+            names = {}
+            with self.indexer.lock:
+                for subtitle_path, name in english_tracks(self.clips_dir):
+                    source = self._source_path(subtitle_path)
+                    video_id = Path(subtitle_path).stem
+                    seen.add(name)
+                    names[video_id] = name
+                    stat = os.stat(source)
+                    entry = self.indexer.get_subtitle_by_video_id(video_id)
+                    fresh = (entry is not None and entry.get("normalization") == NORMALIZATION_VERSION
+                             and entry.get("analytics", {}).get("version") == ANALYTICS_VERSION
+                             and entry.get("path") == source
+                             and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns)
+                    if not fresh:
+                        try:
+                            video_path = os.path.join(self.clips_dir, name + '.mp4')
+                            entry = self.indexer.index_subtitle(source, video_id, video_path)
+                            reindexed += 1
+                        except Exception as e:
+                            logger.error(f"자막 인덱싱 오류 ({source}): {str(e)}")
+                            continue
+                    track = self._tracks.get(name)
+                    if not fresh or track is None or track["mtime_ns"] != entry["mtime_ns"]:
+                        self._tracks[name] = self._load_track(name, entry)
+                        changed = True
+
+                for name in set(self._tracks) - seen:
+                    del self._tracks[name]
+                    changed = True
+                # 코퍼스가 충분히 바뀌었으면 희귀도/난이도 다시 계산
+                if reindexed:
+                    for video_id in self.indexer.refresh_analytics():
+                        if video_id in names and names[video_id] in self._tracks:
+                            entry = self.indexer.get_subtitle_by_video_id(video_id)
+                            self._tracks[names[video_id]] = self._load_track(names[video_id], entry)
+                            changed = True
+            if changed:
+                self._build_postings()
+                try:
+                    self.semantic.update(self._tracks)
+                except Exception as e:
+                    logger.error(f"의미 검색 인덱스 갱신 오류: {str(e)}", exc_info=True)
+            if reindexed:
+                self.indexer.save_index()
+            self._signature = (dir_mtime, self.indexer.version)
+            self._scanned_at = time.monotonic()
+            return reindexed
+
+    def _refresh_if_stale(self) -> None:
+        """클립 디렉토리나 공유 인덱서가 바뀌었거나 rescan_seconds가 지났을 때만 refresh"""
+        try:
+            signature = (os.stat(self.clips_dir).st_mtime_ns, self.indexer.version)
+        except OSError:
+            signature = None
+        if (signature is not None and signature == self._signature
+                and time.monotonic() - self._scanned_at < self.rescan_seconds):
+            return
+        self.refresh()
+
+    def _build_postings(self) -> None:
+        """현재 트랙으로 검색 색인 스냅샷을 새로 만들어 교체"""
+        snapshot = SearchSnapshot(self._tracks)
+        self._snapshot = snapshot
+        logger.info(f"검색 색인 갱신: 문장 {len(snapshot.docs)}개, 트라이그램 {len(snapshot.postings)}개, "
+                    f"단어 {len(snapshot.positions)}개")
+
+    def _load_track(self, name: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """인덱스 항목을 검색용 구조로 변환 (정규화 텍스트는 인덱스에 저장된 것을 사용)"""
+        sentences = entry.get("sentences", [])
+        return {
+            "name": name,
+            "video_path": os.path.join(self.clips_dir, name + '.mp4'),
+            "mtime_ns": entry.get("mtime_ns"),
+            "sentences": sentences,
+            "normalized": [s["normalized"] for s in sentences],
+            "analytics": entry["analytics"]["sentences"],
+            "language": track_language(entry.get("path", "")),
+            "channel": self._channel(name)
+        }
+
+    def _channel(self, name: str) -> Optional[str]:
+        """yt-dlp 정보 파일(<영상>.info.json)의 채널 이름 (없으면 None)"""
+        info_path = os.path.join(self.clips_dir, name + '.info.json')
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            return info.get("channel") or info.get("uploader")
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _exact_candidates(snapshot: SearchSnapshot, query: str) -> Optional[np.ndarray]:
+        """검색어를 그대로 포함할 수 있는 문장 (모든 트라이그램을 가진 문장, 3글자 미만이면 None = 전체)"""
+        if len(query) < 3:
+            return None
+        lists = []
+        for gram in trigrams(query, padded=False):
+            postings = snapshot.postings.get(gram)
+            if postings is None:
+                return np.zeros(0, dtype=np.int32)
+            lists.append(postings)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        return candidates
+
+    def _exact_matches(self, snapshot: SearchSnapshot, queries: List[str]) -> List[Dict[int, float]]:
+        """
+        모든 검색어의 정확한 출현을 한 번에 찾기
+
+        트라이그램으로 고른 후보 문장을 Aho–Corasick으로 한 번씩만 훑는다.
+        긴 검색어는 포함되면 1.0, 짧은 검색어(3글자 이하)는 포함한 단어 길이에 대한
+        비율(최소 0.3)을 점수로 한다.
+
+        Args:
+            snapshot: 검색 색인 스냅샷
+            queries: 정규화한 검색어 목록
+
+        Returns:
+            검색어별 {문장 번호: 점수}
+        """
+        matches: List[Dict[int, float]] = [{} for _ in queries]
+        candidates = [self._exact_candidates(snapshot, query) for query in queries]
+        if any(c is None for c in candidates):
+            doc_ids = range(len(snapshot.texts))
+        else:
+            doc_ids = np.unique(np.concatenate(candidates)).tolist() if candidates else []
+
+        automaton = QueryAutomaton(queries)
+        for doc_id in doc_ids:
+            text = snapshot.texts[doc_id]
+            for query_id, end in automaton.find_all(text):
+                query = queries[query_id]
+                if len(query) > 3:
+                    matches[query_id][doc_id] = 1.0
+                    continue
+                word_start = text.rfind(" ", 0, end - len(query)) + 1
+                word_end = text.find(" ", end)
+                word_length = (len(text) if word_end < 0 else word_end) - word_start
+                score = len(query) / word_length
+                if score >= 0.3 and score > matches[query_id].get(doc_id, 0.0):
+                    matches[query_id][doc_id] = score
+        return matches
+
+    def _fuzzy_matches(self, snapshot: SearchSnapshot, query: str, threshold: float,
+                       skip: Optional[np.ndarray] = None) -> Tuple[List[Tuple[int, float]], bool]:
+        """
+        근사 일치: 트라이그램으로 후보를 줄인 뒤 부분 문자열 편집 거리로 점수 계산
+
+        편집 한 번은 트라이그램을 최대 3개 바꾸므로, 거리 d 이내의 문장은 검색어 트라이그램 중
+        적어도 (개수 - 3d)개를 공유한다. d는 fuzzy_max_distance로 제한해 이 하한이 항상
+        개수의 절반 이상이 되게 한다. (점수 = 1 - 거리 / 검색어 길이, 오타/축약형 차이를 허용)
+
+        Args:
+            snapshot: 검색 색인 스냅샷
+            query: 정규화한 검색어
+            threshold: 최소 유사도
+            skip: 편집 거리를 계산하지 않을 문장 표시 (이미 정확히 일치했거나 필터에서 빠진 문장)
+
+        Returns:
+            ([(문장 번호, 점수)], 후보가 max_fuzzy_candidates를 넘어 잘렸는지 여부)
+        """
+        max_distance = fuzzy_max_distance(query, threshold)
+        grams = trigrams(query, padded=False)
+        lists = [snapshot.postings[g] for g in grams if g in snapshot.postings]
+        required = len(grams) - 3 * max_distance
+        if len(lists) < required:
+            return [], False
+        counts = np.bincount(np.concatenate(lists), minlength=len(snapshot.docs))
+        keep = counts >= required
+        if skip is not None:
+            keep &= ~skip
+        candidates = np.nonzero(keep)[0]
+        truncated = len(candidates) > self.max_fuzzy_candidates
+        if truncated:
+            logger.warning(f"근사 검색 후보 {len(candidates)}개 중 {self.max_fuzzy_candidates}개만 확인: '{query}'")
+            candidates = candidates[np.argsort(-counts[candidates], kind="stable")[:self.max_fuzzy_candidates]]
+
+        distances = substring_distances(query, [snapshot.texts[i] for i in candidates], max_distance)
+        keep = distances <= max_distance
+        matches = [(int(doc_id), 1.0 - int(d) / len(query)) for doc_id, d in zip(candidates[keep], distances[keep])]
+        return matches, truncated
+
+    @staticmethod
+    def _expand_prefix(snapshot: SearchSnapshot, prefix: str) -> List[str]:
+        """접두어로 시작하는 어휘 (문서 빈도 높은 순 최대 MAX_PREFIX_EXPANSIONS개)"""
+        words = []
+        for i in range(bisect_left(snapshot.vocabulary, prefix), len(snapshot.vocabulary)):
+            if not snapshot.vocabulary[i].startswith(prefix):
+                break
+            words.append(snapshot.vocabulary[i])
+        words.sort(key=lambda w: len(snapshot.positions[w]), reverse=True)
+        return words[:MAX_PREFIX_EXPANSIONS]
+
+    def _unit_spans(self, snapshot: SearchSnapshot, unit: QueryUnit, terms: set) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        구문 단위(연속 단어, 마지막 단어는 접두어 가능)가 나오는 문장별 위치 구간 [시작, 끝)
+
+        Args:
+            snapshot: 검색 색인 스냅샷
+            unit: (토큰 목록, 접두어 여부)
+            terms: 점수 계산에 쓸 단어를 모으는 집합 (접두어 확장 포함)
+        """
+        words, prefix = unit
+        maps: List[Dict[int, List[int]]] = []
+        for i, word in enumerate(words):
+            if prefix and i == len(words) - 1:
+                merged: Dict[int, List[int]] = defaultdict(list)
+                for expanded in self._expand_prefix(snapshot, word):
+                    terms.add(expanded)
+                    for doc_id, doc_positions in snapshot.positions[expanded].items():
+                        merged[doc_id].extend(doc_positions)
+                maps.append(merged)
+            else:
+                terms.add(word)
+                maps.append(snapshot.positions.get(word, {}))
+            if not maps[-1]:
+                return {}
+
+        spans = {}
+        for doc_id in set.intersection(*(set(m) for m in sorted(maps, key=len))):
+            starts = set(maps[0][doc_id])
+            for offset, word_map in enumerate(maps[1:], 1):
+                starts &= {p - offset for p in word_map[doc_id]}
+            if starts:
+                spans[doc_id] = [(start, start + len(words)) for start in sorted(starts)]
+        return spans
+
+    def _structured_matches(self, snapshot: SearchSnapshot, clauses: List[Tuple[List[QueryUnit], List[int]]]) -> List[Tuple[int, float]]:
+        """
+        구문/근접/접두어 검색 (단어 위치 역색인 사용, 여러 자막에 걸친 표현도 문장 단위로 일치)
+
+        점수는 BM25를 0~1로 옮긴 값에 첫 일치 위치가 앞일수록 높은 가중치를 곱한다.
+        """
+        terms: set = set()
+        clause_spans = []
+        for units, distances in clauses:
+            spans = self._unit_spans(snapshot, units[0], terms)
+            for unit, distance in zip(units[1:], distances):
+                other = self._unit_spans(snapshot, unit, terms)
+                combined = {}
+                for doc_id in spans.keys() & other.keys():
+                    joined = [(min(a0, b0), max(a1, b1))
+                              for a0, a1 in spans[doc_id] for b0, b1 in other[doc_id]
+                              if max(b0 - a1, a0 - b1, 0) <= distance]
+                    if joined:
+                        combined[doc_id] = joined
+                spans = combined
+            if not spans:
+                return []
+            clause_spans.append(spans)
+
+        doc_count = len(snapshot.docs)
+        average_length = float(snapshot.lengths.mean()) if doc_count else 0.0
+        matches = []
+        for doc_id in set.intersection(*(set(s) for s in clause_spans)):
+            length = int(snapshot.lengths[doc_id])
+            bm25 = 0.0
+            for term in terms:
+                term_positions = snapshot.positions.get(term, {})
+                if doc_id not in term_positions:
+                    continue
+                frequency = len(term_positions[doc_id])
+                idf = math.log(1 + (doc_count - len(term_positions) + 0.5) / (len(term_positions) + 0.5))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                bm25 += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            first = min(start for spans in clause_spans for start, _ in spans[doc_id])
+            score = bm25 / (bm25 + BM25_HALF_SCORE) * (1 - POSITION_WEIGHT * first / max(length, 1))
+            matches.append((doc_id, score))
+        return matches
+
+    @staticmethod
+    def _result(track: Dict[str, Any], sentence: Dict[str, Any], query: str, score: float) -> Dict[str, Any]:
+        """검색 결과 항목 (index는 문장의 첫 원본 자막 번호, 문장 통계 포함)"""
+        analytics = track["analytics"]
+        difficulty = analytics["difficulty"][sentence["id"]]
+        return {
+            "video_path": track["video_path"],
+            "name": track["name"],
+            "index": sentence["cues"][0] if sentence["cues"] else sentence["id"],
+            "sentence_id": sentence["id"],
+            "start_time": sentence["start_time"],
+            "end_time": sentence["end_time"],
+            "text": sentence["text"],
+            "query": query,
+            "score": score,
+            "wpm": analytics["wpm"][sentence["id"]],
+            "rarity": analytics["rarity"][sentence["id"]],
+            "difficulty": difficulty,
+            "level": cefr_level(difficulty)
+        }
+
+    @staticmethod
+    def _filter_mask(snapshot: SearchSnapshot, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        문장 통계 필터 -> 허용 문장 표시 (필터가 없으면 None)
+
+        Args:
+            snapshot: 검색 색인 스냅샷
+            filters: min_wpm, max_wpm, max_rarity, min_difficulty, max_difficulty, levels(CEFR 목록),
+                min_duration, max_duration(문장 길이, 초), videos, channels, languages
+        """
+        if not filters:
+            return None
+        mask = np.ones(len(snapshot.docs), dtype=bool)
+        for key, (column, compare) in STAT_FILTERS.items():
+            if filters.get(key) is not None:
+                mask &= compare(snapshot.stats[column], float(filters[key]))
+        if filters.get("levels"):
+            wanted = [CEFR_LEVELS.index(level.upper()) for level in filters["levels"] if level.upper() in CEFR_LEVELS]
+            mask &= np.isin(snapshot.levels, wanted)
+        for key, attribute in (("videos", "name"), ("channels", "channel"), ("languages", "language")):
+            if filters.get(key):
+                wanted = set(filters[key])
+                tracks = [snapshot.tracks[name][attribute] in wanted for name in snapshot.track_names]
+                mask &= np.asarray(tracks, dtype=bool)[snapshot.doc_track]
+        return mask
+
+    @staticmethod
+    def _facets(snapshot: SearchSnapshot, doc_ids: np.ndarray) -> Dict[str, Dict[str, int]]:
+        """일치 문장의 영상/채널/언어/문장 길이 구간별 개수"""
+        per_track = np.bincount(snapshot.doc_track[doc_ids], minlength=len(snapshot.track_names))
+        facets: Dict[str, Dict[str, int]] = {"video": {}, "channel": {}, "language": {}, "duration": {}}
+        for track_id in np.nonzero(per_track)[0]:
+            track = snapshot.tracks[snapshot.track_names[track_id]]
+            count = int(per_track[track_id])
+            facets["video"][track["name"]] = count
+            facets["language"][track["language"]] = facets["language"].get(track["language"], 0) + count
+            if track["channel"]:
+                facets["channel"][track["channel"]] = facets["channel"].get(track["channel"], 0) + count
+        durations = snapshot.stats["duration"][doc_ids]
+        for label, low, high in DURATION_BUCKETS:
+            facets["duration"][label] = int(np.count_nonzero((durations >= low) & (durations < high)))
+        return facets
+
+    def similar(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        의미가 비슷한 예문 검색 (문장 벡터 코사인 유사도)
+
+        Args:
+            text: 기준 문장
+            limit: 결과 최대 개수
+
+        Returns:
+            유사도 순 검색 결과 (score = 코사인 유사도)
+        """
+        self._refresh_if_stale()
+        tracks = self._snapshot.tracks
+        results = []
+        for name, sentence_id, score in self.semantic.search(text, limit):
+            track = tracks.get(name)
+            if track is None or sentence_id >= len(track["sentences"]):
+                continue
+            results.append(self._result(track, track["sentences"][sentence_id], text, score))
+        return results
+
+    def search(self, queries: List[str], limit: int = 10, threshold: float = 0.5,
+               filters: Optional[Dict[str, Any]] = None, sort_by: str = "score",
+               cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        모든 영어 자막의 문장에서 검색
+
+        일치 항목은 (문장 번호, 점수)로만 모으고, 정렬 순서상 커서 다음의 상위 limit개만
+        힙으로 골라 결과 항목을 만든다. 순서는 정렬 값, (영상 이름, 문장 번호), 검색어 순이다.
+
+        Args:
+            queries: 소문자로 정리한 검색어 목록 ("구문", A NEAR/n B, 접두어* 지원)
+            limit: 결과 최대 개수 (검색어별 결과에도 적용)
+            threshold: 긴 검색어의 최소 유사도
+            filters: 문장 통계/영상/채널/언어/길이 필터 (_filter_mask 참고)
+            sort_by: score(기본, 내림차순), wpm, rarity, difficulty (앞에 -를 붙이면 내림차순)
+            cursor: 이전 페이지의 next_cursor (없으면 첫 페이지)
+
+        Returns:
+            {"results": 전체 결과 한 페이지, "query_results": 검색어별 결과 한 페이지,
+             "next_cursor": 다음 페이지 커서 (없으면 None), "total": 일치한 문장 수,
+             "truncated": 근사 검색 후보가 max_fuzzy_candidates에서 잘려 일부 근사 일치가 빠졌을 수 있음,
+             "facets": 영상/채널/언어/문장 길이별 일치 문장 수}
+        """
+        field = sort_by.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise ValueError(f"정렬 기준을 알 수 없습니다: {sort_by}")
+        descending = field == "score" or sort_by.startswith("-")
+        after = decode_cursor(cursor) if cursor else None
+        self._refresh_if_stale()
+        queries = list(dict.fromkeys(queries))
+
+        snapshot = self._snapshot
+        docs, doc_keys, stats = snapshot.docs, snapshot.doc_keys, snapshot.stats
+        allowed = self._filter_mask(snapshot, filters)
+        structured = {query: parse_structured_query(query) for query in queries}
+        normalized = {query: normalize_text(query) for query in queries if structured[query] is None}
+        patterns = list(dict.fromkeys(n for n in normalized.values() if n))
+        exact = dict(zip(patterns, self._exact_matches(snapshot, patterns)))
+
+        # 정렬 키: 작을수록 앞 (내림차순 값은 부호를 바꾸고, 같으면 문장 번호/검색어 순)
+        def sort_key(doc_id: int, score: float, query: str) -> Tuple[float, float, str]:
+            value = score if field == "score" else float(stats[field][doc_id])
+            return (-value if descending else value, doc_id, query)
+
+        cursor_key = None
+        if after is not None:
+            value, name, sentence_id, query = after
+            position = bisect_left(doc_keys, (name, sentence_id))
+            exists = position < len(doc_keys) and doc_keys[position] == (name, sentence_id)
+            cursor_key = (-value if descending else value, position if exists else position - 0.5, query)
+
+        matched: Dict[str, Dict[int, float]] = {}
+        truncated = False
+        for query in queries:
+            if structured[query] is not None:
+                matches = dict(self._structured_matches(snapshot, structured[query]))
+                pattern = ""
+            else:
+                pattern = normalized[query]
+                if not pattern:
+                    matched[query] = {}
+                    continue
+                matches = dict(exact[pattern])
+            if allowed is not None:
+                matches = {doc_id: score for doc_id, score in matches.items() if allowed[doc_id]}
+            # 근사 일치는 항상 모은다 (페이지와 관계없이 같은 일치 집합이어야 커서와 total이 맞는다).
+            # 정확히 일치한 문장과 필터에서 빠진 문장은 편집 거리를 계산하지 않는다
+            if len(pattern) > 3:
+                skip = np.zeros(len(docs), dtype=bool) if allowed is None else ~allowed
+                skip[list(matches)] = True
+                fuzzy, cut = self._fuzzy_matches(snapshot, pattern, threshold, skip)
+                truncated = truncated or cut
+                matches.update(fuzzy)
+            matched[query] = matches
+
+        def page(items: Iterable[Tuple[int, float, str]], size: int = limit) -> List[Tuple[int, float, str]]:
+            keyed = ((sort_key(*item), item) for item in items)
+            if cursor_key is not None:
+                keyed = ((key, item) for key, item in keyed if key > cursor_key)
+            return [item for _, item in heapq.nsmallest(size, keyed, key=lambda pair: pair[0])]
+
+        def build(items: List[Tuple[int, float, str]]) -> List[Dict[str, Any]]:
+            return [self._result(*docs[doc_id], query, score) for doc_id, score, query in items]
+
+        # 다음 페이지가 있는지 알기 위해 하나 더 고른다
+        top = page(((doc_id, score, query) for query, matches in matched.items()
+                    for doc_id, score in matches.items()), limit + 1)
+        query_results = {
+            query: build(page((doc_id, score, query) for doc_id, score in matches.items()))
+            for query, matches in matched.items()
+        }
+
+        next_cursor = None
+        if len(top) > limit:
+            top = top[:limit]
+            doc_id, score, query = top[-1]
+            value = score if field == "score" else float(stats[field][doc_id])
+            next_cursor = encode_cursor(value, *doc_keys[doc_id], query)
+
+        matched_docs = set()
+        for matches in matched.values():
+            matched_docs.update(matches)
+        total = len(matched_docs)
+        facets = self._facets(snapshot, np.fromiter(matched_docs, dtype=np.int64, count=len(matched_docs)))
+
+        logger.debug(f"자막 검색: {len(queries)}개 검색어, {total}개 일치")
+        return {
+            "results": build(top),
+            "query_results": query_results,
+            "next_cursor": next_cursor,
+            "total": total,
+            "truncated": truncated,
+            "facets": facets
+        }
+
+
+# 애플리케이션 전역 검색 엔진 (메모리 인덱스를 요청 간에 공유)
+_search_engine: Optional[SubtitleSearchEngine] = None
+
+
+def get_search_engine() -> SubtitleSearchEngine:
+    """전역 검색 엔진 반환 (최초 호출 시 생성)"""
+    global _search_engine
+    if _search_engine is None:
+        _search_engine = SubtitleSearchEngine()
+    return _search_engine
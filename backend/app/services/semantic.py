@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+File: semantic.py
+Description: "이 문장과 비슷한 예문" 검색용 문장 벡터 인덱스 (TF-IDF + LSA, 메모리 맵 저장)
+"""
+
+import os
+import json
+import math
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+from app.services.subtitle import normalize_text
+
+logger = setup_logger('semantic', 'semantic.log')
+
+VECTORS_NAME = "vectors.f32"
+MODEL_NAME = "lsa.npz"
+META_NAME = "meta.json"
+
+MAX_VOCABULARY = 50000  # 문서 빈도 높은 순으로 남길 어휘 수
+POWER_ITERATIONS = 2  # 무작위 SVD 반복 횟수
+FIT_SAMPLE = 20000  # LSA 축 학습에 쓰는 최대 문장 수 (변환은 전체 문장에 적용)
+OVERSAMPLES = 10
+REFIT_GROWTH = 2.0  # 학습 당시보다 문장이 이만큼 늘면 LSA를 다시 학습
+SPARSE_CHUNK = 65536  # 희소 행렬 곱을 나눠 계산할 원소 수
+
+
+def sentence_terms(text: str) -> List[str]:
+    """정규화한 문장의 색인어 (단어 + 인접 두 단어)"""
+    words = text.split()
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _segment_dot(keys: np.ndarray, others: np.ndarray, values: np.ndarray, dense: np.ndarray, size: int) -> np.ndarray:
+    """
+    정렬된 keys별로 values * dense[others] 행을 합산 (희소 행렬 곱)
+
+    중간 배열이 (0이 아닌 원소 수 x 열 수)로 커지지 않도록 SPARSE_CHUNK개씩 나눠 누적한다.
+    """
+    out = np.zeros((size, dense.shape[1]), dtype=np.float64)
+    for begin in range(0, len(keys), SPARSE_CHUNK):
+        chunk = keys[begin:begin + SPARSE_CHUNK]
+        starts = np.flatnonzero(np.r_[True, chunk[1:] != chunk[:-1]])
+        products = values[begin:begin + SPARSE_CHUNK, None] * dense[others[begin:begin + SPARSE_CHUNK]]
+        # 한 조각 안의 키는 중복이 없으므로 += 로 조각 경계의 합도 맞게 누적된다
+        out[chunk[starts]] += np.add.reduceat(products, starts, axis=0)
+    return out
+
+
+class SparseRows:
+    """
+    문장 x 어휘 TF-IDF 희소 행렬 (COO, 행 순서로 저장)
+
+    X @ M과 X.T @ M만 필요하므로 scipy 없이 정렬된 인덱스와 reduceat으로 계산한다.
+    """
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray, shape: Tuple[int, int]):
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.shape = shape
+        self._col_order: Optional[np.ndarray] = None
+
+    def dot(self, dense: np.ndarray) -> np.ndarray:
+        """X @ dense"""
+        return _segment_dot(self.rows, self.cols, self.values, dense, self.shape[0])
+
+    def tdot(self, dense: np.ndarray) -> np.ndarray:
+        """X.T @ dense"""
+        if self._col_order is None:
+            self._col_order = np.argsort(self.cols, kind="stable")
+        order = self._col_order
+        return _segment_dot(self.cols[order], self.rows[order], self.values[order], dense, self.shape[1])
+
+
+class LsaModel:
+    """
+    TF-IDF(로그 TF, 평활 IDF) 후 잠재 의미 분석(절단 SVD)으로 문장을 저차원 벡터로 변환
+    """
+
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, components: np.ndarray):
+        self.vocabulary = {term: i for i, term in enumerate(vocabulary)}
+        self.terms = vocabulary
+        self.idf = idf.astype(np.float32)
+        self.components = components.astype(np.float32)
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[0]
+
+    def tfidf(self, texts: List[str]) -> SparseRows:
+        """정규화한 문장 목록 -> 행 단위 L2 정규화한 TF-IDF 희소 행렬 (어휘에 없는 단어는 무시)"""
+        rows, cols, values = [], [], []
+        for row, text in enumerate(texts):
+            counts = Counter(self.vocabulary[t] for t in sentence_terms(text) if t in self.vocabulary)
+            if not counts:
+                continue
+            weights = [(1.0 + math.log(c)) * float(self.idf[col]) for col, c in counts.items()]
+            norm = math.sqrt(sum(w * w for w in weights))
+            rows.extend([row] * len(counts))
+            cols.extend(counts.keys())
+            values.extend(w / norm for w in weights)
+        return SparseRows(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64),
+                          np.asarray(values, dtype=np.float64), (len(texts), len(self.terms)))
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """정규화한 문장 목록 -> 단위 길이 벡터 (float32, 어휘가 없는 문장은 0 벡터)"""
+        vectors = self.tfidf(texts).dot(self.components.T.astype(np.float64))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+    @classmethod
+    def fit(cls, texts: List[str], dimensions: int) -> Optional["LsaModel"]:
+        """
+        문장 목록으로 어휘/IDF와 LSA 축을 학습 (무작위 SVD)
+
+        Args:
+            texts: 정규화한 문장 목록 (FIT_SAMPLE개보다 많으면 고르게 뽑은 일부로 학습)
+            dimensions: 벡터 차원 (문장/어휘 수보다 클 수 없음)
+
+        Returns:
+            학습한 모델, 어휘가 없으면 None
+        """
+        if len(texts) > FIT_SAMPLE:
+            texts = [texts[i] for i in np.linspace(0, len(texts) - 1, FIT_SAMPLE).astype(int)]
+        document_frequency: Counter = Counter()
+        for text in texts:
+            document_frequency.update(set(sentence_terms(text)))
+        # 인접 두 단어는 두 문장 이상에 나온 것만 사용
+        terms = [t for t, df in document_frequency.most_common() if df > 1 or " " not in t][:MAX_VOCABULARY]
+        if not terms:
+            return None
+        idf = np.asarray([math.log((1 + len(texts)) / (1 + document_frequency[t])) + 1 for t in terms])
+        model = cls(terms, idf, np.zeros((0, len(terms))))
+        matrix = model.tfidf(texts)
+
+        rank = min(dimensions, matrix.shape[0], matrix.shape[1])
+        width = min(rank + OVERSAMPLES, matrix.shape[0], matrix.shape[1])
+        rng = np.random.default_rng(0)
+        basis, _ = np.linalg.qr(matrix.dot(rng.standard_normal((matrix.shape[1], width))))
+        for _ in range(POWER_ITERATIONS):
+            basis, _ = np.linalg.qr(matrix.tdot(basis))
+            basis, _ = np.linalg.qr(matrix.dot(basis))
+        _, _, vt = np.linalg.svd(matrix.tdot(basis).T, full_matrices=False)
+        model.components = vt[:rank].astype(np.float32)
+        return model
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        np.savez(tmp_path, terms=np.asarray(self.terms), idf=self.idf, components=self.components)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "LsaModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["terms"].tolist(), data["idf"], data["components"])
+
+
+class EmbeddingEncoder:
+    """로컬 문장 임베딩 모델 (sentence-transformers가 설치되어 있고 모델을 지정한 경우)"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.dimensions = int(self.model.get_sentence_embedding_dimension())
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=64, normalize_embeddings=True,
+                                 show_progress_bar=False).astype(np.float32)
+
+
+class SemanticIndex:
+    """
+    문장 벡터 인덱스
+
+    벡터는 행 단위 float32 파일로 저장해 메모리 맵으로 읽고, 새 영상이 인덱싱되면
+    바뀐 트랙의 문장만 한 번에 변환해 파일 끝에 추가한다 (이전 행은 삭제 표시).
+    LSA는 문장 수가 학습 당시의 REFIT_GROWTH배를 넘거나 삭제 행이 절반을 넘으면 다시 학습한다.
+    검색은 전체 행렬과 질의 벡터의 내적(코사인) 후 argpartition으로 상위 k개를 고른다.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        SemanticIndex 초기화
+
+        Args:
+            config: 설정 (옵션) - index_dir, dimensions, embedding_model
+        """
+        self.config = config or {}
+        self.index_dir = Path(self.config.get("index_dir", settings.SEMANTIC_INDEX_DIR))
+        self.dimensions = int(self.config.get("dimensions", settings.SEMANTIC_DIMENSIONS))
+        self.embedding_model = self.config.get("embedding_model", settings.SEMANTIC_EMBEDDING_MODEL)
+        ensure_dir_exists(str(self.index_dir))
+        self._lock = threading.Lock()
+
+        self._encoder = None
+        self._encoder_name = "lsa"
+        if self.embedding_model:
+            try:
+                self._encoder = EmbeddingEncoder(self.embedding_model)
+                self._encoder_name = f"embedding:{self.embedding_model}"
+            except Exception as e:
+                logger.warning(f"임베딩 모델을 사용할 수 없어 TF-IDF/LSA 사용: {self.embedding_model} ({str(e)})")
+
+        self._meta: Dict[str, Any] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._load()
+
+    def _load(self) -> None:
+        """저장된 인덱스 읽기 (인코더가 다르거나 파일이 맞지 않으면 빈 인덱스로 시작)"""
+        meta_path = self.index_dir / META_NAME
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("encoder") != self._encoder_name:
+                return
+            if self._encoder is None:
+                self._encoder = LsaModel.load(self.index_dir / MODEL_NAME)
+            self._meta = meta
+            self._open_vectors()
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"의미 검색 인덱스를 다시 만듭니다 ({str(e)})")
+            self._meta = {}
+            if self._encoder_name == "lsa":
+                self._encoder = None
+
+    def _open_vectors(self) -> None:
+        """벡터 파일을 메모리 맵으로 열고 살아 있는 행 표시 갱신"""
+        count, dimensions = len(self._meta["rows"]), self._meta["dimensions"]
+        path = self.index_dir / VECTORS_NAME
+        if os.path.getsize(path) != count * dimensions * 4:
+            raise ValueError(f"벡터 파일 크기 불일치: {path}")
+        self._vectors = np.memmap(path, dtype=np.float32, mode="r", shape=(count, dimensions)) if count else None
+        self._alive = np.asarray([row is not None for row in self._meta["rows"]], dtype=bool)
+
+    def _save_meta(self) -> None:
+        tmp_path = self.index_dir / (META_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._meta, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_dir / META_NAME)
+
+    def _encode(self, tracks: List[Tuple[str, Dict[str, Any]]]) -> Tuple[np.ndarray, List[List[Any]]]:
+        """트랙 문장을 한 번에 벡터로 변환 (임베딩 모델은 원문, LSA는 정규화 텍스트 사용)"""
+        texts, rows = [], []
+        for name, track in tracks:
+            source = [s["text"] for s in track["sentences"]] if self._encoder_name != "lsa" else track["normalized"]
+            texts.extend(source)
+            rows.extend([name, s["id"]] for s in track["sentences"])
+        if not texts:
+            return np.zeros((0, self._encoder.dimensions), dtype=np.float32), rows
+        return self._encoder.transform(texts), rows
+
+    def _rebuild(self, tracks: Dict[str, Dict[str, Any]]) -> None:
+        """전체 재구성 (LSA 재학습 포함)"""
+        items = sorted(tracks.items())
+        if self._encoder_name == "lsa":
+            texts = [text for _, track in items for text in track["normalized"]]
+            self._encoder = LsaModel.fit(texts, self.dimensions)
+            if self._encoder is None:
+                self._meta, self._vectors, self._alive = {}, None, np.zeros(0, dtype=bool)
+                return
+            self._encoder.save(self.index_dir / MODEL_NAME)
+
+        vectors, rows = self._encode(items)
+        tmp_path = self.index_dir / (VECTORS_NAME + ".tmp")
+        vectors.tofile(tmp_path)
+        self._vectors = None
+        os.replace(tmp_path, self.index_dir / VECTORS_NAME)
+
+        self._meta = {
+            "encoder": self._encoder_name,
+            "dimensions": int(vectors.shape[1]),
+            "fitted_count": len(rows),
+            "tracks": {},
+            "rows": rows
+        }
+        start = 0
+        for name, track in items:
+            self._meta["tracks"][name] = {"mtime_ns": track["mtime_ns"], "start": start,
+                                          "end": start + len(track["sentences"])}
+            start += len(track["sentences"])
+        self._save_meta()
+        self._open_vectors()
+        logger.info(f"의미 검색 인덱스 재구성: 문장 {len(rows)}개, {self._meta['dimensions']}차원 ({self._encoder_name})")
+
+    def update(self, tracks: Dict[str, Dict[str, Any]]) -> int:
+        """
+        검색 엔진의 트랙 목록과 동기화 (바뀐 트랙만 변환해 추가)
+
+        Args:
+            tracks: 영상 이름 -> {mtime_ns, sentences, normalized}
+
+        Returns:
+            새로 변환한 문장 수
+        """
+        with self._lock:
+            indexed = self._meta.get("tracks", {})
+            changed = [name for name, track in tracks.items()
+                       if name not in indexed or indexed[name]["mtime_ns"] != track["mtime_ns"]]
+            removed = [name for name in indexed if name not in tracks or name in changed]
+            if not changed and not removed:
+                return 0
+
+            # 검색이 이전 행 목록을 들고 있을 수 있으므로 사본을 고쳐 한 번에 바꿔 끼운다
+            rows = list(self._meta.get("rows", []))
+            indexed = dict(indexed)
+            dead = sum(1 for row in rows if row is None) + sum(
+                indexed[name]["end"] - indexed[name]["start"] for name in removed)
+            added = sum(len(tracks[name]["sentences"]) for name in changed)
+            live = len(rows) - dead + added
+            if (self._encoder is None or not self._meta
+                    or (self._encoder_name == "lsa" and live > REFIT_GROWTH * self._meta["fitted_count"])
+                    or dead > live):
+                self._rebuild(tracks)
+                return live
+
+            for name in removed:
+                span = indexed.pop(name)
+                for i in range(span["start"], span["end"]):
+                    rows[i] = None
+            vectors, new_rows = self._encode([(name, tracks[name]) for name in changed])
+            self._vectors = None
+            with open(self.index_dir / VECTORS_NAME, "ab") as f:
+                f.write(vectors.tobytes())
+            start = len(rows)
+            for name in changed:
+                end = start + len(tracks[name]["sentences"])
+                indexed[name] = {"mtime_ns": tracks[name]["mtime_ns"], "start": start, "end": end}
+                start = end
+            rows.extend(new_rows)
+            self._meta = dict(self._meta, tracks=indexed, rows=rows)
+            self._save_meta()
+            self._open_vectors()
+            logger.info(f"의미 검색 인덱스 추가: 트랙 {len(changed)}개, 문장 {added}개")
+            return added
+
+    def search(self, text: str, limit: int = 10) -> List[Tuple[str, int, float]]:
+        """
+        문장과 의미가 가까운 예문 검색
+
+        Args:
+            text: 기준 문장 원문
+            limit: 결과 최대 개수
+
+        Returns:
+            [(영상 이름, 문장 번호, 코사인 유사도)] 유사도 내림차순
+        """
+        with self._lock:
+            vectors, alive, rows, encoder = self._vectors, self._alive, self._meta.get("rows", []), self._encoder
+        if vectors is None or encoder is None or limit <= 0:
+            return []
+        query = encoder.transform([normalize_text(text) if self._encoder_name == "lsa" else text])[0]
+        if not query.any():
+            return []
+        scores = np.asarray(vectors @ query)
+        scores[~alive] = -np.inf
+        k = min(limit, int(alive.sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(rows[i][0], rows[i][1], float(scores[i])) for i in top if scores[i] > 0 and rows[i] is not None]
@@ -5,20 +5,328 @@ Description: 자막 인덱싱 및 처리를 위한 코어 모듈
 """
 
 import os
+import re
 import json
 import pysrt
 import logging
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable
+from functools import lru_cache
+from collections import Counter
 import asyncio
 import datetime
+import threading
+
+import numpy as np
 
 from app.common.utils import setup_logger, ensure_dir_exists, get_project_root
 from app.services.extractor import VideoExtractor
+from app.services.whisper_generator import get_partial_status, partial_subtitle_path
 from app.config import settings
 
 logger = setup_logger('subtitle_core', 'subtitle_core.log')
 
+# 자막 경계 보정 파라미터
+BRIDGE_CUE_SECONDS = 0.05  # 롤링 자동 자막 사이에 끼는 10ms "연결" 자막
+SNAP_LATE_PENALTY = 2.0  # 시작은 앞으로, 끝은 뒤로 옮기는 쪽을 선호 (단어가 잘리지 않게)
+MIN_CUE_SECONDS = 0.3
+
+TAG_RE = re.compile(r"<[^>]+>")
+SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]*$")
+NON_SPEECH_RE = re.compile(r"^\s*[\[(][^\])]*[\])]\s*$")
+INNER_SENTENCE_END_RE = re.compile(r"[.!?]\S*\s+\S")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+
+# 검색용 정규화 텍스트 (규칙을 바꾸면 버전을 올려 기존 인덱스를 다시 만들게 한다)
+NORMALIZATION_VERSION = 1
+APOSTROPHE_RE = re.compile(r"['`\u2018\u2019\u02bc\u00b4]")
+NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+# 인덱싱 시 계산하는 학습 자료 통계 (규칙을 바꾸면 버전을 올린다)
+ANALYTICS_VERSION = 1
+COMMON_WORD_RANK = 2000  # 코퍼스 빈도 상위 몇 개 단어를 "흔한 단어"로 볼지
+ANALYTICS_DRIFT = 0.1  # 코퍼스 단어 수가 이 비율 이상 바뀌면 희귀도 다시 계산
+EASY_WPM = 110.0  # 이 속도 이하는 느린 발화, FAST_WPM 이상은 빠른 발화
+FAST_WPM = 200.0
+CEFR_LEVELS = ["A1", "A2", "B1", "B2", "C1", "C2"]
+
+
+def estimate_difficulty(wpm: float, rarity: float, word_count: int) -> float:
+    """
+    말하기 속도, 희귀 단어 비율, 문장 길이로 추정한 난이도 (0~1)
+
+    희귀 단어가 1/3 이상이면 어휘 항목은 최대로 본다. 단어 목록 없이 코퍼스 통계만으로
+    추정하므로 CEFR 등급은 참고용이다.
+    """
+    pace = min(max((wpm - EASY_WPM) / (FAST_WPM - EASY_WPM), 0.0), 1.0)
+    vocabulary = min(rarity * 3, 1.0)
+    length = min(max((word_count - 4) / 20, 0.0), 1.0)
+    return round(0.45 * vocabulary + 0.35 * pace + 0.2 * length, 3)
+
+
+def cefr_level(difficulty: float) -> str:
+    """난이도(0~1) -> 추정 CEFR 등급"""
+    return CEFR_LEVELS[min(int(difficulty * len(CEFR_LEVELS)), len(CEFR_LEVELS) - 1)]
+
+
+def analytics_columns(items: List[Tuple[str, float]], common_words: set) -> Dict[str, List[float]]:
+    """
+    (정규화 텍스트, 길이(초)) 목록의 통계 열
+
+    Returns:
+        {"words", "wpm", "rarity", "difficulty"} 열 (같은 순서의 숫자 목록)
+    """
+    columns: Dict[str, List[float]] = {"words": [], "wpm": [], "rarity": [], "difficulty": []}
+    for text, duration in items:
+        words = text.split()
+        wpm = len(words) / duration * 60 if duration > 0 else 0.0
+        rarity = sum(1 for w in words if w not in common_words) / len(words) if words else 0.0
+        columns["words"].append(len(words))
+        columns["wpm"].append(round(wpm, 1))
+        columns["rarity"].append(round(rarity, 3))
+        columns["difficulty"].append(estimate_difficulty(wpm, rarity, len(words)))
+    return columns
+
+
+def normalize_text(text: str) -> str:
+    """
+    검색용 정규화 텍스트
+
+    태그 제거, 유니코드 NFKC 정규화, casefold 후 아포스트로피는 지우고(don't -> dont)
+    나머지 문장부호/따옴표는 공백으로 바꿔 단어 사이 공백을 하나로 정리한다.
+    """
+    text = unicodedata.normalize("NFKC", TAG_RE.sub("", text)).casefold()
+    return " ".join(NON_WORD_RE.sub(" ", APOSTROPHE_RE.sub("", text)).split())
+
+
+def refined_subtitle_path(subtitle_path: str) -> Path:
+    """원본 자막 옆에 저장하는 보정 자막 경로 (video.en.srt -> video.en.refined.srt)"""
+    return Path(subtitle_path).with_suffix(".refined.srt")
+
+
+def current_refined_path(subtitle_path: str) -> Optional[Path]:
+    """원본보다 최신인 보정 자막 경로 (없거나 원본이 더 최신이면 None)"""
+    refined = refined_subtitle_path(subtitle_path)
+    try:
+        if refined.stat().st_mtime_ns >= os.stat(subtitle_path).st_mtime_ns:
+            return refined
+    except OSError:
+        pass
+    return None
+
+
+def _rolling_fragments(subs: pysrt.SubRipFile) -> List[List[Any]]:
+    """
+    롤링 자동 자막에서 새로 나타난 줄만 뽑아 [시작, 끝, 텍스트, 원본 자막 번호 목록] 조각으로 변환
+
+    YouTube 자동 자막은 "이전 줄\\n새 줄" 형태의 자막과 새 줄만 담은 10ms 연결 자막이
+    번갈아 나온다. 직전 자막 끝부분과 겹치는 앞줄을 제거하고, 연결 자막에서 처음 나온 줄은
+    그 줄이 실제로 말해진 직전 자막 구간에 붙인다. 일반 자막은 그대로 한 조각씩이 된다.
+    """
+    fragments: List[List[Any]] = []
+    prev_lines: List[str] = []
+    last_span: Optional[Tuple[float, float]] = None
+    last_index: Optional[int] = None
+
+    for sub in subs:
+        start = sub.start.ordinal / 1000.0
+        end = sub.end.ordinal / 1000.0
+        lines = [" ".join(line.split()) for line in TAG_RE.sub("", sub.text).splitlines()]
+        lines = [line for line in lines if line and not NON_SPEECH_RE.match(line)]
+
+        overlap = 0
+        for k in range(min(len(prev_lines), len(lines)), 0, -1):
+            if prev_lines[-k:] == lines[:k]:
+                overlap = k
+                break
+        new_lines = lines[overlap:]
+        prev_lines = lines
+
+        cue_ids = [sub.index]
+        if end - start <= BRIDGE_CUE_SECONDS:
+            span = last_span or (start, end)
+            if last_span is not None:
+                cue_ids.insert(0, last_index)
+        else:
+            span = (start, end)
+            last_span = span
+            last_index = sub.index
+            if not new_lines and lines and fragments:
+                # 같은 문장이 이어지는 자막이면 마지막 조각을 늘림
+                fragments[-1][1] = max(fragments[-1][1], end)
+                fragments[-1][3].append(sub.index)
+        if not new_lines:
+            continue
+
+        text = " ".join(new_lines)
+        if fragments and (fragments[-1][0], fragments[-1][1]) == span:
+            fragments[-1][2] += " " + text
+            fragments[-1][3].extend(i for i in cue_ids if i not in fragments[-1][3])
+        else:
+            fragments.append([span[0], span[1], text, cue_ids])
+    return fragments
+
+
+def _merge_sentences(fragments: List[List[Any]], max_seconds: float, max_gap: float) -> List[List[Any]]:
+    """
+    조각을 문장 단위 자막으로 합침
+
+    문장 부호로 끝나거나, 다음 조각과의 간격이 max_gap보다 길거나, 합친 길이가
+    max_seconds를 넘으면 끊는다 (문장 부호가 없는 자동 자막 대비).
+    """
+    cues: List[List[Any]] = []
+    current: Optional[List[Any]] = None
+    for start, end, text, cue_ids in fragments:
+        if current is not None and (start - current[1] > max_gap
+                                    or end - current[0] > max_seconds
+                                    or SENTENCE_END_RE.search(current[2])):
+            cues.append(current)
+            current = None
+        if current is None:
+            current = [start, end, text, list(cue_ids)]
+        else:
+            current[1] = max(current[1], end)
+            current[2] += " " + text
+            current[3].extend(cue_ids)
+    if current is not None:
+        cues.append(current)
+    return cues
+
+
+def _snap_boundaries(cues: List[List[Any]], rms: np.ndarray, step: float, window: float) -> int:
+    """
+    자막 시작/끝을 window초 안의 가장 가까운 조용한 지점으로 이동 (제자리 수정)
+
+    조용한 지점은 전체 RMS 분포 기준으로 정한다. 주변에 조용한 지점이 없으면
+    (배경 음악 등) 원래 경계를 유지한다.
+
+    Returns:
+        옮긴 경계 수
+    """
+    if len(rms) == 0 or not cues:
+        return 0
+    energy = np.asarray(rms, dtype=np.float32)
+    # 3프레임 이동 평균으로 파열음 사이의 짧은 틈은 무시
+    energy = np.convolve(energy, np.ones(3, dtype=np.float32) / 3, mode="same")
+    floor, loud = np.percentile(energy, [5, 90])
+    quiet = energy <= floor + 0.2 * (loud - floor)
+    radius = max(1, int(round(window / step)))
+
+    def snap(t: float, prefer_earlier: bool) -> float:
+        center = int(t / step)
+        lo, hi = max(0, center - radius), min(len(energy), center + radius + 1)
+        candidates = np.nonzero(quiet[lo:hi])[0] + lo
+        if len(candidates) == 0:
+            return t
+        # 프레임 가장자리 중 원래 경계에 가까운 쪽 시각 사용
+        times = np.where(candidates < center, (candidates + 1) * step, candidates * step)
+        delta = times - t
+        late = delta > 0 if prefer_earlier else delta < 0
+        cost = np.abs(delta) * np.where(late, SNAP_LATE_PENALTY, 1.0)
+        return float(times[int(np.argmin(cost))])
+
+    moved = 0
+    for cue in cues:
+        start, end = snap(cue[0], True), snap(cue[1], False)
+        if end - start < MIN_CUE_SECONDS:
+            continue
+        moved += (start != cue[0]) + (end != cue[1])
+        cue[0], cue[1] = start, end
+
+    # 이웃 자막과 겹치면 가운데에서 나눔
+    for prev, cue in zip(cues, cues[1:]):
+        if cue[0] < prev[1]:
+            middle = (cue[0] + prev[1]) / 2
+            prev[1] = cue[0] = middle
+    return moved
+
+@lru_cache(maxsize=4)
+def _sentence_splitter(backend: str) -> Callable[[str], List[str]]:
+    """
+    문장 분리 함수 (spacy 규칙 기반 sentencizer → nltk punkt → 정규식 순으로 사용 가능한 것)
+
+    spacy는 모델 없이 blank 파이프라인의 sentencizer만 사용하고, nltk는 punkt 데이터가
+    설치되어 있을 때만 사용한다.
+    """
+    if backend in ("auto", "spacy"):
+        try:
+            import spacy
+            nlp = spacy.blank("en")
+            nlp.add_pipe("sentencizer")
+            return lambda text: [sent.text.strip() for sent in nlp(text).sents if sent.text.strip()]
+        except Exception as e:
+            logger.debug(f"spacy 문장 분리 사용 불가: {str(e)}")
+    if backend in ("auto", "nltk"):
+        try:
+            from nltk.tokenize import sent_tokenize
+            sent_tokenize("Test. Sentence.")
+            return sent_tokenize
+        except Exception as e:
+            logger.debug(f"nltk 문장 분리 사용 불가: {str(e)}")
+    return lambda text: [part for part in SENTENCE_SPLIT_RE.split(text) if part]
+
+
+class SentenceSegmenter:
+    """자막 조각을 문장 단위 구간으로 묶는 클래스 (인덱싱 시 사용)"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        SentenceSegmenter 초기화
+
+        Args:
+            config: 설정 (옵션) - max_seconds, max_gap, splitter ('auto', 'spacy', 'nltk', 'regex')
+        """
+        self.config = config or {}
+        self.max_seconds = self.config.get("max_seconds", settings.SUBTITLE_REFINE_MAX_SECONDS)
+        self.max_gap = self.config.get("max_gap", 0.8)
+        self.splitter = self.config.get("splitter", settings.SENTENCE_SPLITTER)
+
+    def _split(self, text: str) -> List[str]:
+        """한 구간 안에 문장이 여러 개면 나눔 (문장 부호가 중간에 없으면 분리기를 부르지 않음)"""
+        if not INNER_SENTENCE_END_RE.search(text):
+            return [text]
+        return _sentence_splitter(self.splitter)(text) or [text]
+
+    def segment(self, subs: pysrt.SubRipFile) -> List[Dict[str, Any]]:
+        """
+        자막을 문장 구간으로 변환 (빈 자막/연결 자막 제외, 롤링 중복 제거)
+
+        문장 부호와 쉼(자막 간격)으로 조각을 합치고, 한 조각에 여러 문장이 있으면
+        글자 수 비율로 시간을 나눈다.
+
+        Args:
+            subs: 자막
+
+        Returns:
+            [{id, start, end, start_time, end_time, text, cues(원본 자막 번호 목록)}]
+        """
+        sentences: List[Dict[str, Any]] = []
+        for start, end, text, cue_ids in _merge_sentences(_rolling_fragments(subs), self.max_seconds, self.max_gap):
+            parts = self._split(text)
+            total = sum(len(part) for part in parts)
+            offset = start
+            for i, part in enumerate(parts):
+                part_end = end if i == len(parts) - 1 else offset + (end - start) * len(part) / total
+                sentences.append({
+                    "id": len(sentences),
+                    "start": round(offset, 3),
+                    "end": round(part_end, 3),
+                    "start_time": str(pysrt.SubRipTime.from_ordinal(int(round(offset * 1000)))),
+                    "end_time": str(pysrt.SubRipTime.from_ordinal(int(round(part_end * 1000)))),
+                    "text": part,
+                    "cues": cue_ids
+                })
+                offset = part_end
+        return sentences
+
+
+def default_index_path() -> str:
+    """기본 자막 인덱스 파일 경로 (data/subtitles/index.json)"""
+    return str(get_project_root() / "backend" / settings.DEFAULT_SUBTITLE_DIR / "index.json")
+
+
 class SubtitleIndexer:
     """자막 인덱싱 및 검색을 위한 클래스"""
     
@@ -29,10 +337,17 @@ class SubtitleIndexer:
         Args:
             output_path: 인덱스 파일 저장 경로 (기본값: data/subtitles/index.json)
         """
-        project_root = get_project_root()
-        default_index_path = project_root / "backend" / settings.DEFAULT_SUBTITLE_DIR / "index.json"
-        self.output_path = output_path or str(default_index_path)
+        self.output_path = output_path or default_index_path()
+        # index_subtitle/refresh_analytics/save_index는 인덱스 전체를 고치거나 쓰므로 한 번에 하나씩
+        self.lock = threading.RLock()
+        # 항목이나 통계가 바뀔 때마다 증가 (검색 엔진이 다시 확인할지 판단)
+        self.version = 0
         self.index = self._load_index()
+        self.index.setdefault("frequencies", {"total": 0, "words": {}})
+        self.segmenter = SentenceSegmenter()
+        # 빈도표 변경 횟수와 그때의 상위 단어 (같은 수의 단어가 바뀌면 total만으로는 변경을 알 수 없음)
+        self._frequency_version = 0
+        self._common_words: Tuple[int, set] = (-1, set())
     
     def _load_index(self) -> Dict[str, Any]:
         """
@@ -59,14 +374,17 @@ class SubtitleIndexer:
         }
     
     def save_index(self) -> None:
-        """인덱스를 파일에 저장"""
+        """인덱스를 파일에 저장 (임시 파일에 쓴 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않게 함)"""
         ensure_dir_exists(os.path.dirname(self.output_path))
         
-        # 업데이트 시각 갱신
-        self.index["meta"]["updated_at"] = datetime.datetime.now().isoformat()
-        
-        with open(self.output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.index, f, ensure_ascii=False, indent=2)
+        with self.lock:
+            # 업데이트 시각 갱신
+            self.index["meta"]["updated_at"] = datetime.datetime.now().isoformat()
+            
+            tmp_path = f"{self.output_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.output_path)
         logger.info(f"인덱스가 저장되었습니다: {self.output_path}")
     
     def index_subtitle(self, subtitle_path: str, video_id: str, video_path: Optional[str] = None) -> Dict[str, Any]:
@@ -81,37 +399,136 @@ class SubtitleIndexer:
         Returns:
             인덱싱된 자막 데이터
         """
+        with self.lock:
+            return self._index_subtitle(subtitle_path, video_id, video_path)
+
+    def _index_subtitle(self, subtitle_path: str, video_id: str, video_path: Optional[str]) -> Dict[str, Any]:
+        """index_subtitle 본체 (잠금 안에서 호출)"""
         try:
             subs = pysrt.open(subtitle_path)
-            subtitle_data = []
+            stat = os.stat(subtitle_path)
+            
+            # 문장 구간을 만들고 원본 자막 -> 문장 번호 매핑 저장
+            sentences = self.segmenter.segment(subs)
+            previous = self.index["subtitles"].get(video_id)
+            cue_sentence = {}
+            for sentence in sentences:
+                sentence["normalized"] = normalize_text(sentence["text"])
+                for cue_index in sentence["cues"]:
+                    cue_sentence.setdefault(cue_index, sentence["id"])
             
+            subtitle_data = []
             for sub in subs:
+                duration = (sub.end.ordinal - sub.start.ordinal) / 1000  # 초 단위
+                text = sub.text.strip()
+                # 빈 자막과 롤링 자동 자막의 10ms 연결 자막은 인덱스에서 제외
+                if not text or (duration <= BRIDGE_CUE_SECONDS and sub.index not in cue_sentence):
+                    continue
                 subtitle_data.append({
                     "index": sub.index,
                     "start_time": str(sub.start),
                     "end_time": str(sub.end),
-                    "duration": (sub.end.ordinal - sub.start.ordinal) / 1000,  # 초 단위
-                    "text": sub.text.strip()
+                    "duration": duration,
+                    "text": text,
+                    "normalized": normalize_text(text),
+                    "sentence": cue_sentence.get(sub.index)
                 })
             
             # 자막 메타데이터 추가
             subtitle_meta = {
                 "path": subtitle_path,
                 "video_path": video_path,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
                 "count": len(subtitle_data),
+                "sentence_count": len(sentences),
+                "normalization": NORMALIZATION_VERSION,
                 "indexed_at": datetime.datetime.now().isoformat(),
-                "data": subtitle_data
+                "data": subtitle_data,
+                "sentences": sentences
             }
             
+            # 코퍼스 단어 빈도는 이전 인덱스 몫을 빼고 새 문장 몫을 더해 갱신
+            if previous and "analytics" in previous:
+                self._count_words(previous.get("sentences", []), -1)
+            self._count_words(sentences, 1)
+            subtitle_meta["analytics"] = self._analyze(subtitle_meta)
             self.index["subtitles"][video_id] = subtitle_meta
+            self.version += 1
             
-            logger.info(f"자막 인덱싱 완료: {video_id} ({len(subtitle_data)} 항목)")
+            logger.info(f"자막 인덱싱 완료: {video_id} ({len(subs)}개 자막 -> {len(subtitle_data)}개, 문장 {len(sentences)}개)")
             return self.index["subtitles"][video_id]
             
         except Exception as e:
             logger.error(f"자막 인덱싱 오류: {str(e)}")
             raise
     
+    def _count_words(self, sentences: List[Dict[str, Any]], sign: int) -> None:
+        """문장 단어를 코퍼스 빈도표에 더하거나(sign=1) 빼기(sign=-1)"""
+        frequencies = self.index["frequencies"]
+        words = frequencies["words"]
+        counts = Counter(w for s in sentences for w in s.get("normalized", normalize_text(s["text"])).split())
+        for word, count in counts.items():
+            total = words.get(word, 0) + sign * count
+            if total > 0:
+                words[word] = total
+            else:
+                words.pop(word, None)
+        frequencies["total"] = max(frequencies["total"] + sign * sum(counts.values()), 0)
+        self._frequency_version += 1
+
+    def common_words(self) -> set:
+        """코퍼스 빈도 상위 COMMON_WORD_RANK개 단어 (빈도표가 바뀔 때만 다시 계산)"""
+        if self._common_words[0] != self._frequency_version:
+            words = self.index["frequencies"]["words"]
+            ranked = sorted(words, key=words.get, reverse=True)[:COMMON_WORD_RANK]
+            self._common_words = (self._frequency_version, set(ranked))
+        return self._common_words[1]
+
+    def _analyze(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        인덱스 항목의 자막/문장별 통계 열 계산 (말하기 속도, 희귀 단어 비율, 난이도)
+
+        Args:
+            entry: index_subtitle이 만든 인덱스 항목
+
+        Returns:
+            {"version", "corpus_total", "cues": 열, "sentences": 열}
+        """
+        common = self.common_words()
+        cues = analytics_columns([(item["normalized"], item["duration"]) for item in entry["data"]], common)
+        sentences = analytics_columns(
+            [(s["normalized"], s["end"] - s["start"]) for s in entry["sentences"]], common)
+        return {
+            "version": ANALYTICS_VERSION,
+            "corpus_total": self.index["frequencies"]["total"],
+            "cues": cues,
+            "sentences": sentences
+        }
+
+    def refresh_analytics(self) -> List[str]:
+        """
+        코퍼스 빈도표가 ANALYTICS_DRIFT 이상 바뀐 항목의 통계 다시 계산
+
+        Returns:
+            다시 계산한 비디오 ID 목록
+        """
+        with self.lock:
+            total = self.index["frequencies"]["total"]
+            refreshed = []
+            for video_id, entry in self.index["subtitles"].items():
+                analytics = entry.get("analytics")
+                if not analytics or analytics.get("version") != ANALYTICS_VERSION:
+                    continue
+                if abs(analytics["corpus_total"] - total) > ANALYTICS_DRIFT * total:
+                    entry["analytics"] = self._analyze(entry)
+                    refreshed.append(video_id)
+            if refreshed:
+                self.version += 1
+        if refreshed:
+            logger.info(f"자막 통계 재계산: {len(refreshed)}개 (코퍼스 단어 {total}개)")
+        return refreshed
+
     def search_subtitles(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         자막 검색
@@ -124,10 +541,16 @@ class SubtitleIndexer:
             검색 결과 목록
         """
         results = []
+        normalized_query = normalize_text(query)
+        if not normalized_query:
+            return results
         
         for video_id, subtitle_info in self.index["subtitles"].items():
             for item in subtitle_info["data"]:
-                if query.lower() in item["text"].lower():
+                normalized = item.get("normalized")
+                if normalized is None:
+                    normalized = normalize_text(item["text"])
+                if normalized_query in normalized:
                     results.append({
                         "video_id": video_id,
                         "subtitle_item": item,
@@ -152,6 +575,29 @@ class SubtitleIndexer:
         """
         return self.index["subtitles"].get(video_id)
 
+# 인덱스 파일 경로 -> 프로세스 전역 인덱서 (같은 index.json을 여러 객체가 통째로 쓰면 변경이 사라짐)
+_indexers: Dict[str, SubtitleIndexer] = {}
+_indexers_lock = threading.Lock()
+
+
+def get_subtitle_indexer(output_path: Optional[str] = None) -> SubtitleIndexer:
+    """
+    인덱스 파일별로 하나만 만드는 공유 인덱서 반환
+
+    Args:
+        output_path: 인덱스 파일 경로 (기본값: data/subtitles/index.json)
+
+    Returns:
+        같은 경로에 대해 항상 같은 SubtitleIndexer
+    """
+    path = os.path.abspath(output_path or default_index_path())
+    with _indexers_lock:
+        indexer = _indexers.get(path)
+        if indexer is None:
+            indexer = _indexers[path] = SubtitleIndexer(path)
+        return indexer
+
+
 class SubtitleMatcher:
     """자막과 번역을 매칭하는 클래스"""
     
@@ -284,24 +730,23 @@ class SubtitleProcessor:
             config: 설정 (옵션)
         """
         self.config = config or {}
-        self.indexer = SubtitleIndexer()
+        self.indexer = get_subtitle_indexer()
         self.matcher = SubtitleMatcher()
         # 영어 자막 파일 확장자들 (우선순위 순)
         self.en_subtitle_extensions = ['.en.srt', '.en.vtt', '.srt', '.vtt']
 
-    async def get_subtitles(self, video_path: str, language: Optional[str] = None) -> List[Dict[str, Any]]:
+    def find_subtitle_file(self, video_path: str, language: Optional[str] = None) -> Optional[Path]:
         """
-        비디오 파일의 자막 가져오기
+        비디오 파일에 해당하는 자막 파일 찾기
         
         Args:
             video_path: 비디오 파일 경로
             language: 자막 언어 (옵션, 지정 시 해당 언어 자막 우선 처리)
             
         Returns:
-            자막 항목 목록 (텍스트, 시작 시간, 종료 시간 포함)
+            우선순위가 가장 높은 자막 파일 경로 또는 None
         """
         video_path = Path(video_path)
-        logger.info(f"자막 가져오기: {video_path}, 언어: {language}")
         
         # 지원되는 언어 코드 목록
         lang_codes = ['en', 'en-US', 'en-GB', 'ko', 'ja', 'zh-CN', 'zh-TW', 'fr', 'de', 'es']
@@ -341,15 +786,70 @@ class SubtitleProcessor:
         
         if not subtitle_files:
             logger.warning(f"자막 파일을 찾을 수 없음: {video_path}")
-            return []
+            return None
         
         # 가장 우선순위가 높은 자막 파일 사용
-        subtitle_path = subtitle_files[0]
+        return subtitle_files[0]
+
+    def find_generating_subtitle(self, video_path: str, language: Optional[str] = None,
+                                 subtitle_path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Whisper가 생성 중인 자막의 최종 경로 찾기 (진행 상태 파일 기준)
+
+        Args:
+            video_path: 비디오 파일 경로
+            language: 자막 언어 (옵션)
+            subtitle_path: find_subtitle_file로 이미 찾은 자막 경로 (옵션, 다시 만드는 중인지 먼저 확인)
+
+        Returns:
+            생성 중인 자막의 최종 경로 또는 None
+        """
+        video = Path(video_path)
+        candidates = [subtitle_path]
+        if language:
+            candidates.append(video.with_suffix(f".{language.replace('-', '_').lower()}.srt"))
+        candidates.append(video.with_suffix(".srt"))
+        for candidate in candidates:
+            if candidate is not None and get_partial_status(str(candidate)) is not None:
+                return candidate
+        return None
+
+    async def get_subtitles(self, video_path: str, language: Optional[str] = None,
+                            refined: bool = False) -> List[Dict[str, Any]]:
+        """
+        비디오 파일의 자막 가져오기
+        
+        Args:
+            video_path: 비디오 파일 경로
+            language: 자막 언어 (옵션, 지정 시 해당 언어 자막 우선 처리)
+            refined: 인덱싱 때 만든 문장 경계 보정 자막 반환 여부 (없으면 원본, 기본값: 원본 자막)
+            
+        Returns:
+            자막 항목 목록 (텍스트, 시작 시간, 종료 시간 포함)
+        """
+        logger.info(f"자막 가져오기: {video_path}, 언어: {language}")
+        
+        subtitle_path = self.find_subtitle_file(video_path, language)
+        # Whisper가 아직 기록 중인 자막은 진행 중 파일의 부분 결과만 반환하고 인덱스에는 넣지 않음
+        generating = self.find_generating_subtitle(video_path, language, subtitle_path)
+        if generating is not None and partial_subtitle_path(str(generating)).exists():
+            try:
+                return await self._parse_srt(str(partial_subtitle_path(str(generating))), index=False)
+            except Exception as e:
+                logger.error(f"생성 중 자막 파싱 오류: {str(e)}", exc_info=True)
+                return []
+        if subtitle_path is None:
+            return []
         
         try:
             # 자막 파일 형식에 따라 처리
             if subtitle_path.suffix.lower() == '.srt':
-                return await self._parse_srt(str(subtitle_path))
+                # 요청한 경우 인덱싱 때(index_and_translate) 만들어 둔 보정 자막을 그대로 제공.
+                # 보정 자막이 있으면 같은 키의 인덱스 항목은 보정 자막 몫이므로 원본으로 덮어쓰지 않음
+                refined_path = current_refined_path(str(subtitle_path))
+                if refined and refined_path is not None:
+                    return await self._parse_srt(str(refined_path), index=False)
+                return await self._parse_srt(str(subtitle_path), index=refined_path is None)
             elif subtitle_path.suffix.lower() == '.vtt':
                 return await self._parse_vtt(str(subtitle_path))
             else:
@@ -359,12 +859,13 @@ class SubtitleProcessor:
             logger.error(f"자막 파싱 오류: {str(e)}", exc_info=True)
             return []
     
-    async def _parse_srt(self, subtitle_path: str) -> List[Dict[str, Any]]:
+    async def _parse_srt(self, subtitle_path: str, index: bool = True) -> List[Dict[str, Any]]:
         """
         SRT 파일 파싱
         
         Args:
             subtitle_path: SRT 파일 경로
+            index: 파싱한 자막을 인덱스에 반영할지 여부
             
         Returns:
             자막 데이터 리스트
@@ -383,9 +884,10 @@ class SubtitleProcessor:
                 })
             
             # 자막 메타데이터 추가
-            video_id = Path(subtitle_path).stem
-            self.indexer.index_subtitle(subtitle_path, video_id)
-            self.indexer.save_index()
+            if index:
+                video_id = Path(subtitle_path).stem
+                self.indexer.index_subtitle(subtitle_path, video_id)
+                self.indexer.save_index()
             
             logger.info(f"자막 {len(subtitle_data)}개 로드 완료: {subtitle_path}")
             return subtitle_data
@@ -457,6 +959,59 @@ class SubtitleProcessor:
             logger.error(f"VTT 변환 오류: {str(e)}")
             return False
 
+    def refine_subtitles(self, subtitle_path: str, video_path: Optional[str] = None, force: bool = False) -> str:
+        """
+        자막 경계 보정 후 원본 옆에 보정 자막(.refined.srt) 저장
+
+        롤링 자동 자막의 중복 줄과 10ms 연결 자막을 문장 단위 자막으로 합치고,
+        비디오가 있으면 캐시된 RMS 에너지(파형 생성 시 함께 계산)에서 가까운 조용한
+        지점으로 시작/끝을 옮긴다. 원본 자막이나 비디오가 바뀌지 않았으면 다시 계산하지 않는다.
+
+        Args:
+            subtitle_path: 원본 SRT 파일 경로
+            video_path: 비디오 파일 경로 (없으면 경계 이동 없이 합치기만 함)
+            force: 이미 최신 보정 자막이 있어도 다시 생성
+
+        Returns:
+            보정 자막 경로
+        """
+        refined_path = refined_subtitle_path(subtitle_path)
+        sources = [subtitle_path] + ([video_path] if video_path and os.path.exists(video_path) else [])
+        if (not force and refined_path.exists()
+                and refined_path.stat().st_mtime_ns >= max(os.stat(p).st_mtime_ns for p in sources)):
+            return str(refined_path)
+
+        subs = pysrt.open(subtitle_path)
+        cues = _merge_sentences(
+            _rolling_fragments(subs),
+            max_seconds=self.config.get("refine_max_seconds", settings.SUBTITLE_REFINE_MAX_SECONDS),
+            max_gap=self.config.get("refine_max_gap", 0.8)
+        )
+
+        moved = 0
+        if len(sources) > 1:
+            try:
+                from app.services.waveform import WaveformGenerator
+                rms, step = WaveformGenerator().rms_envelope(video_path)
+                moved = _snap_boundaries(cues, rms, step, self.config.get("snap_window", settings.SUBTITLE_SNAP_WINDOW))
+            except Exception as e:
+                logger.warning(f"오디오 에너지 확인 실패, 경계 이동 생략: {video_path} ({str(e)})")
+
+        refined = pysrt.SubRipFile()
+        for i, (start, end, text, _) in enumerate(cues, 1):
+            refined.append(pysrt.SubRipItem(
+                index=i,
+                start=pysrt.SubRipTime.from_ordinal(int(round(start * 1000))),
+                end=pysrt.SubRipTime.from_ordinal(int(round(end * 1000))),
+                text=text
+            ))
+        tmp_path = refined_path.with_name(refined_path.name + ".tmp")
+        refined.save(str(tmp_path), encoding='utf-8')
+        os.replace(tmp_path, refined_path)
+
+        logger.info(f"자막 보정 완료: {subtitle_path} ({len(subs)}개 -> {len(cues)}개, 경계 {moved}개 이동)")
+        return str(refined_path)
+
     def index_and_translate(self, subtitle_path: str, video_id: str, video_path: Optional[str] = None, translation_output: Optional[str] = None) -> Dict[str, Any]:
         """
         자막 인덱싱과 번역을 함께 수행
@@ -470,6 +1025,13 @@ class SubtitleProcessor:
         Returns:
             인덱싱된 자막 데이터
         """
+        # 경계 보정 자막을 인덱싱/번역 (반복 영상 자막이 번역을 같은 문장으로 찾을 수 있게)
+        if settings.SUBTITLE_REFINE:
+            try:
+                subtitle_path = self.refine_subtitles(subtitle_path, video_path)
+            except Exception as e:
+                logger.warning(f"자막 보정 실패, 원본 사용: {subtitle_path} ({str(e)})")
+        
         # 인덱싱
         indexed = self.indexer.index_subtitle(subtitle_path, video_id, video_path)
         
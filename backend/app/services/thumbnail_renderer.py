@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+File: thumbnail_renderer.py
+Description: Pillow + NumPy 기반 프로세스 내 썸네일 합성기 (폰트/템플릿 배경/텍스트 마스크 캐시)
+"""
+
+import re
+import math
+import subprocess
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, List
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from app.common.utils import setup_logger
+
+logger = setup_logger('thumbnail_renderer', 'thumbnail_renderer.log')
+
+# 한글 음절 감지 (폰트 선택용)
+HANGUL_RE = re.compile('[가-힣]')
+
+# 배경 프레임 처리 값
+BACKGROUND_BLUR_RADIUS = 20
+BACKGROUND_DARKEN = 0.7
+BACKGROUND_SCALE = 8  # 배경 프레임을 디코딩/합성하는 축소 배율
+
+# 일괄 추출 시 ffmpeg 한 번에 여는 최대 입력 수
+MAX_BATCH_INPUTS = 32
+
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """'#RRGGBB' 색상 문자열을 RGB 튜플로 변환"""
+    color = color.lstrip('#')
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def decode_frame(video_path: str, time_pos: str, width: int, height: int) -> np.ndarray:
+    """
+    ffmpeg로 지정 위치의 프레임 하나를 RGB 배열로 디코딩 (임시 이미지 파일 없이 파이프 사용)
+
+    Args:
+        video_path: 비디오 파일 경로
+        time_pos: 추출 시간 위치 (00:00:00.000 형식 또는 초)
+        width: 출력 너비
+        height: 출력 높이
+
+    Returns:
+        (height, width, 3) uint8 배열
+    """
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-ss", str(time_pos).replace(',', '.'),
+        "-i", video_path,
+        "-frames:v", "1",
+        "-vf", f"scale={width}:{height}",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "pipe:1"
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True)
+    expected = width * height * 3
+    if len(result.stdout) < expected:
+        raise RuntimeError("프레임 추출에 실패했습니다")
+    return np.frombuffer(result.stdout[:expected], dtype=np.uint8).reshape(height, width, 3)
+
+
+def parse_time_pos(time_pos: Any) -> float:
+    """'HH:MM:SS(,mmm)' / 'MM:SS' / 초 값을 초 단위로 변환"""
+    if isinstance(time_pos, (int, float)):
+        return float(time_pos)
+    seconds = 0.0
+    for part in str(time_pos).replace(',', '.').split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def decode_frames(video_path: str,
+                  times: List[float],
+                  width: int,
+                  height: int,
+                  max_inputs: int = MAX_BATCH_INPUTS) -> List[np.ndarray]:
+    """
+    여러 시간 위치의 프레임을 ffmpeg 한 번(입력 수가 많으면 묶음 단위)으로 디코딩
+
+    시간 위치를 정렬해 입력별로 빠른 탐색(-ss)을 건 뒤 각 입력의 첫 프레임만 잘라
+    concat으로 이어 rawvideo 파이프로 받는다.
+
+    Args:
+        video_path: 비디오 파일 경로
+        times: 시간 위치 목록 (초)
+        width: 출력 너비
+        height: 출력 높이
+        max_inputs: ffmpeg 한 번에 여는 최대 입력 수
+
+    Returns:
+        times와 같은 순서의 (height, width, 3) uint8 배열 목록
+    """
+    order = sorted(range(len(times)), key=lambda i: times[i])
+    frames: List[Optional[np.ndarray]] = [None] * len(times)
+    frame_bytes = width * height * 3
+
+    for start in range(0, len(order), max_inputs):
+        group = order[start:start + max_inputs]
+        cmd = ["ffmpeg", "-v", "error"]
+        filters = []
+        for n, i in enumerate(group):
+            cmd += ["-ss", f"{max(times[i], 0.0):.3f}", "-i", video_path]
+            filters.append(f"[{n}:v]trim=end_frame=1,setpts=PTS-STARTPTS,scale={width}:{height},setsar=1[v{n}]")
+        filters.append("".join(f"[v{n}]" for n in range(len(group))) + f"concat=n={len(group)}:v=1:a=0[out]")
+        cmd += [
+            "-filter_complex", ";".join(filters),
+            "-map", "[out]",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "pipe:1"
+        ]
+
+        result = subprocess.run(cmd, check=True, capture_output=True)
+        if len(result.stdout) < frame_bytes * len(group):
+            raise RuntimeError(f"프레임 일괄 추출에 실패했습니다 ({len(result.stdout) // frame_bytes}/{len(group)})")
+        data = np.frombuffer(result.stdout, dtype=np.uint8)
+        for n, i in enumerate(group):
+            frames[i] = data[n * frame_bytes:(n + 1) * frame_bytes].reshape(height, width, 3)
+
+    return frames
+
+
+def build_contact_sheet(frames: List[np.ndarray], columns: int = 10) -> Tuple[Image.Image, List[Tuple[int, int, int, int]]]:
+    """
+    같은 크기의 프레임들을 격자 한 장으로 배치
+
+    Returns:
+        (시트 이미지, 프레임별 (x, y, w, h) 위치)
+    """
+    tile_h, tile_w = frames[0].shape[:2]
+    columns = max(1, min(columns, len(frames)))
+    rows = (len(frames) + columns - 1) // columns
+    sheet = np.zeros((rows * tile_h, columns * tile_w, 3), dtype=np.uint8)
+    boxes = []
+    for n, frame in enumerate(frames):
+        x, y = (n % columns) * tile_w, (n // columns) * tile_h
+        sheet[y:y + tile_h, x:x + tile_w] = frame
+        boxes.append((x, y, tile_w, tile_h))
+    return Image.fromarray(sheet), boxes
+
+
+@lru_cache(maxsize=64)
+def load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """폰트 파일 로드 (경로/크기별 캐시)"""
+    try:
+        return ImageFont.truetype(font_path, size)
+    except OSError:
+        logger.warning(f"폰트를 불러올 수 없어 기본 폰트 사용: {font_path}")
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=32)
+def template_background(width: int,
+                        height: int,
+                        color: str,
+                        gradient_end: Optional[str],
+                        alpha: float) -> Tuple[np.ndarray, float]:
+    """
+    템플릿 배경 레이어 (템플릿/크기별로 한 번만 생성)
+
+    Returns:
+        (alpha가 곱해진 float32 색상 레이어, 프레임에 곱할 가중치)
+    """
+    start = np.array(_hex_to_rgb(color), dtype=np.float32)
+    if gradient_end:
+        # 왼쪽 위 → 오른쪽 아래 대각선 그라데이션
+        end = np.array(_hex_to_rgb(gradient_end), dtype=np.float32)
+        ys = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+        xs = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :]
+        t = ((xs + ys) / 2.0)[:, :, None]
+        layer = start * (1.0 - t) + end * t
+    else:
+        layer = np.broadcast_to(start, (height, width, 3)).astype(np.float32)
+
+    layer = layer * alpha
+    layer.setflags(write=False)
+    return layer, (1.0 - alpha) * BACKGROUND_DARKEN
+
+
+def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> str:
+    """최대 너비를 넘지 않도록 단어 단위 줄바꿈"""
+    lines: List[str] = []
+    for paragraph in text.split('\n'):
+        current = ""
+        for word in paragraph.split(' '):
+            candidate = f"{current} {word}" if current else word
+            if current and font.getlength(candidate) > max_width:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        lines.append(current)
+    return '\n'.join(lines)
+
+
+@lru_cache(maxsize=256)
+def text_mask(text: str,
+              font_path: str,
+              size: int,
+              max_width: int,
+              stroke_width: int = 0,
+              spacing: int = 8) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    텍스트 커버리지 마스크 생성 (텍스트/폰트/크기별 캐시)
+
+    Returns:
+        (글자 마스크, 외곽선 마스크 또는 None) - 0~1 float32 배열, 같은 크기
+    """
+    font = load_font(font_path, size)
+    wrapped = wrap_text(text, font, max_width)
+
+    probe = ImageDraw.Draw(Image.new("L", (1, 1)))
+    left, top, right, bottom = probe.multiline_textbbox(
+        (0, 0), wrapped, font=font, spacing=spacing, align="center", stroke_width=stroke_width
+    )
+    left, top = math.floor(left), math.floor(top)
+    size_wh = (max(1, math.ceil(right) - left), max(1, math.ceil(bottom) - top))
+    origin = (-left, -top)
+
+    fill = Image.new("L", size_wh, 0)
+    ImageDraw.Draw(fill).multiline_text(origin, wrapped, font=font, fill=255, spacing=spacing, align="center")
+    fill_mask = np.asarray(fill, dtype=np.float32) / 255.0
+    fill_mask.setflags(write=False)
+
+    stroke_mask = None
+    if stroke_width:
+        stroke = Image.new("L", size_wh, 0)
+        ImageDraw.Draw(stroke).multiline_text(
+            origin, wrapped, font=font, fill=255, spacing=spacing, align="center",
+            stroke_width=stroke_width, stroke_fill=255
+        )
+        stroke_mask = np.asarray(stroke, dtype=np.float32) / 255.0
+        stroke_mask.setflags(write=False)
+
+    return fill_mask, stroke_mask
+
+
+@lru_cache(maxsize=64)
+def _blurred_mask(text: str, font_path: str, size: int, max_width: int, radius: float) -> np.ndarray:
+    """그림자용으로 흐리게 처리한 텍스트 마스크 (텍스트별 캐시)"""
+    fill_mask, _ = text_mask(text, font_path, size, max_width, 0)
+    pad = int(radius * 2)
+    image = Image.fromarray((fill_mask * 255).astype(np.uint8))
+    padded = Image.new("L", (image.width + pad * 2, image.height + pad * 2), 0)
+    padded.paste(image, (pad, pad))
+    blurred = np.asarray(padded.filter(ImageFilter.GaussianBlur(radius)), dtype=np.float32) / 255.0
+    blurred.setflags(write=False)
+    return blurred
+
+
+def blend(canvas: Image.Image, mask: np.ndarray, color: Tuple[int, int, int], x: int, y: int) -> None:
+    """
+    마스크 모양으로 색을 캔버스에 합성
+
+    전체 프레임이 아니라 마스크가 덮는 영역만 잘라 NumPy로 계산한 뒤 다시 붙여넣는다.
+    """
+    h, w = mask.shape
+    W, H = canvas.size
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(W, x + w), min(H, y + h)
+    if x1 <= x0 or y1 <= y0:
+        return
+    m = mask[y0 - y:y1 - y, x0 - x:x1 - x, None]
+    region = np.asarray(canvas.crop((x0, y0, x1, y1)), dtype=np.float32)
+    region += (np.asarray(color, dtype=np.float32) - region) * m
+    canvas.paste(Image.fromarray((region + 0.5).astype(np.uint8)), (x0, y0))
+
+
+class ThumbnailRenderer:
+    """프레임 한 장 위에 템플릿 배경과 텍스트 레이어를 합성하는 클래스"""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        ThumbnailRenderer 초기화
+
+        Args:
+            config: ThumbnailGenerator 설정 (width, height, 폰트, 그림자, templates 등)
+        """
+        self.config = config
+        self.width = config["width"]
+        self.height = config["height"]
+
+    def _font_for(self, text: str) -> str:
+        """텍스트에 한글이 있으면 한글 폰트 경로 반환"""
+        if HANGUL_RE.search(text):
+            return self.config.get("font_ko", self.config["font"])
+        return self.config["font"]
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        """
+        디코딩할 프레임 크기 (너비, 높이)
+
+        프레임은 흐리게 처리된 뒤 배경색 아래에 깔리기만 하므로
+        출력 해상도의 1/BACKGROUND_SCALE 크기로 디코딩해도 결과가 같다.
+        """
+        return max(1, self.width // BACKGROUND_SCALE), max(1, self.height // BACKGROUND_SCALE)
+
+    def background(self, frame: np.ndarray, template_config: Dict[str, Any]) -> Image.Image:
+        """
+        프레임을 흐리고 어둡게 만든 뒤 템플릿 배경색을 덮은 캔버스 생성
+
+        블러와 색 합성은 축소된 해상도에서 처리하고 마지막에 한 번만 확대한다.
+        """
+        small_w, small_h = self.frame_size
+        image = Image.fromarray(frame)
+        if image.size != (small_w, small_h):
+            image = image.resize((small_w, small_h), Image.BOX)
+        blurred = image.filter(ImageFilter.BoxBlur(BACKGROUND_BLUR_RADIUS / BACKGROUND_SCALE))
+
+        gradient = template_config.get("gradient", False)
+        layer, frame_weight = template_background(
+            small_w,
+            small_h,
+            template_config.get("background_color", self.config["background_color"]),
+            template_config.get("gradient_end", "#000000") if gradient else None,
+            0.9 if gradient else 0.85
+        )
+        tinted = np.asarray(blurred, dtype=np.float32) * frame_weight + layer
+        tinted = Image.fromarray((tinted + 0.5).astype(np.uint8))
+        return tinted.resize((self.width, self.height), Image.BILINEAR)
+
+    def draw_text(self,
+                  canvas: Image.Image,
+                  text: str,
+                  size: int,
+                  color: str,
+                  anchor: Tuple[float, float],
+                  bottom_margin: Optional[int] = None,
+                  box: Optional[Dict[str, Any]] = None,
+                  border: Optional[Dict[str, Any]] = None) -> None:
+        """
+        텍스트 레이어 합성 (그림자, 배경 상자, 외곽선 포함)
+
+        Args:
+            canvas: RGB 캔버스 (제자리 수정)
+            text: 텍스트
+            size: 폰트 크기
+            color: 글자 색상
+            anchor: 남는 공간 대비 위치 비율 (x, y)
+            bottom_margin: 지정하면 세로 위치를 하단 여백 기준으로 계산
+            box: 배경 상자 설정 (color, padding, radius)
+            border: 외곽선 설정 (color, width)
+        """
+        font_path = self._font_for(text)
+        max_width = self.width - self.config["margin"] * 2
+        stroke_width = border["width"] if border else 0
+        fill_mask, stroke_mask = text_mask(text, font_path, size, max_width, stroke_width)
+        h, w = fill_mask.shape
+
+        x = int((self.width - w) * anchor[0])
+        if bottom_margin is not None:
+            y = self.height - h - bottom_margin
+        else:
+            y = int((self.height - h) * anchor[1])
+
+        if box:
+            padding = box.get("padding", 20)
+            box_image = Image.new("L", (w + padding * 2, h + padding * 2), 0)
+            ImageDraw.Draw(box_image).rounded_rectangle(
+                (0, 0, box_image.width - 1, box_image.height - 1), radius=box.get("radius", 0), fill=255
+            )
+            blend(canvas, np.asarray(box_image, dtype=np.float32) / 255.0, _hex_to_rgb(box["color"]), x - padding, y - padding)
+
+        if border:
+            blend(canvas, stroke_mask, _hex_to_rgb(border["color"]), x, y)
+        elif self.config["shadow"]["enabled"]:
+            shadow = self.config["shadow"]
+            radius = shadow.get("blur", 0)
+            dx, dy = shadow["offset"]
+            if radius:
+                pad = int(radius * 2)
+                blend(canvas, _blurred_mask(text, font_path, size, max_width, radius),
+                      _hex_to_rgb(shadow["color"]), x + dx - pad, y + dy - pad)
+            else:
+                blend(canvas, fill_mask, _hex_to_rgb(shadow["color"]), x + dx, y + dy)
+
+        blend(canvas, fill_mask, _hex_to_rgb(color), x, y)
+
+    def render(self,
+               frame: np.ndarray,
+               template_config: Dict[str, Any],
+               text: Optional[str] = None,
+               subtitle: Optional[str] = None) -> Image.Image:
+        """
+        썸네일 이미지 합성
+
+        Args:
+            frame: (height, width, 3) uint8 프레임 (frame_size 크기 권장)
+            template_config: 템플릿 설정
+            text: 중앙 텍스트 (옵션)
+            subtitle: 하단 자막 텍스트 (옵션)
+
+        Returns:
+            합성된 PIL 이미지
+        """
+        canvas = self.background(frame, template_config)
+
+        if text:
+            self.draw_text(
+                canvas,
+                text,
+                template_config.get("font_size", self.config["font_size"]),
+                template_config.get("text_color", self.config["text_color"]),
+                tuple(template_config.get("text_position", [0.5, 0.4])),
+                box=template_config["box"] if template_config.get("box", {}).get("enabled") else None
+            )
+
+        if subtitle:
+            self.draw_text(
+                canvas,
+                subtitle,
+                template_config.get("subtitle_size", self.config["subtitle_size"]),
+                template_config.get("subtitle_color", self.config["subtitle_color"]),
+                (0.5, 1.0),
+                bottom_margin=self.config["margin"],
+                border=template_config["border"] if template_config.get("border", {}).get("enabled") else None
+            )
+
+        return canvas
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+File: tts.py
+Description: 문장 단위 TTS 합성 서비스 (교체 가능한 엔진, 디스크 LRU 캐시, 동시 요청 병합)
+"""
+
+import os
+import json
+import time
+import wave
+import asyncio
+import hashlib
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+
+logger = setup_logger('tts', 'tts.log')
+
+# 최근 이 시간(초) 안에 사용한 캐시 파일은 정리하지 않음 (반환 직후 사용 중인 파일 보호)
+EVICTION_GRACE_SECONDS = 120
+
+
+class TTSEngine:
+    """TTS 엔진 인터페이스"""
+
+    name = "base"
+    extension = ".mp3"
+
+    async def synthesize(self, text: str, voice: str, speed: float, pitch: int, output_path: str) -> None:
+        """
+        텍스트를 음성 파일로 합성
+
+        Args:
+            text: 합성할 문장
+            voice: 음성 이름
+            speed: 속도 배율 (1.0 = 기본)
+            pitch: 음높이 조절 (Hz)
+            output_path: 출력 파일 경로
+        """
+        raise NotImplementedError
+
+
+class EdgeTTSEngine(TTSEngine):
+    """edge-tts 엔진 (Microsoft Edge 온라인 음성)"""
+
+    name = "edge-tts"
+    extension = ".mp3"
+
+    async def synthesize(self, text: str, voice: str, speed: float, pitch: int, output_path: str) -> None:
+        import edge_tts
+        communicate = edge_tts.Communicate(
+            text,
+            voice,
+            rate=f"{int(round((speed - 1.0) * 100)):+d}%",
+            pitch=f"{int(pitch):+d}Hz"
+        )
+        await communicate.save(output_path)
+
+
+class GTTSEngine(TTSEngine):
+    """gTTS 엔진 (Google Translate 음성, 속도는 느림/보통만 지원하고 음높이는 무시)"""
+
+    name = "gtts"
+    extension = ".mp3"
+
+    async def synthesize(self, text: str, voice: str, speed: float, pitch: int, output_path: str) -> None:
+        from gtts import gTTS
+
+        def save():
+            # 음성 이름의 언어-지역 부분만 사용 (en-US-GuyNeural -> en)
+            gTTS(text, lang=(voice or "en").split("-")[0], slow=speed < 0.8).save(output_path)
+
+        await asyncio.to_thread(save)
+
+
+class OfflineTTSEngine(TTSEngine):
+    """
+    네트워크 없이 동작하는 로컬 엔진 (테스트/오프라인용)
+
+    espeak-ng(또는 espeak)가 있으면 사용하고, 없으면 단어 수에 비례하는 길이의
+    합성음을 만들어 타이밍을 흉내 낸다.
+    """
+
+    name = "offline"
+    extension = ".wav"
+    sample_rate = 24000
+
+    async def synthesize(self, text: str, voice: str, speed: float, pitch: int, output_path: str) -> None:
+        espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        if espeak:
+            cmd = [espeak, "-v", (voice or "en").split("-")[0], "-s", str(int(175 * speed)),
+                   "-p", str(max(0, min(99, 50 + int(pitch) // 2))), "-w", output_path, text]
+            await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True)
+            return
+        await asyncio.to_thread(self._write_tone, text, speed, pitch, output_path)
+
+    def _write_tone(self, text: str, speed: float, pitch: int, output_path: str) -> None:
+        """단어마다 짧은 음을 넣은 16bit 모노 WAV 작성"""
+        words = max(1, len(text.split()))
+        word_samples = int(self.sample_rate * 0.3 / max(speed, 0.1))
+        gap = np.zeros(int(word_samples * 0.2), dtype=np.float32)
+        t = np.arange(word_samples, dtype=np.float32) / self.sample_rate
+        tone = 0.3 * np.sin(2 * np.pi * (220 + int(pitch)) * t) * np.hanning(word_samples)
+        signal = np.concatenate([np.concatenate([tone, gap]) for _ in range(words)])
+        with wave.open(output_path, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.sample_rate)
+            f.writeframes((signal * 32767).astype('<i2').tobytes())
+
+
+# 사용 가능한 엔진 (설정/요청의 provider 이름 -> 엔진 클래스)
+ENGINES = {
+    EdgeTTSEngine.name: EdgeTTSEngine,
+    GTTSEngine.name: GTTSEngine,
+    OfflineTTSEngine.name: OfflineTTSEngine
+}
+
+
+class TTSService:
+    """문장 음성 합성과 디스크 캐시 관리 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        TTSService 초기화
+
+        Args:
+            config: 설정 (옵션) - provider, voice, speed, pitch, cache_dir, cache_max_mb, max_concurrent
+        """
+        self.config = config or {}
+        self.provider = self.config.get("provider", settings.TTS_PROVIDER)
+        self.voice = self.config.get("voice", "en-US-GuyNeural")
+        self.speed = float(self.config.get("speed", 1.0))
+        self.pitch = int(self.config.get("pitch", 0))
+        self.cache_dir = Path(self.config.get("cache_dir", settings.TTS_CACHE_DIR))
+        self.cache_max_bytes = int(self.config.get("cache_max_mb", settings.TTS_CACHE_MAX_MB)) * 1024 * 1024
+        self.max_concurrent = int(self.config.get("max_concurrent", settings.TTS_MAX_CONCURRENT))
+        self._engines: Dict[str, TTSEngine] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache_bytes: Optional[int] = None
+
+    def _engine(self, provider: str) -> TTSEngine:
+        """엔진 인스턴스 (provider별로 하나)"""
+        if provider not in ENGINES:
+            raise ValueError(f"지원하지 않는 TTS 엔진입니다: {provider}")
+        if provider not in self._engines:
+            self._engines[provider] = ENGINES[provider]()
+        return self._engines[provider]
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """캐시 키용 문장 정규화 (공백 정리)"""
+        return " ".join((text or "").split())
+
+    def cache_path(self, text: str, voice: str, speed: float, pitch: int, provider: str) -> Path:
+        """(문장, 음성, 속도, 음높이, 엔진)에 해당하는 캐시 파일 경로"""
+        raw = json.dumps([provider, self._normalize(text), voice, round(speed, 3), int(pitch)], ensure_ascii=False)
+        key = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return self.cache_dir / key[:2] / f"{key}{self._engine(provider).extension}"
+
+    async def synthesize(self,
+                         text: str,
+                         voice: Optional[str] = None,
+                         speed: Optional[float] = None,
+                         pitch: Optional[int] = None,
+                         provider: Optional[str] = None) -> str:
+        """
+        문장 음성 합성 (캐시에 있으면 재사용, 같은 문장의 동시 요청은 한 번만 합성)
+
+        Args:
+            text: 합성할 문장
+            voice: 음성 이름 (기본값: 설정)
+            speed: 속도 배율 (기본값: 설정)
+            pitch: 음높이 조절 Hz (기본값: 설정)
+            provider: 엔진 이름 (기본값: 설정)
+
+        Returns:
+            음성 파일 경로
+        """
+        text = self._normalize(text)
+        if not text:
+            raise ValueError("합성할 문장이 비어 있습니다")
+        voice = voice or self.voice
+        speed = self.speed if speed is None else float(speed)
+        pitch = self.pitch if pitch is None else int(pitch)
+        provider = provider or self.provider
+
+        path = self.cache_path(text, voice, speed, pitch, provider)
+        if path.exists():
+            # 최근 사용 시각 갱신 (LRU 정리 기준)
+            os.utime(path, None)
+            return str(path)
+
+        key = str(path)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            await self._synthesize_to(path, text, voice, speed, pitch, provider)
+            future.set_result(key)
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없을 때 "예외를 가져가지 않음" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        return key
+
+    async def _synthesize_to(self, path: Path, text: str, voice: str, speed: float, pitch: int, provider: str) -> None:
+        """동시 합성 수를 제한해 임시 파일로 합성한 뒤 캐시에 넣음"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrent))
+
+        ensure_dir_exists(str(path.parent))
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")
+        async with self._semaphore:
+            try:
+                await self._engine(provider).synthesize(text, voice, speed, pitch, str(tmp_path))
+                if not tmp_path.exists() or tmp_path.stat().st_size == 0:
+                    raise RuntimeError("TTS 결과 파일이 생성되지 않았습니다")
+                os.replace(tmp_path, path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+        logger.info(f"TTS 합성: {provider}/{voice} ({len(text)}자) -> {path.name}")
+        await asyncio.to_thread(self._account, path)
+
+    async def synthesize_many(self, texts: List[str], **options) -> List[str]:
+        """
+        여러 문장을 동시에 합성 (중복 문장은 한 번만 합성)
+
+        Args:
+            texts: 문장 목록
+            **options: synthesize에 전달할 voice, speed, pitch, provider
+
+        Returns:
+            입력 순서와 같은 음성 파일 경로 목록
+        """
+        unique = list(dict.fromkeys(self._normalize(t) for t in texts))
+        paths = await asyncio.gather(*(self.synthesize(t, **options) for t in unique))
+        by_text = dict(zip(unique, paths))
+        return [by_text[self._normalize(t)] for t in texts]
+
+    def _account(self, added: Path) -> None:
+        """캐시 크기를 누적하고 한도를 넘으면 오래 사용하지 않은 파일부터 삭제"""
+        # 다른 정리 작업이 이미 지웠으면 크기만 다시 계산
+        if not added.exists():
+            self._cache_bytes = None
+            return
+        if self._cache_bytes is None:
+            self._cache_bytes = sum(p.stat().st_size for p in self.cache_dir.rglob("*") if p.is_file())
+        else:
+            self._cache_bytes += added.stat().st_size
+        if self._cache_bytes > self.cache_max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        캐시를 한도의 90%까지 줄임 (최근 사용 시각이 오래된 순, 방금 사용한 파일 제외)
+
+        Returns:
+            삭제한 파일 수
+        """
+        files = []
+        for p in self.cache_dir.rglob("*"):
+            try:
+                if p.is_file() and ".tmp" not in p.name:
+                    stat = p.stat()
+                    files.append((stat.st_mtime, stat.st_size, p))
+            except OSError:
+                continue
+        total = sum(size for _, size, _ in files)
+        target = int(self.cache_max_bytes * 0.9)
+        cutoff = time.time() - EVICTION_GRACE_SECONDS
+
+        removed = 0
+        for mtime, size, p in sorted(files):
+            if total <= target or mtime > cutoff:
+                break
+            try:
+                p.unlink()
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                total -= size
+            except OSError as e:
+                logger.warning(f"TTS 캐시 삭제 실패: {p} ({str(e)})")
+        self._cache_bytes = total
+        if removed:
+            logger.info(f"TTS 캐시 정리: {removed}개 삭제, 현재 {total / 1024 / 1024:.1f}MB")
+        return removed
+
+
+# 애플리케이션 전역 TTS 서비스 인스턴스 (캐시 크기/진행 중인 합성을 공유)
+_tts_service: Optional[TTSService] = None
+
+
+def get_tts_service() -> TTSService:
+    """전역 TTS 서비스 반환 (최초 호출 시 생성)"""
+    global _tts_service
+    if _tts_service is None:
+        _tts_service = TTSService()
+    return _tts_service
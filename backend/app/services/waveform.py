@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+File: waveform.py
+Description: 자막 경계 편집용 오디오 파형(min/max 피크) 사전 계산
+
+오디오를 한 번만 디코딩해 여러 확대 단계의 피크를 하나의 바이너리 파일에 저장한다.
+파일은 단계별로 [min0, max0, min1, max1, ...] 배열을 이어 붙인 형태이고, 각 단계의
+바이트 오프셋은 매니페스트(JSON)에 기록한다. 편집기는 매니페스트를 받은 뒤 화면에
+보이는 구간만 HTTP Range로 요청하고, 서버도 np.memmap으로 필요한 부분만 읽는다.
+같은 디코딩에서 가장 세밀한 단계 블록별 RMS 에너지도 계산해 두어 자막 경계 보정에 사용한다.
+"""
+
+import os
+import glob
+import json
+import hashlib
+import subprocess
+from pathlib import Path
+from urllib.parse import quote
+from typing import Dict, Any, Optional, List, Tuple
+
+import numpy as np
+
+from app.common.utils import setup_logger, ensure_dir_exists
+from app.config import settings
+
+logger = setup_logger('waveform', 'waveform.log')
+
+# 피크 파일을 제공하는 API 경로
+WAVEFORM_URL_PREFIX = "/api/youtube/waveform/data"
+
+PEAKS_SUFFIX = ".peaks"
+RMS_SUFFIX = ".rms"
+MANIFEST_SUFFIX = ".json"
+FORMAT_VERSION = 1
+
+# 디코딩 샘플링 레이트 (파형 표시에는 16kHz면 충분하고 Whisper 입력과 같음)
+SAMPLE_RATE = 16000
+
+# 한 번에 읽는 디코딩 출력 크기 (샘플 수, 가장 작은 단계 블록의 배수로 맞춤)
+READ_SAMPLES = 1 << 20
+
+
+class WaveformGenerator:
+    """비디오별 다단계 피크 파일 생성/조회 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        WaveformGenerator 초기화
+
+        Args:
+            config: 설정 (옵션) - samples_per_peak(가장 세밀한 단계), levels, zoom_factor, bits, output_dir
+        """
+        self.config = config or {}
+        self.samples_per_peak = int(self.config.get("samples_per_peak", settings.WAVEFORM_SAMPLES_PER_PEAK))
+        self.levels = max(1, int(self.config.get("levels", settings.WAVEFORM_LEVELS)))
+        self.zoom_factor = max(2, int(self.config.get("zoom_factor", 4)))
+        self.bits = int(self.config.get("bits", settings.WAVEFORM_BITS))
+        if self.bits not in (8, 16):
+            raise ValueError(f"파형 비트 수는 8 또는 16이어야 합니다: {self.bits}")
+        self.dtype = np.dtype(np.int8 if self.bits == 8 else '<i2')
+        self.output_dir = Path(self.config.get("output_dir", settings.WAVEFORM_DIR))
+
+    def _target_base(self, video_path: str) -> Path:
+        """원본 파일/피크 옵션이 바뀌면 달라지는 버전별 파일 경로 (확장자 제외)"""
+        stat = os.stat(video_path)
+        raw = (f"{FORMAT_VERSION}|{os.path.realpath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|"
+               f"{self.samples_per_peak}|{self.levels}|{self.zoom_factor}|{self.bits}")
+        key = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+        return self.output_dir / f"{Path(video_path).stem}-{key}"
+
+    def find(self, video_path: str) -> Optional[Dict[str, Any]]:
+        """
+        원본에 해당하는 최신 피크 매니페스트 (없으면 None)
+        """
+        try:
+            base = self._target_base(video_path)
+            with open(f"{base}{MANIFEST_SUFFIX}", 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not (os.path.exists(f"{base}{PEAKS_SUFFIX}") and os.path.exists(f"{base}{RMS_SUFFIX}")):
+            return None
+        return manifest
+
+    def _decode_peaks(self, video_path: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        ffmpeg 출력(16bit PCM)을 파이프로 조금씩 읽어 가장 세밀한 단계의 (min, max)와 RMS 계산
+
+        오디오 전체를 메모리나 임시 WAV로 만들지 않는다.
+
+        Returns:
+            (int16 배열 (피크 수, 2), float32 RMS 배열 (0~1), 전체 샘플 수)
+        """
+        cmd = [
+            "ffmpeg", "-v", "error",
+            "-i", video_path,
+            "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+            "-f", "s16le", "-c:a", "pcm_s16le",
+            "pipe:1"
+        ]
+        logger.debug(f"파형 디코딩 명령: {' '.join(cmd)}")
+        block = self.samples_per_peak
+        read_bytes = (READ_SAMPLES // block) * block * 2
+        chunks: List[np.ndarray] = []
+        rms_chunks: List[np.ndarray] = []
+        pending = b""
+        total_bytes = 0
+
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            while True:
+                data = process.stdout.read(read_bytes)
+                if not data:
+                    break
+                total_bytes += len(data)
+                data = pending + data
+                usable = len(data) - len(data) % (block * 2)
+                pending = data[usable:]
+                if usable:
+                    frames = np.frombuffer(data[:usable], dtype='<i2').reshape(-1, block)
+                    chunks.append(np.stack([frames.min(axis=1), frames.max(axis=1)], axis=1))
+                    rms_chunks.append(self._block_rms(frames))
+            # 끝에 남은 블록 일부도 하나의 피크로 사용
+            if len(pending) >= 2:
+                tail = np.frombuffer(pending[:len(pending) - len(pending) % 2], dtype='<i2')
+                chunks.append(np.array([[tail.min(), tail.max()]], dtype=np.int16))
+                rms_chunks.append(self._block_rms(tail.reshape(1, -1)))
+            stderr = process.stderr.read().decode('utf-8', 'replace')
+            if process.wait() != 0:
+                raise RuntimeError(f"오디오 디코딩 실패: {stderr.strip()[-500:]}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+        if not chunks:
+            return np.zeros((0, 2), dtype=np.int16), np.zeros(0, dtype=np.float32), 0
+        return np.concatenate(chunks).astype(np.int16), np.concatenate(rms_chunks), total_bytes // 2
+
+    @staticmethod
+    def _block_rms(frames: np.ndarray) -> np.ndarray:
+        """블록(행)별 RMS (0~1)"""
+        values = frames.astype(np.float32) / 32768.0
+        return np.sqrt(np.mean(values * values, axis=1))
+
+    def _quantize(self, peaks: np.ndarray) -> np.ndarray:
+        """int16 피크를 저장 형식으로 변환 (8bit는 최솟값은 내림, 최댓값은 올림해 파형이 작아지지 않게 함)"""
+        if self.bits == 16:
+            return peaks.astype(self.dtype)
+        low = np.floor_divide(peaks[:, 0].astype(np.int32), 256)
+        high = -np.floor_divide(-peaks[:, 1].astype(np.int32), 256)
+        return np.clip(np.stack([low, high], axis=1), -128, 127).astype(self.dtype)
+
+    def _zoom_levels(self, base: np.ndarray) -> List[np.ndarray]:
+        """가장 세밀한 단계에서 zoom_factor배씩 묶은 단계들 계산"""
+        levels = [base]
+        for _ in range(1, self.levels):
+            prev = levels[-1]
+            if len(prev) <= 1:
+                break
+            factor = self.zoom_factor
+            full = len(prev) // factor * factor
+            groups = prev[:full].reshape(-1, factor, 2)
+            merged = np.stack([groups[:, :, 0].min(axis=1), groups[:, :, 1].max(axis=1)], axis=1)
+            if full < len(prev):
+                rest = prev[full:]
+                merged = np.concatenate([merged, [[rest[:, 0].min(), rest[:, 1].max()]]])
+            levels.append(merged.astype(prev.dtype))
+        return levels
+
+    def generate(self, video_path: str, force: bool = False) -> Dict[str, Any]:
+        """
+        피크 파일과 매니페스트 생성
+
+        Args:
+            video_path: 비디오(또는 오디오) 파일 경로
+            force: 이미 최신 파일이 있어도 다시 생성
+
+        Returns:
+            매니페스트 (url, sample_rate, bits, duration, levels[{samples_per_peak, seconds_per_peak, offset, count}])
+        """
+        if not force:
+            existing = self.find(video_path)
+            if existing is not None:
+                return existing
+
+        base = self._target_base(video_path)
+        peaks_path = Path(f"{base}{PEAKS_SUFFIX}")
+        manifest_path = Path(f"{base}{MANIFEST_SUFFIX}")
+        ensure_dir_exists(str(self.output_dir))
+
+        peaks, rms, total_samples = self._decode_peaks(video_path)
+        levels = self._zoom_levels(self._quantize(peaks))
+
+        level_info = []
+        offset = 0
+        samples_per_peak = self.samples_per_peak
+        for level in levels:
+            level_info.append({
+                "samples_per_peak": samples_per_peak,
+                "seconds_per_peak": samples_per_peak / SAMPLE_RATE,
+                "offset": offset,
+                "count": len(level)
+            })
+            offset += level.nbytes
+            samples_per_peak *= self.zoom_factor
+
+        tmp_path = peaks_path.with_name(peaks_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            for level in levels:
+                f.write(level.tobytes())
+        os.replace(tmp_path, peaks_path)
+
+        rms_path = Path(f"{base}{RMS_SUFFIX}")
+        tmp_rms = rms_path.with_name(rms_path.name + ".tmp")
+        rms.astype('<f2').tofile(tmp_rms)
+        os.replace(tmp_rms, rms_path)
+
+        manifest = {
+            "version": FORMAT_VERSION,
+            "video_path": os.path.realpath(video_path),
+            "url": f"{WAVEFORM_URL_PREFIX}/{quote(peaks_path.name)}",
+            "sample_rate": SAMPLE_RATE,
+            "bits": self.bits,
+            "layout": "interleaved min/max per peak, little-endian",
+            "duration": total_samples / SAMPLE_RATE,
+            "size": offset,
+            "levels": level_info,
+            "rms_seconds_per_value": self.samples_per_peak / SAMPLE_RATE
+        }
+        tmp_manifest = manifest_path.with_name(manifest_path.name + ".tmp")
+        with open(tmp_manifest, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_manifest, manifest_path)
+        self._remove_old_versions(video_path, base)
+
+        logger.info(f"파형 생성 완료: {video_path} ({len(levels[0])}개 피크, {len(levels)}단계, {offset / 1024:.0f}KB)")
+        return manifest
+
+    def read_peaks(self, video_path: str, level: int, start: float, end: float) -> Optional[np.ndarray]:
+        """
+        한 단계의 [start, end] 구간 피크를 memmap으로 읽기 (파일 전체를 올리지 않음)
+
+        Args:
+            video_path: 비디오 경로
+            level: 확대 단계 (0이 가장 세밀함)
+            start: 시작 (초)
+            end: 종료 (초)
+
+        Returns:
+            (피크 수, 2) 배열 (아직 생성되지 않았으면 None)
+        """
+        manifest = self.find(video_path)
+        if manifest is None:
+            return None
+        info = manifest["levels"][max(0, min(level, len(manifest["levels"]) - 1))]
+        if info["count"] == 0:
+            return np.zeros((0, 2), dtype=self.dtype)
+        first = max(0, min(int(start / info["seconds_per_peak"]), info["count"]))
+        last = max(first, min(int(np.ceil(end / info["seconds_per_peak"])), info["count"]))
+        peaks = np.memmap(f"{self._target_base(video_path)}{PEAKS_SUFFIX}", dtype=self.dtype, mode='r',
+                          offset=info["offset"], shape=(info["count"], 2))
+        return np.array(peaks[first:last])
+
+    def rms_envelope(self, video_path: str) -> Tuple[np.ndarray, float]:
+        """
+        가장 세밀한 단계 블록별 RMS 에너지 (없으면 생성, memmap으로 반환)
+
+        Args:
+            video_path: 비디오 경로
+
+        Returns:
+            (RMS 배열 (0~1), 값 하나의 길이 (초))
+        """
+        manifest = self.generate(video_path)
+        rms_path = f"{self._target_base(video_path)}{RMS_SUFFIX}"
+        if os.path.getsize(rms_path) == 0:
+            return np.zeros(0, dtype='<f2'), manifest["rms_seconds_per_value"]
+        return np.memmap(rms_path, dtype='<f2', mode='r'), manifest["rms_seconds_per_value"]
+
+    def _remove_old_versions(self, video_path: str, current: Path) -> None:
+        """같은 이름 원본의 이전 피크 파일 삭제"""
+        for old_path in self.output_dir.glob(f"{glob.escape(Path(video_path).stem)}-*"):
+            # 이름 뒤에 버전 키(12자리)만 붙은 파일만 대상 (다른 원본의 파일 보호)
+            old_base = old_path.with_suffix("")
+            if old_base == current or len(old_base.name) != len(current.name):
+                continue
+            if old_path.suffix not in (PEAKS_SUFFIX, RMS_SUFFIX, MANIFEST_SUFFIX):
+                continue
+            try:
+                old_path.unlink()
+            except OSError as e:
+                logger.warning(f"이전 파형 파일 삭제 실패: {old_path} ({str(e)})")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+File: whisper_chunked.py
+Description: 무음 구간 기준 분할 + CPU 프로세스 풀을 이용한 병렬 Whisper 전사
+"""
+
+import os
+import re
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future, wait
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
+
+from app.common.utils import setup_logger, get_temp_file
+from app.config import settings
+from app.services.audio import WHISPER_SAMPLE_RATE, extract_audio, load_wav, to_float32, find_silence_splits
+
+logger = setup_logger('whisper_chunked', 'whisper_chunked.log')
+
+# 청크 경계에서 단어가 잘리지 않도록 앞뒤로 덧붙이는 길이 (초)
+CHUNK_OVERLAP_SECONDS = 0.5
+
+# 워커 프로세스별로 로드된 모델 (프로세스 초기화 시 한 번만 로드)
+_worker_model: Optional[Tuple[str, Any]] = None
+
+# (모델, 백엔드, 워커 수, 스레드 수)별 상주 프로세스 풀 (최근 사용 순, 최대 WHISPER_MAX_CHUNK_POOLS개)
+_pools: "OrderedDict[Tuple[str, str, int, int], ProcessPoolExecutor]" = OrderedDict()
+
+
+def _init_worker(model_name: str, backend: str, cpu_threads: int) -> None:
+    """프로세스 풀 워커 초기화: 스레드 수 제한 후 모델 로드"""
+    global _worker_model
+    os.environ["OMP_NUM_THREADS"] = str(cpu_threads)
+    from app.services.whisper_server import _load_whisper_model
+    _worker_model = _load_whisper_model(model_name, backend, cpu_threads)
+
+
+def _transcribe_chunk(wav_path: str,
+                      start_sample: int,
+                      end_sample: int,
+                      language: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    WAV 파일의 한 구간을 전사 (워커 프로세스에서 실행)
+
+    Returns:
+        청크 시작 기준 상대 시간의 세그먼트 목록
+    """
+    from app.services.whisper_server import _iter_segments
+
+    samples, _sr = load_wav(wav_path)
+    audio = to_float32(samples[start_sample:end_sample])
+    kind, model = _worker_model
+    return list(_iter_segments(kind, model, audio, language, {}))
+
+
+def _normalize_segment_text(text: str) -> str:
+    """중복 비교용 텍스트 정규화"""
+    return re.sub(r"[^\w\s]", "", text.lower()).strip()
+
+
+class SegmentStitcher:
+    """청크별 세그먼트를 순서대로 받아 절대 시간으로 이어 붙이는 클래스"""
+
+    def __init__(self):
+        self.segments: List[Dict[str, Any]] = []
+
+    def add_chunk(self,
+                  offset: float,
+                  overlap_end: float,
+                  segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        다음 청크의 세그먼트를 추가하고 겹침 구간의 중복 제거
+
+        Args:
+            offset: 청크 시작 오프셋 (초)
+            overlap_end: 이전 청크와 겹치는 구간의 끝 (초)
+            segments: 청크 시작 기준 상대 시간 세그먼트 목록
+
+        Returns:
+            이번 청크에서 새로 추가된 세그먼트 목록
+        """
+        added = []
+        for segment in segments:
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            text = segment["text"].strip()
+            if not text:
+                continue
+
+            if self.segments and start < overlap_end:
+                previous = self.segments[-1]
+                # 겹침 구간 안에서 이미 출력된 구간이거나 같은 문장이면 건너뜀
+                if end <= previous["end"] + 0.05:
+                    continue
+                norm = _normalize_segment_text(text)
+                prev_norm = _normalize_segment_text(previous["text"])
+                if norm and (norm == prev_norm or prev_norm.endswith(norm) or norm in prev_norm):
+                    continue
+
+            if self.segments and start < self.segments[-1]["end"]:
+                start = self.segments[-1]["end"]
+            stitched = {"start": start, "end": max(start, end), "text": text}
+            self.segments.append(stitched)
+            added.append(stitched)
+        return added
+
+
+class ChunkedWhisperTranscriber:
+    """긴 오디오를 무음 기준으로 나눠 여러 CPU 프로세스에서 전사하는 클래스"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        ChunkedWhisperTranscriber 초기화
+
+        Args:
+            config: 설정 (옵션) - target_chunk_seconds, max_chunk_seconds, workers, threads_per_worker
+        """
+        self.config = config or {}
+        self.target_chunk_seconds = self.config.get("target_chunk_seconds", 90.0)
+        self.max_chunk_seconds = self.config.get("max_chunk_seconds", 150.0)
+        self.threads_per_worker = max(1, self.config.get("threads_per_worker", settings.WHISPER_THREADS_PER_WORKER))
+        workers = self.config.get("workers", settings.WHISPER_CHUNK_WORKERS)
+        if not workers:
+            workers = max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.workers = workers
+
+    def _get_pool(self, model: str) -> ProcessPoolExecutor:
+        """모델별 상주 프로세스 풀 반환 (모델을 매 작업마다 다시 로드하지 않음)"""
+        key = (model, settings.WHISPER_BACKEND, self.workers, self.threads_per_worker)
+        pool = _pools.get(key)
+        if pool is not None:
+            _pools.move_to_end(key)
+            return pool
+
+        # 모델마다 워커 프로세스가 모델을 올려 두므로 가장 오래 안 쓴 풀부터 종료
+        # (이미 제출된 청크는 끝까지 처리한 뒤 프로세스가 내려감)
+        while _pools and len(_pools) >= max(1, settings.WHISPER_MAX_CHUNK_POOLS):
+            evicted_key, evicted = _pools.popitem(last=False)
+            evicted.shutdown(wait=False)
+            logger.info(f"전사 프로세스 풀 종료 (최근 사용 안 함): 모델={evicted_key[0]}")
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model, settings.WHISPER_BACKEND, self.threads_per_worker)
+        )
+        _pools[key] = pool
+        logger.info(f"전사 프로세스 풀 생성: 모델={model}, 워커={self.workers}, 워커당 스레드={self.threads_per_worker}")
+        return pool
+
+    async def transcribe(self,
+                         video_path: str,
+                         model: str = "tiny",
+                         language: Optional[str] = None,
+                         segment_callback: Optional[Callable[[List[Dict[str, Any]], float], Awaitable[None]]] = None) -> List[Dict[str, Any]]:
+        """
+        비디오를 청크 단위로 병렬 전사
+
+        청크는 완료 순서와 상관없이 앞에서부터 연속으로 끝난 부분까지만
+        이어 붙여 segment_callback으로 전달하므로, 호출자는 결과를 시간순으로 바로 기록할 수 있다.
+
+        Args:
+            video_path: 비디오 파일 경로
+            model: Whisper 모델 크기
+            language: 언어 코드
+            segment_callback: 새로 확정된 세그먼트 콜백 (segments, 처리 완료된 오디오 길이 초)
+
+        Returns:
+            절대 시간 기준 세그먼트 목록
+        """
+        wav_path = get_temp_file(prefix="whisper_audio_", suffix=".wav")
+        futures: List[Future] = []
+        try:
+            # 16kHz 모노 오디오를 한 번만 추출
+            await asyncio.to_thread(extract_audio, video_path, wav_path, WHISPER_SAMPLE_RATE)
+            # WAV 헤더 파싱과 무음 분석(메모리 맵 전체 읽기)은 이벤트 루프 밖에서
+            samples, sample_rate = await asyncio.to_thread(load_wav, wav_path)
+            chunks = await asyncio.to_thread(
+                find_silence_splits,
+                samples,
+                sample_rate,
+                target_chunk_s=self.target_chunk_seconds,
+                max_chunk_s=self.max_chunk_seconds
+            )
+            total_samples = len(samples)
+            del samples
+            logger.info(f"병렬 전사 시작: {video_path}, {len(chunks)}개 청크, 워커 {self.workers}개")
+
+            pool = self._get_pool(model)
+            overlap = int(CHUNK_OVERLAP_SECONDS * sample_rate)
+
+            for start, end in chunks:
+                padded_start = max(0, start - overlap)
+                padded_end = min(total_samples, end + overlap)
+                futures.append(pool.submit(_transcribe_chunk, wav_path, padded_start, padded_end, language))
+
+            stitcher = SegmentStitcher()
+            for i, (start, end) in enumerate(chunks):
+                segments = await asyncio.wrap_future(futures[i])
+                padded_start = max(0, start - overlap)
+                overlap_end = (start + overlap) / sample_rate if start else 0.0
+                added = stitcher.add_chunk(padded_start / sample_rate, overlap_end, segments)
+                # 앞 청크부터 순서대로 기다리므로 i번째까지의 오디오는 모두 처리 완료된 상태
+                if segment_callback:
+                    await segment_callback(added, end / sample_rate)
+
+            return stitcher.segments
+        finally:
+            # 오류/취소로 빠져나온 경우 대기 중인 청크는 취소하고, 이미 워커가 읽고 있는 청크는
+            # 끝날 때까지 기다린 뒤 오디오를 지운다
+            for future in futures:
+                future.cancel()
+            pending = [future for future in futures if not future.done()]
+            if pending:
+                await asyncio.to_thread(wait, pending)
+            if os.path.exists(wav_path):
+                os.unlink(wav_path)
+
+
+def shutdown_chunk_pools() -> None:
+    """상주 프로세스 풀 모두 종료"""
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
@@ -5,6 +5,7 @@ Description: OpenAI Whisper를 사용한 자막 생성 기능
 """
 
 import os
+import json
 import asyncio
 import tempfile
 import subprocess
@@ -13,9 +14,144 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Union, List, Tuple
 
 from app.common.utils import setup_logger, ensure_dir_exists
+from app.services.whisper_server import get_whisper_server
+from app.services.whisper_chunked import ChunkedWhisperTranscriber
+from app.services.media_probe import probe_media_async
+from app.services.estimator import get_estimator
 
 logger = setup_logger('whisper_generator', 'whisper_generator.log')
 
+# 진행 중인 자막 파일 옆에 두는 상태 파일 접미사
+PARTIAL_SUFFIX = ".partial"
+# 생성 중인 큐를 기록하는 파일 접미사 (완료 시 최종 자막으로 교체)
+PARTIAL_SRT_SUFFIX = ".partial.srt"
+
+
+def _format_srt_timestamp(seconds: float) -> str:
+    """초를 SRT 시간 형식(00:00:00,000)으로 변환"""
+    total_ms = int(round(max(0.0, seconds) * 1000))
+    hours, rem = divmod(total_ms, 3600000)
+    minutes, rem = divmod(rem, 60000)
+    secs, ms = divmod(rem, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+
+
+def partial_subtitle_path(subtitle_path: str) -> Path:
+    """생성 중인 큐를 기록하는 파일 경로 (video.en.srt -> video.en.partial.srt)"""
+    return Path(subtitle_path).with_suffix(PARTIAL_SRT_SUFFIX)
+
+
+def get_partial_status(subtitle_path: str) -> Optional[Dict[str, Any]]:
+    """
+    생성 중인 자막 파일의 진행 상태 반환
+
+    Args:
+        subtitle_path: 자막 파일 경로
+
+    Returns:
+        진행 상태 사전 (생성이 끝났거나 생성 중이 아니면 None)
+    """
+    marker = str(subtitle_path) + PARTIAL_SUFFIX
+    if not os.path.exists(marker):
+        return None
+    try:
+        with open(marker, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # 쓰는 도중에 읽은 경우 등 - 진행 중이라는 사실만 알림
+        return {"progress": 0.0}
+
+
+class IncrementalSrtWriter:
+    """
+    세그먼트가 도착할 때마다 SRT 큐를 추가 기록하는 클래스
+
+    큐는 .partial.srt에 기록하고 정상 완료 시에만 최종 자막 파일로 교체하므로, 생성이 실패해도
+    기존 자막 파일은 그대로 남는다.
+    """
+
+    def __init__(self, output_path: str, media_duration: float = 0.0):
+        """
+        IncrementalSrtWriter 초기화
+
+        Args:
+            output_path: 출력 SRT 파일 경로
+            media_duration: 원본 미디어 길이 (초, 진행률 계산용)
+        """
+        self.output_path = output_path
+        self.stream_path = str(partial_subtitle_path(output_path))
+        self.marker_path = output_path + PARTIAL_SUFFIX
+        self.media_duration = media_duration
+        self.decoded_seconds = 0.0
+        self.count = 0
+        self._file = None
+        self._marker_written_at = 0.0
+
+    @property
+    def progress(self) -> float:
+        """처리된 오디오 길이 / 전체 길이 (0~1)"""
+        if self.media_duration <= 0:
+            return 0.0
+        return min(1.0, self.decoded_seconds / self.media_duration)
+
+    def open(self) -> None:
+        """진행 중 자막 파일과 진행 상태 파일 생성"""
+        self._write_marker(force=True)
+        self._file = open(self.stream_path, 'w', encoding='utf-8')
+
+    def append(self, segment: Dict[str, Any]) -> None:
+        """세그먼트 하나를 SRT 큐로 추가하고 즉시 디스크에 반영"""
+        text = segment["text"].strip()
+        if not text:
+            return
+        self.count += 1
+        start = _format_srt_timestamp(segment["start"])
+        end = _format_srt_timestamp(segment["end"])
+        self._file.write(f"{self.count}\n{start} --> {end}\n{text}\n\n")
+        self._file.flush()
+
+    def update_progress(self, decoded_seconds: float) -> None:
+        """처리된 오디오 길이 갱신"""
+        self.decoded_seconds = max(self.decoded_seconds, decoded_seconds)
+        self._write_marker()
+
+    def close(self, completed: bool) -> None:
+        """
+        기록 종료
+
+        Args:
+            completed: 정상 완료 여부 (완료 시 최종 자막 파일로 교체, 실패 시 진행 중 파일만 삭제)
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if completed:
+            os.replace(self.stream_path, self.output_path)
+        elif os.path.exists(self.stream_path):
+            os.unlink(self.stream_path)
+        # 상태 파일은 교체 뒤에 지워 읽는 쪽이 진행 중 파일도 최종 파일도 없는 순간을 보지 않게 함
+        if os.path.exists(self.marker_path):
+            os.unlink(self.marker_path)
+
+    def _write_marker(self, force: bool = False) -> None:
+        """진행 상태 파일 갱신 (최대 1초에 한 번)"""
+        now = time.time()
+        if not force and now - self._marker_written_at < 1.0:
+            return
+        self._marker_written_at = now
+        status = {
+            "progress": self.progress,
+            "decoded_seconds": self.decoded_seconds,
+            "media_duration": self.media_duration,
+            "segments": self.count,
+            "updated_at": now
+        }
+        temp_path = self.marker_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(status, f)
+        os.replace(temp_path, self.marker_path)
+
+
 class WhisperGenerator:
     """Whisper를 이용한 자막 생성 클래스"""
 
@@ -47,24 +183,120 @@ class WhisperGenerator:
                                video_path: str, 
                                output_path: str, 
                                model: str = "tiny",
-                               language: str = "en") -> Tuple[bool, Dict[str, Any]]:
+                               language: str = "en",
+                               mode: str = "single",
+                               progress_callback=None) -> Tuple[bool, Dict[str, Any]]:
         """
         영상에서 자막 파일 생성
         
+        세그먼트가 디코딩될 때마다 출력 SRT에 큐를 추가하므로,
+        작업 중에도 get_partial_status()로 확인한 부분 자막을 제공할 수 있다.
+        
         Args:
             video_path: 비디오 파일 경로
             output_path: 출력 자막 파일 경로
             model: Whisper 모델 크기 ('tiny', 'base', 'small', 'medium', 'large')
             language: 자막 언어 코드 ('en', 'ko', 등)
+            mode: 처리 방식 ('single': 상주 워커 1개, 'chunked': 무음 기준 분할 후 병렬 처리)
+            progress_callback: 진행률 콜백 함수 (progress: float, message: str)
             
         Returns:
             성공 여부, 처리 정보(모델, 처리 시간 등)
         """
         if model not in self.available_models:
             model = "tiny"
-            
+
+        if mode != "chunked" and not self.config.get("use_server", True):
+            return await self._generate_subtitle_cli(video_path, output_path, model, language)
+
+        start_time = time.time()
+        writer = None
         try:
-            logger.info(f"Whisper 자막 생성 시작: {video_path}, 모델: {model}")
+            logger.info(f"Whisper 자막 생성 시작: {video_path}, 모델: {model}, 방식: {mode}")
+
+            # 출력 디렉토리 확인
+            output_dir = os.path.dirname(output_path)
+            os.makedirs(output_dir, exist_ok=True)
+
+            media_duration = await self._get_media_duration(video_path)
+            writer = IncrementalSrtWriter(output_path, media_duration)
+            writer.open()
+
+            async def on_segments(segments: List[Dict[str, Any]], decoded_seconds: float):
+                for segment in segments:
+                    writer.append(segment)
+                writer.update_progress(decoded_seconds)
+                if progress_callback:
+                    await progress_callback(
+                        writer.progress,
+                        f"자막 생성 중... {writer.progress:.0%} ({self._format_time(decoded_seconds)} 처리됨)"
+                    )
+
+            result_info = {}
+            if mode == "chunked":
+                transcriber = ChunkedWhisperTranscriber(self.config.get("chunked"))
+                await transcriber.transcribe(video_path, model=model, language=language, segment_callback=on_segments)
+                result_info = {"mode": "chunked", "workers": transcriber.workers}
+            else:
+                async for event in get_whisper_server().transcribe(video_path, model=model, language=language):
+                    if event["type"] == "segment":
+                        await on_segments([event["segment"]], event["segment"]["end"])
+                    elif event["type"] == "loading":
+                        logger.info(f"Whisper 모델 로드 중: {model}")
+                        if progress_callback:
+                            await progress_callback(0.0, f"Whisper 모델 로드 중... ({model})")
+                    elif event["type"] == "done":
+                        result_info = {"mode": "single", "backend": event.get("backend")}
+                    elif event["type"] == "error":
+                        raise RuntimeError(event["error"])
+
+            writer.close(completed=True)
+            duration = time.time() - start_time
+            await asyncio.to_thread(get_estimator().record, "whisper", duration, media_duration,
+                                    variant=f"{model}/{mode}", media_seconds=media_duration)
+
+            logger.info(f"Whisper 자막 생성 완료: {output_path} ({writer.count}개 세그먼트, 소요시간: {duration:.1f}초)")
+
+            return True, {
+                "model": model,
+                "model_size": self.model_sizes.get(model, "unknown"),
+                "processing_speed": self.model_processing_speed.get(model, "unknown"),
+                "duration": duration,
+                "output_path": output_path,
+                "language": language,
+                "segments": writer.count,
+                **result_info
+            }
+
+        except Exception as e:
+            logger.error(f"Whisper 자막 생성 오류: {str(e)}")
+            if writer is not None:
+                writer.close(completed=False)
+            return False, {
+                "model": model,
+                "error": str(e),
+                "duration": time.time() - start_time
+            }
+
+    async def _generate_subtitle_cli(self,
+                                     video_path: str,
+                                     output_path: str,
+                                     model: str,
+                                     language: str) -> Tuple[bool, Dict[str, Any]]:
+        """
+        whisper CLI를 실행해 자막 생성 (워커를 사용하지 않는 경우)
+
+        Args:
+            video_path: 비디오 파일 경로
+            output_path: 출력 자막 파일 경로
+            model: Whisper 모델 크기
+            language: 자막 언어 코드
+
+        Returns:
+            성공 여부, 처리 정보
+        """
+        try:
+            logger.info(f"Whisper CLI 자막 생성 시작: {video_path}, 모델: {model}")
             start_time = time.time()
             
             # 출력 디렉토리 확인
@@ -87,11 +319,7 @@ class WhisperGenerator:
                 stderr=asyncio.subprocess.PIPE
             )
             
-            # 진행 상황을 5초마다 기록
-            while process.returncode is None:
-                await asyncio.sleep(5)
-                logger.info(f"Whisper 자막 생성 중... (모델: {model})")
-            
+            # 파이프를 비우면서 종료 대기 (파이프가 가득 차 프로세스가 멈추는 것 방지)
             stdout, stderr = await process.communicate()
             
             if process.returncode != 0:
@@ -104,6 +332,9 @@ class WhisperGenerator:
             
             end_time = time.time()
             duration = end_time - start_time
+            media_duration = await self._get_media_duration(video_path)
+            await asyncio.to_thread(get_estimator().record, "whisper", duration, media_duration,
+                                    variant=f"{model}/cli", media_seconds=media_duration)
             
             # 출력 파일명 수정이 필요한 경우 (whisper는 자체 파일명 규칙을 사용함)
             video_filename = Path(video_path).stem
@@ -131,74 +362,51 @@ class WhisperGenerator:
                 "error": str(e),
                 "duration": time.time() - start_time if 'start_time' in locals() else 0
             }
-    
+
     async def estimate_processing_time(self, 
                                      video_path: str, 
-                                     model: str = "tiny") -> Dict[str, Any]:
+                                     model: str = "tiny",
+                                     mode: str = "single") -> Dict[str, Any]:
         """
         비디오 처리 시간 예상
         
+        이 호스트에서 같은 모델/처리 방식으로 실행한 작업 기록으로 처리 속도를 학습하고,
+        기록이 없으면 모델별 기본 속도를 사용한다.
+        
         Args:
             video_path: 비디오 파일 경로
             model: Whisper 모델 ('tiny', 'base', 'small', 'medium', 'large')
+            mode: 처리 방식 ('single', 'chunked')
             
         Returns:
-            예상 처리 시간 정보
+            예상 처리 시간 정보 (90% 예측 구간 포함)
         """
         if model not in self.available_models:
             model = "tiny"
             
         try:
             # 비디오 길이 확인
-            cmd = [
-                'ffprobe', 
-                '-v', 'error', 
-                '-show_entries', 'format=duration', 
-                '-of', 'default=noprint_wrappers=1:nokey=1', 
-                video_path
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                logger.error(f"비디오 길이 확인 오류: {stderr.decode()}")
+            video_duration = await self._get_media_duration(video_path)
+            if video_duration <= 0:
                 return {
                     "model": model,
                     "error": "비디오 길이를 확인할 수 없습니다.",
                     "estimated_seconds": 0
                 }
             
-            # 비디오 길이(초)
-            try:
-                video_duration = float(stdout.decode().strip())
-            except (ValueError, TypeError):
-                video_duration = 0
-            
-            # 모델별 처리 속도 계수 (대략적인 값)
-            speed_factors = {
-                "tiny": 32,
-                "base": 16,
-                "small": 6,
-                "medium": 2,
-                "large": 1
-            }
-            
-            # 예상 처리 시간 계산 (비디오 길이 / 속도 계수)
-            estimated_seconds = video_duration / speed_factors.get(model, 32)
+            if mode != "chunked" and not self.config.get("use_server", True):
+                mode = "cli"
+            estimate = await asyncio.to_thread(get_estimator().estimate, "whisper", video_duration,
+                                               variant=f"{model}/{mode}")
             
             return {
                 "model": model,
+                "mode": mode,
                 "model_size": self.model_sizes.get(model, "unknown"),
                 "processing_speed": self.model_processing_speed.get(model, "unknown"),
                 "video_duration": video_duration,
-                "estimated_seconds": estimated_seconds,
-                "human_estimate": self._format_time(estimated_seconds)
+                **estimate,
+                "human_estimate": self._format_time(estimate["estimated_seconds"])
             }
             
         except Exception as e:
@@ -209,6 +417,19 @@ class WhisperGenerator:
                 "estimated_seconds": 0
             }
     
+    async def _get_media_duration(self, video_path: str) -> float:
+        """
+        미디어 길이(초) 확인 (캐시된 ffprobe 메타데이터 사용)
+
+        Args:
+            video_path: 비디오 파일 경로
+
+        Returns:
+            재생 시간 (초), 확인 실패 시 0
+        """
+        info = await probe_media_async(video_path)
+        return info.get("duration", 0.0)
+
     def _format_time(self, seconds: float) -> str:
         """초를 읽기 쉬운 시간 형식으로 변환"""
         if seconds < 60:
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+File: whisper_server.py
+Description: Whisper 모델을 메모리에 상주시키는 장기 실행 전사(transcription) 워커
+"""
+
+import gc
+import uuid
+import queue
+import asyncio
+import threading
+import multiprocessing
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Iterator, AsyncIterator
+
+from app.common.utils import setup_logger
+from app.config import settings
+
+logger = setup_logger('whisper_server', 'whisper_server.log')
+
+# 워커 종료 신호
+_STOP_SIGNAL = None
+
+
+def _load_whisper_model(model_name: str, backend: str, cpu_threads: int = 0) -> Tuple[str, Any]:
+    """
+    워커 프로세스 안에서 Whisper 모델 로드
+
+    Args:
+        model_name: 모델 크기 ('tiny', 'base', 'small', 'medium', 'large')
+        backend: 사용할 백엔드 ('auto', 'faster-whisper', 'openai-whisper')
+        cpu_threads: 모델이 사용할 CPU 스레드 수 (0이면 라이브러리 기본값)
+
+    Returns:
+        (백엔드 이름, 모델 객체)
+    """
+    if backend in ("auto", "faster-whisper"):
+        try:
+            from faster_whisper import WhisperModel
+            return "faster-whisper", WhisperModel(model_name, device="cpu", compute_type="int8", cpu_threads=cpu_threads)
+        except ImportError:
+            if backend == "faster-whisper":
+                raise
+
+    import whisper
+    if cpu_threads:
+        import torch
+        torch.set_num_threads(cpu_threads)
+    return "openai-whisper", whisper.load_model(model_name, device="cpu")
+
+
+def _iter_segments(kind: str,
+                   model: Any,
+                   audio: Any,
+                   language: Optional[str],
+                   options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    전사 결과를 세그먼트 단위로 순회 (audio는 파일 경로 또는 16kHz float32 배열)
+
+    faster-whisper는 세그먼트를 디코딩하는 즉시 내보내고,
+    openai-whisper는 전사가 끝난 뒤 세그먼트를 순서대로 내보낸다.
+    """
+    if kind == "faster-whisper":
+        segments, _info = model.transcribe(audio, language=language, **options)
+        for seg in segments:
+            yield {"start": float(seg.start), "end": float(seg.end), "text": seg.text.strip()}
+    else:
+        result = model.transcribe(audio, language=language, fp16=False, verbose=None, **options)
+        for seg in result.get("segments", []):
+            yield {"start": float(seg["start"]), "end": float(seg["end"]), "text": seg["text"].strip()}
+
+
+def _worker_main(job_queue, event_queue, max_models: int, backend: str) -> None:
+    """
+    전사 워커 프로세스 진입점
+
+    로드한 모델을 LRU 순서로 유지하고, 작업 큐에서 받은 작업의
+    세그먼트를 이벤트 큐로 하나씩 돌려보낸다.
+    """
+    models: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+
+    while True:
+        job = job_queue.get()
+        if job is _STOP_SIGNAL:
+            break
+
+        job_id = job["job_id"]
+        model_name = job["model"]
+        try:
+            if model_name in models:
+                models.move_to_end(model_name)
+            else:
+                event_queue.put({"job_id": job_id, "type": "loading", "model": model_name})
+                models[model_name] = _load_whisper_model(model_name, backend)
+                # 가장 오래 사용되지 않은 모델부터 해제
+                while len(models) > max_models:
+                    models.popitem(last=False)
+                    gc.collect()
+
+            kind, model = models[model_name]
+            event_queue.put({"job_id": job_id, "type": "started", "model": model_name, "backend": kind})
+
+            count = 0
+            for segment in _iter_segments(kind, model, job["audio_path"], job.get("language"), job.get("options") or {}):
+                count += 1
+                event_queue.put({"job_id": job_id, "type": "segment", "index": count, "segment": segment})
+
+            event_queue.put({"job_id": job_id, "type": "done", "segments": count, "backend": kind})
+        except Exception as e:
+            event_queue.put({"job_id": job_id, "type": "error", "error": str(e)})
+
+
+class WhisperModelServer:
+    """Whisper 모델을 상주시키는 전사 워커 프로세스 관리 클래스"""
+
+    def __init__(self, max_models: int = 2, backend: str = "auto"):
+        """
+        WhisperModelServer 초기화
+
+        Args:
+            max_models: 워커가 동시에 메모리에 유지할 최대 모델 수
+            backend: 사용할 Whisper 백엔드 ('auto', 'faster-whisper', 'openai-whisper')
+        """
+        self.max_models = max(1, max_models)
+        self.backend = backend
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._job_queue = None
+        self._event_queue = None
+        self._dispatcher = None
+        self._listeners: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+
+    def is_running(self) -> bool:
+        """워커 프로세스 실행 여부"""
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        """워커 프로세스와 이벤트 분배 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self.is_running():
+                return
+
+            self._job_queue = self._ctx.Queue()
+            self._event_queue = self._ctx.Queue()
+            self._process = self._ctx.Process(
+                target=_worker_main,
+                args=(self._job_queue, self._event_queue, self.max_models, self.backend),
+                name="whisper-worker",
+                daemon=True
+            )
+            self._process.start()
+
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_events,
+                args=(self._process, self._event_queue),
+                name="whisper-dispatcher",
+                daemon=True
+            )
+            self._dispatcher.start()
+            logger.info(f"Whisper 워커 시작: pid={self._process.pid}, 최대 모델 수={self.max_models}")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """워커 프로세스 종료"""
+        with self._lock:
+            process = self._process
+            if process is None:
+                return
+
+            if process.is_alive():
+                self._job_queue.put(_STOP_SIGNAL)
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join(timeout)
+
+            self._process = None
+            logger.info("Whisper 워커 종료")
+
+    def _dispatch_events(self, process, event_queue) -> None:
+        """워커 이벤트를 작업별 asyncio 큐로 전달"""
+        while True:
+            try:
+                event = event_queue.get(timeout=1.0)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                # 워커가 비정상 종료되면 대기 중인 모든 작업을 실패 처리
+                with self._lock:
+                    pending = list(self._listeners.keys())
+                for job_id in pending:
+                    self._deliver({"job_id": job_id, "type": "error", "error": "Whisper 워커가 종료되었습니다"})
+                return
+
+            self._deliver(event)
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        """이벤트를 해당 작업의 리스너에게 전달"""
+        with self._lock:
+            if event["type"] in ("done", "error"):
+                listener = self._listeners.pop(event["job_id"], None)
+            else:
+                listener = self._listeners.get(event["job_id"])
+
+        if listener is None:
+            return
+
+        loop, event_queue = listener
+        try:
+            loop.call_soon_threadsafe(event_queue.put_nowait, event)
+        except RuntimeError:
+            # 요청한 이벤트 루프가 이미 닫힌 경우
+            pass
+
+    async def transcribe(self,
+                         audio_path: str,
+                         model: str = "tiny",
+                         language: Optional[str] = None,
+                         options: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        전사 작업을 제출하고 워커 이벤트를 순서대로 반환
+
+        Args:
+            audio_path: 오디오/비디오 파일 경로
+            model: Whisper 모델 크기
+            language: 언어 코드 (None이면 자동 감지)
+            options: 백엔드 transcribe 함수에 넘길 추가 옵션
+
+        Yields:
+            이벤트 사전 ('loading', 'started', 'segment', 'done', 'error')
+        """
+        self.start()
+
+        job_id = uuid.uuid4().hex
+        events: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._listeners[job_id] = (asyncio.get_running_loop(), events)
+
+        self._job_queue.put({
+            "job_id": job_id,
+            "audio_path": audio_path,
+            "model": model,
+            "language": language,
+            "options": options or {}
+        })
+        logger.info(f"Whisper 작업 제출: {job_id}, 모델: {model}, 파일: {audio_path}")
+
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event["type"] in ("done", "error"):
+                    break
+        finally:
+            with self._lock:
+                self._listeners.pop(job_id, None)
+
+
+# 애플리케이션 전역 워커 인스턴스
+_server: Optional[WhisperModelServer] = None
+
+
+def get_whisper_server() -> WhisperModelServer:
+    """전역 Whisper 워커 인스턴스 반환 (최초 호출 시 생성)"""
+    global _server
+    if _server is None:
+        _server = WhisperModelServer(
+            max_models=settings.WHISPER_MAX_LOADED_MODELS,
+            backend=settings.WHISPER_BACKEND
+        )
+    return _server
+
+
+def shutdown_whisper_server() -> None:
+    """전역 Whisper 워커 종료"""
+    if _server is not None:
+        _server.stop()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+File: search_benchmark.py
+Description: 자막 검색 벤치마크 (합성 코퍼스 생성, 고정 검색어 세트, p50/p95 지연 시간과 메모리 보고)
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.search_benchmark --videos 200 --repeat 20
+    python -m benchmarks.search_benchmark --backend indexer --json results.json --max-p95-ms 50
+    python -m benchmarks.search_benchmark --backend mypackage.module:factory
+
+같은 --seed면 같은 코퍼스와 검색어가 만들어지므로 CI에서 백엔드/커밋 간 비교에 쓸 수 있다.
+외부 백엔드는 factory(clips_dir, work_dir)가 run(queries, limit) 메서드를 가진 객체를 반환하면 된다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import importlib
+import resource
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.search import SubtitleSearchEngine  # noqa: E402
+from app.services.subtitle import SubtitleIndexer  # noqa: E402
+
+# 합성 코퍼스의 원본 (프로젝트 루트의 자막 API 응답 예시)
+DEFAULT_SAMPLES = [BACKEND_DIR.parent / "shark_subtitles.json", BACKEND_DIR.parent / "subtitles.json"]
+QUIET_LOGGERS = ("subtitle_core", "search", "semantic")
+
+# 고정 검색어 세트: 분류 -> 검색어 목록 (multiline은 코퍼스에서 뽑은 줄로 채움)
+QUERY_SET: Dict[str, List[str]] = {
+    "exact": ["the brain", "scrub daddy", "shark tank", "kitchen"],
+    "short": ["do", "the", "a"],
+    "fuzzy": ["brian", "scrub dady", "fascinatng part", "kichen sponge"],
+    "phrase": ['"the brain is"', '"kind of"', '"every time"'],
+    "near": ["brain NEAR/3 energy", "scrub NEAR/2 sponge"],
+    "prefix": ["scrub*", "fascinat*", "comp*"],
+}
+MULTILINE_QUERIES = 20
+
+
+def load_sample_lines(sample_paths: List[Path]) -> List[str]:
+    """
+    예시 자막 JSON({"subtitles": [{"text": ...}]})에서 중복 없는 자막 줄 목록 추출
+
+    롤링 자동 자막은 앞 자막의 줄을 반복하므로 줄 단위로 중복을 없앤다.
+    """
+    lines: Dict[str, None] = {}
+    for path in sample_paths:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for cue in data.get("subtitles", []):
+            for line in cue.get("text", "").splitlines():
+                line = " ".join(line.split())
+                if len(line.split()) >= 2:
+                    lines.setdefault(line, None)
+    if not lines:
+        raise ValueError(f"예시 자막에서 문장을 찾지 못했습니다: {sample_paths}")
+    return list(lines)
+
+
+def format_srt_time(seconds: float) -> str:
+    """초 -> SRT 시간 문자열 (HH:MM:SS,mmm)"""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+
+
+def write_srt(path: Path, cues: List[Tuple[float, float, str]]) -> None:
+    """(시작 초, 끝 초, 텍스트) 목록을 SRT 파일로 저장 (번호는 1부터)"""
+    blocks = [f"{index}\n{format_srt_time(start)} --> {format_srt_time(end)}\n{text}\n"
+              for index, (start, end, text) in enumerate(cues, 1)]
+    path.write_text("\n".join(blocks), encoding="utf-8")
+
+
+def generate_corpus(clips_dir: Path, lines: List[str], videos: int, cues_per_video: int, seed: int) -> int:
+    """
+    예시 줄을 섞어 합성 영상 자막(SRT) 생성
+
+    자막마다 예시 줄 하나를 고르고 일부는 인접 단어를 바꿔 변형한다. 시간은 120~180 wpm
+    속도와 짧은 쉼으로 정하고, 가끔 문장 부호를 붙여 문장 분리도 함께 측정되게 한다.
+
+    Returns:
+        생성한 자막 수
+    """
+    rng = random.Random(seed)
+    clips_dir.mkdir(parents=True, exist_ok=True)
+    total = 0
+    for video in range(videos):
+        clock = rng.uniform(0.0, 2.0)
+        cues = []
+        for _ in range(cues_per_video):
+            words = rng.choice(lines).split()
+            if len(words) > 2 and rng.random() < 0.2:
+                i = rng.randrange(len(words) - 1)
+                words[i], words[i + 1] = words[i + 1], words[i]
+            text = " ".join(words)
+            if rng.random() < 0.3:
+                text += rng.choice([".", "?", "!"])
+            duration = len(words) / rng.uniform(120, 180) * 60
+            start, clock = clock, clock + duration
+            cues.append((start, clock, text))
+            clock += rng.choice([0.0, 0.0, 0.2, 1.0])
+        write_srt(clips_dir / f"synthetic_{video:04d}.en.srt", cues)
+        total += cues_per_video
+    return total
+
+
+def build_queries(lines: List[str], seed: int) -> Dict[str, List[List[str]]]:
+    """분류 -> 호출 목록 (호출 하나는 검색어 목록, multiline은 한 번에 여러 줄)"""
+    rng = random.Random(seed + 1)
+    queries = {category: [[query.lower()] for query in items] for category, items in QUERY_SET.items()}
+    queries["multiline"] = [[line.lower() for line in rng.sample(lines, min(MULTILINE_QUERIES, len(lines)))]]
+    return queries
+
+
+class EngineBackend:
+    """SubtitleSearchEngine.search (앱의 자막 검색 경로)"""
+
+    def __init__(self, clips_dir: str, work_dir: str):
+        self.engine = SubtitleSearchEngine({
+            "clips_dir": clips_dir,
+            "index_path": os.path.join(work_dir, "index.json"),
+            "semantic": {"index_dir": os.path.join(work_dir, "semantic")}
+        })
+        self.engine.refresh()
+
+    def run(self, queries: List[str], limit: int) -> int:
+        """검색어 목록을 한 번에 검색하고 결과 수 반환"""
+        return len(self.engine.search(queries, limit)["results"])
+
+
+class SimilarBackend(EngineBackend):
+    """SubtitleSearchEngine.similar (문장 벡터 예문 검색, 검색어마다 한 번 호출)"""
+
+    def run(self, queries: List[str], limit: int) -> int:
+        """검색어마다 비슷한 예문을 찾고 결과 수 합계 반환"""
+        return sum(len(self.engine.similar(query, limit)) for query in queries)
+
+
+class IndexerBackend:
+    """SubtitleIndexer.search_subtitles (자막 단위 정규화 텍스트 부분 문자열 검색)"""
+
+    def __init__(self, clips_dir: str, work_dir: str):
+        self.indexer = SubtitleIndexer(os.path.join(work_dir, "index.json"))
+        for path in sorted(Path(clips_dir).glob("*.srt")):
+            self.indexer.index_subtitle(str(path), path.stem)
+
+    def run(self, queries: List[str], limit: int) -> int:
+        """검색어마다 자막을 검색하고 결과 수 합계 반환"""
+        return sum(len(self.indexer.search_subtitles(query, limit)) for query in queries)
+
+
+BACKENDS: Dict[str, Callable[[str, str], Any]] = {
+    "engine": EngineBackend,
+    "similar": SimilarBackend,
+    "indexer": IndexerBackend,
+}
+
+
+def load_backend(name: str) -> Callable[[str, str], Any]:
+    """백엔드 이름 또는 'module:factory' 경로 -> 팩토리"""
+    if name in BACKENDS:
+        return BACKENDS[name]
+    module_name, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"알 수 없는 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)} 또는 module:factory)")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def rss_mb() -> float:
+    """현재까지의 최대 상주 메모리 (MB, Linux는 KB 단위, macOS는 바이트 단위)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    """호출별 지연 시간(초) 목록 -> 호출 수와 p50/p95/평균/최대 (ms)"""
+    values = np.asarray(latencies) * 1000
+    return {
+        "calls": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """코퍼스 생성 -> 백엔드 구성(인덱싱) -> 검색어 세트 반복 실행"""
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="search_bench_"))
+    clips_dir = work_dir / "clips"
+    try:
+        lines = load_sample_lines([Path(p) for p in args.samples])
+        cues = generate_corpus(clips_dir, lines, args.videos, args.cues_per_video, args.seed)
+        queries = build_queries(lines, args.seed)
+        factory = load_backend(args.backend)
+
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        backend = factory(str(clips_dir), str(work_dir))
+        build_seconds = time.perf_counter() - started
+        build_peak_mb = None
+        if args.trace_memory:
+            build_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+        rss_after_build = rss_mb()
+
+        categories: Dict[str, Dict[str, Any]] = {}
+        all_latencies: List[float] = []
+        for category, calls in queries.items():
+            for call in calls:
+                for _ in range(args.warmup):
+                    backend.run(call, args.limit)
+            latencies, hits = [], 0
+            for _ in range(args.repeat):
+                for call in calls:
+                    started = time.perf_counter()
+                    hits = backend.run(call, args.limit)
+                    latencies.append(time.perf_counter() - started)
+            categories[category] = {**summarize(latencies), "last_hits": hits}
+            all_latencies.extend(latencies)
+
+        return {
+            "backend": args.backend,
+            "seed": args.seed,
+            "corpus": {"videos": args.videos, "cues": cues, "sample_lines": len(lines)},
+            "build_seconds": round(build_seconds, 3),
+            "memory": {
+                "build_peak_traced_mb": round(build_peak_mb, 1) if build_peak_mb is not None else None,
+                "rss_after_build_mb": round(rss_after_build, 1),
+                "rss_peak_mb": round(rss_mb(), 1),
+            },
+            "overall": summarize(all_latencies),
+            "categories": categories,
+        }
+    finally:
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """run_benchmark 결과를 코퍼스/인덱싱/메모리 요약과 분류별 지연 시간 표로 출력"""
+    corpus, memory = report["corpus"], report["memory"]
+    print(f"백엔드: {report['backend']}  코퍼스: 영상 {corpus['videos']}개, 자막 {corpus['cues']}개 "
+          f"(예시 줄 {corpus['sample_lines']}개, seed {report['seed']})")
+    print(f"인덱싱: {report['build_seconds']:.2f}s  메모리: RSS {memory['rss_after_build_mb']}MB "
+          f"(최대 {memory['rss_peak_mb']}MB)"
+          + (f", 인덱싱 중 Python 할당 최대 {memory['build_peak_traced_mb']}MB"
+             if memory["build_peak_traced_mb"] is not None else ""))
+    print(f"{'분류':<10} {'호출':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'평균(ms)':>9} {'최대(ms)':>9} {'결과':>6}")
+    for category, stats in list(report["categories"].items()) + [("overall", report["overall"])]:
+        print(f"{category:<10} {stats['calls']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['mean_ms']:>9.2f} {stats['max_ms']:>9.2f} {stats.get('last_hits', ''):>6}")
+
+
+def main() -> int:
+    """명령행 인자로 벤치마크 실행 (--max-p95-ms를 넘으면 1 반환)"""
+    parser = argparse.ArgumentParser(description="자막 검색 벤치마크")
+    parser.add_argument("--backend", default="engine", help=f"{', '.join(BACKENDS)} 또는 module:factory")
+    parser.add_argument("--samples", nargs="+", default=[str(p) for p in DEFAULT_SAMPLES], help="예시 자막 JSON")
+    parser.add_argument("--videos", type=int, default=100, help="합성 영상 수")
+    parser.add_argument("--cues-per-video", type=int, default=300, help="영상당 자막 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--limit", type=int, default=10, help="검색 결과 개수")
+    parser.add_argument("--repeat", type=int, default=10, help="검색어 세트 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--trace-memory", action="store_true", help="인덱싱 중 Python 할당 최대치 측정 (느려짐)")
+    parser.add_argument("--work-dir", help="코퍼스/인덱스 위치 (지정하면 지우지 않음)")
+    parser.add_argument("--keep", action="store_true", help="임시 작업 디렉토리를 지우지 않음")
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--max-p95-ms", type=float, help="전체 p95가 이 값을 넘으면 종료 코드 1 (CI용)")
+    args = parser.parse_args()
+
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.max_p95_ms is not None and report["overall"]["p95_ms"] > args.max_p95_ms:
+        print(f"p95 {report['overall']['p95_ms']}ms > 기준 {args.max_p95_ms}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
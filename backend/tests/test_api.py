@@ -0,0 +1,99 @@
+"""라우터 핸들러 테스트 (HTTP 클라이언트 없이 핸들러를 직접 호출, ffprobe/추정기는 가짜로 대체)"""
+
+import asyncio
+import threading
+from typing import Dict, List, Tuple
+
+from app.config import settings
+from app.routers import youtube
+
+
+def call_asgi(response, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+    """응답 객체를 ASGI 앱으로 한 번 실행해 (상태 코드, 헤더, 본문) 반환"""
+    messages: List[dict] = []
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+
+    requested = False
+
+    async def receive():
+        # 요청 본문은 한 번만 보내고, 이후에는 응답이 끝나 취소될 때까지 연결 유지
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(response(scope, receive, send))
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return start["status"], {k.decode(): v.decode() for k, v in start["headers"]}, body
+
+
+class ThreadRecordingEstimator:
+    """호출된 스레드를 기록하는 처리 시간 추정기 대체"""
+
+    def __init__(self):
+        self.threads = []
+
+    def estimate(self, job_type, work_seconds, **kwargs):
+        self.threads.append(threading.current_thread())
+        return {"estimated_seconds": work_seconds, "lower_seconds": work_seconds, "upper_seconds": work_seconds}
+
+    def record(self, job_type, seconds, work_seconds, **kwargs):
+        self.threads.append(threading.current_thread())
+
+
+def test_estimate_generation_runs_estimator_off_the_event_loop(tmp_path, monkeypatch):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    estimator = ThreadRecordingEstimator()
+
+    async def probe(path):
+        return {"duration": 10.0, "width": 1280, "height": 720}
+
+    monkeypatch.setattr(youtube, "probe_media_async", probe)
+    monkeypatch.setattr(youtube, "get_estimator", lambda: estimator)
+    request = youtube.EstimateRequest(
+        video_path=str(video),
+        subtitle_segments=[{"start_time": "00:00:01,000", "end_time": "00:00:03,500"}],
+    )
+
+    response = asyncio.run(youtube.estimate_generation_time(request))
+    assert response["status"] == "success"
+    assert response["estimated_seconds"] == 2.5
+    assert estimator.threads and threading.main_thread() not in estimator.threads
+
+
+def test_waveform_data_serves_byte_ranges(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "WAVEFORM_DIR", str(tmp_path))
+    data = bytes(range(256)) * 4
+    (tmp_path / "clip-abc.peaks").write_bytes(data)
+
+    response = asyncio.run(youtube.get_waveform_data("clip-abc.peaks"))
+    status, headers, body = call_asgi(response, {"Range": "bytes=100-199"})
+    assert status == 206
+    assert headers["content-range"] == f"bytes 100-199/{len(data)}"
+    assert body == data[100:200]
+
+    status, _, body = call_asgi(response, {})
+    assert status == 200 and body == data
+
+
+def test_hls_segments_serve_byte_ranges(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "HLS_DIR", str(tmp_path))
+    package = tmp_path / "repeat-abc"
+    package.mkdir()
+    (package / "seg_0000.m4s").write_bytes(b"0123456789")
+
+    response = asyncio.run(youtube.get_hls_file("repeat-abc", "seg_0000.m4s"))
+    status, headers, body = call_asgi(response, {"Range": "bytes=2-5"})
+    assert status == 206 and body == b"2345"
+
+    response = asyncio.run(youtube.get_hls_file("..", "seg_0000.m4s"))
+    assert response.status_code == 404
@@ -0,0 +1,62 @@
+"""반복 영상 ASS 자막 생성 테스트 (임시 자막 파일과 임시 캐시 디렉토리 사용)"""
+
+import pytest
+
+from app.services import ass_subtitles
+from app.services.ass_subtitles import AssSubtitleBuilder, _ass_color, ass_filter
+from benchmarks.search_benchmark import write_srt
+
+
+@pytest.fixture
+def clip(tmp_path, monkeypatch):
+    monkeypatch.setattr(ass_subtitles, "translation_store_path", lambda video_path: None)
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    write_srt(tmp_path / "clip.en.srt", [(1.0, 3.0, "<i>Hello</i> there."), (3.0, 5.0, "See {you}."), (9.0, 10.0, "Later.")])
+    write_srt(tmp_path / "clip.ko.srt", [(0.8, 3.1, "안녕하세요."), (3.1, 5.0, "또 봐요.")])
+    return video
+
+
+def dialogues(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.split(",", 9)[1:] for line in f.read().splitlines() if line.startswith("Dialogue:")]
+
+
+def test_build_renders_each_mode_relative_to_segment(tmp_path, clip):
+    builder = AssSubtitleBuilder(cache_dir=str(tmp_path / "cache"))
+
+    en_ko = dialogues(builder.build(str(clip), 2.0, 6.0, "en_ko"))
+    # 구간(2~6초)과 겹치는 두 줄만, 구간 시작 기준 시간으로 잘림
+    assert [(start, end) for start, end, *_ in en_ko] == [("0:00:00.00", "0:00:01.00"), ("0:00:01.00", "0:00:03.00")]
+    assert en_ko[0][-1] == "Hello there.\\N{\\rKO}안녕하세요."
+    assert en_ko[1][-1] == "See (you).\\N{\\rKO}또 봐요."
+
+    assert [d[-1] for d in dialogues(builder.build(str(clip), 2.0, 6.0, "en"))] == ["Hello there.", "See (you)."]
+    assert [d[-1] for d in dialogues(builder.build(str(clip), 2.0, 6.0, "ko"))] == ["{\\rKO}안녕하세요.", "{\\rKO}또 봐요."]
+    assert builder.build(str(clip), 2.0, 6.0, "no_subtitle") is None
+    assert builder.build(str(clip), 6.0, 8.0, "en") is None
+    with pytest.raises(ValueError):
+        builder.build(str(clip), 2.0, 6.0, "fr")
+
+
+def test_build_is_cached_until_subtitles_or_style_change(tmp_path, clip):
+    builder = AssSubtitleBuilder(cache_dir=str(tmp_path / "cache"))
+    first = builder.build(str(clip), 2.0, 6.0, "en_ko")
+    assert builder.build(str(clip), 2.0, 6.0, "en_ko") == first
+
+    write_srt(tmp_path / "clip.ko.srt", [(0.8, 3.1, "반가워요.")])
+    changed = builder.build(str(clip), 2.0, 6.0, "en_ko")
+    assert changed != first
+    assert dialogues(changed)[0][-1] == "Hello there.\\N{\\rKO}반가워요."
+
+    styled = AssSubtitleBuilder({"fontsize": 60}, cache_dir=str(tmp_path / "cache"))
+    assert styled.build(str(clip), 2.0, 6.0, "en_ko") != changed
+
+
+def test_ass_helpers(tmp_path):
+    assert _ass_color("#FF8000") == "&H000080FF"
+    assert _ass_color("#00000080") == "&H7F000000"
+    assert _ass_color("bad") == "&H00FFFFFF"
+    # 필터 인자 안의 ':'와 따옴표는 이스케이프
+    expr = ass_filter(str(tmp_path / "it's:x.ass"))
+    assert expr.startswith("ass='") and expr.endswith("it\\'s\\:x.ass'")
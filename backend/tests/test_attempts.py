@@ -0,0 +1,40 @@
+"""녹음 업로드(스트리밍 multipart) 테스트"""
+
+import asyncio
+
+import pytest
+
+from app.services.attempts import RecordingUpload, UploadTooLarge
+
+BOUNDARY = "testboundary"
+
+
+def multipart_body(fields, files) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode() + value + b"\r\n")
+    for name, filename, data in files:
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b"\r\n")
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+def receive(upload: RecordingUpload, body: bytes, chunk_size: int = 7) -> None:
+    async def stream():
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+    asyncio.run(upload.receive(stream(), f"multipart/form-data; boundary={BOUNDARY}"))
+
+
+def test_upload_writes_takes_to_disk(tmp_path):
+    upload = RecordingUpload(tmp_path, max_file_bytes=1024)
+    receive(upload, multipart_body({"text": b"hello"}, [("takes", "a.wav", b"x" * 100), ("takes", "b.xyz", b"y" * 50)]))
+    assert upload.fields == {"text": "hello"}
+    assert [(f["size"], f["path"].rsplit("/", 1)[-1]) for f in upload.files] == [(100, "take_00.wav"), (50, "take_01.bin")]
+    assert (tmp_path / "take_00.wav").read_bytes() == b"x" * 100
+
+
+def test_upload_rejects_large_file(tmp_path):
+    upload = RecordingUpload(tmp_path, max_file_bytes=64)
+    with pytest.raises(UploadTooLarge):
+        receive(upload, multipart_body({}, [("takes", "a.wav", b"x" * 65)]))
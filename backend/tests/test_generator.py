@@ -0,0 +1,41 @@
+"""반복 영상 생성기 테스트 (ffmpeg/ffprobe/TTS는 가짜로 대체)"""
+
+import asyncio
+import threading
+
+from app.services import generator
+from app.services.generator import RepeatVideoGenerator
+
+
+class FakeTTS:
+    async def synthesize_many(self, texts, **kwargs):
+        return [f"/tts/{i}.mp3" for i in range(len(texts))]
+
+
+def test_tts_pass_probes_off_the_event_loop(monkeypatch):
+    probe_threads = []
+    commands = []
+
+    def probe_media(path):
+        probe_threads.append(threading.current_thread())
+        return {"duration": 3.0}
+
+    async def probe_media_async(path):
+        return {"has_audio": True, "duration": 60.0}
+
+    monkeypatch.setattr(generator, "segment_cues", lambda video, start, end: [(0.5, 2.0, "Hi."), (4.0, 5.0, "Bye.")])
+    monkeypatch.setattr(generator, "probe_media", probe_media)
+    monkeypatch.setattr(generator, "probe_media_async", probe_media_async)
+    monkeypatch.setattr(generator, "get_tts_service", lambda: FakeTTS())
+    monkeypatch.setattr(generator.subprocess, "run", lambda cmd, **kwargs: commands.append(cmd))
+    repeat = RepeatVideoGenerator({"tts": {"subtitle_mode": "no_subtitle"}})
+
+    path, total = asyncio.run(repeat._render_tts_pass("clip.mp4", "clip.mp4", 10.0, 5.0, "veryfast", None))
+    repeat.cleanup()
+
+    # 마지막 문장 음성(4.0초 + 3.0초)이 구간보다 길어 7초로 늘어남
+    assert total == 7.0 and path is not None
+    assert len(probe_threads) == 2 and threading.main_thread() not in probe_threads
+    cmd = commands[0]
+    assert cmd[cmd.index("-t") + 1] == "7.000"
+    assert cmd.count("-i") == 3
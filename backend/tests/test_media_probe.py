@@ -0,0 +1,75 @@
+"""미디어 메타데이터 캐시 테스트 (ffprobe와 SQLite 캐시는 가짜로 대체)"""
+
+import json
+import subprocess
+from collections import OrderedDict
+
+import pytest
+
+from app.services import media_probe
+from app.services.media_probe import probe_media
+
+FFPROBE_OUTPUT = {
+    "format": {"duration": "12.5", "bit_rate": "800000"},
+    "streams": [
+        {"index": 0, "codec_type": "video", "codec_name": "h264", "width": 1280, "height": 720,
+         "avg_frame_rate": "30000/1001"},
+        {"index": 1, "codec_type": "audio", "codec_name": "aac"},
+    ],
+    "packets": [
+        {"stream_index": 0, "pts_time": "0.000", "flags": "K_"},
+        {"stream_index": 0, "pts_time": "1.000", "flags": "__"},
+        {"stream_index": 0, "pts_time": "2.000", "flags": "K_"},
+        {"stream_index": 1, "pts_time": "3.000", "flags": "K_"},
+        {"stream_index": 0, "pts_time": "4.000", "flags": "K_"},
+    ],
+}
+
+
+@pytest.fixture
+def ffprobe(monkeypatch):
+    """ffprobe 호출 경로를 기록하고, DB 캐시 대신 저장 목록을 쓰는 가짜"""
+    calls, stored = [], []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd[-1])
+        return subprocess.CompletedProcess(cmd, 0, stdout=json.dumps(FFPROBE_OUTPUT), stderr="")
+
+    monkeypatch.setattr(media_probe.subprocess, "run", run)
+    monkeypatch.setattr(media_probe, "_cache", OrderedDict())
+    monkeypatch.setattr(media_probe, "_load_rows", lambda paths: {})
+    monkeypatch.setattr(media_probe, "_store_rows", stored.extend)
+    return calls, stored
+
+
+def test_probe_summarizes_streams_and_keyframes(tmp_path, ffprobe):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"x" * 10)
+
+    info = probe_media(str(video))
+    assert info["duration"] == 12.5 and info["size"] == 10
+    assert (info["width"], info["height"]) == (1280, 720)
+    assert info["fps"] == pytest.approx(29.97, abs=0.01)
+    assert info["has_audio"] and info["audio_codec"] == "aac"
+    # 오디오 패킷을 제외한 비디오 키프레임 0, 2, 4초 -> 평균 2초
+    assert info["keyframe_interval"] == 2.0
+
+
+def test_probe_runs_once_until_file_changes(tmp_path, ffprobe):
+    calls, stored = ffprobe
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"x" * 10)
+
+    probe_media(str(video))
+    probe_media(str(video))
+    assert len(calls) == 1 and len(stored) == 1
+
+    video.write_bytes(b"x" * 20)
+    assert probe_media(str(video))["size"] == 20
+    assert len(calls) == 2
+
+
+def test_probe_missing_file_returns_empty_metadata(tmp_path, ffprobe):
+    calls, _ = ffprobe
+    assert probe_media(str(tmp_path / "missing.mp4"))["duration"] == 0.0
+    assert calls == []
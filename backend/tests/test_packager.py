@@ -0,0 +1,63 @@
+"""HLS 패키징 테스트 (ffmpeg는 가짜로 대체)"""
+
+import subprocess
+
+import pytest
+
+from app.services import packager
+from app.services.packager import HLSPackager, PLAYLIST_NAME, keyframe_args
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """재생 목록과 세그먼트 세 개를 만드는 ffmpeg 대체 ("broken" 입력은 실패)"""
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        if "broken" in cmd[cmd.index("-i") + 1]:
+            raise subprocess.CalledProcessError(1, cmd)
+        pattern = cmd[cmd.index("-hls_segment_filename") + 1]
+        for n in range(3):
+            with open(pattern % n, "wb") as f:
+                f.write(b"m4s")
+        with open(cmd[-1], "w") as f:
+            f.write("#EXTM3U\n")
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(packager.subprocess, "run", run)
+    return commands
+
+
+def test_package_copies_streams_into_fmp4_segments(tmp_path, fake_ffmpeg):
+    video = tmp_path / "repeat.mp4"
+    video.write_bytes(b"mp4")
+    hls = HLSPackager({"segment_seconds": 2, "output_dir": str(tmp_path / "hls")})
+
+    assert hls.find(str(video)) is None
+    manifest = hls.package(str(video))
+    cmd = fake_ffmpeg[0]
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    assert cmd[cmd.index("-hls_segment_type") + 1] == "fmp4"
+    assert cmd[cmd.index("-hls_time") + 1] == "2"
+    assert manifest["segments"] == 3
+    assert manifest["playlist_url"].startswith("/api/youtube/hls/repeat-")
+    assert manifest["playlist_url"].endswith("/" + PLAYLIST_NAME)
+    assert hls.find(str(video)) == manifest
+
+    assert hls.package(str(video)) == manifest
+    assert len(fake_ffmpeg) == 1
+
+
+def test_failed_package_leaves_no_directories(tmp_path, fake_ffmpeg):
+    video = tmp_path / "broken.mp4"
+    video.write_bytes(b"mp4")
+    hls = HLSPackager({"output_dir": str(tmp_path / "hls")})
+
+    with pytest.raises(subprocess.CalledProcessError):
+        hls.package(str(video))
+    assert list((tmp_path / "hls").iterdir()) == []
+
+
+def test_keyframe_args_align_with_segments():
+    assert keyframe_args(4) == ["-force_key_frames", "expr:gte(t,n_forced*4)"]
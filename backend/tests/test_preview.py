@@ -0,0 +1,56 @@
+"""스크럽 미리보기 스프라이트/WebVTT 테스트 (ffprobe/ffmpeg는 가짜로 대체)"""
+
+import subprocess
+
+import pytest
+
+from app.services import preview
+from app.services.preview import SpritePreviewGenerator, VTT_NAME
+
+
+@pytest.fixture
+def fake_media(monkeypatch):
+    """25초 1280x720 영상으로 보이게 하고, ffmpeg는 시트 두 장을 출력 패턴대로 만듦"""
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        pattern = cmd[-1]
+        for n in (1, 2):
+            with open(pattern % n, "wb") as f:
+                f.write(b"jpg")
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    info = {"duration": 25.0, "width": 1280, "height": 720, "keyframe_interval": 2.0}
+    monkeypatch.setattr(preview, "probe_media", lambda path: dict(info))
+    monkeypatch.setattr(preview.subprocess, "run", run)
+    return commands
+
+
+def test_generate_builds_sprites_and_vtt_track(tmp_path, fake_media):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    generator = SpritePreviewGenerator({"interval": 5, "columns": 2, "rows": 2, "output_dir": str(tmp_path / "previews")})
+
+    manifest = generator.generate(str(video))
+    cmd = fake_media[0]
+    # 키프레임 간격(2초)이 샘플 간격(5초)보다 짧으면 키프레임만 디코딩
+    assert cmd[cmd.index("-skip_frame") + 1] == "nokey"
+    assert cmd[cmd.index("-vf") + 1] == "fps=1/5.0,scale=160:90,tile=2x2"
+    assert manifest["frames"] == 5 and manifest["sprites"] == ["sprite_001.jpg", "sprite_002.jpg"]
+
+    target = generator.preview_dir(str(video))
+    assert target is not None and target.name == f"clip-{manifest['version']}"
+    vtt = (target / VTT_NAME).read_text(encoding="utf-8").split("\n")
+    assert vtt[0] == "WEBVTT"
+    assert vtt[2:4] == ["00:00:00.000 --> 00:00:05.000", f"/api/youtube/preview/sprites/{target.name}/sprite_001.jpg#xywh=0,0,160,90"]
+    # 다섯 번째 프레임은 두 번째 시트의 첫 칸, 마지막 큐는 영상 길이에서 끝남
+    assert vtt[14:16] == ["00:00:20.000 --> 00:00:25.000", f"/api/youtube/preview/sprites/{target.name}/sprite_002.jpg#xywh=0,0,160,90"]
+
+    # 원본이 그대로면 다시 만들지 않고, 바뀌면 새 버전을 만들고 이전 버전은 지움
+    generator.generate(str(video))
+    assert len(fake_media) == 1
+    video.write_bytes(b"changed video")
+    assert generator.preview_dir(str(video)) is None
+    generator.generate(str(video))
+    assert [p.name for p in (tmp_path / "previews").iterdir()] == [generator.preview_dir(str(video)).name]
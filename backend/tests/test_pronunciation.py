@@ -0,0 +1,28 @@
+"""발음 채점(DTW) 테스트 (합성 신호 사용)"""
+
+import numpy as np
+
+from app.services.pronunciation import PronunciationAnalyzer, ReferenceFeatures, SAMPLE_RATE
+
+
+def synthetic_speech(seconds: float = 1.5) -> np.ndarray:
+    """음높이가 바뀌는 배음 신호 (단어 사이 짧은 쉼 포함)"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = np.where(t < seconds / 2, 180.0, 260.0)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    signal = sum(np.sin(k * phase) / k for k in range(1, 6))
+    signal[(t > seconds / 2 - 0.05) & (t < seconds / 2 + 0.05)] = 0.0
+    return (0.3 * signal).astype(np.float32)
+
+
+def test_self_match_scores_higher_than_noise(tmp_path):
+    analyzer = PronunciationAnalyzer({"cache_dir": str(tmp_path)})
+    speech = synthetic_speech()
+    reference = ReferenceFeatures.from_signal(speech, "hello world")
+    noise = np.random.default_rng(0).normal(0.0, 0.1, len(speech)).astype(np.float32)
+
+    same = analyzer.score(speech, reference)
+    other = analyzer.score(noise, reference)
+    assert same["score"] > other["score"]
+    assert same["pronunciation"] == 100.0
+    assert [w["word"] for w in same["words"]] == ["hello", "world"]
@@ -0,0 +1,62 @@
+"""프록시 영상 생성 테스트 (ffprobe/ffmpeg는 가짜로 대체)"""
+
+import subprocess
+
+import pytest
+
+from app.services import proxy
+from app.services.proxy import ProxyGenerator
+
+
+@pytest.fixture
+def fake_media(monkeypatch):
+    """원본 높이를 바꿀 수 있는 가짜 ffprobe와 출력 파일만 만드는 가짜 ffmpeg"""
+    info = {"height": 1080, "fps": 30.0}
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        with open(cmd[-1], "wb") as f:
+            f.write(b"proxy")
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(proxy, "probe_media", lambda path: dict(info))
+    monkeypatch.setattr(proxy.subprocess, "run", run)
+    return info, commands
+
+
+def test_generate_short_gop_proxy_once_per_source_version(tmp_path, fake_media):
+    info, commands = fake_media
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"source")
+    generator = ProxyGenerator({"height": 360, "output_dir": str(tmp_path / "proxies")})
+
+    assert generator.proxy_path(str(video)) is None
+    path = generator.generate(str(video))
+    assert path == generator.proxy_path(str(video))
+    cmd = commands[0]
+    assert cmd[cmd.index("-vf") + 1] == "scale=-2:360"
+    # 0.5초 GOP (30fps -> 15프레임), 장면 전환 키프레임 없이 고정 간격
+    assert cmd[cmd.index("-g") + 1] == "15" and cmd[cmd.index("-sc_threshold") + 1] == "0"
+    assert "+faststart" in cmd
+
+    assert generator.generate(str(video)) == path
+    assert len(commands) == 1
+
+    # 원본이 바뀌면 새 프록시를 만들고 이전 프록시는 지움
+    video.write_bytes(b"new source")
+    new_path = generator.generate(str(video))
+    assert new_path != path
+    assert [str(p) for p in (tmp_path / "proxies").iterdir()] == [new_path]
+
+
+def test_small_sources_skip_proxy(tmp_path, fake_media):
+    info, commands = fake_media
+    info["height"] = 360
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"source")
+    generator = ProxyGenerator({"height": 360, "output_dir": str(tmp_path / "proxies")})
+
+    assert not generator.needs_proxy(str(video))
+    assert generator.generate(str(video)) is None
+    assert commands == []
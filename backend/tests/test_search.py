@@ -0,0 +1,189 @@
+"""자막 검색 엔진 테스트 (임시 클립 디렉토리와 임시 인덱스 사용)"""
+
+import json
+import threading
+from typing import List, Tuple
+
+import pytest
+
+from app.services.search import SubtitleSearchEngine, fuzzy_max_distance, substring_distances
+from app.services.subtitle import get_subtitle_indexer
+from benchmarks.search_benchmark import write_srt
+
+
+def timed(lines: List[str], gap: float = 2.0) -> List[Tuple[float, float, str]]:
+    """줄마다 2초짜리 자막을 gap초 간격으로 배치 (gap=0이면 이어지는 자막)"""
+    return [(i * (2.0 + gap), i * (2.0 + gap) + 2.0, text) for i, text in enumerate(lines)]
+
+
+def make_engine(tmp_path, **config) -> SubtitleSearchEngine:
+    clips_dir = tmp_path / "clips"
+    clips_dir.mkdir(parents=True)
+    write_srt(clips_dir / "alpha.en.srt", timed([
+        "Grab the kitchen sponge please.",
+        "The weather is nice today.",
+        "I bought a kichen sponge yesterday.",
+        "Where is the kitchen sponge?",
+    ]))
+    write_srt(clips_dir / "beta.en.srt", timed([
+        "This kitchen sponge is amazing.",
+        "Scrub daddy changes shape in warm water.",
+        "My kitchen spunge is worn out.",
+        "We will see you next time.",
+    ]))
+    write_srt(clips_dir / "gamma.en.srt", timed([
+        "so what I really want to",
+        "show you is this thing.",
+    ], gap=0.0))
+    return SubtitleSearchEngine({
+        "clips_dir": str(clips_dir),
+        "index_path": str(tmp_path / "index.json"),
+        "semantic": {"index_dir": str(tmp_path / "semantic")},
+        **config
+    })
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return make_engine(tmp_path)
+
+
+def test_paging_exact_and_fuzzy_to_end(engine):
+    first = engine.search(["kitchen sponge"], limit=3)
+    assert [r["score"] for r in first["results"]] == [1.0, 1.0, 1.0]
+    assert first["next_cursor"] is not None
+    assert first["total"] == 5
+
+    second = engine.search(["kitchen sponge"], limit=3, cursor=first["next_cursor"])
+    assert len(second["results"]) == 2
+    assert all(r["score"] < 1.0 for r in second["results"])
+    assert second["next_cursor"] is None
+    assert second["total"] == 5
+
+    seen = {(r["name"], r["sentence_id"]) for r in first["results"] + second["results"]}
+    assert len(seen) == 5
+
+
+def test_paging_matches_single_page(engine):
+    everything = engine.search(["kitchen sponge"], limit=10)["results"]
+    paged, cursor = [], None
+    while True:
+        page = engine.search(["kitchen sponge"], limit=2, cursor=cursor)
+        paged.extend(page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert [(r["name"], r["sentence_id"]) for r in paged] == [(r["name"], r["sentence_id"]) for r in everything]
+
+
+def test_level_filter_matches_result_level(engine):
+    results = engine.search(["kitchen sponge"], limit=10)["results"]
+    level = results[0]["level"]
+    filtered = engine.search(["kitchen sponge"], limit=10, filters={"levels": [level.lower()]})["results"]
+    assert filtered and all(r["level"] == level for r in filtered)
+    assert len(filtered) == sum(1 for r in results if r["level"] == level)
+
+
+def test_sentence_spans_cues(engine):
+    results = engine.search(["want to show you"], limit=10)["results"]
+    assert [(r["name"], r["index"], r["score"]) for r in results] == [("gamma", 1, 1.0)]
+    assert results[0]["text"] == "so what I really want to show you is this thing."
+
+
+def test_multiple_queries(engine):
+    page = engine.search(["kitchen sponge", "scrub daddy", "kitchen sponge"], limit=10)
+    assert list(page["query_results"]) == ["kitchen sponge", "scrub daddy"]
+    assert [r["name"] for r in page["query_results"]["scrub daddy"]] == ["beta"]
+    assert {r["query"] for r in page["results"]} == {"kitchen sponge", "scrub daddy"}
+
+
+def test_phrase_near_and_prefix(engine):
+    phrase = engine.search(['"kitchen sponge"'], limit=10)["results"]
+    assert {(r["name"], r["sentence_id"]) for r in phrase} == {("alpha", 0), ("alpha", 3), ("beta", 0)}
+
+    near = engine.search(["changes NEAR/2 warm"], limit=10)["results"]
+    assert [(r["name"], r["sentence_id"]) for r in near] == [("beta", 1)]
+    assert not engine.search(["changes NEAR/1 warm"], limit=10)["results"]
+
+    prefix = engine.search(["spung*"], limit=10)["results"]
+    assert [(r["name"], r["sentence_id"]) for r in prefix] == [("beta", 2)]
+
+
+@pytest.mark.parametrize("query", ["kichen sponge", "kitchen spunge", "scrub dady", "weather is nise"])
+def test_fuzzy_filter_keeps_every_match_within_distance(engine, query):
+    engine.refresh()
+    snapshot = engine._snapshot
+    max_distance = fuzzy_max_distance(query, 0.5)
+    distances = substring_distances(query, snapshot.texts, max_distance)
+    expected = {doc_id for doc_id, d in enumerate(distances) if d <= max_distance}
+    matches, truncated = engine._fuzzy_matches(snapshot, query, 0.5)
+    assert expected and {doc_id for doc_id, _ in matches} == expected
+    assert not truncated
+
+
+def test_fuzzy_max_distance_keeps_half_of_trigrams():
+    # 임계값 0.5가 허용하는 6번이 아니라 트라이그램 11개 중 절반 이상이 남는 1번까지
+    assert fuzzy_max_distance("kichen sponge", 0.5) == 1
+    assert fuzzy_max_distance("kichen sponge", 0.99) == 0
+    assert fuzzy_max_distance("brian", 0.5) == 0
+
+
+def test_fuzzy_candidate_limit_is_reported(tmp_path):
+    assert make_engine(tmp_path / "full").search(["kichen sponge"], limit=10)["truncated"] is False
+    page = make_engine(tmp_path / "cut", max_fuzzy_candidates=1).search(["kichen sponge"], limit=10)
+    assert page["truncated"] is True
+
+
+def test_engine_shares_indexer_and_concurrent_writes_survive(engine, tmp_path):
+    index_path = str(tmp_path / "index.json")
+    assert engine.indexer is get_subtitle_indexer(index_path)
+    engine.search(["kitchen sponge"])
+
+    extra = tmp_path / "extra"
+    extra.mkdir()
+    paths = []
+    for i in range(8):
+        path = extra / f"clip{i}.en.srt"
+        write_srt(path, timed([f"Sentence number {i} is here."]))
+        paths.append(path)
+
+    def index_and_save(path):
+        # 요청별 SubtitleProcessor가 하는 것처럼 같은 경로의 인덱서를 받아 인덱싱 후 저장
+        indexer = get_subtitle_indexer(index_path)
+        indexer.index_subtitle(str(path), path.stem)
+        indexer.save_index()
+
+    threads = [threading.Thread(target=index_and_save, args=(path,)) for path in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(index_path, encoding="utf-8") as f:
+        saved = json.load(f)["subtitles"]
+    assert {"alpha.en", "beta.en", "gamma.en"} | {path.stem for path in paths} <= set(saved)
+
+
+def test_search_rescans_only_when_clips_or_index_change(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path)
+    scans = []
+    refresh = engine.refresh
+    monkeypatch.setattr(engine, "refresh", lambda: scans.append(1) or refresh())
+
+    engine.search(["kitchen sponge"])
+    engine.search(["weather"])
+    engine.similar("kitchen sponge")
+    assert len(scans) == 1
+
+    write_srt(tmp_path / "clips" / "delta.en.srt", timed(["A brand new kitchen sponge."]))
+    assert any(r["name"] == "delta" for r in engine.search(["brand new"])["results"])
+    assert len(scans) == 2
+
+    # 다른 요청이 공유 인덱서를 고치면 다음 검색에서 다시 확인
+    engine.indexer.index_subtitle(str(tmp_path / "clips" / "alpha.en.srt"), "other")
+    engine.search(["weather"])
+    assert len(scans) == 3
+
+    engine.rescan_seconds = 0.0
+    engine.search(["weather"])
+    assert len(scans) == 4
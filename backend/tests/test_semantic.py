@@ -0,0 +1,78 @@
+"""의미 검색 인덱스 테스트 (TF-IDF/LSA, 임베딩 모델 없이)"""
+
+import numpy as np
+
+from app.services import semantic
+from app.services.semantic import SemanticIndex, SparseRows, VECTORS_NAME
+from app.services.subtitle import normalize_text
+
+
+def make_track(texts, mtime_ns=1):
+    return {
+        "mtime_ns": mtime_ns,
+        "sentences": [{"id": i + 1, "text": text} for i, text in enumerate(texts)],
+        "normalized": [normalize_text(text) for text in texts]
+    }
+
+
+TRACKS = {
+    "cooking": make_track(["I love cooking pasta at home", "The pasta sauce needs more garlic",
+                           "Cooking dinner for my family"]),
+    "travel": make_track(["We took the train to Paris", "The train station was crowded",
+                          "Paris is beautiful in spring"]),
+}
+
+
+def test_sparse_rows_match_dense_products():
+    rng = np.random.default_rng(0)
+    dense = rng.random((5, 7)) * (rng.random((5, 7)) > 0.6)
+    rows, cols = np.nonzero(dense)
+    sparse = SparseRows(rows, cols, dense[rows, cols], dense.shape)
+    right, left = rng.random((7, 3)), rng.random((5, 3))
+    np.testing.assert_allclose(sparse.dot(right), dense @ right)
+    np.testing.assert_allclose(sparse.tdot(left), dense.T @ left)
+
+
+def test_search_ranks_related_sentences(tmp_path):
+    index = SemanticIndex({"index_dir": str(tmp_path), "dimensions": 4})
+    assert index.search("pasta") == []
+    assert index.update(TRACKS) == 6
+    assert index.update(TRACKS) == 0
+
+    results = index.search("pasta with garlic sauce", limit=2)
+    assert results[0][:2] == ("cooking", 2)
+    assert all(score <= results[0][2] for _, _, score in results)
+    assert index.search("train to Paris", limit=1)[0][0] == "travel"
+    assert index.search("zzz unknown words") == []
+
+    # 저장된 인덱스를 다시 열면 재학습 없이 같은 결과
+    reopened = SemanticIndex({"index_dir": str(tmp_path), "dimensions": 4})
+    assert reopened.search("pasta with garlic sauce", limit=2) == results
+
+
+def test_update_appends_changed_tracks_and_hides_old_rows(tmp_path, monkeypatch):
+    index = SemanticIndex({"index_dir": str(tmp_path), "dimensions": 4})
+    index.update(TRACKS)
+    vector_size = (tmp_path / VECTORS_NAME).stat().st_size
+
+    rebuilds = []
+    monkeypatch.setattr(index, "_rebuild", lambda tracks: rebuilds.append(tracks))
+    tracks = dict(TRACKS, travel=make_track(["The train to Paris was late"], mtime_ns=2))
+    assert index.update(tracks) == 1
+    assert not rebuilds
+    assert (tmp_path / VECTORS_NAME).stat().st_size == vector_size + vector_size // 6
+
+    results = index.search("train to Paris", limit=10)
+    assert ("travel", 1, results[0][2]) == results[0]
+    # 이전 travel 문장(삭제 표시된 행)은 결과에 나오지 않음
+    assert not [r for r in results if r[0] == "travel" and r[1] > 1]
+
+
+def test_dead_rows_trigger_rebuild(tmp_path, monkeypatch):
+    monkeypatch.setattr(semantic, "REFIT_GROWTH", 100.0)
+    index = SemanticIndex({"index_dir": str(tmp_path), "dimensions": 4})
+    index.update(TRACKS)
+    # travel 삭제 + cooking 변경 -> 삭제 행 6개 > 살아 있는 행 3개
+    assert index.update({"cooking": dict(TRACKS["cooking"], mtime_ns=2)}) == 3
+    assert index._meta["rows"] == [["cooking", 1], ["cooking", 2], ["cooking", 3]]
+    assert (tmp_path / VECTORS_NAME).stat().st_size == 3 * index._meta["dimensions"] * 4
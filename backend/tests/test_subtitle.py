@@ -0,0 +1,64 @@
+"""자막 처리기 테스트 (임시 디렉토리와 임시 인덱스 사용)"""
+
+import os
+import asyncio
+
+from app.services.subtitle import SubtitleProcessor, get_subtitle_indexer
+from benchmarks.search_benchmark import write_srt
+
+ORIGINAL = [(0.0, 1.5, "so what I really"), (1.5, 3.0, "want to show you"), (3.0, 4.5, "is this thing.")]
+
+
+def make_processor(tmp_path) -> SubtitleProcessor:
+    processor = SubtitleProcessor()
+    processor.indexer = get_subtitle_indexer(str(tmp_path / "index.json"))
+    return processor
+
+
+def test_get_subtitles_returns_original_cues_by_default(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    write_srt(tmp_path / "clip.en.srt", ORIGINAL)
+    write_srt(tmp_path / "clip.en.refined.srt", [(0.0, 4.5, "so what I really want to show you is this thing.")])
+    processor = make_processor(tmp_path)
+
+    original = asyncio.run(processor.get_subtitles(str(video), "en"))
+    refined = asyncio.run(processor.get_subtitles(str(video), "en", refined=True))
+    assert [s["text"] for s in original] == [text for _, _, text in ORIGINAL]
+    assert len(refined) == 1
+    # 보정 자막이 있으면 인덱스 항목은 인덱싱 단계(index_and_translate) 몫이라 어느 쪽도 덮어쓰지 않음
+    assert processor.indexer.get_subtitle_by_video_id("clip.en") is None
+
+
+def test_get_subtitles_ignores_stale_refined_track(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    write_srt(tmp_path / "clip.en.refined.srt", [(0.0, 4.5, "old refined text")])
+    write_srt(tmp_path / "clip.en.srt", ORIGINAL)
+    stat = os.stat(tmp_path / "clip.en.srt")
+    os.utime(tmp_path / "clip.en.refined.srt", ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+    processor = make_processor(tmp_path)
+
+    refined = asyncio.run(processor.get_subtitles(str(video), "en", refined=True))
+    assert len(refined) == 3
+    assert processor.indexer.get_subtitle_by_video_id("clip.en")["path"] == str(tmp_path / "clip.en.srt")
+
+
+def test_get_subtitles_serves_generating_stream_without_indexing(tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    write_srt(tmp_path / "clip.en.srt", ORIGINAL)
+    # 같은 자막을 다시 생성하는 중: 진행 상태 파일과 .partial.srt만 있고 최종 파일은 아직 이전 것
+    write_srt(tmp_path / "clip.en.partial.srt", [(0.0, 1.0, "new cue")])
+    (tmp_path / "clip.en.srt.partial").write_text('{"progress": 0.2}', encoding="utf-8")
+    processor = make_processor(tmp_path)
+
+    assert processor.find_generating_subtitle(str(video), "en") == tmp_path / "clip.en.srt"
+    subtitles = asyncio.run(processor.get_subtitles(str(video), "en"))
+    assert [s["text"] for s in subtitles] == ["new cue"]
+    assert processor.indexer.get_subtitle_by_video_id("clip.en") is None
+
+    (tmp_path / "clip.en.srt.partial").unlink()
+    (tmp_path / "clip.en.partial.srt").unlink()
+    subtitles = asyncio.run(processor.get_subtitles(str(video), "en"))
+    assert [s["text"] for s in subtitles] == [text for _, _, text in ORIGINAL]
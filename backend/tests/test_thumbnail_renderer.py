@@ -0,0 +1,99 @@
+"""Pillow 썸네일 합성 테스트 (ffmpeg 프레임 디코딩은 가짜로 대체)"""
+
+import re
+import subprocess
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services import thumbnail_renderer
+from app.services.generator import ThumbnailGenerator
+from app.services.thumbnail_renderer import ThumbnailRenderer
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """scale=WxH 크기의 회색 rawvideo 프레임을 돌려주는 ffmpeg 대체 (명령 목록 기록)"""
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        width, height = map(int, re.search(r"scale=(\d+):(\d+)", " ".join(cmd)).groups())
+        frames = max(1, cmd.count("-i"))
+        return subprocess.CompletedProcess(cmd, 0, stdout=bytes([128]) * (width * height * 3 * frames), stderr=b"")
+
+    monkeypatch.setattr(thumbnail_renderer.subprocess, "run", run)
+    return commands
+
+
+def test_generate_thumbnail_decodes_one_small_frame(tmp_path, fake_ffmpeg):
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    output = tmp_path / "thumb.jpg"
+
+    ok, result = ThumbnailGenerator().generate_thumbnail(str(video), "00:00:05,500", str(output), text="Hello")
+    assert ok, result
+    assert len(fake_ffmpeg) == 1
+    cmd = " ".join(fake_ffmpeg[0])
+    # 배경 프레임은 출력의 1/8 크기로 디코딩
+    assert "-ss 00:00:05.500" in cmd and "scale=160:90" in cmd
+    with Image.open(output) as image:
+        assert image.size == (1280, 720)
+
+
+def test_render_draws_text_over_tinted_background():
+    generator = ThumbnailGenerator()
+    renderer = ThumbnailRenderer(generator.config)
+    template = generator.config["templates"]["basic"]
+    width, height = renderer.frame_size
+    frame = np.full((height, width, 3), 200, dtype=np.uint8)
+
+    plain = np.asarray(renderer.render(frame, template), dtype=np.int32)
+    # 검은 템플릿 배경이 프레임을 어둡게 덮음 (가장자리까지 균일)
+    assert plain.shape == (720, 1280, 3)
+    assert plain.max() < 100 and plain.max() - plain.min() <= 2
+
+    titled = np.asarray(renderer.render(frame, template, text="Hello", subtitle="world"), dtype=np.int32)
+    assert titled[200:400].max() > 200  # 중앙 흰 글자
+    assert titled[600:].max() > 180  # 하단 자막
+    np.testing.assert_array_equal(titled[:100], plain[:100])
+
+
+def test_hangul_text_uses_korean_font():
+    renderer = ThumbnailRenderer({"width": 64, "height": 36, "font": "en.ttf", "font_ko": "ko.ttf"})
+    assert renderer._font_for("Hello") == "en.ttf"
+    assert renderer._font_for("안녕 Hello") == "ko.ttf"
+
+
+def test_batch_decodes_sorted_seeks_in_groups_and_keeps_item_order(tmp_path, monkeypatch):
+    commands = []
+
+    def run(cmd, **kwargs):
+        # 입력마다 -ss 초 값을 픽셀 값으로 쓴 프레임을 입력 순서대로 이어 붙여 반환
+        commands.append(cmd)
+        seeks = [float(cmd[i + 1]) for i, arg in enumerate(cmd) if arg == "-ss"]
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"".join(bytes([int(s)]) * (160 * 90 * 3) for s in seeks))
+
+    monkeypatch.setattr(thumbnail_renderer.subprocess, "run", run)
+    frames = thumbnail_renderer.decode_frames("clip.mp4", [30.0, 10.0, 20.0], 160, 90, max_inputs=2)
+    assert [int(frame[0, 0, 0]) for frame in frames] == [30, 10, 20]
+    assert [[float(c[i + 1]) for i, a in enumerate(c) if a == "-ss"] for c in commands] == [[10.0, 20.0], [30.0]]
+
+    commands.clear()
+    video = tmp_path / "clip.mp4"
+    video.touch()
+    items = [
+        {"time_pos": "00:00:30", "text": "third"},
+        {"time_pos": "00:00:10,000", "subtitle": "first", "template": "quiz"},
+        {"time_pos": 20, "template": "missing"},
+    ]
+    ok, manifest = ThumbnailGenerator().generate_thumbnails_batch(str(video), items, str(tmp_path / "out"), workers=2)
+    assert ok, manifest
+    assert len(commands) == 1  # 기본 묶음 크기 안이면 ffmpeg 한 번
+    assert [t["time"] for t in manifest["thumbnails"]] == [30.0, 10.0, 20.0]
+    assert [t["template"] for t in manifest["thumbnails"]] == ["basic", "quiz", "basic"]
+    assert all((tmp_path / "out" / f"clip_thumb_{i:03d}.jpg").exists() for i in (1, 2, 3))
+    # 컨택트 시트는 시간순
+    assert [tile["index"] for tile in manifest["contact_sheet"]["tiles"]] == [1, 2, 0]
+    assert (tmp_path / "out" / "clip_thumbnails.json").exists()
@@ -0,0 +1,97 @@
+"""TTS 서비스 테스트 (합성 엔진은 호출을 세는 가짜로 대체, 임시 캐시 디렉토리 사용)"""
+
+import os
+import time
+import wave
+import shutil
+import asyncio
+
+import pytest
+
+from app.services import tts
+from app.services.tts import TTSService, TTSEngine, OfflineTTSEngine
+
+
+class CountingEngine(TTSEngine):
+    """합성 호출과 최대 동시 실행 수를 기록하는 엔진"""
+
+    name = "counting"
+    extension = ".mp3"
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def synthesize(self, text, voice, speed, pitch, output_path):
+        self.calls.append((text, voice, speed, pitch))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if text == "fail":
+            raise RuntimeError("엔진 오류")
+        with open(output_path, "wb") as f:
+            f.write(text.encode())
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    engine = CountingEngine()
+    monkeypatch.setitem(tts.ENGINES, CountingEngine.name, lambda: engine)
+    service = TTSService({"provider": "counting", "cache_dir": str(tmp_path / "tts"), "max_concurrent": 2})
+    return service, engine
+
+
+def test_synthesize_many_merges_duplicates_and_reuses_cache(service):
+    service, engine = service
+
+    paths = asyncio.run(service.synthesize_many(["Hi there.", " Hi   there. ", "Bye.", "Hi there.", "Later."]))
+    assert len(engine.calls) == 3
+    assert paths[0] == paths[1] == paths[3] and len(set(paths)) == 3
+    assert open(paths[2], "rb").read() == b"Bye."
+    assert engine.max_active == 2
+
+    asyncio.run(service.synthesize("Hi there."))
+    assert len(engine.calls) == 3
+    # 음성/속도/음높이가 다르면 다른 캐시 항목
+    slow = asyncio.run(service.synthesize("Hi there.", speed=0.8))
+    assert slow != paths[0] and len(engine.calls) == 4
+
+
+def test_failed_synthesis_leaves_no_cache_entry(service):
+    service, engine = service
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.synthesize("fail"))
+    assert not service.cache_path("fail", service.voice, service.speed, service.pitch, "counting").exists()
+    assert not any(p.is_file() for p in service.cache_dir.rglob("*"))
+
+
+def test_evict_removes_least_recently_used_beyond_grace(tmp_path):
+    service = TTSService({"provider": "offline", "cache_dir": str(tmp_path / "tts"), "cache_max_mb": 1})
+    now = time.time()
+    files = []
+    for n, age in enumerate([4000, 3000, 2000, 10]):
+        path = service.cache_dir / "ab" / f"{n}.mp3"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 400 * 1024)
+        os.utime(path, (now - age, now - age))
+        files.append(path)
+
+    # 1.6MB -> 0.9MB 이하가 될 때까지 오래된 것부터, 최근 사용(120초 이내) 파일은 남김
+    assert service.evict() == 2
+    assert [p.exists() for p in files] == [False, False, True, True]
+
+
+@pytest.mark.skipif(shutil.which("espeak-ng") or shutil.which("espeak"), reason="espeak가 있으면 실제 음성 사용")
+def test_offline_engine_writes_wav_scaled_by_words_and_speed(tmp_path):
+    engine = OfflineTTSEngine()
+
+    def duration(text, speed):
+        path = tmp_path / f"{len(text)}-{speed}.wav"
+        asyncio.run(engine.synthesize(text, "en-US", speed, 0, str(path)))
+        with wave.open(str(path)) as f:
+            return f.getnframes() / f.getframerate()
+
+    assert duration("one two three four", 1.0) == pytest.approx(2 * duration("one two", 1.0))
+    assert duration("one two", 2.0) == pytest.approx(duration("one two", 1.0) / 2, rel=0.01)
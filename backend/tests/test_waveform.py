@@ -0,0 +1,96 @@
+"""파형 피크 사전 계산 테스트 (ffmpeg 디코딩은 정해진 PCM을 내보내는 가짜로 대체)"""
+
+import io
+
+import numpy as np
+import pytest
+
+from app.services import waveform
+from app.services.waveform import WaveformGenerator, PEAKS_SUFFIX, SAMPLE_RATE
+
+
+class FakeProcess:
+    """stdout으로 PCM 바이트를 내보내는 Popen 대체"""
+
+    def __init__(self, pcm: bytes, returncode: int = 0):
+        self.stdout = io.BytesIO(pcm)
+        self.stderr = io.BytesIO(b"decode error" if returncode else b"")
+        self.returncode = returncode
+
+    def wait(self):
+        return self.returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
+
+@pytest.fixture
+def samples(monkeypatch):
+    """블록 4샘플 기준 4개 블록 + 나머지 2샘플 (총 18샘플)"""
+    pcm = np.array([1, -5, 3, 2, 10, 0, -1, 4, 300, -300, 7, 7, -20000, 20000, 0, 0, 9, -9], dtype='<i2')
+    popens = []
+
+    def popen(cmd, stdout=None, stderr=None):
+        popens.append(cmd)
+        return FakeProcess(pcm.tobytes(), returncode=1 if "broken" in cmd[cmd.index("-i") + 1] else 0)
+
+    monkeypatch.setattr(waveform.subprocess, "Popen", popen)
+    return pcm, popens
+
+
+def make_generator(tmp_path, bits=16):
+    return WaveformGenerator({"samples_per_peak": 4, "levels": 3, "zoom_factor": 2, "bits": bits,
+                              "output_dir": str(tmp_path / "waveforms")})
+
+
+def test_generate_writes_min_max_levels_and_rms(tmp_path, samples, monkeypatch):
+    pcm, popens = samples
+    # 읽기 단위를 블록 크기와 어긋나게 해 블록이 두 번의 read에 걸치게 함
+    monkeypatch.setattr(waveform, "READ_SAMPLES", 6)
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    generator = make_generator(tmp_path)
+
+    manifest = generator.generate(str(video))
+    assert len(popens) == 1
+    assert manifest["duration"] == len(pcm) / SAMPLE_RATE
+    assert [level["count"] for level in manifest["levels"]] == [5, 3, 2]
+    assert [level["offset"] for level in manifest["levels"]] == [0, 20, 32]
+
+    level0 = generator.read_peaks(str(video), 0, 0.0, 1.0)
+    assert level0.tolist() == [[-5, 3], [-1, 10], [-300, 300], [-20000, 20000], [-9, 9]]
+    assert generator.read_peaks(str(video), 1, 0.0, 1.0).tolist() == [[-5, 10], [-20000, 20000], [-9, 9]]
+    assert generator.read_peaks(str(video), 2, 0.0, 1.0).tolist() == [[-20000, 20000], [-9, 9]]
+    # 구간 읽기 (블록 하나 = 0.25ms)
+    assert generator.read_peaks(str(video), 0, 0.00025, 0.0005).tolist() == [[-1, 10]]
+
+    rms, seconds = generator.rms_envelope(str(video))
+    expected = np.sqrt(np.mean((pcm[12:16].astype(np.float32) / 32768.0) ** 2))
+    assert seconds == 4 / SAMPLE_RATE and len(rms) == 5
+    assert float(rms[3]) == pytest.approx(expected, rel=1e-3)
+    assert len(popens) == 1
+
+    peaks_file = tmp_path / "waveforms" / manifest["url"].rsplit("/", 1)[1]
+    assert peaks_file.suffix == PEAKS_SUFFIX and peaks_file.stat().st_size == manifest["size"]
+
+
+def test_8bit_peaks_round_outward(tmp_path, samples):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    generator = make_generator(tmp_path, bits=8)
+    generator.generate(str(video))
+    # 작은 값도 0으로 사라지지 않도록 최솟값은 내림, 최댓값은 올림
+    assert generator.read_peaks(str(video), 0, 0.0, 1.0).tolist() == [[-1, 1], [-1, 1], [-2, 2], [-79, 79], [-1, 1]]
+
+
+def test_failed_decode_raises_and_writes_nothing(tmp_path, samples):
+    video = tmp_path / "broken.mp4"
+    video.write_bytes(b"video")
+    generator = make_generator(tmp_path)
+    with pytest.raises(RuntimeError):
+        generator.generate(str(video))
+    assert generator.find(str(video)) is None
+    assert list((tmp_path / "waveforms").iterdir()) == []
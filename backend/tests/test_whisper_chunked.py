@@ -0,0 +1,90 @@
+"""청크 전사 테스트 (프로세스 풀과 오디오 추출은 가짜로 대체)"""
+
+import wave
+import asyncio
+from concurrent.futures import Future
+
+import numpy as np
+
+from app.config import settings
+from app.services import whisper_chunked
+from app.services.audio import frame_rms, load_wav, find_silence_splits
+from app.services.whisper_chunked import ChunkedWhisperTranscriber
+
+
+class FakePool:
+    """submit하면 바로 끝난 Future를 돌려주는 ProcessPoolExecutor 대체"""
+
+    def __init__(self, max_workers=None, mp_context=None, initializer=None, initargs=()):
+        self.model = initargs[0]
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result([{"start": 0.0, "end": 1.0, "text": f"{self.model} from {args[1]}"}])
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def write_wav(path, samples: np.ndarray, sample_rate: int = 16000) -> None:
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.astype("<i2").tobytes())
+
+
+def test_frame_rms_in_blocks_matches_whole_array(tmp_path):
+    rng = np.random.default_rng(0)
+    write_wav(tmp_path / "a.wav", rng.integers(-20000, 20000, 16000 * 3 + 123))
+    samples, sample_rate = load_wav(str(tmp_path / "a.wav"))
+
+    whole = frame_rms(samples, sample_rate, block_frames=len(samples))
+    blocked = frame_rms(samples, sample_rate, block_frames=7)
+    assert len(whole) == 100
+    np.testing.assert_array_equal(blocked, whole)
+    assert len(frame_rms(samples[:10], sample_rate)) == 0
+
+
+def test_pools_evict_least_recently_used(monkeypatch):
+    monkeypatch.setattr(whisper_chunked, "ProcessPoolExecutor", FakePool)
+    monkeypatch.setattr(whisper_chunked, "_pools", whisper_chunked.OrderedDict())
+    monkeypatch.setattr(settings, "WHISPER_MAX_CHUNK_POOLS", 2)
+    transcriber = ChunkedWhisperTranscriber({"workers": 1})
+
+    tiny = transcriber._get_pool("tiny")
+    base = transcriber._get_pool("base")
+    assert transcriber._get_pool("tiny") is tiny
+    small = transcriber._get_pool("small")
+
+    assert base.shut_down and not tiny.shut_down and not small.shut_down
+    assert [key[0] for key in whisper_chunked._pools] == ["tiny", "small"]
+
+
+def test_transcribe_splits_off_the_event_loop(tmp_path, monkeypatch):
+    # 10초 소리, 1초 무음, 10초 소리 -> 무음 가운데에서 두 청크로 나뉨
+    rng = np.random.default_rng(1)
+    tone = rng.integers(-8000, 8000, 16000 * 10)
+    source = tmp_path / "source.wav"
+    write_wav(source, np.concatenate([tone, np.zeros(16000, dtype=np.int64), tone]))
+
+    monkeypatch.setattr(whisper_chunked, "ProcessPoolExecutor", FakePool)
+    monkeypatch.setattr(whisper_chunked, "_pools", whisper_chunked.OrderedDict())
+    monkeypatch.setattr(whisper_chunked, "extract_audio",
+                        lambda video, wav, rate: (open(wav, "wb").write(source.read_bytes()), wav)[1])
+    threads = []
+    real_to_thread = asyncio.to_thread
+
+    async def to_thread(fn, *args, **kwargs):
+        threads.append(fn)
+        return await real_to_thread(fn, *args, **kwargs)
+
+    monkeypatch.setattr(whisper_chunked.asyncio, "to_thread", to_thread)
+    transcriber = ChunkedWhisperTranscriber({"workers": 1, "target_chunk_seconds": 5.0, "max_chunk_seconds": 15.0})
+
+    segments = asyncio.run(transcriber.transcribe("clip.mp4", model="tiny"))
+    assert threads[:3] == [whisper_chunked.extract_audio, load_wav, find_silence_splits]
+    assert len(segments) == 2
+    assert 10.0 <= segments[1]["start"] <= 11.0
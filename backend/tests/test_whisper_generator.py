@@ -0,0 +1,42 @@
+"""Whisper 자막 증분 기록 테스트"""
+
+import pytest
+
+from app.services.whisper_generator import IncrementalSrtWriter, get_partial_status, partial_subtitle_path
+
+SEGMENTS = [{"start": 0.0, "end": 1.2, "text": " Hello there."}, {"start": 1.2, "end": 2.5, "text": "How are you?"}]
+
+
+@pytest.mark.parametrize("completed", [True, False])
+def test_writer_keeps_existing_subtitle_until_completed(tmp_path, completed):
+    output = tmp_path / "clip.en.srt"
+    output.write_text("1\n00:00:00,000 --> 00:00:01,000\nold\n\n", encoding="utf-8")
+    writer = IncrementalSrtWriter(str(output), media_duration=5.0)
+    writer.open()
+    for segment in SEGMENTS:
+        writer.append(segment)
+    writer.update_progress(2.5)
+
+    stream = partial_subtitle_path(str(output))
+    assert stream == tmp_path / "clip.en.partial.srt"
+    assert "Hello there." in stream.read_text(encoding="utf-8")
+    assert "old" in output.read_text(encoding="utf-8")
+    assert get_partial_status(str(output)) is not None
+
+    writer.close(completed=completed)
+    assert not stream.exists()
+    assert get_partial_status(str(output)) is None
+    text = output.read_text(encoding="utf-8")
+    if completed:
+        assert text.startswith("1\n00:00:00,000 --> 00:00:01,200\nHello there.\n\n2\n")
+    else:
+        assert "old" in text
+
+
+def test_failed_first_generation_leaves_no_subtitle(tmp_path):
+    output = tmp_path / "clip.srt"
+    writer = IncrementalSrtWriter(str(output))
+    writer.open()
+    writer.append(SEGMENTS[0])
+    writer.close(completed=False)
+    assert list(tmp_path.iterdir()) == []
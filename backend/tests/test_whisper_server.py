@@ -0,0 +1,151 @@
+"""Whisper 모델 서버 테스트 (모델 로드/전사는 가짜로 대체, 워커는 같은 프로세스의 스레드로 실행)"""
+
+import queue
+import asyncio
+import threading
+
+import pytest
+
+from app.services import whisper_server
+from app.services.whisper_server import WhisperModelServer, _worker_main, _STOP_SIGNAL
+
+
+class FakeProcess:
+    """워커 스레드를 multiprocessing.Process처럼 보이게 하는 래퍼"""
+
+    def __init__(self, thread=None, stops_on_join: bool = True):
+        self.thread = thread
+        self.stops_on_join = stops_on_join
+        self.alive = True
+        self.terminated = False
+        self.pid = 0
+
+    def is_alive(self) -> bool:
+        if self.thread is not None:
+            return self.thread.is_alive()
+        return self.alive
+
+    def join(self, timeout=None) -> None:
+        if self.thread is not None:
+            self.thread.join(timeout)
+        elif self.stops_on_join:
+            self.alive = False
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.alive = False
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    """모델 로드 기록을 남기고, 오디오 경로 "fail"이면 전사 중 오류를 내는 가짜 모델"""
+    loads = []
+
+    def load(model_name, backend, cpu_threads=0):
+        if model_name == "broken":
+            raise RuntimeError("모델 파일 없음")
+        loads.append(model_name)
+        return "stub", model_name
+
+    def iter_segments(kind, model, audio, language, options):
+        if audio == "fail":
+            raise RuntimeError("디코딩 실패")
+        for i in range(2):
+            yield {"start": float(i), "end": float(i + 1), "text": f"{model} {i}"}
+
+    monkeypatch.setattr(whisper_server, "_load_whisper_model", load)
+    monkeypatch.setattr(whisper_server, "_iter_segments", iter_segments)
+    return loads
+
+
+def run_worker(jobs, max_models: int = 2):
+    job_queue, event_queue = queue.Queue(), queue.Queue()
+    for i, (model, audio) in enumerate(jobs):
+        job_queue.put({"job_id": str(i), "model": model, "audio_path": audio})
+    job_queue.put(_STOP_SIGNAL)
+    _worker_main(job_queue, event_queue, max_models, "auto")
+    events = []
+    while not event_queue.empty():
+        events.append(event_queue.get())
+    return events
+
+
+def test_worker_evicts_least_recently_used_model(stub_model):
+    run_worker([("tiny", "a"), ("base", "b"), ("tiny", "c"), ("small", "d"), ("base", "e"), ("tiny", "f")])
+    # small 로드 때 base가, base 재로드 때 tiny가 밀려남
+    assert stub_model == ["tiny", "base", "small", "base", "tiny"]
+
+
+def test_worker_reports_errors_and_keeps_running(stub_model):
+    events = run_worker([("broken", "a"), ("tiny", "fail"), ("tiny", "b")])
+    by_job = {}
+    for event in events:
+        by_job.setdefault(event["job_id"], []).append(event)
+    assert by_job["0"][-1] == {"job_id": "0", "type": "error", "error": "모델 파일 없음"}
+    assert by_job["1"][-1]["type"] == "error" and by_job["1"][-1]["error"] == "디코딩 실패"
+    assert [e["type"] for e in by_job["2"]] == ["started", "segment", "segment", "done"]
+
+
+def start_in_thread(server: WhisperModelServer) -> None:
+    """워커를 스레드로 띄우는 start() 대체 (spawn 프로세스 없이 실제 큐/분배 경로 사용)"""
+    server._job_queue, server._event_queue = queue.Queue(), queue.Queue()
+    thread = threading.Thread(target=_worker_main,
+                              args=(server._job_queue, server._event_queue, server.max_models, server.backend),
+                              daemon=True)
+    thread.start()
+    server._process = FakeProcess(thread)
+    server._dispatcher = threading.Thread(target=server._dispatch_events,
+                                          args=(server._process, server._event_queue), daemon=True)
+    server._dispatcher.start()
+
+
+def test_transcribe_streams_segments_in_order(stub_model, monkeypatch):
+    server = WhisperModelServer()
+    monkeypatch.setattr(server, "start", lambda: None)
+    start_in_thread(server)
+
+    async def collect(audio):
+        return [event async for event in server.transcribe(audio, model="tiny")]
+
+    events = asyncio.run(collect("clip.wav"))
+    assert [e["type"] for e in events] == ["loading", "started", "segment", "segment", "done"]
+    assert [e["segment"]["text"] for e in events if e["type"] == "segment"] == ["tiny 0", "tiny 1"]
+
+    events = asyncio.run(collect("fail"))
+    assert events[-1]["type"] == "error"
+    server.stop(timeout=1.0)
+    assert not server._listeners and server._process is None
+
+
+def test_dispatcher_fails_pending_jobs_when_worker_dies():
+    server = WhisperModelServer()
+    process = FakeProcess()
+    process.alive = False
+
+    async def wait_for_error():
+        events: asyncio.Queue = asyncio.Queue()
+        server._listeners["job"] = (asyncio.get_running_loop(), events)
+        dispatcher = threading.Thread(target=server._dispatch_events, args=(process, queue.Queue()), daemon=True)
+        dispatcher.start()
+        event = await asyncio.wait_for(events.get(), timeout=5.0)
+        dispatcher.join(5.0)
+        return event, dispatcher.is_alive()
+
+    event, dispatcher_alive = asyncio.run(wait_for_error())
+    assert event["type"] == "error" and event["job_id"] == "job"
+    assert not dispatcher_alive
+    assert not server._listeners
+
+
+@pytest.mark.parametrize("stops_on_join", [True, False])
+def test_stop_sends_stop_signal_then_terminates(stops_on_join):
+    server = WhisperModelServer()
+    server._job_queue = queue.Queue()
+    process = FakeProcess(stops_on_join=stops_on_join)
+    server._process = process
+
+    server.stop(timeout=0.01)
+    assert server._job_queue.get_nowait() is _STOP_SIGNAL
+    assert process.terminated is not stops_on_join
+    assert server._process is None and not server.is_running()
+    server.stop()